@@ -15,6 +15,7 @@ import logging
 load_dotenv()
 
 from .app_utils.tools import read_router_config, write_router_config
+from .app_utils.topology import get_topology
 
 
 # Configure logging
@@ -26,13 +27,13 @@ logging.basicConfig(
 
 def confirmation_if_not_spof_router(router_name: str) -> bool:
     """
-    Returns True if the router is NOT a Single Point of Failure (SPOF).
-    Non-SPOF routers can be modified automatically.
+    Returns True if the router IS a Single Point of Failure (SPOF), i.e. a
+    human must approve the write. Non-SPOF routers are modified automatically.
     """
-    # Example policy:
-    # - r1-sea3 → SPOF router → human approval required
+    # Policy:
+    # - Articulation points of the topology (see topology_links.csv) → SPOF → human approval required
     # - anything else → auto-approved
-    return router_name == "r1-sea3"
+    return get_topology().is_spof(router_name)
 
 
 ## When you will explicitly need to use True/False confirmation every time
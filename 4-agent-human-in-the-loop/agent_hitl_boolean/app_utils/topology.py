@@ -0,0 +1,212 @@
+"""
+Topology graph used to decide which routers are Single Points of Failure (SPOF).
+
+Links are loaded from a file (one "router_a,router_b" pair per line) and the
+articulation points and bridges are precomputed with Tarjan's algorithm, so
+the confirmation policy answers is_spof() with a set lookup on the request path.
+Adding or removing a link only recomputes the connected component it touches.
+"""
+
+import os
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_TOPOLOGY_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "topology_links.csv",
+)
+
+Link = Tuple[str, str]
+
+
+def _link_key(router_a: str, router_b: str) -> Link:
+    return (router_a, router_b) if router_a <= router_b else (router_b, router_a)
+
+
+def read_links(path: str) -> List[Link]:
+    """
+    Read links from a file. Each non-empty line holds two router names
+    separated by a comma or whitespace; lines starting with '#' are ignored.
+    """
+    links = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            parts = [p.strip() for p in line.replace(",", " ").split()]
+            if len(parts) < 2:
+                raise ValueError(f"{path}:{line_number}: expected two router names")
+            links.append((parts[0], parts[1]))
+    return links
+
+
+class TopologyGraph:
+    """Undirected router graph with precomputed articulation points and bridges."""
+
+    def __init__(self, links: Iterable[Link] = ()):
+        # Neighbor -> number of parallel links, so a doubled link is never a bridge
+        self._adjacency: Dict[str, Counter] = defaultdict(Counter)
+        self._component: Dict[str, int] = {}
+        self._component_members: Dict[int, Set[str]] = {}
+        self._articulation_points: Dict[int, FrozenSet[str]] = {}
+        self._bridges: Dict[int, FrozenSet[Link]] = {}
+        self._spof: FrozenSet[str] = frozenset()
+        self._next_component_id = 0
+        self._lock = threading.Lock()
+
+        for router_a, router_b in links:
+            self._add_edge(router_a, router_b)
+        with self._lock:
+            self._recompute(set(self._adjacency))
+
+    @classmethod
+    def from_file(cls, path: str) -> "TopologyGraph":
+        """Build a topology graph from a links file."""
+        return cls(read_links(path))
+
+    # ------------------------------------------------------------------
+    # Lookups (O(1), used on the request path)
+    # ------------------------------------------------------------------
+
+    def is_spof(self, router_name: str) -> bool:
+        """True if removing the router disconnects part of the network."""
+        return router_name in self._spof
+
+    def is_bridge(self, router_a: str, router_b: str) -> bool:
+        """True if the link between the two routers is the only path between them."""
+        component_id = self._component.get(router_a)
+        if component_id is None:
+            return False
+        return _link_key(router_a, router_b) in self._bridges.get(component_id, ())
+
+    @property
+    def articulation_points(self) -> FrozenSet[str]:
+        return self._spof
+
+    @property
+    def bridges(self) -> FrozenSet[Link]:
+        return frozenset().union(*self._bridges.values()) if self._bridges else frozenset()
+
+    def __contains__(self, router_name: str) -> bool:
+        return router_name in self._adjacency
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def add_link(self, router_a: str, router_b: str) -> None:
+        """Add a link and recompute only the component(s) it joins."""
+        with self._lock:
+            self._add_edge(router_a, router_b)
+            affected = self._members_of(router_a) | self._members_of(router_b)
+            self._recompute(affected | {router_a, router_b})
+
+    def remove_link(self, router_a: str, router_b: str) -> None:
+        """Remove one link and recompute only the component it belonged to."""
+        with self._lock:
+            if self._adjacency.get(router_a, {}).get(router_b, 0) == 0:
+                return
+            affected = self._members_of(router_a)
+            for u, v in ((router_a, router_b), (router_b, router_a)):
+                self._adjacency[u][v] -= 1
+                if self._adjacency[u][v] == 0:
+                    del self._adjacency[u][v]
+            for router in (router_a, router_b):
+                if not self._adjacency[router]:
+                    del self._adjacency[router]
+            self._recompute(affected)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _add_edge(self, router_a: str, router_b: str) -> None:
+        if router_a == router_b:
+            return
+        self._adjacency[router_a][router_b] += 1
+        self._adjacency[router_b][router_a] += 1
+
+    def _members_of(self, router_name: str) -> Set[str]:
+        component_id = self._component.get(router_name)
+        if component_id is None:
+            return set()
+        return self._component_members[component_id]
+
+    def _recompute(self, routers: Set[str]) -> None:
+        """Re-run Tarjan over the components containing the given routers."""
+        for component_id in {self._component.get(r) for r in routers} - {None}:
+            for router in self._component_members.pop(component_id):
+                self._component.pop(router, None)
+            self._articulation_points.pop(component_id, None)
+            self._bridges.pop(component_id, None)
+
+        for router in routers:
+            if router in self._adjacency and router not in self._component:
+                self._tarjan(router)
+
+        self._spof = frozenset().union(*self._articulation_points.values())
+
+    def _tarjan(self, root: str) -> None:
+        """Iterative Tarjan DFS from root; records one component's AP and bridges."""
+        component_id = self._next_component_id
+        self._next_component_id += 1
+
+        discovery: Dict[str, int] = {root: 0}
+        low: Dict[str, int] = {root: 0}
+        parent: Dict[str, Optional[str]] = {root: None}
+        children: Counter = Counter()
+        articulation: Set[str] = set()
+        bridges: Set[Link] = set()
+        counter = 1
+        stack = [(root, iter(self._adjacency[root].items()))]
+
+        while stack:
+            node, neighbors = stack[-1]
+            advanced = False
+            for neighbor, multiplicity in neighbors:
+                if neighbor not in discovery:
+                    discovery[neighbor] = low[neighbor] = counter
+                    counter += 1
+                    parent[neighbor] = node
+                    children[node] += 1
+                    stack.append((neighbor, iter(self._adjacency[neighbor].items())))
+                    advanced = True
+                    break
+                if neighbor != parent[node] or multiplicity > 1:
+                    low[node] = min(low[node], discovery[neighbor])
+            if advanced:
+                continue
+
+            stack.pop()
+            up = parent[node]
+            if up is None:
+                continue
+            low[up] = min(low[up], low[node])
+            if low[node] > discovery[up] and self._adjacency[up][node] == 1:
+                bridges.add(_link_key(up, node))
+            if parent[up] is not None and low[node] >= discovery[up]:
+                articulation.add(up)
+
+        if children[root] > 1:
+            articulation.add(root)
+
+        members = set(discovery)
+        for router in members:
+            self._component[router] = component_id
+        self._component_members[component_id] = members
+        self._articulation_points[component_id] = frozenset(articulation)
+        self._bridges[component_id] = frozenset(bridges)
+
+
+_topology: Optional[TopologyGraph] = None
+
+
+def get_topology() -> TopologyGraph:
+    """Return the process-wide topology, loaded from HITL_TOPOLOGY_FILE if set."""
+    global _topology
+    if _topology is None:
+        path = os.environ.get("HITL_TOPOLOGY_FILE", DEFAULT_TOPOLOGY_FILE)
+        _topology = TopologyGraph.from_file(path) if os.path.exists(path) else TopologyGraph()
+    return _topology
@@ -16,6 +16,13 @@ from dotenv import load_dotenv
 import logging
 
 from .app_utils.tools import read_router_config
+from .app_utils.approval_store import (
+    EXECUTED,
+    FAILED,
+    PENDING,
+    REJECTED,
+    get_approval_store,
+)
 
 
 load_dotenv()
@@ -33,9 +40,17 @@ def write_router_config_confirmation_wizard(
     """
 
     tool_confirmation = tool_context.tool_confirmation
+    store = get_approval_store()
 
-    # Step 1: Ask for approval
+    # Step 1: Ask for approval (and persist it so it survives restarts and
+    # can be approved in bulk through the /approvals API)
     if not tool_confirmation:
+        approval_id = store.add_pending(
+            router_name=router_name,
+            requester=tool_context.user_id,
+            session_id=tool_context.session.id,
+            function_call_id=tool_context.function_call_id,
+        )
         tool_context.request_confirmation(
             hint=(
                 """This action will MODIFY router configuration.
@@ -43,27 +58,78 @@ def write_router_config_confirmation_wizard(
                 "Sample Answer: {"confirmed": true, "payload":{"ok_to_write": false}} """
             ),
             payload={
-                "ok_to_write": False
+                "ok_to_write": False,
+                "approval_id": approval_id,
             },
         )
         return {
             "status": "pending_approval",
+            "approval_id": approval_id,
             "message": "Awaiting human approval before applying configuration."
         }
 
     # Step 2: Process approval
-    ok_to_write = tool_confirmation.payload.get("ok_to_write", False)
-    
-    print("XXXXXXXX", ok_to_write)
-    if ok_to_write:
-        return write_router_config(router_name)
+    approval_id = (tool_confirmation.payload or {}).get("approval_id")
+    approval = store.get(approval_id) if approval_id else (
+        store.get_by_function_call(tool_context.function_call_id)
+    )
+    ok_to_write = (tool_confirmation.payload or {}).get("ok_to_write", False)
+
+    if not approval:
+        # Not recorded in the store: the chat answer is the only decision
+        if ok_to_write:
+            return write_router_config(router_name)
+        return {
+            "status": "rejected",
+            "message": "Human reviewer rejected the configuration change."
+        }
+
+    approval_id = approval["approval_id"]
+    if approval["status"] == PENDING:
+        store.decide([approval_id], ok_to_write, reviewer=tool_context.user_id)
 
+    # A reviewer may already have decided (or be executing) this one through
+    # the bulk API; only the caller that claims the approval writes
+    print("XXXXXXXX", ok_to_write)
+    if store.claim(approval_id):
+        try:
+            result = write_router_config(router_name)
+        except Exception as e:
+            store.mark_result(approval_id, FAILED, str(e))
+            return {"status": "failed", "router_name": router_name, "message": str(e)}
+        store.mark_result(approval_id, EXECUTED, result["message"])
+        return result
+    return _approval_outcome(router_name, store.get(approval_id))
+
+
+def _approval_outcome(router_name: str, approval: dict) -> dict:
+    """The tool result for an approval that was decided or run elsewhere."""
+    status = approval["status"]
+    if status == EXECUTED:
+        return {
+            "status": "success",
+            "router_name": router_name,
+            "message": approval["result"],
+        }
+    if status == FAILED:
+        return {
+            "status": "failed",
+            "router_name": router_name,
+            "message": f"The approved write failed: {approval['result']}",
+        }
+    if status == REJECTED:
+        return {
+            "status": "rejected",
+            "message": "Human reviewer rejected the configuration change."
+        }
+    # EXECUTING (or APPROVED and about to be claimed) by the bulk approval API
     return {
-        "status": "rejected",
-        "message": "Human reviewer rejected the configuration change."
+        "status": "in_progress",
+        "router_name": router_name,
+        "approval_id": approval["approval_id"],
+        "message": "The approved write is already being applied; check /approvals for the result.",
     }
 
-
 root_agent = Agent(
     name="network_engineer_agent",
     model="gemini-2.5-flash",
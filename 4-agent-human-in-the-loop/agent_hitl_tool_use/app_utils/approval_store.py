@@ -0,0 +1,237 @@
+"""
+Durable pending-approval store for Human-in-the-Loop router writes.
+
+Every call to write_router_config_confirmation_wizard that asks for a human
+decision is recorded here, so pending approvals survive a restart and can be
+listed and approved/rejected in bulk through the FastAPI app instead of one
+chat turn at a time.
+
+An approved write can be run from the chat (when the conversation resumes)
+and from the bulk API. Whichever path first moves the approval from APPROVED
+to EXECUTING with claim() runs the write; the other only reports the outcome.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+PENDING = "pending"
+APPROVED = "approved"
+EXECUTING = "executing"
+REJECTED = "rejected"
+EXECUTED = "executed"
+FAILED = "failed"
+
+DEFAULT_DB_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ".adk",
+    "pending_approvals.db",
+)
+DEFAULT_MAX_CONCURRENT_WRITES = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_approvals (
+    approval_id TEXT PRIMARY KEY,
+    router_name TEXT NOT NULL,
+    requester TEXT NOT NULL,
+    session_id TEXT,
+    function_call_id TEXT,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    decided_at REAL,
+    reviewer TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pending_router ON pending_approvals (status, router_name);
+CREATE INDEX IF NOT EXISTS idx_pending_requester ON pending_approvals (status, requester);
+CREATE INDEX IF NOT EXISTS idx_pending_created ON pending_approvals (status, created_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_pending_call ON pending_approvals (function_call_id);
+"""
+
+
+class PendingApprovalStore:
+    """SQLite-backed store of write approvals, indexed by router, requester and age."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        # One connection shared across threads; sqlite3 calls are serialized by the lock.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def add_pending(
+        self,
+        router_name: str,
+        requester: str,
+        session_id: Optional[str] = None,
+        function_call_id: Optional[str] = None,
+    ) -> str:
+        """
+        Record a new pending approval and return its approval_id.
+        Re-registering the same function_call_id returns the existing approval.
+        """
+        if function_call_id:
+            existing = self.get_by_function_call(function_call_id)
+            if existing:
+                return existing["approval_id"]
+
+        approval_id = str(uuid.uuid4())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO pending_approvals (approval_id, router_name, requester, "
+                "session_id, function_call_id, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    approval_id,
+                    router_name,
+                    requester,
+                    session_id,
+                    function_call_id,
+                    PENDING,
+                    time.time(),
+                ),
+            )
+        return approval_id
+
+    def get(self, approval_id: str) -> Optional[Dict[str, Any]]:
+        """Return a single approval by id, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM pending_approvals WHERE approval_id = ?", (approval_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_by_function_call(self, function_call_id: str) -> Optional[Dict[str, Any]]:
+        """Return the approval registered for an ADK function call id, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM pending_approvals WHERE function_call_id = ?",
+                (function_call_id,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def list_approvals(
+        self,
+        status: str = PENDING,
+        router_name: Optional[str] = None,
+        requester: Optional[str] = None,
+        older_than_seconds: Optional[float] = None,
+        limit: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """
+        List approvals filtered by status and optionally router, requester and age.
+        Results are ordered oldest first so reviewers clear the backlog in order.
+        """
+        clauses = ["status = ?"]
+        params: List[Any] = [status]
+        if router_name:
+            clauses.append("router_name = ?")
+            params.append(router_name)
+        if requester:
+            clauses.append("requester = ?")
+            params.append(requester)
+        if older_than_seconds is not None:
+            clauses.append("created_at <= ?")
+            params.append(time.time() - older_than_seconds)
+        params.append(limit)
+
+        query = (
+            f"SELECT * FROM pending_approvals WHERE {' AND '.join(clauses)} "
+            "ORDER BY created_at ASC LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def decide(
+        self, approval_ids: List[str], approved: bool, reviewer: str = "unknown"
+    ) -> List[str]:
+        """
+        Approve or reject pending approvals in one transaction.
+        Only approvals still pending are changed; their ids are returned.
+        """
+        if not approval_ids:
+            return []
+        new_status = APPROVED if approved else REJECTED
+        placeholders = ",".join("?" for _ in approval_ids)
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT approval_id FROM pending_approvals "
+                f"WHERE status = ? AND approval_id IN ({placeholders})",
+                [PENDING, *approval_ids],
+            ).fetchall()
+            decided = [row["approval_id"] for row in rows]
+            self._conn.executemany(
+                "UPDATE pending_approvals SET status = ?, decided_at = ?, reviewer = ? "
+                "WHERE approval_id = ?",
+                [(new_status, time.time(), reviewer, aid) for aid in decided],
+            )
+        return decided
+
+    def claim(self, approval_id: str) -> bool:
+        """
+        Atomically move an approval from APPROVED to EXECUTING.
+        Returns True for the one caller that should run the write.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE pending_approvals SET status = ? WHERE approval_id = ? AND status = ?",
+                (EXECUTING, approval_id, APPROVED),
+            )
+        return cursor.rowcount == 1
+
+    def mark_result(self, approval_id: str, status: str, result: str) -> None:
+        """Record the outcome of an executed (or failed) write."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pending_approvals SET status = ?, result = ? WHERE approval_id = ?",
+                (status, result, approval_id),
+            )
+
+
+async def execute_approved_writes(
+    store: PendingApprovalStore,
+    approval_ids: List[str],
+    write_fn: Callable[[str], Dict[str, Any]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENT_WRITES,
+) -> List[Dict[str, Any]]:
+    """
+    Run the write for every approved approval concurrently, at most
+    max_concurrency at a time, and record each outcome in the store.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run_one(approval_id: str) -> Dict[str, Any]:
+        if not store.claim(approval_id):
+            return {"approval_id": approval_id, "status": "skipped"}
+        approval = store.get(approval_id)
+        async with semaphore:
+            try:
+                result = await asyncio.to_thread(write_fn, approval["router_name"])
+            except Exception as e:
+                store.mark_result(approval_id, FAILED, str(e))
+                return {"approval_id": approval_id, "status": FAILED, "error": str(e)}
+        store.mark_result(approval_id, EXECUTED, result.get("message", ""))
+        return {"approval_id": approval_id, "status": EXECUTED, "result": result}
+
+    return list(await asyncio.gather(*(_run_one(aid) for aid in approval_ids)))
+
+
+_store: Optional[PendingApprovalStore] = None
+
+
+def get_approval_store() -> PendingApprovalStore:
+    """Return the process-wide store, opened at HITL_APPROVALS_DB if set."""
+    global _store
+    if _store is None:
+        _store = PendingApprovalStore(os.environ.get("HITL_APPROVALS_DB", DEFAULT_DB_PATH))
+    return _store
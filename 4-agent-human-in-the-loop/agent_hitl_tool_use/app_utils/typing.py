@@ -44,3 +44,12 @@ class Feedback(BaseModel):
     service_name: Literal["4-agent-human-in-the-loop"] = "4-agent-human-in-the-loop"
     user_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     session_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+
+
+class ApprovalDecision(BaseModel):
+    """Represents a bulk approve/reject decision for pending router writes."""
+
+    approval_ids: list[str]
+    approved: bool
+    reviewer: str = "unknown"
+    max_concurrency: int = Field(default=8, ge=1, le=64)
@@ -21,7 +21,13 @@ from fastapi import FastAPI
 from google.adk.cli.fast_api import get_fast_api_app
 
 from agent_hitl_tool_use.app_utils.telemetry import setup_telemetry
-from agent_hitl_tool_use.app_utils.typing import Feedback
+from agent_hitl_tool_use.app_utils.approval_store import (
+    PENDING,
+    execute_approved_writes,
+    get_approval_store,
+)
+from agent_hitl_tool_use.app_utils.tools import write_router_config
+from agent_hitl_tool_use.app_utils.typing import ApprovalDecision, Feedback
 
 # Suppress Pydantic warnings about JSON schema generation for internal ADK types
 warnings.filterwarnings("ignore", category=UserWarning, module="pydantic")
@@ -157,6 +163,69 @@ def collect_feedback(feedback: Feedback) -> dict[str, str]:
     return {"status": "success"}
 
 
+@app.get("/approvals")
+def list_pending_approvals(
+    status: str = PENDING,
+    router_name: str | None = None,
+    requester: str | None = None,
+    older_than_seconds: float | None = None,
+    limit: int = 500,
+) -> dict:
+    """List router write approvals, filtered by router, requester and age.
+
+    Args:
+        status: Approval status to list (default: pending)
+        router_name: Only approvals for this router
+        requester: Only approvals requested by this user
+        older_than_seconds: Only approvals waiting at least this long
+        limit: Maximum number of approvals to return
+
+    Returns:
+        The matching approvals, oldest first
+    """
+    approvals = get_approval_store().list_approvals(
+        status=status,
+        router_name=router_name,
+        requester=requester,
+        older_than_seconds=older_than_seconds,
+        limit=limit,
+    )
+    return {"count": len(approvals), "approvals": approvals}
+
+
+@app.post("/approvals/decision")
+async def decide_pending_approvals(decision: ApprovalDecision) -> dict:
+    """Approve or reject pending router writes in bulk.
+
+    Approved writes are executed concurrently, at most
+    decision.max_concurrency at a time.
+
+    Args:
+        decision: The approval ids, the decision and the reviewer
+
+    Returns:
+        The decided approval ids and the result of each executed write
+    """
+    store = get_approval_store()
+    decided = store.decide(
+        decision.approval_ids, decision.approved, reviewer=decision.reviewer
+    )
+    results = []
+    if decision.approved and decided:
+        results = await execute_approved_writes(
+            store,
+            decided,
+            write_router_config,
+            max_concurrency=decision.max_concurrency,
+        )
+    return {
+        "status": "success",
+        "decided": decided,
+        "skipped": [aid for aid in decision.approval_ids if aid not in decided],
+        "results": results,
+    }
+
+
 # Main execution
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,118 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+
+from agent_hitl_tool_use.app_utils.approval_store import (
+    APPROVED,
+    EXECUTED,
+    EXECUTING,
+    FAILED,
+    PENDING,
+    REJECTED,
+    PendingApprovalStore,
+    execute_approved_writes,
+)
+
+
+def test_pending_approvals_survive_reopen(tmp_path) -> None:
+    """Pending approvals are persisted and can be listed after a restart."""
+    db_path = str(tmp_path / "approvals.db")
+    store = PendingApprovalStore(db_path)
+    approval_id = store.add_pending("r1-sea3", "alice", "s1", "call-1")
+    assert store.add_pending("r1-sea3", "alice", "s1", "call-1") == approval_id
+    store.add_pending("r2-sea3", "bob", "s2", "call-2")
+
+    reopened = PendingApprovalStore(db_path)
+    assert len(reopened.list_approvals()) == 2
+    assert [a["approval_id"] for a in reopened.list_approvals(router_name="r1-sea3")] == [
+        approval_id
+    ]
+    assert len(reopened.list_approvals(requester="bob")) == 1
+    assert reopened.list_approvals(older_than_seconds=3600) == []
+
+
+def test_bulk_decision_only_changes_pending(tmp_path) -> None:
+    """Bulk decisions skip approvals that were already decided."""
+    store = PendingApprovalStore(str(tmp_path / "approvals.db"))
+    first = store.add_pending("r1-sea3", "alice")
+    second = store.add_pending("r2-sea3", "alice")
+
+    assert store.decide([first], approved=False, reviewer="noc") == [first]
+    assert store.decide([first, second], approved=True, reviewer="noc") == [second]
+    assert store.get(first)["status"] == REJECTED
+    assert store.get(second)["status"] == APPROVED
+    assert store.list_approvals(status=PENDING) == []
+
+
+def test_approved_writes_run_with_bounded_concurrency(tmp_path) -> None:
+    """Approved writes execute concurrently but never above the limit."""
+    store = PendingApprovalStore(str(tmp_path / "approvals.db"))
+    ids = [store.add_pending(f"r{i}-sea3", "alice") for i in range(10)]
+    store.decide(ids, approved=True)
+
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def fake_write(router_name: str) -> dict:
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(0.02)
+        with lock:
+            running["now"] -= 1
+        return {"status": "success", "message": f"pushed to {router_name}"}
+
+    results = asyncio.run(
+        execute_approved_writes(store, ids, fake_write, max_concurrency=3)
+    )
+
+    assert all(r["status"] == EXECUTED for r in results)
+    assert 1 < running["peak"] <= 3
+    assert store.get(ids[0])["result"] == "pushed to r0-sea3"
+
+
+def test_an_approved_write_is_claimed_once(tmp_path) -> None:
+    """The chat and the bulk API cannot both run the same approved write."""
+    store = PendingApprovalStore(str(tmp_path / "approvals.db"))
+    approval_id = store.add_pending("r1-sea3", "alice")
+    assert not store.claim(approval_id)  # still pending
+    store.decide([approval_id], approved=True)
+
+    assert store.claim(approval_id)
+    assert store.get(approval_id)["status"] == EXECUTING
+    assert not store.claim(approval_id)
+
+    writes = []
+    results = asyncio.run(
+        execute_approved_writes(store, [approval_id], lambda name: writes.append(name) or {})
+    )
+    assert results == [{"approval_id": approval_id, "status": "skipped"}]
+    assert writes == []
+
+
+def test_failed_write_is_recorded(tmp_path) -> None:
+    store = PendingApprovalStore(str(tmp_path / "approvals.db"))
+    approval_id = store.add_pending("r1-sea3", "alice")
+    store.decide([approval_id], approved=True)
+
+    def broken_write(router_name: str) -> dict:
+        raise ConnectionError("r1-sea3 unreachable")
+
+    results = asyncio.run(execute_approved_writes(store, [approval_id], broken_write))
+    assert results[0]["status"] == FAILED
+    assert store.get(approval_id)["status"] == FAILED
+    assert not store.claim(approval_id)
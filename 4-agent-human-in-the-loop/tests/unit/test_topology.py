@@ -0,0 +1,83 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+
+from agent_hitl_boolean.app_utils.topology import (
+    DEFAULT_TOPOLOGY_FILE,
+    TopologyGraph,
+)
+
+
+def _brute_force_spof(links: list[tuple[str, str]]) -> set[str]:
+    """Routers whose removal increases the number of connected components."""
+
+    def components(removed: str | None) -> int:
+        adjacency: dict[str, set[str]] = {}
+        for a, b in links:
+            if removed in (a, b):
+                continue
+            adjacency.setdefault(a, set()).add(b)
+            adjacency.setdefault(b, set()).add(a)
+        nodes = {n for link in links for n in link} - {removed}
+        seen: set[str] = set()
+        count = 0
+        for node in nodes:
+            if node in seen:
+                continue
+            count += 1
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                if current in seen:
+                    continue
+                seen.add(current)
+                stack.extend(adjacency.get(current, ()))
+        return count
+
+    baseline = components(None)
+    nodes = {n for link in links for n in link}
+    # A router that only disappears (leaf) does not add a component
+    return {n for n in nodes if components(n) > baseline}
+
+
+def test_sample_topology_spof() -> None:
+    """r1-sea3 joins the SEA and PDX sites, so it needs human approval."""
+    topology = TopologyGraph.from_file(DEFAULT_TOPOLOGY_FILE)
+    assert topology.is_spof("r1-sea3")
+    assert not topology.is_spof("r3-sea3")
+    assert topology.is_bridge("r1-pdx1", "r1-sea3")
+    # Parallel links are never bridges
+    assert not topology.is_bridge("r2-sea3", "r1-gov51")
+
+
+def test_incremental_updates_match_full_rebuild() -> None:
+    """Adding and removing links gives the same answer as rebuilding the graph."""
+    rng = random.Random(7)
+    routers = [f"r{i}" for i in range(40)]
+    links = [(rng.choice(routers), rng.choice(routers)) for _ in range(45)]
+    links = [(a, b) for a, b in links if a != b]
+
+    topology = TopologyGraph()
+    current: list[tuple[str, str]] = []
+    for a, b in links:
+        topology.add_link(a, b)
+        current.append((a, b))
+        assert topology.articulation_points == _brute_force_spof(current)
+
+    for a, b in links[::2]:
+        topology.remove_link(a, b)
+        current.remove((a, b))
+        assert topology.articulation_points == _brute_force_spof(current)
+        assert topology.articulation_points == TopologyGraph(current).articulation_points
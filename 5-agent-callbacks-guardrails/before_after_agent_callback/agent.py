@@ -38,9 +38,13 @@ from google.adk.runners import InMemoryRunner # Use InMemoryRunner
 from google.genai import types # For types.Content
 from google.adk.models import LlmRequest, LlmResponse
 from google.adk.models import Gemini
-from typing import Optional 
+from typing import List, Optional
 from google.adk.apps.app import App
 from .app_utils.tools import read_router_config
+from .app_utils.guardrail_chain import GuardrailChain
+from .app_utils.router_extractor import get_router_extractor
+from .app_utils.session_index import SessionIndexPlugin, get_session_index
+from .app_utils.health_prober import DOWN, UNKNOWN, get_health_monitor
 
 from dotenv import load_dotenv
 
@@ -62,48 +66,46 @@ logging.basicConfig(
 GEMINI_2_FLASH="gemini-2.0-flash"
 
 
-import re
-
 def extract_router_name(text: str) -> Optional[str]:
     """
-    Extracts the router name from a string using flexible patterns.
-    Supports various router naming conventions commonly used in networks.
+    Extracts the router name from a string.
+    Known devices are matched against the device inventory (hostnames and aliases)
+    in a single pass; unknown names fall back to common router naming conventions.
 
     Args:
         text: The input string containing the router name.
 
     Returns:
-        The router name as a string, or None if no match is found.
+        The canonical router name as a string, or None if no match is found.
+    """
+    return get_router_extractor().extract(text)
+
+
+def extract_router_names(text: str) -> List[str]:
     """
-    # More flexible patterns for router names
-    patterns = [
-        r"\b(r\d+-[a-zA-Z]+\d+)\b",  # r1-core01, r2-edge05
-        r"\b(router\d+)\b",           # router1, router01
-        r"\b([a-zA-Z]+-router\d+)\b", # core-router1, edge-router2
-        r"\b(R\d+)\b",                # R1, R2 (Cisco style)
-        r"\b([a-zA-Z]{2,4}\d+)\b",    # cor01, edg05 (abbreviated)
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            router_name = match.group(1)
-            return router_name
-
-    return None
+    Extracts every router mentioned in a string, in order of first mention.
+
+    Args:
+        text: The input string, e.g. a user message with a pasted log.
+
+    Returns:
+        A list of canonical router names (empty if none are found).
+    """
+    return get_router_extractor().extract_all(text)
     
-def check_router_status(router_name: str) -> bool:
+async def check_router_status(router_name: Optional[str]) -> str:
     """
     Checks if the router is up and running.
+    Answered from the background health table; only unknown routers are probed inline.
     """
     print(f"[Callback] Checking router status: {router_name}")
-    import random
-    status = ['up', 'down']
-    return random.choice(status)
+    if not router_name:
+        return UNKNOWN
+    return await get_health_monitor().get_status(router_name)
 
     
 # --- 1. Define the Callback Function ---
-def check_if_router_is_up_and_agent_should_run(callback_context: CallbackContext) -> Optional[types.Content]:
+async def check_if_router_is_up_and_agent_should_run(callback_context: CallbackContext) -> Optional[types.Content]:
     """This function will check if the router is up and if the agent should run.
     """
 
@@ -114,35 +116,25 @@ def check_if_router_is_up_and_agent_should_run(callback_context: CallbackContext
     session = callback_context._invocation_context.session
     
     # Use Case 1: PreValidation 
-    # Get the last user message which is the lst event
- 
-    if session.events:
-        for event in reversed(session.events):
-            if event.content:
-                # Extract text from content
-                print(f"[Callback] event.content: {event.content}")
-                if hasattr(event.content, "parts") and event.content.parts:
-                    for part in event.content.parts:
-                        if hasattr(part, "text") and part.text:
-                            last_user_message = part.text
-                            break  # break out of innermost for part in event.content.parts
-                break  # break out of for event in reversed(session.events) after finding the last_user_message
-                            
+    # Get the last user message from the session index (constant time, no event scan)
+    last_user_message = get_session_index(session).last_user_message
 
     print(f"[Callback] before_agent_callback_Last User Message: {last_user_message}")
     callback_context.state['before_agent_callback_latest_user_message'] = last_user_message
     # Use Case 1: PreValidation 
-    router_name = extract_router_name(last_user_message)
+    router_names = extract_router_names(last_user_message)
+    router_name = router_names[0] if router_names else None
+    callback_context.state['before_agent_callback_latest_router_names'] = router_names
     
     # Use Case 2:Context Manipulation / Initiation
     callback_context.state['before_agent_callback_latest_router_name'] = router_name
     print(f"[Callback] before_agent_callback_Router Name: {router_name}")
 
-    router_status = check_router_status(router_name)
+    router_status = await check_router_status(router_name)
     print(f"[Callback] Router Status: {router_status}")
     callback_context.state['before_agent_callback_latest_router_status'] = router_status
     # Return a message back to the user as agent output content
-    if router_status == 'up':
+    if router_status != DOWN:
         return None
     else:
         return types.Content(
@@ -161,21 +153,9 @@ def check_if_router_is_up_and_agent_should_process_the_repsonse(callback_context
     
     session = callback_context._invocation_context.session
     
-    # Get the last user message which is the lst event
-    last_message = ""
-    if session.events:
-        for event in reversed(session.events):
-            if event.content:
-                # Extract text from content
-                print(f"[Callback] event.content: {event.content}")
-                if hasattr(event.content, "parts") and event.content.parts:
-                    for part in event.content.parts:
-                        if hasattr(part, "text") and part.text:
-                            last_message = part.text
-                            break  # break out of innermost for part in event.content.parts
-                break  # break out of for event in reversed(session.events) after finding the last_user_message
-                            
-                            
+    # Get the last agent response from the session index (constant time, no event scan)
+    last_message = get_session_index(session).last_agent_message
+
     print(f"[Callback] Agent Response Message: {last_message}")
     print(f"[Callback] Router Name: {callback_context.state['before_agent_callback_latest_router_name']}")
     print(f"[Callback] Router Status: {callback_context.state['before_agent_callback_latest_router_status']}")
@@ -222,8 +202,13 @@ root_agent = Agent(
 
     IMPORTANT: This agent includes built-in guardrails that prevent operations on unhealthy infrastructure. If a router is detected as down or unreachable, operations will be safely blocked with appropriate notifications.""",
     tools=[read_router_config],
-    before_agent_callback=check_if_router_is_up_and_agent_should_run,
-    after_agent_callback=check_if_router_is_up_and_agent_should_process_the_repsonse,
+    before_agent_callback=GuardrailChain("before_agent", [check_if_router_is_up_and_agent_should_run]),
+    after_agent_callback=GuardrailChain("after_agent", [check_if_router_is_up_and_agent_should_process_the_repsonse]),
 )
 
-app = App(root_agent=root_agent, name="before_after_agent_callback")
+app = App(
+    root_agent=root_agent,
+    name="before_after_agent_callback",
+    # Keeps the per-session message index current as events are appended
+    plugins=[SessionIndexPlugin()],
+)
@@ -0,0 +1,321 @@
+"""
+Background router health probing for the agent guardrails.
+
+The before-agent callback needs to know whether a router is up before every
+run. Probing inline would add a network round-trip to every turn, so
+RouterHealthMonitor keeps a TTL'd health table that a background asyncio task
+refreshes for every known router. Callbacks answer from memory; only unknown
+routers are probed on demand, and stale entries are refreshed in the background.
+The task exits after idle_seconds without lookups (the next lookup restarts it)
+and can be stopped with stop_health_monitor().
+
+Probers are pluggable: any object with a `name` and an async
+`probe(address) -> bool` method can be added (TCP, SSH banner and ICMP are
+provided). A prober that raises (e.g. the address does not resolve) has failed
+to probe, which is not the same as the router being down: a router is only DOWN
+if a prober ran and got no answer. Routers missing from the inventory, routers
+whose probers all failed and every router while probing is disabled (the
+default; set ROUTER_HEALTH_PROBES to enable it) are UNKNOWN.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+UP = "up"
+DOWN = "down"
+UNKNOWN = "unknown"
+
+DEFAULT_INVENTORY_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "device_inventory.json",
+)
+
+
+class Prober(Protocol):
+    name: str
+
+    async def probe(self, address: str) -> bool: ...
+
+
+class TcpProber:
+    """Reachable if a TCP connection to the port is accepted."""
+
+    def __init__(self, port: int = 22, timeout: float = 2.0):
+        self.port = port
+        self.timeout = timeout
+        self.name = f"tcp:{port}"
+
+    async def probe(self, address: str) -> bool:
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(address, self.port), self.timeout
+            )
+        except socket.gaierror:
+            raise  # the address does not resolve: no answer either way
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+
+class SshProber(TcpProber):
+    """Reachable if the SSH port answers with an SSH protocol banner."""
+
+    def __init__(self, port: int = 22, timeout: float = 3.0):
+        super().__init__(port, timeout)
+        self.name = f"ssh:{port}"
+
+    async def probe(self, address: str) -> bool:
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(address, self.port), self.timeout
+            )
+        except socket.gaierror:
+            raise
+        except (OSError, asyncio.TimeoutError):
+            return False
+        try:
+            banner = await asyncio.wait_for(reader.readline(), self.timeout)
+            return banner.startswith(b"SSH-")
+        except (OSError, asyncio.TimeoutError):
+            return False
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+class IcmpProber:
+    """Reachable if one ICMP echo is answered (uses the system ping binary)."""
+
+    def __init__(self, timeout: float = 1.0):
+        self.timeout = timeout
+        self.name = "icmp"
+
+    async def probe(self, address: str) -> bool:
+        # OSError (no ping binary) propagates: the probe could not run
+        process = await asyncio.create_subprocess_exec(
+            "ping", "-c", "1", "-W", str(max(1, int(self.timeout))), address,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            return await asyncio.wait_for(process.wait(), self.timeout + 1) == 0
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+
+def build_probers(spec: str) -> List[Prober]:
+    """
+    Build probers from a comma-separated spec, e.g. "tcp:22,ssh:22,icmp".
+    """
+    probers: List[Prober] = []
+    for item in (s.strip() for s in spec.split(",")):
+        if not item:
+            continue
+        kind, _, port = item.partition(":")
+        if kind == "tcp":
+            probers.append(TcpProber(int(port or 22)))
+        elif kind == "ssh":
+            probers.append(SshProber(int(port or 22)))
+        elif kind == "icmp":
+            probers.append(IcmpProber())
+        else:
+            raise ValueError(f"Unknown prober '{item}'")
+    return probers
+
+
+@dataclass
+class HealthEntry:
+    status: str
+    checked_at: float
+    probes: Dict[str, bool] = field(default_factory=dict)
+
+
+class RouterHealthMonitor:
+    """TTL'd router health table refreshed by a background asyncio task."""
+
+    def __init__(
+        self,
+        routers: Dict[str, str],
+        probers: Iterable[Prober],
+        ttl_seconds: float = 30.0,
+        refresh_interval_seconds: float = 10.0,
+        max_concurrent_probes: int = 64,
+        idle_seconds: float = 300.0,
+    ):
+        """
+        Args:
+            routers: Mapping of router name -> address to probe.
+            probers: Probers to run; a router is up if any of them succeeds.
+            ttl_seconds: Age after which a health entry is stale.
+            refresh_interval_seconds: How often the background task wakes up.
+            max_concurrent_probes: Upper bound on routers probed at once.
+            idle_seconds: The background task exits after this long without lookups.
+        """
+        self.routers = dict(routers)
+        self.probers = list(probers)
+        self.ttl_seconds = ttl_seconds
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.idle_seconds = idle_seconds
+        self._last_lookup = time.monotonic()
+        self._table: Dict[str, HealthEntry] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent_probes)
+        self._background: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def lookup(self, router_name: str) -> Optional[HealthEntry]:
+        """The cached entry for a router (possibly stale), without probing."""
+        return self._table.get(router_name)
+
+    def is_fresh(self, entry: Optional[HealthEntry]) -> bool:
+        return entry is not None and time.monotonic() - entry.checked_at < self.ttl_seconds
+
+    async def get_status(self, router_name: str) -> str:
+        """
+        Router status for the request path.
+        Fresh entries are answered from memory. Stale entries are answered from
+        memory while a refresh runs in the background. Inventory routers not
+        probed yet are probed once on demand; routers outside the inventory and
+        all routers while no probers are configured are UNKNOWN.
+        """
+        if not self.probers or router_name not in self.routers:
+            return UNKNOWN
+        self._last_lookup = time.monotonic()
+        self.ensure_started()
+        entry = self._table.get(router_name)
+        if self.is_fresh(entry):
+            return entry.status
+        if entry is not None:
+            self._refresh(router_name)
+            return entry.status
+        return (await self._refresh(router_name)).status
+
+    # ------------------------------------------------------------------
+    # Probing
+    # ------------------------------------------------------------------
+
+    def ensure_started(self) -> None:
+        """Start the background refresh task on the running loop, once."""
+        if not self.probers:
+            return
+        if self._background is None or self._background.done():
+            self._background = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background refresh task and any probes in flight."""
+        for task in list(self._in_flight.values()):
+            task.cancel()
+        if self._background:
+            self._background.cancel()
+            try:
+                await self._background
+            except asyncio.CancelledError:
+                pass
+            self._background = None
+
+    async def _run(self) -> None:
+        while time.monotonic() - self._last_lookup < self.idle_seconds:
+            stale = [r for r in self.routers if not self.is_fresh(self._table.get(r))]
+            if stale:
+                await asyncio.gather(*(self._refresh(r) for r in stale))
+            await asyncio.sleep(self.refresh_interval_seconds)
+        logger.debug("Health monitor idle for %.0fs, stopping refreshes", self.idle_seconds)
+
+    def _refresh(self, router_name: str) -> "asyncio.Task[HealthEntry]":
+        """Probe a router; concurrent callers share the same in-flight probe."""
+        task = self._in_flight.get(router_name)
+        if task is None or task.done():
+            task = asyncio.get_running_loop().create_task(self._probe(router_name))
+            self._in_flight[router_name] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(router_name, None))
+        return task
+
+    async def _probe(self, router_name: str) -> HealthEntry:
+        address = self.routers.get(router_name, router_name)
+        async with self._semaphore:
+            results = await asyncio.gather(
+                *(prober.probe(address) for prober in self.probers),
+                return_exceptions=True,
+            )
+        probes = {
+            prober.name: result is True for prober, result in zip(self.probers, results)
+        }
+        for prober, result in zip(self.probers, results):
+            if isinstance(result, Exception):
+                logger.warning("Health probe %s of %s (%s) failed: %s",
+                               prober.name, router_name, address, result)
+        if any(probes.values()):
+            status = UP
+        elif all(isinstance(result, Exception) for result in results):
+            status = UNKNOWN
+        else:
+            status = DOWN
+        entry = HealthEntry(
+            status=status,
+            checked_at=time.monotonic(),
+            probes=probes,
+        )
+        self._table[router_name] = entry
+        logger.debug("Health probe %s (%s): %s", router_name, address, probes)
+        return entry
+
+
+def load_router_addresses(path: str) -> Dict[str, str]:
+    """Router name -> probe address from the device inventory."""
+    if not os.path.exists(path):
+        logger.warning("Device inventory %s not found; router health is unknown", path)
+        return {}
+    with open(path) as f:
+        return {d["hostname"]: d.get("address", d["hostname"]) for d in json.load(f)}
+
+
+_monitor: Optional[RouterHealthMonitor] = None
+
+
+def get_health_monitor() -> RouterHealthMonitor:
+    """
+    Return the process-wide monitor. Configured with ROUTER_INVENTORY_FILE,
+    ROUTER_HEALTH_PROBES (e.g. "tcp:22,ssh:22,icmp"; default: no probing, every
+    router is UNKNOWN) and ROUTER_HEALTH_TTL_SECONDS.
+    """
+    global _monitor
+    if _monitor is None:
+        _monitor = RouterHealthMonitor(
+            routers=load_router_addresses(
+                os.environ.get("ROUTER_INVENTORY_FILE", DEFAULT_INVENTORY_FILE)
+            ),
+            probers=build_probers(os.environ.get("ROUTER_HEALTH_PROBES", "")),
+            ttl_seconds=float(os.environ.get("ROUTER_HEALTH_TTL_SECONDS", "30")),
+        )
+    return _monitor
+
+
+async def stop_health_monitor() -> None:
+    """Stop the process-wide monitor's background task, e.g. on shutdown."""
+    global _monitor
+    if _monitor is not None:
+        await _monitor.stop()
+        _monitor = None
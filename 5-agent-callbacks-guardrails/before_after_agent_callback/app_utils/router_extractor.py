@@ -0,0 +1,172 @@
+"""
+Inventory-backed router-name extraction for the agent callbacks.
+
+Hostnames and aliases from the device inventory are compiled into a single
+Aho-Corasick automaton, so every known device mentioned in a message (even a
+long pasted log) is found in one linear pass. Names that are not in the
+inventory fall back to one combined, precompiled naming-convention regex.
+"""
+
+import json
+import os
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_INVENTORY_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "device_inventory.json",
+)
+
+# Common router naming conventions, combined into one alternation and compiled once.
+# The loose "[a-zA-Z]{2,4}\d+" pattern is intentionally gone: it matched words like
+# "eth0" or "ipv4". Abbreviated names should be listed as inventory aliases instead.
+FALLBACK_ROUTER_PATTERN = re.compile(
+    r"\b("
+    r"r\d+-[a-z]+\d+"        # r1-core01, r2-edge05
+    r"|[a-z]+-router\d+"     # core-router1, edge-router2
+    r"|router\d+"            # router1, router01
+    r"|r\d+"                 # R1, R2 (Cisco style)
+    r")\b",
+    re.IGNORECASE,
+)
+
+
+def _is_name_char(ch: str) -> bool:
+    return ch.isalnum() or ch in "-_"
+
+
+class RouterNameExtractor:
+    """Finds inventory devices mentioned in free text with an Aho-Corasick automaton."""
+
+    def __init__(self, names: Dict[str, str]):
+        """
+        Args:
+            names: Mapping of hostname or alias -> canonical hostname.
+        """
+        # State 0 is the root. _goto[state] maps a character to the next state.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Patterns ending at a state: (pattern length, canonical hostname)
+        self._output: List[List[Tuple[int, str]]] = [[]]
+
+        for name, hostname in names.items():
+            self._add(name.lower(), hostname)
+        self._build_failure_links()
+
+    @classmethod
+    def from_inventory(cls, devices: Iterable[dict]) -> "RouterNameExtractor":
+        """Build from inventory records with a "hostname" and optional "aliases"."""
+        names: Dict[str, str] = {}
+        for device in devices:
+            hostname = device["hostname"]
+            names[hostname] = hostname
+            for alias in device.get("aliases", []):
+                names[alias] = hostname
+        return cls(names)
+
+    @classmethod
+    def from_file(cls, path: str) -> "RouterNameExtractor":
+        """Build from a JSON inventory file (a list of device records)."""
+        with open(path) as f:
+            return cls.from_inventory(json.load(f))
+
+    def _add(self, name: str, hostname: str) -> None:
+        state = 0
+        for ch in name:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(name), hostname))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(ch, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._output[next_state] = (
+                    self._output[next_state] + self._output[self._fail[next_state]]
+                )
+
+    def find_all(self, text: str) -> List[str]:
+        """
+        Return every device mentioned in text, as canonical hostnames, in order
+        of first mention. Inventory matches must sit on name boundaries
+        (so "r1-sea3" does not match inside "r1-sea30").
+        """
+        lowered = text.lower()
+        goto, fail, output = self._goto, self._fail, self._output
+        length = len(lowered)
+        # start index -> (match length, hostname); the longest match at a start wins
+        matches: Dict[int, Tuple[int, str]] = {}
+        state = 0
+        for index, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            for pattern_length, hostname in output[state]:
+                start = index - pattern_length + 1
+                if start > 0 and _is_name_char(lowered[start - 1]):
+                    continue
+                if index + 1 < length and _is_name_char(lowered[index + 1]):
+                    continue
+                if pattern_length > matches.get(start, (0, ""))[0]:
+                    matches[start] = (pattern_length, hostname)
+
+        found: List[str] = []
+        seen = set()
+        for start in sorted(matches):
+            hostname = matches[start][1]
+            if hostname not in seen:
+                seen.add(hostname)
+                found.append(hostname)
+        return found
+
+    def extract_all(self, text: str) -> List[str]:
+        """Inventory matches, or naming-convention matches when none are known."""
+        found = self.find_all(text)
+        if found:
+            return found
+        seen = set()
+        fallback = []
+        for match in FALLBACK_ROUTER_PATTERN.finditer(text):
+            name = match.group(1)
+            if name.lower() not in seen:
+                seen.add(name.lower())
+                fallback.append(name)
+        return fallback
+
+    def extract(self, text: str) -> Optional[str]:
+        """The first router mentioned in text, or None."""
+        found = self.extract_all(text)
+        return found[0] if found else None
+
+
+_extractor: Optional[RouterNameExtractor] = None
+
+
+def get_router_extractor() -> RouterNameExtractor:
+    """Return the process-wide extractor, built from ROUTER_INVENTORY_FILE if set."""
+    global _extractor
+    if _extractor is None:
+        path = os.environ.get("ROUTER_INVENTORY_FILE", DEFAULT_INVENTORY_FILE)
+        _extractor = (
+            RouterNameExtractor.from_file(path)
+            if os.path.exists(path)
+            else RouterNameExtractor({})
+        )
+    return _extractor
@@ -0,0 +1,130 @@
+"""
+Per-session index of the latest messages, maintained as events are appended.
+
+The guardrail callbacks need "the last user message" and "the last agent
+response". Walking session.events in reverse on every invocation costs more
+as the session grows; SessionIndexPlugin instead updates a small index for
+every new user message and runner event, so lookups are constant-time
+regardless of history size.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events.event import Event
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.sessions.session import Session
+from google.genai import types
+
+MAX_INDEXED_SESSIONS = 10_000
+
+
+@dataclass
+class SessionEventIndex:
+    """Latest messages and tool results of one session."""
+
+    last_user_message: str = ""
+    last_agent_message: str = ""
+    last_agent_author: Optional[str] = None
+    last_tool_results: Dict[str, Any] = field(default_factory=dict)
+    event_count: int = 0
+
+    def record_user_message(self, content: Optional[types.Content]) -> None:
+        text = _first_text(content)
+        if text:
+            self.last_user_message = text
+        self.event_count += 1
+
+    def record_event(self, event: Event) -> None:
+        """Update the index with one appended event."""
+        if event.partial:
+            return
+        self.event_count += 1
+        if not event.content:
+            return
+        if event.author == "user" or event.content.role == "user":
+            text = _first_text(event.content)
+            if text:
+                self.last_user_message = text
+        else:
+            text = _first_text(event.content)
+            if text:
+                self.last_agent_message = text
+                self.last_agent_author = event.author
+        for part in event.content.parts or []:
+            if part.function_response and part.function_response.name:
+                self.last_tool_results[part.function_response.name] = (
+                    part.function_response.response
+                )
+
+
+def _first_text(content: Optional[types.Content]) -> str:
+    if not content or not content.parts:
+        return ""
+    for part in content.parts:
+        if part.text:
+            return part.text
+    return ""
+
+
+_indexes: "OrderedDict[str, SessionEventIndex]" = OrderedDict()
+
+
+def _index_for(session_id: str) -> Optional[SessionEventIndex]:
+    index = _indexes.get(session_id)
+    if index is not None:
+        _indexes.move_to_end(session_id)
+    return index
+
+
+def _store(session_id: str, index: SessionEventIndex) -> None:
+    _indexes[session_id] = index
+    _indexes.move_to_end(session_id)
+    while len(_indexes) > MAX_INDEXED_SESSIONS:
+        _indexes.popitem(last=False)
+
+
+def get_session_index(session: Session) -> SessionEventIndex:
+    """
+    Return the index for a session.
+    A session that was never indexed (e.g. loaded after a restart) is
+    indexed once from its existing events; afterwards the plugin keeps it current.
+    An index whose event count no longer matches the session (another worker
+    appended events, or the session was rewound) is rebuilt the same way.
+    """
+    index = _index_for(session.id)
+    if index is None or index.event_count != len(session.events):
+        index = SessionEventIndex()
+        for event in session.events:
+            index.record_event(event)
+        _store(session.id, index)
+    return index
+
+
+class SessionIndexPlugin(BasePlugin):
+    """Keeps SessionEventIndex current as the runner appends events."""
+
+    def __init__(self, name: str = "session_index"):
+        super().__init__(name=name)
+
+    async def on_user_message_callback(
+        self,
+        *,
+        invocation_context: InvocationContext,
+        user_message: types.Content,
+    ) -> Optional[types.Content]:
+        get_session_index(invocation_context.session).record_user_message(user_message)
+        return None
+
+    async def on_event_callback(
+        self, *, invocation_context: InvocationContext, event: Event
+    ) -> Optional[Event]:
+        index = _index_for(invocation_context.session.id)
+        if index is None:
+            # The runner appends before this callback, so seeding includes the event
+            get_session_index(invocation_context.session)
+        else:
+            index.record_event(event)
+        return None
@@ -10,8 +10,8 @@ from google.adk.models import Gemini
 from google.genai import types
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import LlmRequest, LlmResponse
-from typing import Optional
-import random
+from collections import OrderedDict
+from typing import List, Optional
 
 from dotenv import load_dotenv
 
@@ -21,6 +21,11 @@ import os
 import google.auth
 import logging
 from .app_utils.tools import read_router_config
+from .app_utils.guardrail_chain import GuardrailChain
+from .app_utils.secret_detector import (
+    StreamingSecretRedactor,
+    contains_plaintext_secret,
+)
 
 _, project_id = google.auth.default()
 os.environ["GOOGLE_CLOUD_PROJECT"] = project_id
@@ -35,31 +40,27 @@ logging.basicConfig(
 
 
 def is_there_password_in_user_request(message: str) -> bool:
-    """Checks if the user request contains a password in plaintext.
+    """Checks if the user request contains a secret in plaintext.
 
     Args:
-        message (str): The user request message to check for a password.
+        message (str): The user request message to check for a secret.
 
     Returns:
-        bool: True if the user request contains a password in plaintext, False otherwise.
+        bool: True if the user request contains a plaintext password, key or community, False otherwise.
     """
     # You can redirect this to any system. You can also use LLM calbacks to make a decision is something is sensitive.
-    if "password" in message.lower():
-        return True
-    return False
+    return contains_plaintext_secret(message)
 
 def is_there_password_in_user_response(message: str) -> bool:
-    """Checks if the user response contains a password in plaintext.
+    """Checks if the model response contains a secret in plaintext.
 
     Args:
-        message (str): The user response message to check for a password.
+        message (str): The model response message to check for a secret.
 
     Returns:
-        bool: True if the user response contains a password in plaintext, False otherwise.
+        bool: True if the response contains a plaintext password, key or community, False otherwise.
     """
-    if "PassWord" in message:
-        return True
-    return False
+    return contains_plaintext_secret(message)
 
 def check_sensitive_content_model_request(callback_context: CallbackContext,
                                           llm_request: LlmRequest) -> Optional[types.Content]:
@@ -97,39 +98,79 @@ def check_sensitive_content_model_request(callback_context: CallbackContext,
         state["password_found_in_request"] = False
         return None
 
+# Streaming redactors for in-progress responses, keyed by invocation id. They are
+# dropped on the final response and when the agent run ends; invocations that
+# end in an error or are cancelled skip both, so the oldest are evicted past
+# MAX_STREAMING_INVOCATIONS.
+MAX_STREAMING_INVOCATIONS = 1_000
+_stream_redactors: "OrderedDict[str, StreamingSecretRedactor]" = OrderedDict()
+
+
+def _stream_redactor(invocation_id: str) -> StreamingSecretRedactor:
+    redactor = _stream_redactors.get(invocation_id)
+    if redactor is None:
+        redactor = _stream_redactors[invocation_id] = StreamingSecretRedactor()
+        while len(_stream_redactors) > MAX_STREAMING_INVOCATIONS:
+            _stream_redactors.popitem(last=False)
+    return redactor
+
+
+def discard_stream_redactor(callback_context: CallbackContext) -> Optional[types.Content]:
+    """After-agent callback: drops the invocation's streaming redactor, if any."""
+    _stream_redactors.pop(callback_context.invocation_id, None)
+    return None
+
+
+def _redact_text_parts(parts: List[types.Part], redactor: StreamingSecretRedactor,
+                       final: bool) -> None:
+    """Redacts the text parts in place, carrying secrets split across parts."""
+    text_parts = [part for part in parts if part.text]
+    for part in text_parts:
+        part.text = redactor.feed(part.text)
+    if final:
+        text_parts[-1].text += redactor.flush()
+
+
 def check_sensitive_content_model_response(callback_context: CallbackContext, 
-                                           llm_response: LlmResponse) -> Optional[types.Content]:
-    """This function will check if the user response contains a password in plaintext.
-    If it does, it will return a response to skip the model call.
+                                           llm_response: LlmResponse) -> Optional[LlmResponse]:
+    """This function will redact secrets from the model response.
+    Streamed (partial) chunks are redacted incrementally, carrying state across chunk
+    boundaries. When the final response holds a plaintext secret, it is returned
+    redacted together with a policy violation notice. Only the text of the parts is
+    changed, so usage metadata and the other response fields are kept.
     """
     state = callback_context.state
-  
-    # Extract text from the response
-    response_text = ""
-    for part in llm_response.content.parts:
-        if hasattr(part, "text") and part.text:
-            response_text += part.text
-    
-    if is_there_password_in_user_response(response_text):
-        # Return a response to skip the model call
-        state["password_found_in_response"] = True
-        
-        return LlmResponse(
-            content=types.Content(
-                role="model",
-                parts=[
-                    types.Part(
-                        text="""This config violates the AshTech Policies.
-                        Please ensure you set encryption on the password.
-                        """
-                    )
-                ],
-            )
-        )
-    else:
-         # Return None to use the original response
-        state["password_found_in_response"] = True
+    if not llm_response.content or not llm_response.content.parts:
         return None
+    parts = llm_response.content.parts
+    if not any(part.text for part in parts):
+        return None
+
+    if llm_response.partial:
+        _redact_text_parts(parts, _stream_redactor(callback_context.invocation_id), final=False)
+        return llm_response
+
+    # Final (complete) response: redact all of its text again from the start
+    _stream_redactors.pop(callback_context.invocation_id, None)
+    original = [part.text for part in parts]
+    redactor = StreamingSecretRedactor()
+    _redact_text_parts(parts, redactor, final=True)
+    kinds = redactor.findings
+    state["password_found_in_response"] = redactor.found_plaintext_secret
+    if not kinds:
+        # Return None to use the original response
+        for part, text in zip(parts, original):
+            part.text = text
+        return None
+
+    state["secret_kinds_in_response"] = sorted(kinds)
+    if state["password_found_in_response"]:
+        first_text = next(part for part in parts if part.text is not None)
+        first_text.text = (
+            "This config violates the AshTech Policies. "
+            "Please ensure you set encryption on the password.\n\n" + first_text.text
+        )
+    return llm_response
 
 
 root_agent = Agent(
@@ -140,8 +181,9 @@ root_agent = Agent(
     ),
     instruction="You are a helpful Network AI assistant designed to provide accurate and useful router configurations.",
     tools=[read_router_config],
-    before_model_callback=check_sensitive_content_model_request,
-    after_model_callback=check_sensitive_content_model_response,
+    before_model_callback=GuardrailChain("before_model", [check_sensitive_content_model_request]),
+    after_model_callback=GuardrailChain("after_model", [check_sensitive_content_model_response]),
+    after_agent_callback=GuardrailChain("after_agent", [discard_stream_redactor]),
 )
 
 app = App(root_agent=root_agent, name="before_after_model_callback")
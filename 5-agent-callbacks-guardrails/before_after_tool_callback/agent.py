@@ -12,7 +12,6 @@ from google.adk.agents.callback_context import CallbackContext
 from google.adk.tools import ToolContext
 from typing import Optional, Dict, Any
 from google.adk.tools.base_tool import BaseTool
-import copy
 
 from dotenv import load_dotenv
 
@@ -22,6 +21,9 @@ import os
 import google.auth
 import logging
 from .app_utils.tools import read_router_config
+from .app_utils.guardrail_chain import GuardrailChain
+from .app_utils.tool_result import mask_tool_result, unwrap_tool_result
+from .app_utils.access_policy import get_policy_store
 
 _, project_id = google.auth.default()
 os.environ["GOOGLE_CLOUD_PROJECT"] = project_id
@@ -33,6 +35,7 @@ logging.basicConfig(
     level=logging.DEBUG,
     format='%(asctime)s - %(levelname)s - %(name)s - %(message)s'
 )
+logger = logging.getLogger(__name__)
 
 
 
@@ -42,21 +45,19 @@ def before_tool_callback_blocked_router_access(tool: BaseTool,
                          tool_context: ToolContext
     ) -> Optional[Dict]:
     """This function will check if the tool is being called and if it should be blocked.
-    When a specific router is being called(r1-gov51), we will block the call and return a message to the user.
+    The decision comes from the access policy file (access_policy.json), e.g. routers in
+    the gov cloud (r1-gov*) are blocked and a message is returned to the user.
     """
     tool_name = tool.name
-    print(f"[Callback] Before tool call for '{tool_name}'")
-    print(f"[Callback] Original args: {args}")   
-    # Skip the call completely for restricted countries
-    if (
-        tool_name == "read_router_config"
-        and args.get("router_name", "").lower() == "r1-gov51"
-    ):
-        print("[Callback] Blocking restricted router")
-        return {"result": "Access to this router has been restricted. as it is in gov cloud"}
-    
-    
-    print("[Callback] Proceeding with normal tool call")
+    logger.debug("[Callback] Before tool call for '%s' with args %s", tool_name, args)
+
+    # Groups come from the policy file's "groups" map for the authenticated user,
+    # never from session state, which the client can set.
+    decision = get_policy_store().decide(tool_name, args, user_id=tool_context.user_id)
+    if not decision.allowed:
+        logger.info("[Callback] Blocked '%s' by policy rule '%s'", tool_name, decision.rule_id)
+        return {"result": decision.message}
+
     return None
 
 # --- Define After Tool Callback ---
@@ -65,47 +66,23 @@ def after_tool_callback_content_security_validation(tool: BaseTool,
                         tool_context: ToolContext, 
                         tool_response: Dict) -> Optional[Dict]:
     """
-    Simple callback that validates Content Security Validation
+    Simple callback that validates Content Security Validation.
+    The tool's structured result is used as-is (no re-parsing) and secrets are
+    masked in one compiled pass over each string field.
     """
     tool_name = tool.name
-    print(f"[Callback] After tool call for '{tool_name}'")
-    print(f"[Callback] Args used: {args}")
-    print(f"[Callback] Original response: {tool_response}")
-
-    import ast
-    # Handle both cases: when result is a dict or when it's a string representation
-    original_result = tool_response.get("result", tool_response)
-    
-    # If it's a string, try to parse it as a literal
-    if isinstance(original_result, str):
-        try:
-            original_result = ast.literal_eval(original_result)
-        except (ValueError, SyntaxError):
-            # If parsing fails, use the original response as-is
-            original_result = tool_response
-    
-    # Ensure original_result is a dict
-    if not isinstance(original_result, dict):
-        print(f"[Callback] Warning: result is not a dict, using tool_response directly")
-        original_result = tool_response
-    
-    print(f"[Callback] Extracted result: '{original_result}'")
-
-    # Mask PassWord in the response
-    if tool_name == "read_router_config" and isinstance(original_result, dict):
-        modified = False
-        
-        # Replace PassWord in config field
-        if "config" in original_result and "PassWord" in original_result.get('config', ''):
-            original_result['config'] = original_result['config'].replace("PassWord", "******")
-            modified = True
-        
-        if modified:
-            print(f"[Callback] Modified response: {original_result}")
-            return original_result
-        
-    print("[Callback] No modifications needed, returning original response")
-    return None
+    logger.debug("[Callback] After tool call for '%s' with args %s", tool_name, args)
+
+    if tool_name != "read_router_config":
+        return None
+
+    masked_result = mask_tool_result(unwrap_tool_result(tool_response))
+    if masked_result is None:
+        logger.debug("[Callback] No modifications needed, returning original response")
+        return None
+
+    logger.debug("[Callback] Masked secrets in '%s' response", tool_name)
+    return masked_result
 
 root_agent = Agent(
     name="root_agent",
@@ -115,8 +92,8 @@ root_agent = Agent(
     ),
     instruction="You are a helpful Network AI assistant designed to provide accurate and useful router configurations.",
     tools=[read_router_config],
-    before_tool_callback=before_tool_callback_blocked_router_access,
-    after_tool_callback=after_tool_callback_content_security_validation,
+    before_tool_callback=GuardrailChain("before_tool", [before_tool_callback_blocked_router_access]),
+    after_tool_callback=GuardrailChain("after_tool", [after_tool_callback_content_security_validation]),
 )
 
 app = App(root_agent=root_agent, name="before_after_tool_callback")
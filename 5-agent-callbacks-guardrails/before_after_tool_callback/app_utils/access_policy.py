@@ -0,0 +1,325 @@
+"""
+Declarative, hot-reloadable access policy for the before-tool callback.
+
+Rules live in a JSON policy file and are evaluated like a router ACL: the
+first rule (in file order) that matches the tool call decides, otherwise the
+default effect applies. A rule can constrain the tool, the router, other
+argument values and the caller's user groups. Group membership is looked up
+from the policy's "groups" map by the caller's user id:
+
+    {
+      "default": "allow",
+      "groups": {"gov-cleared": ["alice"]},
+      "rules": [
+        {"id": "gov-cleared", "effect": "allow", "tool": "read_router_config",
+         "router": "r1-gov*", "groups": ["gov-cleared"]},
+        {"id": "gov-cloud", "effect": "deny", "router": "r1-gov*",
+         "message": "Access to this router has been restricted. as it is in gov cloud"}
+      ]
+    }
+
+Router patterns are exact names ("r1-gov51"), prefixes ("r1-gov*"), globs
+("r?-gov*") or regexes ("re:^r\\d+-gov\\d+$"). Rules are compiled per tool into
+hash tables (exact names), a prefix trie and an ordered regex list, so a
+decision only looks at rules that can match the router instead of scanning
+every rule.
+
+PolicyStore watches the file and swaps in a newly compiled policy when it
+changes. Requests keep using the previous policy until the new one is ready,
+and a file that fails to compile is logged and ignored. Until a policy has
+loaded (the file is missing or broken at startup), every call is denied.
+"""
+
+import fnmatch
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import (
+    Any, Dict, FrozenSet, Iterable, List, Optional, Pattern, Sequence, Set, Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+ALLOW = "allow"
+DENY = "deny"
+ROUTER_ARG = "router_name"
+ANY = "*"
+
+DEFAULT_POLICY_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "access_policy.json",
+)
+DEFAULT_DENY_MESSAGE = "Access to this router has been restricted by policy."
+
+
+@dataclass(frozen=True)
+class PolicyDecision:
+    effect: str
+    rule_id: Optional[str] = None
+    message: Optional[str] = None
+
+    @property
+    def allowed(self) -> bool:
+        return self.effect == ALLOW
+
+
+@dataclass
+class PolicyRule:
+    """One rule from the policy file. `index` is its position (lower wins)."""
+
+    index: int
+    id: str
+    effect: str
+    tool: str = ANY
+    router: str = ANY
+    args: Dict[str, str] = field(default_factory=dict)
+    groups: FrozenSet = frozenset()
+    message: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, index: int, raw: Dict[str, Any]) -> "PolicyRule":
+        effect = raw.get("effect", DENY)
+        if effect not in (ALLOW, DENY):
+            raise ValueError(f"rule {index}: effect must be 'allow' or 'deny', got {effect!r}")
+        return cls(
+            index=index,
+            id=str(raw.get("id", index)),
+            effect=effect,
+            tool=raw.get("tool", ANY),
+            router=str(raw.get("router", ANY)).lower(),
+            args={k: str(v) for k, v in raw.get("args", {}).items()},
+            groups=frozenset(raw.get("groups", ())),
+            message=raw.get("message"),
+        )
+
+    def matches_rest(self, args: Dict[str, Any], groups: Set[str]) -> bool:
+        """Constraints other than tool and router (already matched by the index)."""
+        if self.groups and not (self.groups & groups):
+            return False
+        for name, value in self.args.items():
+            if str(args.get(name)) != value:
+                return False
+        return True
+
+    def decision(self) -> PolicyDecision:
+        message = self.message
+        if message is None and self.effect == DENY:
+            message = DEFAULT_DENY_MESSAGE
+        return PolicyDecision(self.effect, self.id, message)
+
+
+class _RouterIndex:
+    """Rules of one tool, indexed by router pattern."""
+
+    def __init__(self) -> None:
+        self.exact: Dict[str, List[PolicyRule]] = {}
+        self.trie: Dict[str, Any] = {}  # char -> subtree; "" -> rules ending here
+        self.regexes: List[Tuple[PolicyRule, Pattern[str]]] = []
+        self.any: List[PolicyRule] = []
+
+    def add(self, rule: PolicyRule) -> None:
+        pattern = rule.router
+        if pattern == ANY:
+            self.any.append(rule)
+        elif pattern.startswith("re:"):
+            self.regexes.append((rule, re.compile(pattern[3:], re.IGNORECASE)))
+        elif pattern.endswith("*") and not any(c in pattern[:-1] for c in "*?["):
+            node = self.trie
+            for ch in pattern[:-1]:
+                node = node.setdefault(ch, {})
+            node.setdefault("", []).append(rule)
+        elif any(c in pattern for c in "*?["):
+            self.regexes.append((rule, re.compile(fnmatch.translate(pattern), re.IGNORECASE)))
+        else:
+            self.exact.setdefault(pattern, []).append(rule)
+
+    def candidates(self, router: str) -> Iterable[PolicyRule]:
+        """Rules whose router pattern matches, in rule order (hash + trie + any)."""
+        lists = [self.any]
+        exact = self.exact.get(router)
+        if exact:
+            lists.append(exact)
+        node = self.trie
+        if "" in node:
+            lists.append(node[""])
+        for ch in router:
+            node = node.get(ch)
+            if node is None:
+                break
+            if "" in node:
+                lists.append(node[""])
+        if len(lists) == 1:
+            return lists[0]
+        return heapq.merge(*lists, key=lambda rule: rule.index)
+
+    def first_match(
+        self, router: str, args: Dict[str, Any], groups: Set[str]
+    ) -> Optional[PolicyRule]:
+        best: Optional[PolicyRule] = None
+        for rule in self.candidates(router):
+            if rule.matches_rest(args, groups):
+                best = rule
+                break
+        # Regex fallbacks are ordered too: only rules before the current best can win
+        for rule, pattern in self.regexes:
+            if best is not None and rule.index >= best.index:
+                break
+            if pattern.match(router) and rule.matches_rest(args, groups):
+                return rule
+        return best
+
+
+class AccessPolicy:
+    """A compiled policy. Immutable once built, so it can be swapped atomically."""
+
+    def __init__(
+        self,
+        rules: Sequence[Dict[str, Any]],
+        default: str = ALLOW,
+        groups: Optional[Dict[str, Sequence[str]]] = None,
+    ):
+        if default not in (ALLOW, DENY):
+            raise ValueError(f"default must be 'allow' or 'deny', got {default!r}")
+        self.default = PolicyDecision(
+            default, None, DEFAULT_DENY_MESSAGE if default == DENY else None
+        )
+        self.rules = [PolicyRule.from_dict(i, raw) for i, raw in enumerate(rules)]
+        # user id -> groups
+        self._user_groups: Dict[str, Set[str]] = {}
+        for group, members in (groups or {}).items():
+            for user in members:
+                self._user_groups.setdefault(user, set()).add(group)
+
+        # Rules for a named tool also include the tool wildcard rules, so a
+        # lookup only consults one index.
+        tool_names = {rule.tool for rule in self.rules} - {ANY}
+        self._by_tool: Dict[str, _RouterIndex] = {name: _RouterIndex() for name in tool_names}
+        self._any_tool = _RouterIndex()
+        for rule in self.rules:
+            if rule.tool == ANY:
+                self._any_tool.add(rule)
+                for index in self._by_tool.values():
+                    index.add(rule)
+            else:
+                self._by_tool[rule.tool].add(rule)
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "AccessPolicy":
+        return cls(raw.get("rules", []), raw.get("default", ALLOW), raw.get("groups"))
+
+    @classmethod
+    def from_file(cls, path: str) -> "AccessPolicy":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def groups_for(self, user_id: Optional[str]) -> Set[str]:
+        return self._user_groups.get(user_id, set()) if user_id else set()
+
+    def decide(
+        self,
+        tool_name: str,
+        args: Dict[str, Any],
+        groups: Iterable[str] = (),
+        user_id: Optional[str] = None,
+    ) -> PolicyDecision:
+        """
+        Decision for one tool call: the first matching rule, else the default.
+
+        The caller's groups are the policy's "groups" entries for user_id, plus
+        `groups`, which must be resolved server-side (never taken from
+        client-settable data such as session state).
+        """
+        index = self._by_tool.get(tool_name, self._any_tool)
+        router = str(args.get(ROUTER_ARG, "")).lower()
+        caller_groups = self.groups_for(user_id) | set(groups)
+        rule = index.first_match(router, args, caller_groups)
+        return rule.decision() if rule else self.default
+
+
+class PolicyStore:
+    """Serves the current AccessPolicy and reloads it when the file changes."""
+
+    def __init__(self, path: str, poll_interval_seconds: float = 1.0):
+        self.path = path
+        self.poll_interval_seconds = poll_interval_seconds
+        self._version: Optional[Tuple[int, int]] = None
+        # Fail closed until the policy file has loaded
+        self._policy = AccessPolicy([], DENY)
+        self._missing = False
+        self._loaded = False
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.reload()
+
+    @property
+    def policy(self) -> AccessPolicy:
+        return self._policy
+
+    def decide(self, tool_name: str, args: Dict[str, Any], **kwargs: Any) -> PolicyDecision:
+        self.start()
+        return self._policy.decide(tool_name, args, **kwargs)
+
+    def reload(self) -> bool:
+        """Compile the file if it changed since the last load. Returns True if swapped."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if not self._missing:
+                logger.error(
+                    "Access policy %s not found, %s", self.path,
+                    "keeping previous" if self._loaded else "denying all tool calls",
+                )
+                self._missing = True
+            return False
+        self._missing = False
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._version:
+            return False
+        try:
+            policy = AccessPolicy.from_file(self.path)
+        except (OSError, ValueError, KeyError, TypeError, re.error) as e:
+            logger.error(
+                "Access policy %s not loaded, %s: %s", self.path,
+                "keeping previous" if self._loaded else "denying all tool calls", e,
+            )
+            self._version = version
+            return False
+        # Single reference assignment: in-flight decisions finish on the old policy
+        self._policy = policy
+        self._version = version
+        self._loaded = True
+        logger.info("Loaded access policy %s (%d rules)", self.path, len(policy.rules))
+        return True
+
+    def start(self) -> None:
+        """Start the file watcher thread, once."""
+        if self._watcher is None:
+            self._watcher = threading.Thread(
+                target=self._watch, name="access-policy-watcher", daemon=True
+            )
+            self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval_seconds):
+            self.reload()
+
+
+_store: Optional[PolicyStore] = None
+
+
+def get_policy_store() -> PolicyStore:
+    """Return the process-wide policy store, reading ACCESS_POLICY_FILE if set."""
+    global _store
+    if _store is None:
+        _store = PolicyStore(
+            os.environ.get("ACCESS_POLICY_FILE", DEFAULT_POLICY_FILE),
+            float(os.environ.get("ACCESS_POLICY_POLL_SECONDS", "1")),
+        )
+    return _store
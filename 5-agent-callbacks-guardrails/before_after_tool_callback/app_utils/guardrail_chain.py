@@ -0,0 +1,241 @@
+"""
+Composable guardrail chains for agent, model and tool callbacks.
+
+A GuardrailChain is itself an ADK callback: it takes the same arguments as the
+callback slot it is plugged into and passes them to every stage. Stages run in
+order and the chain stops at the first stage that returns a value (a block or
+a replacement response), exactly like a single callback returning non-None.
+Independent checks can be grouped with Parallel() so they run concurrently;
+when one of them blocks, the others are cancelled.
+
+Each stage's latency is recorded in a per-stage histogram, available from
+get_guardrail_metrics() (served at GET /guardrails/metrics) and exported as the
+OpenTelemetry histogram "guardrail.stage.duration" when OpenTelemetry is set up.
+The whole chain's latency is recorded under the reserved name TOTAL_STAGE,
+which no stage may use.
+Cancelled stages did not finish their check, so they are only counted as
+"cancelled" and their truncated durations are left out of the histogram.
+"""
+
+import asyncio
+import bisect
+import inspect
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    from opentelemetry import metrics as otel_metrics
+except ImportError:  # OpenTelemetry is optional for local runs
+    otel_metrics = None
+
+# Metrics name of the whole chain's latency; not a valid stage name
+TOTAL_STAGE = "(total)"
+
+# Histogram bucket upper bounds, in milliseconds
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500,
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.blocked = 0
+        self.errors = 0
+        self.cancelled = 0
+        self._lock = threading.Lock()
+
+    def observe(self, duration_ms: float, blocked: bool = False, error: bool = False) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, duration_ms)] += 1
+            self.count += 1
+            self.total_ms += duration_ms
+            self.max_ms = max(self.max_ms, duration_ms)
+            self.blocked += blocked
+            self.errors += error
+
+    def observe_cancelled(self) -> None:
+        with self._lock:
+            self.cancelled += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (max for the +Inf bucket)."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = q * self.count
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank and bucket_count:
+                    return self.buckets[index] if index < len(self.buckets) else self.max_ms
+            return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p99 = self.quantile(0.5), self.quantile(0.99)
+        with self._lock:
+            return {
+                "count": self.count,
+                "blocked": self.blocked,
+                "errors": self.errors,
+                "cancelled": self.cancelled,
+                "mean_ms": self.total_ms / self.count if self.count else 0.0,
+                "max_ms": self.max_ms,
+                "p50_ms": p50,
+                "p99_ms": p99,
+                "buckets_ms": {
+                    **{str(b): c for b, c in zip(self.buckets, self.counts)},
+                    "+Inf": self.counts[-1],
+                },
+            }
+
+
+_histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+_otel_histogram = None
+
+
+def _histogram_for(chain: str, stage: str) -> LatencyHistogram:
+    key = (chain, stage)
+    histogram = _histograms.get(key)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(key, LatencyHistogram())
+    return histogram
+
+
+def _record(
+    chain: str, stage: str, duration_ms: float, blocked: bool, error: bool, cancelled: bool = False
+) -> None:
+    global _otel_histogram
+    if cancelled:
+        _histogram_for(chain, stage).observe_cancelled()
+        return
+    _histogram_for(chain, stage).observe(duration_ms, blocked, error)
+    if otel_metrics is not None:
+        if _otel_histogram is None:
+            _otel_histogram = otel_metrics.get_meter(__name__).create_histogram(
+                "guardrail.stage.duration",
+                unit="ms",
+                description="Latency of one guardrail stage",
+            )
+        _otel_histogram.record(
+            duration_ms,
+            {"guardrail.chain": chain, "guardrail.stage": stage, "guardrail.blocked": blocked},
+        )
+
+
+def get_guardrail_metrics() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Per-stage latency histograms, as {chain: {stage: snapshot}}."""
+    metrics: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for (chain, stage), histogram in list(_histograms.items()):
+        metrics.setdefault(chain, {})[stage] = histogram.snapshot()
+    return metrics
+
+
+def reset_guardrail_metrics() -> None:
+    with _histograms_lock:
+        _histograms.clear()
+
+
+@dataclass
+class Stage:
+    """One guardrail check. `check` may be sync or async."""
+
+    name: str
+    check: Callable[..., Any]
+
+
+class Parallel:
+    """Independent stages run concurrently; the first one to block wins."""
+
+    def __init__(self, *stages: Union[Stage, Callable[..., Any]]):
+        self.stages = [_as_stage(s) for s in stages]
+        self.name = "parallel(" + ",".join(s.name for s in self.stages) + ")"
+
+
+def _as_stage(item: Union[Stage, Callable[..., Any]]) -> Stage:
+    return item if isinstance(item, Stage) else Stage(item.__name__, item)
+
+
+class GuardrailChain:
+    """An ordered, short-circuiting list of guardrail stages used as one callback."""
+
+    def __init__(self, name: str, stages: Sequence[Union[Stage, Parallel, Callable[..., Any]]]):
+        """
+        Args:
+            name: Chain name used in metrics, e.g. "before_tool".
+            stages: Stages in order. Plain callables become stages named after
+                the function; Parallel groups run their stages concurrently.
+        """
+        self.name = name
+        self.stages: List[Union[Stage, Parallel]] = [
+            s if isinstance(s, Parallel) else _as_stage(s) for s in stages
+        ]
+        for stage in self.stages:
+            for s in stage.stages if isinstance(stage, Parallel) else [stage]:
+                if s.name == TOTAL_STAGE:
+                    raise ValueError(f"{TOTAL_STAGE!r} is reserved for the chain total")
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Optional[Any]:
+        start = time.perf_counter()
+        result = None
+        try:
+            for stage in self.stages:
+                if isinstance(stage, Parallel):
+                    result = await self._run_parallel(stage, args, kwargs)
+                else:
+                    result = await self._run_stage(stage, args, kwargs)
+                if result is not None:
+                    return result
+            return None
+        finally:
+            _record(self.name, TOTAL_STAGE, (time.perf_counter() - start) * 1000, result is not None, False)
+
+    async def _run_stage(self, stage: Stage, args: tuple, kwargs: dict) -> Optional[Any]:
+        start = time.perf_counter()
+        result = None
+        error = False
+        cancelled = False
+        try:
+            result = stage.check(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        except asyncio.CancelledError:
+            # Another stage of a Parallel group blocked first: this one never decided
+            cancelled = True
+            raise
+        except Exception:
+            error = True
+            raise
+        finally:
+            _record(
+                self.name, stage.name, (time.perf_counter() - start) * 1000,
+                result is not None, error, cancelled,
+            )
+
+    async def _run_parallel(self, group: Parallel, args: tuple, kwargs: dict) -> Optional[Any]:
+        tasks = [
+            asyncio.ensure_future(self._run_stage(stage, args, kwargs))
+            for stage in group.stages
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result is not None:
+                    return result
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Let the cancelled stages record themselves before the chain returns
+            await asyncio.gather(*tasks, return_exceptions=True)
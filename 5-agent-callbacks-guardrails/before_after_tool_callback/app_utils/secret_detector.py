@@ -0,0 +1,234 @@
+"""
+Compiled secret detection and redaction for model requests and responses.
+
+All secret patterns (plaintext passwords, Cisco type 5/7/8/9 secrets, SNMP
+communities, TACACS+/RADIUS keys and IKE pre-shared keys) are combined into a
+single compiled regex, so detection and redaction are one pass over the text.
+Plaintext passwords are recognised in config syntax only. On an IOS
+"password|secret [0] x" line, a "password: x" key line or after "password=", any
+value is a secret, provided it ends the line (where a line ends matters, so
+"Password: see the runbook" is prose). A "password: x" in running text is only
+taken for a secret when x looks like a credential (a digit, a symbol or mixed
+case), so prose about passwords is left alone.
+
+StreamingSecretRedactor applies the same pass to streamed model chunks. It
+carries the unfinished tail of the stream across chunk boundaries, so a secret
+split over two chunks is still redacted before any of it is emitted.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Match, Tuple
+
+REDACTED = "******"
+
+# (kind, prefix regex, secret value regex). Order matters: at a given position the
+# first alternative wins, so the typed Cisco forms come before the plaintext form.
+_SECRET_RULES: List[Tuple[str, str, str]] = [
+    ("cisco_type5", r"\bsecret[ \t]+5[ \t]+", r"\$1\$\S+"),
+    ("cisco_type8", r"\bsecret[ \t]+8[ \t]+", r"\$8\$\S+"),
+    ("cisco_type9", r"\bsecret[ \t]+9[ \t]+", r"\$9\$\S+"),
+    ("cisco_type7", r"\b(?:password|key)[ \t]+7[ \t]+", r"[0-9A-Fa-f]{4,}\b"),
+    ("snmp_community", r"\bsnmp-server[ \t]+community[ \t]+", r"\S+"),
+    (
+        "tacacs_key",
+        r"\btacacs-server[ \t]+(?:host[ \t]+\S+[ \t]+)?key[ \t]+(?:0[ \t]+)?",
+        r"\S+",
+    ),
+    (
+        "radius_key",
+        r"\bradius-server[ \t]+(?:host[ \t]+\S+[ \t]+(?:auth-port[ \t]+\d+[ \t]+)?(?:acct-port[ \t]+\d+[ \t]+)?)?key[ \t]+(?:0[ \t]+)?",
+        r"\S+",
+    ),
+    (
+        "pre_shared_key",
+        r"\b(?:crypto[ \t]+isakmp[ \t]+key[ \t]+(?:[06][ \t]+)?|pre-shared-key[ \t]+(?:(?:local|remote)[ \t]+)?(?:[06][ \t]+)?)",
+        r"\S+",
+    ),
+    (
+        # An IOS "[enable|username u [privilege n]] password|secret [0] x" line
+        # or a "password: x" key line: any value that ends the line.
+        "plaintext_password",
+        r"^[ \t]*(?:(?:enable[ \t]+|username[ \t]+\S+[ \t]+(?:privilege[ \t]+\d+[ \t]+)?)?"
+        r"(?:password|secret)[ \t]+(?:0[ \t]+)?"
+        r"|[\"']?(?:password|passwd|secret)[\"']?[ \t]*:[ \t]*[\"']?)",
+        r"(?!\d\s)[^\s\"',;]+(?=[\"']?[,;]?[ \t]*$)",
+    ),
+    ("plaintext_password", r"\b(?:password|passwd|secret)=", r"[^\s\"',;&]+"),
+    (
+        # "password: x" / "secret = x" in running text: only a credential-like
+        # token (a digit, a symbol or mixed case), so an ordinary word after
+        # "password" is not taken for a secret.
+        "plaintext_password",
+        r"\b(?:password|passwd|secret)[ \t]*[:=][ \t]*",
+        r"(?=[^\s\"',;]*(?:\d|[!@#$%^&*_+=~|<>\\/-]|(?-i:[a-z][A-Z])))[^\s\"',;]+",
+    ),
+]
+
+# Secrets stored as one-way hashes are sensitive but not a plaintext exposure.
+HASHED_KINDS = frozenset({"cisco_type5", "cisco_type8", "cisco_type9"})
+
+# Every rule starts with one of these letters or at the start of a line; the
+# leading lookahead lets the engine skip most positions without trying each
+# alternative.
+_FIRST_LETTERS = "cprstk"
+# Every rule needs one of these keywords, and no secret spans a line, so the
+# full pattern only runs on lines that hold one (found with str.find).
+_KEYWORDS = ("pass", "secret", "community", "key")
+
+SECRET_PATTERN = re.compile(
+    f"(?:(?=[{_FIRST_LETTERS}])|^)(?:"
+    + "|".join(
+        f"(?P<k{i}>{prefix}(?P<v{i}>{value}))"
+        for i, (_, prefix, value) in enumerate(_SECRET_RULES)
+    )
+    + ")",
+    re.IGNORECASE | re.MULTILINE,
+)
+_KIND_BY_GROUP: Dict[str, Tuple[str, str]] = {
+    f"k{i}": (kind, f"v{i}") for i, (kind, _, _) in enumerate(_SECRET_RULES)
+}
+
+# Longest span (prefix + value) a secret is expected to cover. The streaming
+# redactor never emits the last MAX_SECRET_SPAN characters of an unfinished line.
+MAX_SECRET_SPAN = 256
+
+
+@dataclass
+class SecretFinding:
+    kind: str
+    start: int
+    end: int
+
+
+def _finditer(text: str, pos: int = 0) -> Iterator[Match[str]]:
+    """SECRET_PATTERN matches in text[pos:], tried only on lines with a keyword."""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Lowercasing changed offsets (rare non-ASCII input); scan the whole text.
+        yield from SECRET_PATTERN.finditer(text, pos)
+        return
+    next_hit = {keyword: lowered.find(keyword, pos) for keyword in _KEYWORDS}
+    while True:
+        for keyword, hit in next_hit.items():
+            if -1 < hit < pos:
+                next_hit[keyword] = lowered.find(keyword, pos)
+        hits = [hit for hit in next_hit.values() if hit != -1]
+        if not hits:
+            return
+        hit = min(hits)
+        line_start = max(pos, lowered.rfind("\n", 0, hit) + 1)
+        line_end = lowered.find("\n", hit)
+        if line_end == -1:
+            line_end = len(text)
+        yield from SECRET_PATTERN.finditer(text, line_start, line_end)
+        pos = line_end
+
+
+def find_secrets(text: str) -> List[SecretFinding]:
+    """Every secret value in text, with its kind and position."""
+    findings = []
+    for match in _finditer(text):
+        kind, value_group = _KIND_BY_GROUP[match.lastgroup]
+        findings.append(SecretFinding(kind, match.start(value_group), match.end(value_group)))
+    return findings
+
+
+def contains_plaintext_secret(text: str) -> bool:
+    """True if text holds a secret that is not a one-way hash."""
+    return any(f.kind not in HASHED_KINDS for f in find_secrets(text))
+
+
+def redact_secrets(text: str) -> Tuple[str, Counter]:
+    """
+    Replace every secret value with REDACTED in a single pass.
+
+    Returns:
+        The redacted text and a Counter of the secret kinds found.
+    """
+    return _redact_until(text, len(text))
+
+
+def _redact_until(text: str, end: int) -> Tuple[str, Counter]:
+    """
+    Redact text[:end] and return it. text[end:] is only read, so that rules
+    which need the end of the line see where the line really ends.
+    """
+    kinds: Counter = Counter()
+    parts, pos = [], 0
+    for match in _finditer(text):
+        if match.start() >= end:
+            break
+        kind, value_group = _KIND_BY_GROUP[match.lastgroup]
+        kinds[kind] += 1
+        parts += [text[pos : match.start(value_group)], REDACTED]
+        pos = match.end(value_group)
+    parts.append(text[pos:end])
+    return "".join(parts), kinds
+
+
+class StreamingSecretRedactor:
+    """
+    Redacts secrets from a stream of text chunks.
+
+    feed() returns the text that is safe to emit now; the unfinished tail is
+    kept until the next chunk (or flush()) shows where it ends.
+    """
+
+    def __init__(self, max_secret_span: int = MAX_SECRET_SPAN):
+        self.max_secret_span = max_secret_span
+        self.findings: Counter = Counter()
+        self._tail = ""
+        self._tail_at_line_start = True
+
+    @property
+    def found_secret(self) -> bool:
+        return bool(self.findings)
+
+    @property
+    def found_plaintext_secret(self) -> bool:
+        return any(kind not in HASHED_KINDS for kind in self.findings)
+
+    def feed(self, chunk: str) -> str:
+        text = self._tail + chunk
+        # Complete lines can always be redacted and released.
+        cut = text.rfind("\n") + 1
+        # A very long unfinished line is released up to a safe point, keeping
+        # enough back that a secret starting there is never split.
+        if len(text) - cut > 2 * self.max_secret_span:
+            cut = self._safe_cut(text, cut, len(text) - self.max_secret_span)
+        at_line_start = self._tail_at_line_start
+        self._tail = text[cut:]
+        self._tail_at_line_start = text[cut - 1] == "\n" if cut else at_line_start
+        return self._redact(text, cut, at_line_start)
+
+    def flush(self) -> str:
+        """Redact and return whatever is still held back."""
+        text, self._tail = self._tail, ""
+        at_line_start, self._tail_at_line_start = self._tail_at_line_start, True
+        return self._redact(text, len(text), at_line_start)
+
+    def _safe_cut(self, text: str, line_start: int, limit: int) -> int:
+        cut = max(text.rfind(" ", line_start, limit), line_start)
+        # Never cut through a match (or a prefix that could still become one).
+        for match in _finditer(text, line_start):
+            if match.start() >= cut:
+                break
+            if match.end() >= cut:
+                return match.start()
+        return cut
+
+    def _redact(self, text: str, cut: int, at_line_start: bool) -> str:
+        """Redact and return text[:cut]; the held-back rest of the line is context."""
+        if not cut:
+            return ""
+        if at_line_start:
+            redacted, kinds = _redact_until(text, cut)
+        else:
+            # Text released from the middle of a line: a leading non-word
+            # character keeps "^" from matching at its start.
+            redacted, kinds = _redact_until("\0" + text, cut + 1)
+            redacted = redacted[1:]
+        self.findings.update(kinds)
+        return redacted
@@ -0,0 +1,65 @@
+"""
+Typed tool results and single-pass secret masking for the tool callbacks.
+
+Tools return a RouterConfigResult dict. ADK hands a dict result to the
+after-tool callback unchanged (only non-dict values are wrapped as
+{"result": value}), so the callback works on the original object and never
+serializes or re-parses it. Masking is one pass per string field with the
+secret rules of secret_detector, the same rules the model callbacks use to
+redact requests and responses, so a secret is masked in a tool result exactly
+when it would be redacted from a model response.
+"""
+
+from typing import Any, Dict, Optional, Tuple, TypedDict
+
+from .secret_detector import REDACTED, redact_secrets
+
+MASK = REDACTED
+
+
+class RouterConfigResult(TypedDict):
+    """Result returned by read_router_config and write_router_config."""
+
+    status: str
+    router_name: str
+    config: str
+    message: str
+
+
+def unwrap_tool_result(tool_response: Any) -> Dict[str, Any]:
+    """
+    The structured object a tool returned.
+    Dict results are returned as-is; ADK's {"result": value} wrapper is
+    removed when it holds a dict. Anything else stays wrapped.
+    """
+    if isinstance(tool_response, dict):
+        inner = tool_response.get("result")
+        if len(tool_response) == 1 and isinstance(inner, dict):
+            return inner
+        return tool_response
+    return {"result": tool_response}
+
+
+def mask_secrets(text: str) -> Tuple[str, int]:
+    """Mask every secret value in text. Returns the text and the number masked."""
+    masked, kinds = redact_secrets(text)
+    return masked, sum(kinds.values())
+
+
+def mask_tool_result(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Mask secrets in every string field of a tool result.
+
+    Returns:
+        A masked copy of the result, or None if nothing needed masking.
+    """
+    masked: Optional[Dict[str, Any]] = None
+    for key, value in result.items():
+        if not isinstance(value, str):
+            continue
+        new_value, count = mask_secrets(value)
+        if count:
+            if masked is None:
+                masked = dict(result)
+            masked[key] = new_value
+    return masked
@@ -1,11 +1,14 @@
-def read_router_config(router_name: str) -> str:
+from .tool_result import RouterConfigResult
+
+
+def read_router_config(router_name: str) -> dict:
     """Read the configuration of a router.
 
     Args:
         router_name: The name of the router to read the configuration for.
 
     Returns:
-        A string with the configuration of the router.
+        A RouterConfigResult dict with the configuration of the router.
     """
     router_config = f"""
                         !
@@ -49,14 +52,14 @@ def read_router_config(router_name: str) -> str:
                         end
 
                         """
-    return {
-        "status": "success",
-        "router_name": router_name,
-        "config": router_config,
-        "message": f"The configuration of the router {router_name} is: {router_config}"
-    }
+    return RouterConfigResult(
+        status="success",
+        router_name=router_name,
+        config=router_config,
+        message=f"The configuration of the router {router_name} is: {router_config}",
+    )
 
-def write_router_config(router_name: str) -> str:
+def write_router_config(router_name: str) -> dict:
     
     """
     Generate a small sample configuration that can be sent to a Cisco router.
@@ -66,7 +69,7 @@ def write_router_config(router_name: str) -> str:
         config: The simple configuration body as a single string or snippet.
 
     Returns:
-        Confirmation message with the configuration to be applied.
+        A RouterConfigResult dict with the configuration to be applied.
     """
     # This is a simple illustrative implementation and does not persist configs.
     # Make a small config script using the given values for a Cisco router.
@@ -74,9 +77,9 @@ def write_router_config(router_name: str) -> str:
                         hostname {router_name}
                         end
                         """
-    return {
-        "status": "success",
-        "router_name": router_name,
-        "config": router_config,
-        "message": f"Apply the following configuration to {router_name}."
-    }
\ No newline at end of file
+    return RouterConfigResult(
+        status="success",
+        router_name=router_name,
+        config=router_config,
+        message=f"Apply the following configuration to {router_name}.",
+    )
\ No newline at end of file
@@ -20,6 +20,7 @@ import google.auth
 from fastapi import FastAPI
 from google.adk.cli.fast_api import get_fast_api_app
 
+from before_after_tool_callback.app_utils.guardrail_chain import get_guardrail_metrics
 from before_after_tool_callback.app_utils.telemetry import setup_telemetry
 from before_after_tool_callback.app_utils.typing import Feedback
 
@@ -157,6 +158,12 @@ def collect_feedback(feedback: Feedback) -> dict[str, str]:
     return {"status": "success"}
 
 
+@app.get("/guardrails/metrics")
+def guardrail_metrics() -> dict:
+    """Per-stage guardrail latency histograms (count, blocked, p50/p99, buckets)."""
+    return get_guardrail_metrics()
+
+
 # Main execution
 if __name__ == "__main__":
     import uvicorn
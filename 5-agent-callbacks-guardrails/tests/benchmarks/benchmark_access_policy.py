@@ -0,0 +1,118 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Benchmark before-tool access-policy decisions with 10k rules.
+
+Compares the compiled policy (hash tables + prefix trie + ordered regex
+fallbacks) with a linear first-match scan over the same rules, and reports
+p50/p99 decision latency per tool call.
+
+Run with:
+    uv run python -m tests.benchmarks.benchmark_access_policy
+"""
+
+import fnmatch
+import random
+import re
+import statistics
+import time
+
+from before_after_tool_callback.app_utils.access_policy import AccessPolicy
+
+SITES = ["sea", "pdx", "sfo", "iad", "ord", "dfw", "lax", "jfk", "gov", "lab"]
+TOOLS = ["read_router_config", "write_router_config", "ping", "traceroute", "*"]
+
+
+def build_rules(count: int, rng: random.Random) -> list[dict]:
+    rules = []
+    for i in range(count):
+        router = f"r{rng.randint(1, 4)}-{rng.choice(SITES)}{rng.randint(0, 999)}"
+        kind = rng.random()
+        if kind < 0.80:
+            pattern = router
+        elif kind < 0.97:
+            pattern = router[: rng.randint(3, 7)] + "*"
+        else:
+            pattern = f"re:^r{rng.randint(1, 4)}-{rng.choice(SITES)}9\\d\\d$"
+        rule = {"id": f"rule-{i}", "effect": rng.choice(["allow", "deny"]),
+                "tool": rng.choice(TOOLS), "router": pattern}
+        if rng.random() < 0.1:
+            rule["groups"] = [rng.choice(["noc", "sec", "gov-cleared"])]
+        if rng.random() < 0.1:
+            rule["args"] = {"vrf": rng.choice(["mgmt", "cust"])}
+        rules.append(rule)
+    return rules
+
+
+def linear_decide(rules: list[dict], tool: str, args: dict, groups: set) -> str | None:
+    """First-match scan over every rule, as a baseline."""
+    router = args.get("router_name", "").lower()
+    for rule in rules:
+        if rule["tool"] not in ("*", tool):
+            continue
+        pattern = rule["router"]
+        if pattern.startswith("re:"):
+            if not re.match(pattern[3:], router):
+                continue
+        elif not fnmatch.fnmatchcase(router, pattern):
+            continue
+        if rule.get("groups") and not set(rule["groups"]) & groups:
+            continue
+        if any(str(args.get(k)) != v for k, v in rule.get("args", {}).items()):
+            continue
+        return rule["id"]
+    return None
+
+
+def latencies_us(decide, queries) -> list[float]:
+    samples = []
+    for tool, args, groups in queries:
+        start = time.perf_counter_ns()
+        decide(tool, args, groups)
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    return samples
+
+
+def report(name: str, samples: list[float]) -> None:
+    q = statistics.quantiles(samples, n=100)
+    print(f"{name:>10} | {q[49]:>8.1f} us | {q[98]:>8.1f} us | {max(samples):>9.1f} us")
+
+
+def main() -> None:
+    rng = random.Random(42)
+    rules = build_rules(10_000, rng)
+    start = time.perf_counter()
+    policy = AccessPolicy(rules)
+    print(f"Compile 10k rules: {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    queries = [
+        (
+            rng.choice(TOOLS[:-1]),
+            {"router_name": f"r{rng.randint(1, 4)}-{rng.choice(SITES)}{rng.randint(0, 999)}",
+             "vrf": rng.choice(["mgmt", "cust"])},
+            {rng.choice(["noc", "sec", "gov-cleared"])},
+        )
+        for _ in range(20_000)
+    ]
+    for tool, args, groups in queries[:500]:
+        assert policy.decide(tool, args, groups=groups).rule_id == linear_decide(rules, tool, args, groups)
+
+    print(f"{'engine':>10} | {'p50':>11} | {'p99':>11} | {'max':>12}")
+    print("-" * 54)
+    report("compiled", latencies_us(lambda t, a, g: policy.decide(t, a, groups=g), queries))
+    report("linear", latencies_us(lambda t, a, g: linear_decide(rules, t, a, g), queries[:300]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Benchmark router-name extraction on long pasted log messages.
+
+Compares the previous five-regex extractor (first loose match only) with the
+inventory-backed Aho-Corasick extractor (all devices, one pass).
+
+Run with:
+    uv run python -m tests.benchmarks.benchmark_router_extractor
+"""
+
+import random
+import re
+import time
+
+from before_after_agent_callback.app_utils.router_extractor import RouterNameExtractor
+
+LEGACY_PATTERNS = [
+    r"\b(r\d+-[a-zA-Z]+\d+)\b",
+    r"\b(router\d+)\b",
+    r"\b([a-zA-Z]+-router\d+)\b",
+    r"\b(R\d+)\b",
+    r"\b([a-zA-Z]{2,4}\d+)\b",
+]
+
+
+def legacy_extract_router_name(text: str) -> str | None:
+    """The original extract_router_name, kept here as the baseline."""
+    for pattern in LEGACY_PATTERNS:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            return match.group(1)
+    return None
+
+
+def legacy_extract_all(text: str) -> list[str]:
+    """Five full passes with the original patterns, for an all-matches comparison."""
+    found: list[str] = []
+    for pattern in LEGACY_PATTERNS:
+        found.extend(m.group(1) for m in re.finditer(pattern, text, re.IGNORECASE))
+    return found
+
+
+def build_inventory(size: int) -> list[dict]:
+    sites = ["sea", "pdx", "sfo", "iad", "ord", "dfw", "lax", "jfk"]
+    return [
+        {
+            "hostname": f"r{i % 4 + 1}-{sites[i % len(sites)]}{i}",
+            "aliases": [f"{sites[i % len(sites)]}{i}-core{i % 4 + 1}", f"10.{i // 250}.{i % 250}.1"],
+        }
+        for i in range(size)
+    ]
+
+
+def build_log(inventory: list[dict], size_bytes: int, rng: random.Random) -> str:
+    templates = [
+        "%LINEPROTO-5-UPDOWN: Line protocol on Interface Gi0/{port}, changed state to down on {dev}",
+        "%OSPF-5-ADJCHG: Process 1, Nbr {ip} on Gi0/{port} from FULL to DOWN",
+        "%SYS-5-CONFIG_I: Configured from console by admin on vty0 (10.1.1.{port})",
+        "%BGP-5-ADJCHANGE: neighbor {ip} Down BGP Notification sent, hold time expired",
+        "%SEC-6-IPACCESSLOGP: list 101 denied tcp 192.0.2.{port}(443) -> 198.51.100.7(22), 1 packet",
+    ]
+    lines = []
+    total = 0
+    while total < size_bytes:
+        device = rng.choice(inventory)
+        line = rng.choice(templates).format(
+            port=rng.randint(0, 48), dev=device["hostname"], ip=device["aliases"][1]
+        )
+        lines.append(f"Oct 19 12:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d} {line}")
+        total += len(lines[-1]) + 1
+    return "\n".join(lines)
+
+
+def timed(fn, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    rng = random.Random(42)
+    inventory = build_inventory(2000)
+
+    start = time.perf_counter()
+    extractor = RouterNameExtractor.from_inventory(inventory)
+    print(f"Automaton build (2000 devices, 6000 names): {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    print(
+        f"{'message':>10} | {'legacy first':>12} | {'legacy 5-pass all':>17} | "
+        f"{'inventory all':>13} | {'devices':>7} | {'MB/s':>6}"
+    )
+    print("-" * 84)
+    for size in (2_000, 50_000, 500_000, 2_000_000):
+        log = build_log(inventory, size, rng)
+        legacy = timed(legacy_extract_router_name, log)
+        legacy_all = timed(legacy_extract_all, log, repeat=3)
+        new = timed(extractor.extract_all, log, repeat=3)
+        devices = len(extractor.extract_all(log))
+        print(
+            f"{len(log) // 1000:>8}KB | {legacy * 1000:>9.2f} ms | {legacy_all * 1000:>14.2f} ms | "
+            f"{new * 1000:>10.2f} ms | "
+            f"{devices:>7} | {len(log) / new / 1e6:>6.1f}"
+        )
+
+    print(f"\nLegacy answer on a log: {legacy_extract_router_name(build_log(inventory, 2000, rng))!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Benchmark secret redaction on large router configurations.
+
+Compares one regex pass per secret kind with the combined compiled pattern,
+and measures streaming redaction of the same text in model-sized chunks.
+
+Run with:
+    uv run python -m tests.benchmarks.benchmark_secret_detector
+"""
+
+import random
+import re
+import time
+
+from before_after_model_callback.app_utils.secret_detector import (
+    REDACTED,
+    _SECRET_RULES,
+    StreamingSecretRedactor,
+    redact_secrets,
+)
+
+PER_RULE_PATTERNS = [
+    re.compile(f"({prefix})({value})", re.IGNORECASE | re.MULTILINE) for _, prefix, value in _SECRET_RULES
+]
+
+
+def per_rule_redact(text: str) -> str:
+    """One full pass per secret kind, as a baseline."""
+    for pattern in PER_RULE_PATTERNS:
+        text = pattern.sub(lambda m: m.group(1) + REDACTED, text)
+    return text
+
+
+def build_config(size_bytes: int, rng: random.Random) -> str:
+    templates = [
+        "interface GigabitEthernet0/{n}\n description uplink-{n}\n ip address 10.{n}.0.1 255.255.255.0",
+        "router ospf 1\n network 10.{n}.0.0 0.0.255.255 area 0",
+        "username op{n} privilege 15 password 7 0822455D0A{n:02X}",
+        "snmp-server community ro{n} RO",
+        "enable secret 9 $9$abc{n}$defghijklmnop",
+        "line vty 0 4\n password vty{n}pass\n transport input ssh",
+        "logging host 10.0.{n}.9",
+    ]
+    lines, total = [], 0
+    while total < size_bytes:
+        lines.append(rng.choice(templates).format(n=rng.randint(0, 250)))
+        total += len(lines[-1]) + 1
+    return "\n".join(lines)
+
+
+def stream_redact(text: str, chunk_size: int) -> str:
+    redactor = StreamingSecretRedactor()
+    out = [redactor.feed(text[i:i + chunk_size]) for i in range(0, len(text), chunk_size)]
+    out.append(redactor.flush())
+    return "".join(out)
+
+
+def timed(fn, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    rng = random.Random(42)
+    print(
+        f"{'config':>9} | {'per-rule':>10} | {'combined':>10} | {'stream 64B':>10} | "
+        f"{'combined MB/s':>13} | {'stream MB/s':>11}"
+    )
+    print("-" * 80)
+    for size in (10_000, 200_000, 2_000_000):
+        config = build_config(size, rng)
+        assert stream_redact(config, 64) == redact_secrets(config)[0]
+        baseline = timed(per_rule_redact, config)
+        combined = timed(redact_secrets, config)
+        streamed = timed(stream_redact, config, 64)
+        print(
+            f"{len(config) // 1000:>7}KB | {baseline * 1000:>7.2f} ms | {combined * 1000:>7.2f} ms | "
+            f"{streamed * 1000:>7.2f} ms | {len(config) / combined / 1e6:>13.1f} | "
+            f"{len(config) / streamed / 1e6:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Benchmark after-tool callback overhead per tool call.
+
+Compares the previous callback body (print the whole response, re-parse
+string results with ast.literal_eval, replace "PassWord") with the typed
+result path (use the returned dict as-is, one compiled masking pass per field).
+
+Run with:
+    uv run python -m tests.benchmarks.benchmark_tool_result
+"""
+
+import ast
+import contextlib
+import io
+import time
+
+from before_after_tool_callback.app_utils.tool_result import (
+    mask_tool_result,
+    unwrap_tool_result,
+)
+from before_after_tool_callback.app_utils.tools import read_router_config
+
+
+def legacy_callback(tool_response: dict) -> dict | None:
+    """The original callback body, kept here as the baseline."""
+    print(f"[Callback] Original response: {tool_response}")
+    original_result = tool_response.get("result", tool_response)
+    if isinstance(original_result, str):
+        try:
+            original_result = ast.literal_eval(original_result)
+        except (ValueError, SyntaxError):
+            original_result = tool_response
+    if not isinstance(original_result, dict):
+        original_result = tool_response
+    print(f"[Callback] Extracted result: '{original_result}'")
+    if "config" in original_result and "PassWord" in original_result.get("config", ""):
+        original_result["config"] = original_result["config"].replace("PassWord", "******")
+        print(f"[Callback] Modified response: {original_result}")
+        return original_result
+    return None
+
+
+def typed_callback(tool_response: dict) -> dict | None:
+    return mask_tool_result(unwrap_tool_result(tool_response))
+
+
+def build_result(interfaces: int) -> dict:
+    result = read_router_config("r1-core01")
+    extra = "".join(
+        f"interface GigabitEthernet0/{i}\n description uplink-{i}\n"
+        f" ip address 10.{i // 250}.{i % 250}.1 255.255.255.0\n no shutdown\n!\n"
+        for i in range(interfaces)
+    )
+    result["config"] += extra
+    result["message"] += extra
+    return result
+
+
+def per_call_us(fn, response_factory, calls: int) -> float:
+    responses = [response_factory() for _ in range(calls)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for response in responses:
+            fn(response)
+        elapsed = time.perf_counter() - start
+    return elapsed / calls * 1e6
+
+
+def main() -> None:
+    print(
+        f"{'config':>8} | {'legacy dict':>12} | {'legacy str':>12} | {'typed':>10} | {'speedup':>7}"
+    )
+    print("-" * 62)
+    for interfaces in (0, 100, 1000):
+        result = build_result(interfaces)
+        size = len(result["config"])
+        calls = 2000 if interfaces < 1000 else 200
+        legacy_dict = per_call_us(legacy_callback, lambda: dict(result), calls)
+        legacy_str = per_call_us(legacy_callback, lambda: {"result": repr(result)}, calls)
+        typed = per_call_us(typed_callback, lambda: dict(result), calls)
+        print(
+            f"{size // 1000:>6}KB | {legacy_dict:>9.1f} us | {legacy_str:>9.1f} us | "
+            f"{typed:>7.1f} us | {min(legacy_dict, legacy_str) / typed:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import random
+import time
+
+from before_after_tool_callback.app_utils.access_policy import (
+    ALLOW,
+    DENY,
+    AccessPolicy,
+    PolicyStore,
+)
+
+RULES = [
+    {"id": "cleared", "effect": "allow", "tool": "read_router_config",
+     "router": "r1-gov*", "groups": ["gov-cleared"]},
+    {"id": "gov", "effect": "deny", "router": "r1-gov*", "message": "gov cloud"},
+    {"id": "lab", "effect": "deny", "tool": "write_router_config", "router": "re:^lab-\\d+$"},
+    {"id": "vrf", "effect": "deny", "router": "r?-edge*", "args": {"vrf": "mgmt"}},
+    {"id": "exact", "effect": "allow", "router": "r1-gov51", "tool": "write_router_config"},
+]
+
+
+def test_first_matching_rule_wins() -> None:
+    policy = AccessPolicy(RULES, groups={"gov-cleared": ["alice"]})
+
+    denied = policy.decide("read_router_config", {"router_name": "R1-GOV51"})
+    assert (denied.effect, denied.rule_id, denied.message) == (DENY, "gov", "gov cloud")
+    assert policy.decide("read_router_config", {"router_name": "r1-gov51"}, user_id="alice").allowed
+    # The earlier gov deny shadows the later exact allow
+    assert policy.decide("write_router_config", {"router_name": "r1-gov51"}).rule_id == "gov"
+    assert policy.decide("write_router_config", {"router_name": "lab-7"}).rule_id == "lab"
+    assert policy.decide("read_router_config", {"router_name": "lab-7"}).allowed
+    assert policy.decide("ping", {"router_name": "r2-edge9", "vrf": "mgmt"}).rule_id == "vrf"
+    assert policy.decide("ping", {"router_name": "r2-edge9", "vrf": "cust"}).rule_id is None
+
+
+def _brute_force(rules, tool, router, args, groups):
+    import fnmatch
+    import re
+
+    for rule in rules:
+        if rule.get("tool", "*") not in ("*", tool):
+            continue
+        pattern = rule.get("router", "*").lower()
+        if pattern.startswith("re:"):
+            if not re.match(pattern[3:], router, re.IGNORECASE):
+                continue
+        elif not fnmatch.fnmatchcase(router, pattern):
+            continue
+        if rule.get("groups") and not set(rule["groups"]) & groups:
+            continue
+        if any(str(args.get(k)) != v for k, v in rule.get("args", {}).items()):
+            continue
+        return rule["id"]
+    return None
+
+
+def test_compiled_policy_matches_linear_scan() -> None:
+    rng = random.Random(5)
+    tools = ["read_router_config", "write_router_config", "*"]
+    routers = [f"r{i}-{site}{j}" for i in range(1, 4) for site in ("gov", "edge", "core") for j in range(5)]
+    rules = []
+    for i in range(400):
+        router = rng.choice(routers)
+        kind = rng.random()
+        if kind < 0.3:
+            pattern = router[: rng.randint(1, len(router))] + "*"
+        elif kind < 0.4:
+            pattern = "re:^" + router[:3] + ".*"
+        elif kind < 0.45:
+            pattern = "*"
+        else:
+            pattern = router
+        rule = {"id": str(i), "effect": rng.choice([ALLOW, DENY]),
+                "tool": rng.choice(tools), "router": pattern}
+        if rng.random() < 0.2:
+            rule["groups"] = [rng.choice(["a", "b"])]
+        if rng.random() < 0.2:
+            rule["args"] = {"vrf": rng.choice(["mgmt", "cust"])}
+        rules.append(rule)
+    policy = AccessPolicy(rules)
+    for _ in range(3000):
+        tool = rng.choice(tools[:2] + ["ping"])
+        router = rng.choice(routers)
+        args = {"router_name": router, "vrf": rng.choice(["mgmt", "cust"])}
+        groups = set(rng.sample(["a", "b"], rng.randint(0, 2)))
+        assert policy.decide(tool, args, groups=groups).rule_id == _brute_force(
+            rules, tool, router, args, groups
+        )
+
+
+def test_store_hot_reloads_and_keeps_policy_on_bad_file(tmp_path) -> None:
+    path = tmp_path / "policy.json"
+    path.write_text(json.dumps({"rules": [{"id": "a", "effect": "deny", "router": "r1"}]}))
+    store = PolicyStore(str(path), poll_interval_seconds=0.05)
+    assert store.decide("t", {"router_name": "r1"}).rule_id == "a"
+
+    path.write_text(json.dumps({"rules": [{"id": "b", "effect": "deny", "router": "r2"}]}))
+    deadline = time.time() + 2
+    while store.decide("t", {"router_name": "r2"}).allowed and time.time() < deadline:
+        time.sleep(0.02)
+    assert store.decide("t", {"router_name": "r2"}).rule_id == "b"
+    assert store.decide("t", {"router_name": "r1"}).allowed
+
+    path.write_text("{not json")
+    assert not store.reload()
+    assert store.decide("t", {"router_name": "r2"}).rule_id == "b"
+    store.stop()
+
+
+def test_store_denies_when_policy_file_is_missing(tmp_path, caplog) -> None:
+    path = tmp_path / "policy.json"
+    store = PolicyStore(str(path))
+    decision = store.policy.decide("read_router_config", {"router_name": "r1-sea3"})
+    assert not decision.allowed
+    assert "not found" in caplog.text
+
+    path.write_text(json.dumps({"default": "allow", "rules": []}))
+    assert store.reload()
+    assert store.policy.decide("read_router_config", {"router_name": "r1-sea3"}).allowed
+
+
+def test_store_denies_when_initial_policy_file_is_broken(tmp_path) -> None:
+    path = tmp_path / "policy.json"
+    path.write_text("{not json")
+    store = PolicyStore(str(path))
+    assert not store.policy.decide("read_router_config", {"router_name": "r1-gov51"}).allowed
+    assert not store.policy.decide("read_router_config", {"router_name": "r1-sea3"}).allowed
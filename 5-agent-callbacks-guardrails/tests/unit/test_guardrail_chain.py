@@ -0,0 +1,115 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+
+import pytest
+
+from before_after_agent_callback.app_utils.guardrail_chain import (
+    GuardrailChain,
+    Parallel,
+    TOTAL_STAGE,
+    Stage,
+    get_guardrail_metrics,
+    reset_guardrail_metrics,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    reset_guardrail_metrics()
+
+
+def test_stages_run_in_order_and_short_circuit() -> None:
+    calls = []
+
+    def allow(callback_context):
+        calls.append("allow")
+
+    async def block(callback_context):
+        calls.append("block")
+        return {"result": "blocked"}
+
+    def never(callback_context):
+        calls.append("never")
+
+    chain = GuardrailChain("before_agent", [allow, Stage("deny", block), never])
+    assert asyncio.run(chain(callback_context=None)) == {"result": "blocked"}
+    assert calls == ["allow", "block"]
+
+    metrics = get_guardrail_metrics()["before_agent"]
+    assert metrics["allow"]["count"] == 1
+    assert metrics["deny"]["blocked"] == 1
+    assert "never" not in metrics
+    assert metrics[TOTAL_STAGE]["blocked"] == 1
+
+
+def test_chain_total_is_reserved() -> None:
+    def total(callback_context):
+        return None
+
+    # A stage named "total" keeps its own metrics, apart from the chain total
+    assert asyncio.run(GuardrailChain("after_agent", [total])(callback_context=None)) is None
+    metrics = get_guardrail_metrics()["after_agent"]
+    assert metrics["total"]["count"] == 1 and metrics[TOTAL_STAGE]["count"] == 1
+    with pytest.raises(ValueError):
+        GuardrailChain("after_agent", [Parallel(total, Stage(TOTAL_STAGE, total))])
+
+
+def test_parallel_stages_run_concurrently() -> None:
+    async def slow_check(tool, args, tool_context):
+        await asyncio.sleep(0.2)
+
+    async def fast_block(tool, args, tool_context):
+        await asyncio.sleep(0.01)
+        return {"result": "denied"}
+
+    chain = GuardrailChain("before_tool", [Parallel(slow_check, slow_check)])
+    start = time.perf_counter()
+    assert asyncio.run(chain(tool=None, args={}, tool_context=None)) is None
+    assert time.perf_counter() - start < 0.35
+
+    blocking = GuardrailChain("before_tool_block", [Parallel(slow_check, fast_block)])
+    start = time.perf_counter()
+    assert asyncio.run(blocking(tool=None, args={}, tool_context=None)) == {"result": "denied"}
+    assert time.perf_counter() - start < 0.15
+
+
+def test_errors_are_recorded_and_raised() -> None:
+    def broken(callback_context):
+        raise RuntimeError("boom")
+
+    chain = GuardrailChain("after_model", [broken])
+    with pytest.raises(RuntimeError):
+        asyncio.run(chain(callback_context=None))
+    assert get_guardrail_metrics()["after_model"]["broken"]["errors"] == 1
+
+
+def test_stages_cancelled_by_a_parallel_block_are_not_counted_as_passed() -> None:
+    async def slow_check(tool, args, tool_context):
+        await asyncio.sleep(0.2)
+
+    async def fast_block(tool, args, tool_context):
+        await asyncio.sleep(0.01)
+        return {"result": "denied"}
+
+    chain = GuardrailChain("before_tool", [Parallel(slow_check, fast_block)])
+    assert asyncio.run(chain(tool=None, args={}, tool_context=None)) == {"result": "denied"}
+
+    metrics = get_guardrail_metrics()["before_tool"]
+    assert metrics["slow_check"]["cancelled"] == 1
+    assert metrics["slow_check"]["count"] == 0
+    assert metrics["fast_block"]["blocked"] == 1
+    assert metrics["fast_block"]["cancelled"] == 0
@@ -0,0 +1,160 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from before_after_agent_callback.app_utils.health_prober import (
+    DOWN,
+    UNKNOWN,
+    UP,
+    IcmpProber,
+    RouterHealthMonitor,
+    TcpProber,
+)
+
+
+class CountingProber:
+    """Wraps a prober and counts how often it is called."""
+
+    def __init__(self, inner: TcpProber):
+        self.inner = inner
+        self.name = inner.name
+        self.calls = 0
+
+    async def probe(self, address: str) -> bool:
+        self.calls += 1
+        return await self.inner.probe(address)
+
+
+def test_status_is_served_from_memory_after_first_probe() -> None:
+    """Routers not probed yet are probed once; later lookups do not touch the network."""
+
+    async def scenario() -> None:
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        closed = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        closed_port = closed.sockets[0].getsockname()[1]
+        closed.close()
+        await closed.wait_closed()
+
+        prober = CountingProber(TcpProber(port=port, timeout=0.5))
+        monitor = RouterHealthMonitor(
+            routers={"r1-sea3": "127.0.0.1"},
+            probers=[prober],
+            ttl_seconds=60,
+            refresh_interval_seconds=60,
+        )
+        assert await monitor.get_status("r1-sea3") == UP
+        assert await monitor.get_status("r1-sea3") == UP
+        assert prober.calls == 1
+
+        down_monitor = RouterHealthMonitor(
+            routers={"r1-sea3": "127.0.0.1"},
+            probers=[TcpProber(port=closed_port, timeout=0.5)],
+            refresh_interval_seconds=60,
+        )
+        assert await down_monitor.get_status("r1-sea3") == DOWN
+
+        await monitor.stop()
+        await down_monitor.stop()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_background_task_refreshes_known_routers() -> None:
+    """Inventory routers are probed in the background before anyone asks."""
+
+    async def scenario() -> None:
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        monitor = RouterHealthMonitor(
+            routers={"r1-sea3": "127.0.0.1", "r2-sea3": "127.0.0.1"},
+            probers=[TcpProber(port=port, timeout=0.5)],
+            refresh_interval_seconds=0.05,
+        )
+        monitor.ensure_started()
+        await asyncio.sleep(0.2)
+        assert monitor.lookup("r1-sea3").status == UP
+        assert monitor.lookup("r2-sea3").status == UP
+        await monitor.stop()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_unprobed_routers_are_unknown_not_down() -> None:
+    """Without an inventory entry, probers or a resolvable address nothing is DOWN."""
+
+    async def scenario() -> None:
+        prober = CountingProber(TcpProber(port=22, timeout=0.5))
+        monitor = RouterHealthMonitor(routers={"r1-sea3": "127.0.0.1"}, probers=[prober])
+        assert await monitor.get_status("not-in-inventory") == UNKNOWN
+        assert prober.calls == 0
+
+        disabled = RouterHealthMonitor(routers={"r1-sea3": "127.0.0.1"}, probers=[])
+        assert await disabled.get_status("r1-sea3") == UNKNOWN
+        assert disabled._background is None
+
+        unresolvable = RouterHealthMonitor(
+            routers={"r1-gov51": "r1-gov51.invalid"},
+            probers=[TcpProber(port=22, timeout=0.5)],
+            refresh_interval_seconds=60,
+        )
+        assert await unresolvable.get_status("r1-gov51") == UNKNOWN
+        await monitor.stop()
+        await unresolvable.stop()
+
+    asyncio.run(scenario())
+
+
+def test_background_task_stops_when_idle() -> None:
+    """The refresh task exits without lookups and the next lookup restarts it."""
+
+    async def scenario() -> None:
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        monitor = RouterHealthMonitor(
+            routers={"r1-sea3": "127.0.0.1"},
+            probers=[TcpProber(port=port, timeout=0.5)],
+            refresh_interval_seconds=0.05,
+            idle_seconds=0.1,
+        )
+        assert await monitor.get_status("r1-sea3") == UP
+        await asyncio.sleep(0.3)
+        assert monitor._background.done()
+        assert await monitor.get_status("r1-sea3") == UP
+        assert not monitor._background.done()
+        await monitor.stop()
+        assert monitor._background is None
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_missing_ping_binary_is_unknown(monkeypatch) -> None:
+    """An ICMP prober that cannot run ping does not mark the router down."""
+    monkeypatch.setenv("PATH", "")
+
+    async def scenario() -> None:
+        monitor = RouterHealthMonitor(
+            routers={"r1-sea3": "127.0.0.1"}, probers=[IcmpProber()], refresh_interval_seconds=60
+        )
+        assert await monitor.get_status("r1-sea3") == UNKNOWN
+        await monitor.stop()
+
+    asyncio.run(scenario())
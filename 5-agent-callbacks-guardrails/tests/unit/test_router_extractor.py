@@ -0,0 +1,42 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from before_after_agent_callback.app_utils.router_extractor import (
+    DEFAULT_INVENTORY_FILE,
+    RouterNameExtractor,
+)
+
+
+def test_finds_all_inventory_devices_in_order() -> None:
+    """Hostnames and aliases resolve to canonical names, in order of mention."""
+    extractor = RouterNameExtractor.from_file(DEFAULT_INVENTORY_FILE)
+    message = (
+        "%LINK-3-UPDOWN on SEA3-CORE2: Gi0/1 down; neighbor r1-sea3 lost, "
+        "then 10.10.3.2 flapped again. r1-sea30 is not ours."
+    )
+    assert extractor.find_all(message) == ["r2-sea3", "r1-sea3"]
+
+
+def test_boundaries_and_longest_match() -> None:
+    """Names must sit on boundaries; the longest name at a position wins."""
+    extractor = RouterNameExtractor({"r1": "r1", "r1-sea3": "r1-sea3"})
+    assert extractor.find_all("xr1-sea3 r1-sea3x") == []
+    assert extractor.find_all("reload r1-sea3.") == ["r1-sea3"]
+
+
+def test_falls_back_to_naming_conventions() -> None:
+    """Unknown names use the compiled fallback regex; loose words do not match."""
+    extractor = RouterNameExtractor({})
+    assert extractor.extract_all("is router7 up? check eth0 and ipv4") == ["router7"]
+    assert extractor.extract("no devices here") is None
@@ -0,0 +1,115 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+
+from before_after_model_callback.app_utils.secret_detector import (
+    REDACTED,
+    StreamingSecretRedactor,
+    contains_plaintext_secret,
+    find_secrets,
+    redact_secrets,
+)
+
+CONFIG = """hostname r1-core01
+enable secret 5 $1$mERr$hx5rVt7rPNoS4wqbXKX7m0
+enable secret PassWord
+username admin privilege 15 password 7 0822455D0A16
+snmp-server community n3tw0rkRO RO
+tacacs-server host 10.1.1.5 key 0 TacKey123
+radius-server host 10.1.1.6 auth-port 1812 acct-port 1813 key RadKey456
+crypto isakmp key IkeSecret99 address 0.0.0.0
+line vty 0 4
+ password hunter2
+"""
+
+
+def test_redacts_every_secret_kind() -> None:
+    redacted, kinds = redact_secrets(CONFIG)
+
+    for secret in ("PassWord", "0822455D0A16", "n3tw0rkRO", "TacKey123",
+                   "RadKey456", "IkeSecret99", "hunter2", "$1$mERr"):
+        assert secret not in redacted
+    assert "snmp-server community ****** RO" in redacted
+    assert kinds["plaintext_password"] == 2
+    assert kinds["cisco_type5"] == 1
+    assert kinds["cisco_type7"] == 1
+
+
+def test_hashed_secrets_are_not_plaintext() -> None:
+    assert not contains_plaintext_secret("enable secret 9 $9$abcdefgh$ijklmnop")
+    assert contains_plaintext_secret("password = hunter2")
+    assert not contains_plaintext_secret("please review the password policy")
+    assert [f.kind for f in find_secrets("password: s3cr3t")] == ["plaintext_password"]
+
+
+def test_prose_about_passwords_is_not_a_secret() -> None:
+    prose = [
+        "To set the password for the console line, use the line console 0 command.",
+        "What is the enable password on r1-sea3?",
+        "The password must be at least 8 characters",
+        "Password must contain a digit.",
+        "Enable secret is stronger than enable password.",
+        "Password: see the runbook",
+        "password 8 characters or more",
+    ]
+    for text in prose:
+        assert find_secrets(text) == [], text
+        assert redact_secrets(text)[0] == text
+
+
+def test_any_value_of_an_ios_password_line_is_a_secret() -> None:
+    for line in (
+        "enable password cisco",
+        "username admin password 0 letmein",
+        "username admin privilege 15 secret 0 admin",
+        "password: hunter",
+        '  "password": "hunter",',
+        "https://r1-sea3/api?user=admin&password=hunter",
+    ):
+        assert [f.kind for f in find_secrets(line)] == ["plaintext_password"], line
+        redacted, _ = redact_secrets(line)
+        assert REDACTED in redacted and not any(
+            word in redacted for word in ("cisco", "letmein", "0 admin", "hunter")
+        ), line
+
+
+def test_running_text_needs_a_credential_like_value() -> None:
+    assert find_secrets("use password: hunter2 for the lab") != []
+    assert find_secrets("the password: hunter is too weak") == []
+
+
+def test_streaming_matches_full_redaction() -> None:
+    rng = random.Random(7)
+    text = (CONFIG * 3 + "x" * 2000 + " password: LongLineSecret " + "y" * 1000
+            + "\n" + "z" * 2000 + " password hunter2 is prose mid-line " + "w" * 1000)
+    expected, _ = redact_secrets(text)
+    for _ in range(50):
+        redactor = StreamingSecretRedactor(max_secret_span=64)
+        out, pos = [], 0
+        while pos < len(text):
+            step = rng.randint(1, 40)
+            out.append(redactor.feed(text[pos:pos + step]))
+            pos += step
+        out.append(redactor.flush())
+        assert "".join(out) == expected
+        assert redactor.found_plaintext_secret
+
+
+def test_split_secret_is_never_emitted() -> None:
+    redactor = StreamingSecretRedactor()
+    emitted = redactor.feed("snmp-server community n3tw")
+    emitted += redactor.feed("0rkRO RO\n")
+    assert "n3tw" not in emitted
+    assert f"community {REDACTED} RO" in emitted
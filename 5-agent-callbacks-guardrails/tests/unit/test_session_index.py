@@ -0,0 +1,94 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from google.adk.events.event import Event
+from google.adk.sessions.session import Session
+from google.genai import types
+
+from before_after_agent_callback.app_utils.session_index import (
+    SessionEventIndex,
+    get_session_index,
+)
+
+
+def _text_event(author: str, text: str) -> Event:
+    role = "user" if author == "user" else "model"
+    return Event(
+        author=author,
+        content=types.Content(role=role, parts=[types.Part(text=text)]),
+    )
+
+
+def test_index_tracks_latest_messages_and_tool_results() -> None:
+    """Each appended event updates the index without rescanning history."""
+    index = SessionEventIndex()
+    index.record_event(_text_event("user", "show config of r1-sea3"))
+    index.record_event(
+        Event(
+            author="root_agent",
+            content=types.Content(
+                role="user",
+                parts=[
+                    types.Part(
+                        function_response=types.FunctionResponse(
+                            name="read_router_config", response={"status": "success"}
+                        )
+                    )
+                ],
+            ),
+        )
+    )
+    index.record_event(_text_event("root_agent", "Here is the configuration."))
+
+    assert index.last_user_message == "show config of r1-sea3"
+    assert index.last_agent_message == "Here is the configuration."
+    assert index.last_tool_results["read_router_config"] == {"status": "success"}
+    assert index.event_count == 3
+
+
+def test_unindexed_session_is_seeded_once_from_history() -> None:
+    """A session loaded after a restart is indexed from its events once."""
+    session = Session(
+        id="restored-session",
+        app_name="before_after_agent_callback",
+        user_id="noc",
+        events=[
+            _text_event("user", "is r2-sea3 up?"),
+            _text_event("root_agent", "r2-sea3 is healthy."),
+        ],
+    )
+    index = get_session_index(session)
+    assert index.last_user_message == "is r2-sea3 up?"
+    assert index.last_agent_message == "r2-sea3 is healthy."
+    assert get_session_index(session) is index
+
+
+def test_stale_index_is_rebuilt() -> None:
+    """Events appended elsewhere (another worker) or a rewind reseed the index."""
+    session = Session(
+        id="shared-session",
+        app_name="before_after_agent_callback",
+        user_id="noc",
+        events=[_text_event("user", "is r2-sea3 up?")],
+    )
+    index = get_session_index(session)
+    session.events.append(_text_event("root_agent", "r2-sea3 is healthy."))
+    session.events.append(_text_event("user", "and r1-pdx1?"))
+    assert get_session_index(session).last_user_message == "and r1-pdx1?"
+
+    del session.events[1:]  # rewound to the first turn
+    rewound = get_session_index(session)
+    assert rewound.last_user_message == "is r2-sea3 up?"
+    assert rewound.last_agent_message == ""
+    assert rewound is not index
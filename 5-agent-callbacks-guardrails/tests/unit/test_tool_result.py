@@ -0,0 +1,68 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from before_after_tool_callback.app_utils.tool_result import (
+    MASK,
+    mask_secrets,
+    mask_tool_result,
+    unwrap_tool_result,
+)
+from before_after_tool_callback.app_utils.tools import read_router_config
+
+
+def test_masks_config_and_message_without_touching_original() -> None:
+    result = read_router_config("r1-core01")
+    masked = mask_tool_result(unwrap_tool_result(result))
+
+    assert masked is not None
+    for field in ("config", "message"):
+        for secret in ("PassWord", "Admin@123", "Console@123", "VTY@123"):
+            assert secret not in masked[field]
+        assert "crypto key generate rsa modulus 2048" in masked[field]
+    assert "PassWord" in result["config"]
+    assert masked["router_name"] == "r1-core01"
+
+
+def test_mask_secrets_patterns() -> None:
+    text, count = mask_secrets(
+        "username op password 7 0822455D0A16\nsnmp-server community public RO\n"
+        "tacacs-server host 10.0.0.5 key 0 TacKey\nlogin local"
+    )
+    assert count == 3
+    assert f"password 7 {MASK}" in text
+    assert f"community {MASK} RO" in text
+    assert "TacKey" not in text
+    assert mask_tool_result({"config": "login local", "status": "success"}) is None
+
+
+def test_masks_with_the_model_callback_rules() -> None:
+    # Forms the model callbacks' secret_detector redacts: hashes, IKE keys,
+    # key-value passwords. Prose about passwords is left alone.
+    text, count = mask_secrets(
+        "enable secret 5 $1$mERr$hx5rVt7rPNoS4wqbXKX7m0\n"
+        "crypto isakmp key IkeSecret99 address 0.0.0.0\n"
+        "password: hunter\n"
+        "The password must be at least 8 characters"
+    )
+    assert count == 3
+    for secret in ("$1$mERr", "IkeSecret99", "hunter"):
+        assert secret not in text
+    assert text.endswith("The password must be at least 8 characters")
+
+
+def test_unwrap_tool_result() -> None:
+    result = {"config": "x"}
+    assert unwrap_tool_result(result) is result
+    assert unwrap_tool_result({"result": result}) is result
+    assert unwrap_tool_result("text") == {"result": "text"}
@@ -40,6 +40,123 @@ from .app_utils.tools import (
     optimize_network_latency,
     block_security_threat,
 )
+from .app_utils.remediation import RemediationExecutor
+from .app_utils.simulator import get_simulator
+from .app_utils.loop_controller import (
+    SKIP_MONITORING,
+    STOP,
+    LoopBudget,
+    LoopRunStats,
+    next_step,
+)
+
+import asyncio
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional
+from pydantic import Field
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.models import LlmResponse
+
+# Targets the loop controller checks when the session does not set "monitoring_targets"
+DEFAULT_MONITORING_TARGETS = os.environ.get("LOOP_MONITORING_TARGETS", "127.0.0.1")
+
+
+async def collect_monitoring_signals(targets: str) -> List[Dict[str, Any]]:
+    """Run the monitoring checks directly (no LLM) and return their results."""
+    status, security = await asyncio.gather(
+        check_network_status(targets),
+        asyncio.to_thread(check_security_alerts),
+    )
+    return [
+        {"tool": "check_network_status", **status},
+        {"tool": "check_security_alerts", **security},
+    ]
+
+
+class LoopController(BaseAgent):
+    """First step of every loop iteration: collects signals and decides whether
+    the monitoring LLM call is needed and whether the loop should stop."""
+
+    budget: LoopBudget = Field(default_factory=LoopBudget.from_env)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        stats = LoopRunStats.for_invocation(state.get("loop_run_stats"), ctx.invocation_id)
+        # Each invocation replays the simulation scenario from the start with the
+        # same seed; later iterations of the same invocation continue its timeline
+        get_simulator().begin_invocation(ctx.invocation_id)
+        targets = state.get("monitoring_targets") or DEFAULT_MONITORING_TARGETS
+        results = await collect_monitoring_signals(targets)
+        step, reason = next_step(stats, results, self.budget)
+
+        signals = [
+            {key: value for key, value in result.items() if key != "output"}
+            for result in results
+        ]
+        delta: Dict[str, Any] = {
+            "loop_run_stats": stats.to_dict(),
+            "monitoring_signals": signals,
+            "monitoring_skip": step == SKIP_MONITORING,
+        }
+        if step == STOP:
+            delta["loop_run_report"] = stats.report()
+            # The summary reads these even when the loop stops before the LLM agents ran
+            delta.setdefault("monitoring_results", state.get("monitoring_results")
+                             or f"Collected signals: {signals}")
+            delta.setdefault("remediation_results", state.get("remediation_results")
+                             or "No remediation attempted")
+            text = f"Loop stopped after {stats.iterations} iteration(s): {reason}. Run: {stats.report()}"
+        elif step == SKIP_MONITORING:
+            text = f"Iteration {stats.iterations}: signals unchanged, skipping monitoring analysis."
+        else:
+            text = f"Iteration {stats.iterations}: signals changed, running monitoring analysis."
+
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            actions=EventActions(state_delta=delta, escalate=step == STOP),
+        )
+
+
+def skip_unchanged_monitoring(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Skips the monitoring LLM call when the loop controller saw no change in signals."""
+    if not callback_context.state.get("monitoring_skip"):
+        return None
+    return types.Content(
+        role="model",
+        parts=[types.Part(text=(
+            "Signals unchanged since the last iteration; previous assessment stands.\n"
+            f"{callback_context.state.get('monitoring_results', '')}"
+        ))],
+    )
+
+
+def record_token_usage(callback_context: CallbackContext,
+                       llm_response: LlmResponse) -> Optional[LlmResponse]:
+    """Adds each completed LLM call's token count to the loop run stats."""
+    if llm_response.partial or not llm_response.usage_metadata:
+        return None
+    state = callback_context.state
+    stats = LoopRunStats.for_invocation(state.get("loop_run_stats"), callback_context.invocation_id)
+    stats.add_tokens(llm_response.usage_metadata.total_token_count or 0)
+    state["loop_run_stats"] = stats.to_dict()
+    return None
+
+
+def report_loop_run(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Finalizes iterations, LLM calls, tokens and wall time for the run."""
+    state = callback_context.state
+    stats = LoopRunStats.for_invocation(state.get("loop_run_stats"), callback_context.invocation_id)
+    stats.wall_time_s = time.time() - stats.started_at
+    state["loop_run_stats"] = stats.to_dict()
+    state["loop_run_report"] = stats.report()
+    logging.info("Loop run report: %s", stats.report())
+    return None
 
 # Define the subagents
 # --- Tool Definition ---
@@ -62,6 +179,9 @@ Your responsibilities:
     - check_security_alerts()
     - check_network_status()
 
+- The loop controller already collected the latest signals (use the tools to dig deeper):
+  {monitoring_signals?}
+
 - Explicitly classify the system as:
   - healthy
   - degraded
@@ -90,9 +210,40 @@ network_monitoring_agent = Agent(
         check_network_status,
     ],
     output_key="monitoring_results",
+    before_agent_callback=skip_unchanged_monitoring,
+    after_model_callback=record_token_usage,
 )
 
 
+REMEDIATION_TOOLS = {
+    tool.__name__: tool
+    for tool in (
+        restart_network_service,
+        adjust_firewall_rules,
+        fix_connectivity_issue,
+        optimize_network_latency,
+        block_security_threat,
+    )
+}
+# Shared by the tool callbacks and execute_remediation_plan; the ledger lives in session state
+remediation_executor = RemediationExecutor(REMEDIATION_TOOLS)
+
+
+async def execute_remediation_plan(actions: List[Dict[str, Any]], tool_context: ToolContext) -> dict:
+    """Run several remediation actions in one call. Actions on different targets run concurrently.
+
+    Args:
+        actions: List of {"action": <remediation tool name>, "args": {<its arguments>}},
+            e.g. [{"action": "fix_connectivity_issue", "args": {"server_address": "10.0.0.1"}}].
+
+    Returns:
+        One result per action, in order. Duplicates of recent actions are
+        "skipped" and actions over the rate limit are "rate_limited".
+    """
+    results = await remediation_executor.execute_batch(tool_context.state, actions)
+    return {"tool_call_status": "success", "results": results}
+
+
 SYSTEM_PROMPT_NETWORK_REMEDIATION = """
 You are a network remediation agent operating inside an ADK LoopAgent.
 
@@ -105,8 +256,13 @@ You are authorized to call exit_loop() ONLY under the following condition:
   - fix_connectivity_issue()
   - optimize_network_latency()
   - block_security_threat()
+  - execute_remediation_plan() to run several of the above in one call
   - exit_loop()
 
+Remediation calls are de-duplicated and rate limited. A result with
+tool_call_status "skipped" or "rate_limited" means the action was not run
+again; do not retry it in this run.
+
 You must NOT:
 - Infer system health yourself
 - Override monitoring conclusions
@@ -130,9 +286,14 @@ remediation_agent = Agent(
         fix_connectivity_issue,
         optimize_network_latency,
         block_security_threat,
+        execute_remediation_plan,
         exit_loop,
     ],
     output_key="remediation_results",
+    before_tool_callback=remediation_executor.before_tool,
+    after_tool_callback=remediation_executor.after_tool,
+    on_tool_error_callback=remediation_executor.on_tool_error,
+    after_model_callback=record_token_usage,
 )
 
 
@@ -162,6 +323,7 @@ You MUST use only the inputs explicitly provided below.
 Inputs:
 - monitoring_results: {monitoring_results}
 - remediation_results: {remediation_results}
+- loop_run_report: {loop_run_report?}
 
 Rules:
 - Do NOT add new information
@@ -203,14 +365,20 @@ summary_agent = Agent(
     output_key="summary_results",
 )
 
+loop_controller = LoopController(
+    name="LoopController",
+    description="Collects monitoring signals, skips unchanged iterations and stops the loop on convergence or budget.",
+)
+
 loop_agent = LoopAgent(
     name="NetworkLoopAgent",
-    sub_agents=[network_monitoring_agent, remediation_agent],
+    sub_agents=[loop_controller, network_monitoring_agent, remediation_agent],
     description="""This agent monitors a network and automatically attempts 
     to fix common network problems. It checks for connectivity issues, 
     latency problems, and security alerts. If problems are detected, 
     it calls the remediation agent to attempt to resolve them. """,
     max_iterations=3,       # Maximum number of iterations to run the loop before exitingx
+    after_agent_callback=report_loop_run,
 )
 
 sequential_pipeline_agent = SequentialAgent(
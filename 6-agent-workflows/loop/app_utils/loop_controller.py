@@ -0,0 +1,147 @@
+"""
+Convergence detection and budgets for the monitoring LoopAgent.
+
+At the start of every iteration the loop controller collects the monitoring
+signals itself and fingerprints them. The fingerprint only covers the
+discrete signals (statuses, unreachable and refused targets), not the report
+text or raw measurements, so two iterations that saw the same network state
+match.
+
+- Signals all healthy: stop, nothing to remediate.
+- Signals unchanged since the previous iteration: skip the monitoring LLM call
+  (its previous conclusion still holds); stop when they are still unchanged
+  after `patience` such iterations, since remediation is not changing anything.
+- Token or wall-time budget spent: stop.
+
+The loop therefore ends without relying on the model calling exit_loop, and
+LoopRunStats records iterations, LLM calls, tokens and wall time per run.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Result fields that describe network state. Everything else (report text,
+# latency samples) is ignored by the fingerprint.
+SIGNAL_KEYS = ("tool_call_status", "network_status", "unreachable", "high_latency", "refused")
+
+STOP = "stop"
+SKIP_MONITORING = "skip_monitoring"
+RUN = "run"
+
+
+def fingerprint(results: Iterable[Dict[str, Any]], signal_keys: Sequence[str] = SIGNAL_KEYS) -> str:
+    """Stable hash of the signal fields of a list of tool results."""
+    signals = [
+        {key: result[key] for key in signal_keys if key in result}
+        for result in results
+    ]
+    encoded = json.dumps(signals, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def all_healthy(results: Iterable[Dict[str, Any]]) -> bool:
+    return all(result.get("network_status") == "healthy" for result in results)
+
+
+@dataclass
+class LoopBudget:
+    """Limits for one loop run."""
+
+    max_tokens: int = 50_000
+    max_seconds: float = 120.0
+    # Unchanged iterations tolerated (with the monitoring LLM skipped) before
+    # the loop counts as converged
+    patience: int = 1
+
+    @classmethod
+    def from_env(cls) -> "LoopBudget":
+        """LOOP_TOKEN_BUDGET, LOOP_TIME_BUDGET_SECONDS and LOOP_CONVERGENCE_PATIENCE."""
+        return cls(
+            max_tokens=int(os.environ.get("LOOP_TOKEN_BUDGET", "50000")),
+            max_seconds=float(os.environ.get("LOOP_TIME_BUDGET_SECONDS", "120")),
+            patience=int(os.environ.get("LOOP_CONVERGENCE_PATIENCE", "1")),
+        )
+
+
+@dataclass
+class LoopRunStats:
+    """Per-run loop statistics, stored in session state as a dict."""
+
+    invocation_id: str
+    started_at: float = field(default_factory=time.time)
+    iterations: int = 0
+    llm_calls: int = 0
+    skipped_llm_calls: int = 0
+    tokens: int = 0
+    wall_time_s: float = 0.0
+    last_fingerprint: Optional[str] = None
+    unchanged_iterations: int = 0
+    stop_reason: Optional[str] = None
+    fingerprints: List[str] = field(default_factory=list)
+
+    @classmethod
+    def for_invocation(cls, raw: Optional[Dict[str, Any]], invocation_id: str) -> "LoopRunStats":
+        """The stats of this invocation's run, or fresh stats for a new run."""
+        if raw and raw.get("invocation_id") == invocation_id:
+            return cls(**raw)
+        return cls(invocation_id=invocation_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def add_tokens(self, count: int) -> None:
+        self.llm_calls += 1
+        self.tokens += count
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "iterations": self.iterations,
+            "llm_calls": self.llm_calls,
+            "skipped_llm_calls": self.skipped_llm_calls,
+            "tokens": self.tokens,
+            "wall_time_s": round(self.wall_time_s, 2),
+            "stop_reason": self.stop_reason or "max_iterations",
+        }
+
+
+def next_step(
+    stats: LoopRunStats,
+    results: Sequence[Dict[str, Any]],
+    budget: LoopBudget,
+    now: Optional[float] = None,
+) -> Tuple[str, Optional[str]]:
+    """
+    Record one iteration's signals and decide what the iteration does.
+
+    Returns:
+        (STOP, reason), (SKIP_MONITORING, None) or (RUN, None).
+    """
+    now = time.time() if now is None else now
+    stats.iterations += 1
+    stats.wall_time_s = now - stats.started_at
+
+    current = fingerprint(results)
+    unchanged = current == stats.last_fingerprint
+    stats.unchanged_iterations = stats.unchanged_iterations + 1 if unchanged else 0
+    stats.last_fingerprint = current
+    stats.fingerprints.append(current)
+
+    if all_healthy(results):
+        stats.stop_reason = "healthy"
+    elif stats.tokens >= budget.max_tokens:
+        stats.stop_reason = "token_budget"
+    elif stats.wall_time_s >= budget.max_seconds:
+        stats.stop_reason = "time_budget"
+    elif stats.unchanged_iterations >= budget.patience + 1:
+        stats.stop_reason = "converged"
+    if stats.stop_reason:
+        return STOP, stats.stop_reason
+
+    if unchanged:
+        stats.skipped_llm_calls += 1
+        return SKIP_MONITORING, None
+    return RUN, None
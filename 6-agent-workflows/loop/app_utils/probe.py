@@ -0,0 +1,340 @@
+"""
+Asyncio probe engine behind the loop monitoring tools.
+
+Every target is probed with timed TCP connects (and optionally one ICMP echo
+through the system `ping`), thousands at a time on one event loop, bounded by
+a semaphore. Results are collected column-wise into arrays (one slot per
+target) and the report is rendered once from them.
+
+Targets are comma-separated: "10.0.0.1", "core1.example.net:22", "[::1]:443"
+or URLs ("https://example.com/status"). A target without a port is probed on
+DEFAULT_PORTS in order until one accepts the connection. Malformed targets are
+reported with the INVALID state. A REFUSED target answered, so it is up but
+not serving on the probed port: it is reported apart from the unreachable ones.
+"""
+
+import asyncio
+import ipaddress
+import math
+import os
+import re
+import shutil
+import socket
+import statistics
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+DEFAULT_PORTS: Tuple[int, ...] = (22, 443, 80)
+
+OPEN = "open"          # connection accepted
+REFUSED = "refused"    # host answered with a reset: up, but nothing listening
+TIMEOUT = "timeout"
+ERROR = "error"        # resolution failure, no route, ...
+INVALID = "invalid"    # not a host[:port] target; never probed
+
+INVALID_PORT = -1
+_URL_SCHEME = re.compile(r"^([a-z][a-z0-9+.-]*)://", re.IGNORECASE)
+_SCHEME_PORTS = {"http": 80, "https": 443, "ssh": 22, "telnet": 23}
+
+NAN = float("nan")
+_PING_TIME = re.compile(rb"time[=<]([\d.]+)\s*ms")
+
+
+def parse_targets(spec: str) -> List[Tuple[str, Optional[int]]]:
+    """
+    (host, port or None) for every target in a comma-separated list.
+
+    URLs are reduced to their host, with the scheme's port if none is given.
+    An entry that is not a valid host[:port] is kept as (entry, INVALID_PORT)
+    so it is reported with the INVALID state instead of failing the check.
+    """
+    targets = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        target = _parse_target(item)
+        targets.append(target if target else (item, INVALID_PORT))
+    return targets
+
+
+def _parse_target(item: str) -> Optional[Tuple[str, Optional[int]]]:
+    scheme_port = None
+    scheme = _URL_SCHEME.match(item)
+    if scheme:
+        scheme_port = _SCHEME_PORTS.get(scheme.group(1).lower())
+        item = item[scheme.end():].split("/", 1)[0].rpartition("@")[2]
+    if item.startswith("["):  # [v6]:port
+        host, _, rest = item[1:].partition("]")
+        if rest and not rest.startswith(":"):
+            return None
+        port = rest[1:]
+    elif item.count(":") == 1:
+        host, port = item.split(":")
+    else:  # hostname, v4 or bare v6 address
+        host, port = item, ""
+    if not host or any(ch.isspace() or ch in "/?#@" for ch in host):
+        return None
+    if not port:
+        return host, scheme_port
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        return None
+    return host, int(port)
+
+
+def target_label(host: str, port: Optional[int]) -> str:
+    if port is None or port == INVALID_PORT:
+        return host
+    return f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+
+
+@dataclass
+class ProbeResults:
+    """Column-wise probe results; index i describes targets[i]."""
+
+    targets: List[str]
+    states: List[str]
+    ports: array        # port that answered, 0 if none did
+    rtt_min_ms: array   # TCP connect times, NaN without an open port
+    rtt_avg_ms: array
+    rtt_max_ms: array
+    jitter_ms: array
+    loss: array         # fraction of failed connects on the answering port
+    icmp_rtt_ms: Optional[array] = None
+    elapsed_s: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def unreachable(self) -> List[str]:
+        return [t for t, state in zip(self.targets, self.states) if state not in (OPEN, REFUSED, INVALID)]
+
+    def refused(self) -> List[str]:
+        return [t for t, state in zip(self.targets, self.states) if state == REFUSED]
+
+    def invalid(self) -> List[str]:
+        return [t for t, state in zip(self.targets, self.states) if state == INVALID]
+
+    def high_latency(self, threshold_ms: float) -> List[str]:
+        return [
+            t for t, state, avg in zip(self.targets, self.states, self.rtt_avg_ms)
+            if state == OPEN and avg > threshold_ms
+        ]
+
+
+@dataclass
+class _Target:
+    state: str = ERROR
+    port: int = 0
+    samples: List[float] = field(default_factory=list)
+    attempts: int = 0
+
+
+async def _resolve(host: str, port: int) -> Tuple[int, tuple]:
+    """(family, sockaddr); IP literals skip the resolver."""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        family, _, _, _, sockaddr = infos[0]
+        return family, sockaddr
+    if address.version == 6:
+        return socket.AF_INET6, (host, port, 0, 0)
+    return socket.AF_INET, (host, port)
+
+
+async def tcp_connect(family: int, sockaddr: tuple, timeout: float) -> Tuple[str, float]:
+    """Time one TCP handshake. Returns (state, milliseconds or NaN)."""
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(loop.sock_connect(sock, sockaddr), timeout)
+        return OPEN, (time.perf_counter() - start) * 1000
+    except asyncio.TimeoutError:
+        return TIMEOUT, NAN
+    except ConnectionRefusedError:
+        return REFUSED, (time.perf_counter() - start) * 1000
+    except OSError:
+        return ERROR, NAN
+    finally:
+        sock.close()
+
+
+async def icmp_echo(host: str, timeout: float) -> float:
+    """One ICMP echo through the system ping; NaN if lost or ping is unavailable."""
+    ping = shutil.which("ping")
+    if ping is None:
+        return NAN
+    try:
+        process = await asyncio.create_subprocess_exec(
+            ping, "-n", "-c", "1", "-W", str(max(1, math.ceil(timeout))), host,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return NAN
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout + 1)
+    except asyncio.TimeoutError:
+        return NAN
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+    match = _PING_TIME.search(stdout)
+    return float(match.group(1)) if match else NAN
+
+
+async def _probe_one(
+    host: str, port: Optional[int], ports: Sequence[int], samples: int, timeout: float
+) -> _Target:
+    target = _Target()
+    if port == INVALID_PORT:
+        target.state = INVALID
+        return target
+    for candidate in ((port,) if port is not None else ports):
+        try:
+            family, sockaddr = await _resolve(host, candidate)
+        except OSError:
+            return target
+        state, rtt = await tcp_connect(family, sockaddr, timeout)
+        target.attempts = 1
+        # Keep the most informative state: open > refused > timeout > error
+        if state == OPEN or (state == REFUSED and target.state != REFUSED) or (
+            state == TIMEOUT and target.state == ERROR
+        ):
+            target.state = state
+        if state != OPEN:
+            continue
+        target.port = candidate
+        target.samples.append(rtt)
+        for _ in range(samples - 1):
+            state, rtt = await tcp_connect(family, sockaddr, timeout)
+            target.attempts += 1
+            if state == OPEN:
+                target.samples.append(rtt)
+        break
+    return target
+
+
+async def probe_targets(
+    targets: Sequence[Tuple[str, Optional[int]]],
+    ports: Sequence[int] = DEFAULT_PORTS,
+    samples: int = 1,
+    timeout: float = 1.0,
+    concurrency: int = 500,
+    icmp: bool = False,
+) -> ProbeResults:
+    """
+    Probe every target concurrently.
+
+    Args:
+        targets: (host, port) pairs from parse_targets(); port None uses `ports`.
+        ports: Ports tried, in order, for targets without a port.
+        samples: TCP connects timed on the answering port (latency statistics).
+        timeout: Per-connect timeout in seconds.
+        concurrency: Targets probed at the same time.
+        icmp: Also send one ICMP echo per target.
+    """
+    start = time.perf_counter()
+    count = len(targets)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _bounded(host: str, port: Optional[int]) -> Tuple[_Target, float]:
+        async with semaphore:
+            if icmp:
+                target, icmp_rtt = await asyncio.gather(
+                    _probe_one(host, port, ports, samples, timeout), icmp_echo(host, timeout)
+                )
+                return target, icmp_rtt
+            return await _probe_one(host, port, ports, samples, timeout), NAN
+
+    probed = await asyncio.gather(*(_bounded(host, port) for host, port in targets))
+
+    results = ProbeResults(
+        targets=[target_label(host, port) for host, port in targets],
+        states=[target.state for target, _ in probed],
+        ports=array("i", (target.port for target, _ in probed)),
+        rtt_min_ms=array("d", [NAN]) * count,
+        rtt_avg_ms=array("d", [NAN]) * count,
+        rtt_max_ms=array("d", [NAN]) * count,
+        jitter_ms=array("d", [NAN]) * count,
+        loss=array("d", [1.0]) * count,
+        icmp_rtt_ms=array("d", (rtt for _, rtt in probed)) if icmp else None,
+    )
+    for i, (target, _) in enumerate(probed):
+        if target.samples:
+            results.rtt_min_ms[i] = min(target.samples)
+            results.rtt_avg_ms[i] = statistics.fmean(target.samples)
+            results.rtt_max_ms[i] = max(target.samples)
+            results.jitter_ms[i] = statistics.pstdev(target.samples)
+            results.loss[i] = 1 - len(target.samples) / target.attempts
+    results.elapsed_s = time.perf_counter() - start
+    return results
+
+
+def probe_settings() -> dict:
+    """Engine settings from PROBE_TIMEOUT_SECONDS, PROBE_CONCURRENCY and PROBE_ICMP."""
+    return {
+        "timeout": float(os.environ.get("PROBE_TIMEOUT_SECONDS", "1.0")),
+        "concurrency": int(os.environ.get("PROBE_CONCURRENCY", "500")),
+        "icmp": os.environ.get("PROBE_ICMP", "").lower() in ("1", "true", "yes"),
+    }
+
+
+def _ms(value: float) -> str:
+    return "-" if math.isnan(value) else f"{value:.1f}"
+
+
+def render_report(
+    title: str,
+    results: ProbeResults,
+    threshold_ms: Optional[float] = None,
+    max_rows: int = 50,
+) -> str:
+    """
+    Render the probe results as one text report: a summary, then one row per
+    target with problem targets first, capped at max_rows.
+    """
+    unreachable = results.unreachable()
+    refused = results.refused()
+    invalid = results.invalid()
+    slow = set(results.high_latency(threshold_ms)) if threshold_ms is not None else set()
+    reachable_count = len(results) - len(unreachable) - len(refused) - len(invalid)
+
+    lines = [
+        title,
+        "=" * len(title),
+        f"Targets Checked: {len(results)} in {results.elapsed_s:.2f} s",
+        f"Reachable: {reachable_count}  Unreachable: {len(unreachable)}"
+        + (f"  Refused (host up): {len(refused)}" if refused else "")
+        + (f"  Over {threshold_ms:g} ms: {len(slow)}" if threshold_ms is not None else "")
+        + (f"  Invalid: {len(invalid)}" if invalid else ""),
+        "",
+        "target | state | port | rtt min/avg/max ms | jitter ms | loss"
+        + (" | icmp ms" if results.icmp_rtt_ms is not None else ""),
+    ]
+    order = sorted(
+        range(len(results)),
+        key=lambda i: (results.states[i] == OPEN and results.targets[i] not in slow, i),
+    )
+    for i in order[:max_rows]:
+        state = results.states[i].upper()
+        if results.targets[i] in slow:
+            state += " (HIGH LATENCY)"
+        row = (
+            f"{results.targets[i]} | {state} | {results.ports[i] or '-'} | "
+            f"{_ms(results.rtt_min_ms[i])}/{_ms(results.rtt_avg_ms[i])}/{_ms(results.rtt_max_ms[i])} | "
+            f"{_ms(results.jitter_ms[i])} | {results.loss[i]:.0%}"
+        )
+        if results.icmp_rtt_ms is not None:
+            row += f" | {_ms(results.icmp_rtt_ms[i])}"
+        lines.append(row)
+    if len(results) > max_rows:
+        lines.append(f"... {len(results) - max_rows} more targets, all reachable within limits"
+                     if len(unreachable) + len(refused) + len(invalid) + len(slow) <= max_rows
+                     else f"... {len(results) - max_rows} more targets")
+    return "\n".join(lines)
@@ -0,0 +1,255 @@
+"""
+Idempotent, rate-limited execution of remediation actions.
+
+Every remediation call gets an idempotency key derived from (action, target,
+args). Before an action runs it is checked against the action ledger kept in
+session state ("remediation_ledger"):
+
+- the same key already ran (or is running) within the cooldown window:
+  suppressed, the earlier outcome is returned instead of acting again
+- the target already had `per_target_limit` actions within the rate window,
+  or the whole run had `global_limit`: rate limited
+- otherwise the action runs and is recorded
+
+An action that raised or reported "remediation_failed" is recorded as failed.
+Failed attempts still count toward the rate limits but never suppress a retry.
+
+The same checks back both the before/after/error tool callbacks (single tool
+calls from the RemediationAgent) and execute_batch(), which runs a list of
+actions with actions on different targets in parallel and actions on one
+target in order.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, MutableMapping, Optional, Sequence
+
+LEDGER_KEY = "remediation_ledger"
+# Argument names that identify the device an action touches, in priority order
+TARGET_ARGS = ("server_address", "source_ip", "destination_ip")
+# Ledger entries kept for auditing; older ones are dropped
+MAX_LEDGER_ENTRIES = 500
+
+RUNNING = "running"
+EXECUTED = "executed"
+FAILED = "failed"
+SUPPRESSED = "suppressed"
+RATE_LIMITED = "rate_limited"
+
+
+def action_target(args: Dict[str, Any]) -> str:
+    for name in TARGET_ARGS:
+        if args.get(name):
+            return str(args[name])
+    return "*"
+
+
+def idempotency_key(action: str, target: str, args: Dict[str, Any]) -> str:
+    encoded = json.dumps([action, target, args], sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+@dataclass
+class RemediationPolicy:
+    cooldown_seconds: float = 300.0
+    window_seconds: float = 600.0
+    per_target_limit: int = 2
+    global_limit: int = 6
+    max_concurrency: int = 8
+
+    @classmethod
+    def from_env(cls) -> "RemediationPolicy":
+        """REMEDIATION_COOLDOWN_SECONDS, REMEDIATION_WINDOW_SECONDS,
+        REMEDIATION_PER_TARGET_LIMIT, REMEDIATION_GLOBAL_LIMIT, REMEDIATION_MAX_CONCURRENCY."""
+        return cls(
+            cooldown_seconds=float(os.environ.get("REMEDIATION_COOLDOWN_SECONDS", "300")),
+            window_seconds=float(os.environ.get("REMEDIATION_WINDOW_SECONDS", "600")),
+            per_target_limit=int(os.environ.get("REMEDIATION_PER_TARGET_LIMIT", "2")),
+            global_limit=int(os.environ.get("REMEDIATION_GLOBAL_LIMIT", "6")),
+            max_concurrency=int(os.environ.get("REMEDIATION_MAX_CONCURRENCY", "8")),
+        )
+
+
+def _skipped(status: str, message: str, network_status: Optional[str]) -> Dict[str, Any]:
+    return {
+        "tool_call_status": status,
+        "output": message,
+        "network_status": network_status or "remediation_skipped",
+    }
+
+
+class RemediationExecutor:
+    """Applies a RemediationPolicy to the ledger in a session state mapping."""
+
+    def __init__(self, tools: Dict[str, Callable[..., Dict[str, Any]]],
+                 policy: Optional[RemediationPolicy] = None):
+        self.tools = tools
+        self.policy = policy or RemediationPolicy.from_env()
+
+    def _ledger(self, state: MutableMapping[str, Any]) -> List[Dict[str, Any]]:
+        return list(state.get(LEDGER_KEY) or [])
+
+    def _save(self, state: MutableMapping[str, Any], ledger: List[Dict[str, Any]]) -> None:
+        # Reassign (not mutate) so the change is recorded in the event's state delta
+        state[LEDGER_KEY] = ledger[-MAX_LEDGER_ENTRIES:]
+
+    def admit(
+        self, state: MutableMapping[str, Any], action: str, args: Dict[str, Any],
+        now: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Decide whether an action may run and record the decision in the ledger.
+
+        Returns:
+            The ledger entry. Its "status" is RUNNING when the action may run,
+            otherwise SUPPRESSED or RATE_LIMITED with the response to return
+            in place of running the tool.
+        """
+        now = time.time() if now is None else now
+        policy = self.policy
+        target = action_target(args)
+        key = idempotency_key(action, target, args)
+        ledger = self._ledger(state)
+        entry: Dict[str, Any] = {"key": key, "action": action, "target": target,
+                                 "args": args, "at": now}
+
+        previous = next(
+            (e for e in reversed(ledger)
+             if e["key"] == key and e["status"] in (RUNNING, EXECUTED)
+             and now - e["at"] < policy.cooldown_seconds),
+            None,
+        )
+        acted = [e for e in ledger if e["status"] in (RUNNING, EXECUTED, FAILED)
+                 and now - e["at"] < policy.window_seconds]
+        if previous is not None:
+            entry["status"] = SUPPRESSED
+            entry["response"] = _skipped(
+                "skipped",
+                f"Duplicate remediation suppressed: {action} on {target} already "
+                f"{'running' if previous['status'] == RUNNING else 'ran'} "
+                f"{now - previous['at']:.0f}s ago (cooldown {policy.cooldown_seconds:.0f}s). "
+                f"Previous outcome: {previous.get('network_status', 'pending')}",
+                previous.get("network_status"),
+            )
+        elif sum(e["target"] == target for e in acted) >= policy.per_target_limit:
+            entry["status"] = RATE_LIMITED
+            entry["response"] = _skipped(
+                "rate_limited",
+                f"Rate limit: {target} already had {policy.per_target_limit} remediation "
+                f"action(s) in the last {policy.window_seconds:.0f}s; {action} not run.",
+                None,
+            )
+        elif len(acted) >= policy.global_limit:
+            entry["status"] = RATE_LIMITED
+            entry["response"] = _skipped(
+                "rate_limited",
+                f"Rate limit: {policy.global_limit} remediation action(s) already ran in "
+                f"the last {policy.window_seconds:.0f}s; {action} on {target} not run.",
+                None,
+            )
+        else:
+            entry["status"] = RUNNING
+        ledger.append(entry)
+        self._save(state, ledger)
+        return entry
+
+    def complete(
+        self, state: MutableMapping[str, Any], key: str, result: Dict[str, Any],
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Mark the running entry for `key` with the tool's outcome: FAILED when
+        the tool errored or reported "remediation_failed", else EXECUTED.
+        """
+        failed = (result.get("tool_call_status") == "error"
+                  or result.get("network_status") == "remediation_failed")
+        ledger = self._ledger(state)
+        for i in range(len(ledger) - 1, -1, -1):
+            if ledger[i]["key"] == key and ledger[i]["status"] == RUNNING:
+                ledger[i] = {
+                    **ledger[i],
+                    "status": FAILED if failed else EXECUTED,
+                    "network_status": result.get("network_status"),
+                    "duration_s": round((time.time() if now is None else now) - ledger[i]["at"], 3),
+                }
+                break
+        self._save(state, ledger)
+
+    # --- ADK callbacks for single tool calls -------------------------------
+
+    def before_tool(self, tool: Any, args: Dict[str, Any], tool_context: Any) -> Optional[Dict[str, Any]]:
+        if tool.name not in self.tools:
+            return None
+        entry = self.admit(tool_context.state, tool.name, dict(args))
+        return entry.get("response")
+
+    def after_tool(self, tool: Any, args: Dict[str, Any], tool_context: Any,
+                   tool_response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if tool.name in self.tools and isinstance(tool_response, dict) \
+                and tool_response.get("tool_call_status") not in ("skipped", "rate_limited"):
+            key = idempotency_key(tool.name, action_target(args), dict(args))
+            self.complete(tool_context.state, key, tool_response)
+        return None
+
+    def on_tool_error(self, tool: Any, args: Dict[str, Any], tool_context: Any,
+                      error: Exception) -> Optional[Dict[str, Any]]:
+        """The tool raised, so after_tool never runs: record the entry as failed
+        and let the error propagate."""
+        if tool.name in self.tools:
+            key = idempotency_key(tool.name, action_target(args), dict(args))
+            self.complete(tool_context.state, key, {
+                "tool_call_status": "error", "output": str(error),
+                "network_status": "remediation_failed",
+            })
+        return None
+
+    # --- Batches ----------------------------------------------------------
+
+    async def execute_batch(
+        self, state: MutableMapping[str, Any], actions: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a list of {"action": name, "args": {...}} remediations.
+
+        Admission is decided up front in list order, so duplicates inside the
+        batch are suppressed too. Admitted actions on different targets run
+        concurrently; actions on the same target run in order.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(actions)
+        by_target: Dict[str, List[int]] = {}
+        entries = []
+        for i, item in enumerate(actions):
+            action, args = item.get("action"), dict(item.get("args") or {})
+            if action not in self.tools:
+                results[i] = {"action": action, "tool_call_status": "error",
+                              "output": f"Unknown remediation action {action!r}",
+                              "network_status": "remediation_failed"}
+                entries.append(None)
+                continue
+            entry = self.admit(state, action, args)
+            entries.append(entry)
+            if entry["status"] == RUNNING:
+                by_target.setdefault(entry["target"], []).append(i)
+            else:
+                results[i] = {"action": action, "target": entry["target"], **entry["response"]}
+
+        semaphore = asyncio.Semaphore(self.policy.max_concurrency)
+
+        async def _run_target(indexes: List[int]) -> None:
+            for i in indexes:
+                entry = entries[i]
+                async with semaphore:
+                    try:
+                        result = await asyncio.to_thread(self.tools[entry["action"]], **entry["args"])
+                    except Exception as e:
+                        result = {"tool_call_status": "error", "output": str(e),
+                                  "network_status": "remediation_failed"}
+                self.complete(state, entry["key"], result)
+                results[i] = {"action": entry["action"], "target": entry["target"], **result}
+
+        await asyncio.gather(*(_run_target(indexes) for indexes in by_target.values()))
+        return results
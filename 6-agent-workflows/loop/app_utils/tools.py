@@ -1,128 +1,164 @@
 """
 Network monitoring and remediation tools for loop agent.
 All functions return JSON with tool_call_status, output, and network_status.
+The connectivity, latency and status checks probe real targets (see probe.py)
+unless a simulation scenario is loaded; every other outcome comes from the
+seeded scenario simulator (see simulator.py).
 """
 
 import json
-from typing import Dict, Any
-import random
+import statistics
+from array import array
+from typing import Dict, Any, List, Optional, Tuple
+
+from .probe import (
+    INVALID, INVALID_PORT, OPEN, TIMEOUT, ProbeResults, parse_targets, probe_settings,
+    probe_targets, render_report, target_label,
+)
+from .simulator import ScenarioSimulator, get_simulator
+
+# TCP connects timed per target by check_network_latency
+LATENCY_SAMPLES = 5
+
+
+def _simulated_probe(
+    targets: List[Tuple[str, Optional[int]]], simulator: ScenarioSimulator, samples: int
+) -> ProbeResults:
+    """Probe results from the scenario's unreachable / high_latency faults instead of the network."""
+    labels, states, ports = [], [], []
+    rtt_min, rtt_avg, rtt_max, jitter = array("d"), array("d"), array("d"), array("d")
+    for host, port in targets:
+        label = target_label(host, port)
+        rng = simulator.rng("probe", label, advance=False)
+        labels.append(label)
+        invalid = port == INVALID_PORT
+        if invalid or simulator.fault("unreachable", host, rng, 0.0):
+            states.append(INVALID if invalid else TIMEOUT)
+            ports.append(0)
+            for column in (rtt_min, rtt_avg, rtt_max, jitter):
+                column.append(float("nan"))
+            continue
+        base = simulator.fault_params("high_latency", host).get("latency_ms") \
+            if simulator.fault("high_latency", host, rng, 0.0) else rng.uniform(2, 40)
+        base = float(base if base is not None else 180)
+        rtts = [base * rng.uniform(0.9, 1.1) for _ in range(samples)]
+        states.append(OPEN)
+        ports.append(port or 22)
+        rtt_min.append(min(rtts))
+        rtt_avg.append(statistics.fmean(rtts))
+        rtt_max.append(max(rtts))
+        jitter.append(statistics.pstdev(rtts))
+    return ProbeResults(
+        targets=labels, states=states, ports=array("i", ports),
+        rtt_min_ms=rtt_min, rtt_avg_ms=rtt_avg, rtt_max_ms=rtt_max, jitter_ms=jitter,
+        loss=array("d", (0.0 if state == OPEN else 1.0 for state in states)),
+    )
+
+
+async def _probe(server_addresses: str, samples: int = 1) -> ProbeResults:
+    """Probe the targets, or simulate them when a simulation scenario is loaded."""
+    targets = parse_targets(server_addresses)
+    simulator = get_simulator()
+    if simulator.scenario is not None:
+        simulator.rng("probe")  # one simulator step per tool call
+        return _simulated_probe(targets, simulator, samples)
+    return await probe_targets(targets, samples=samples, **probe_settings())
+
+
+def _no_valid_targets(results: ProbeResults) -> Optional[Dict[str, Any]]:
+    """The error result of a check given no target it could probe, else None."""
+    if len(results.invalid()) < len(results):
+        return None
+    return {
+        "tool_call_status": "error",
+        "output": "No valid target to check"
+                  + (f": {', '.join(results.invalid())}" if len(results) else ""),
+        "network_status": "unknown",
+        "unreachable": [],
+        "invalid": results.invalid(),
+    }
 
 
 # ============================================================================
 # NETWORK MONITORING TOOLS
 # ============================================================================
 
-def check_network_connectivity(server_address: str) -> Dict[str, Any]:
+async def check_network_connectivity(server_address: str) -> Dict[str, Any]:
     """
-    Check connectivity to a network server or device.
+    Check connectivity to one or more network servers or devices.
     
     Args:
-        server_address: IP address or hostname of the server to check
+        server_address: IP address or hostname of the server to check, or a
+            comma-separated list of them ("host", "host:port" or a URL)
         
     Returns:
-        Dictionary with tool_call_status, output, and network_status fields
+        Dictionary with tool_call_status, output, network_status and the lists
+        of unreachable, refused (host up, port closed) and invalid (malformed)
+        targets. Without any valid target the check is an error.
     """
-    # Simulate connectivity check with random results
-    is_reachable = random.choice([True, True, True, False])  # 75% success rate
-    
-    if is_reachable:
-        output = f"""
-        Connectivity Check Results for {server_address}:
-        ================================================
-        Target: {server_address}
-        Status: REACHABLE
-        
-        Ping Test:
-        Sending 5 ICMP packets to {server_address}
-        Success rate: 100% (5/5)
-        Round-trip time: min/avg/max = 8/12/18 ms
-        
-        TCP Connection Test:
-        Port 80 (HTTP): OPEN
-        Port 443 (HTTPS): OPEN
-        Port 22 (SSH): OPEN
-        
-        DNS Resolution: SUCCESS
-        Resolved IP: {server_address}
-        
-        Overall Status: CONNECTED
-        """
-        network_status = "healthy"
-    else:
-        output = f"""
-        Connectivity Check Results for {server_address}:
-        ================================================
-        Target: {server_address}
-        Status: UNREACHABLE
-        
-        Ping Test:
-        Sending 5 ICMP packets to {server_address}
-        Success rate: 0% (0/5)
-        Request timeout
-        
-        TCP Connection Test:
-        Port 80 (HTTP): TIMEOUT
-        Port 443 (HTTPS): TIMEOUT
-        Port 22 (SSH): TIMEOUT
-        
-        DNS Resolution: SUCCESS
-        Resolved IP: {server_address}
-        
-        Overall Status: DISCONNECTED
-        Issue Detected: No response from target server
-        """
+    results = await _probe(server_address)
+    error = _no_valid_targets(results)
+    if error:
+        return error
+    unreachable = results.unreachable()
+    refused = results.refused()
+    
+    if unreachable:
         network_status = "unreachable"
+    elif refused:
+        network_status = "degraded"
+    else:
+        network_status = "healthy"
     
     return {
         "tool_call_status": "success",
-        "output": output.strip(),
-        "network_status": network_status
+        "output": render_report("Connectivity Check Results", results),
+        "network_status": network_status,
+        "unreachable": unreachable,
+        "refused": refused,
+        "invalid": results.invalid(),
     }
 
 
-def check_network_latency(server_address: str, threshold_ms: int = 100) -> Dict[str, Any]:
+async def check_network_latency(server_address: str, threshold_ms: int = 100) -> Dict[str, Any]:
     """
-    Check network latency to a server and compare against threshold.
+    Check network latency to one or more servers and compare against threshold.
     
     Args:
-        server_address: IP address or hostname of the server to check
+        server_address: IP address or hostname of the server to check, or a
+            comma-separated list of them ("host", "host:port" or a URL)
         threshold_ms: Maximum acceptable latency in milliseconds (default: 100ms)
         
     Returns:
-        Dictionary with tool_call_status, output, and network_status fields
-    """
-    # Simulate latency measurement
-    avg_latency = random.randint(15, 150)
-    is_high_latency = avg_latency > threshold_ms
-    
-    output = f"""
-    Latency Check Results for {server_address}:
-    ===========================================
-    Target: {server_address}
-    Threshold: {threshold_ms} ms
-    
-    Latency Measurements (10 samples):
-    Minimum: {avg_latency - 5} ms
-    Average: {avg_latency} ms
-    Maximum: {avg_latency + 10} ms
-    Jitter: {random.randint(2, 8)} ms
-    
-    Threshold Comparison:
-    Average Latency: {avg_latency} ms
-    Threshold: {threshold_ms} ms
-    Status: {'EXCEEDED' if is_high_latency else 'WITHIN LIMITS'}
-    
-    Path Analysis:
-    Hop Count: {random.randint(5, 12)}
-    Bottleneck Detected: {'YES - High latency detected' if is_high_latency else 'NO'}
+        Dictionary with tool_call_status, output, network_status and the lists
+        of unreachable, high-latency, refused (host up, port closed) and invalid
+        (malformed) targets. Without any valid target the check is an error.
     """
-    
-    network_status = "high_latency" if is_high_latency else "healthy"
+    results = await _probe(server_address, samples=LATENCY_SAMPLES)
+    error = _no_valid_targets(results)
+    if error:
+        return error
+    high_latency = results.high_latency(threshold_ms)
+    unreachable = results.unreachable()
+    refused = results.refused()
+    
+    if unreachable:
+        network_status = "unreachable"
+    elif high_latency:
+        network_status = "high_latency"
+    elif refused:
+        network_status = "degraded"
+    else:
+        network_status = "healthy"
     
     return {
         "tool_call_status": "success",
-        "output": output.strip(),
-        "network_status": network_status
+        "output": render_report("Latency Check Results", results, threshold_ms),
+        "network_status": network_status,
+        "unreachable": unreachable,
+        "high_latency": high_latency,
+        "refused": refused,
+        "invalid": results.invalid(),
     }
 
 
@@ -134,10 +170,12 @@ def check_security_alerts() -> Dict[str, Any]:
         Dictionary with tool_call_status, output, and network_status fields
     """
     # Simulate security alert detection
-    has_alerts = random.choice([True, False, False])  # 33% chance of alerts
+    simulator = get_simulator()
+    rng = simulator.rng("check_security_alerts")
+    has_alerts = simulator.fault("security_alert", "network", rng, 1 / 3)
     
     if has_alerts:
-        alert_types = random.choice([
+        alert_types = rng.choice([
             ["Suspicious login attempts", "Port scan detected"],
             ["Firewall rule violation", "Unauthorized access attempt"],
             ["DDoS attack detected", "Malware signature detected"]
@@ -156,15 +194,15 @@ def check_security_alerts() -> Dict[str, Any]:
             output += f"""
         Alert #{i}: {alert}
             Severity: {'HIGH' if 'attack' in alert.lower() or 'malware' in alert.lower() else 'MEDIUM'}
-            Source IP: 192.168.{random.randint(1, 255)}.{random.randint(1, 255)}
-            Timestamp: 2025-01-15 14:{random.randint(40, 50)}:{random.randint(0, 59)} UTC
+            Source IP: 192.168.{rng.randint(1, 255)}.{rng.randint(1, 255)}
+            Timestamp: 2025-01-15 14:{rng.randint(40, 50)}:{rng.randint(0, 59)} UTC
             Status: ACTIVE"""
         
         output += f"""
         
         Firewall Status:
-        Active Connections: {random.randint(500, 2000)}
-        Blocked Connections (last hour): {random.randint(50, 500)}
+        Active Connections: {rng.randint(500, 2000)}
+        Blocked Connections (last hour): {rng.randint(50, 500)}
         Intrusion Detection: ACTIVE
         
         Recommendation: Immediate remediation required
@@ -181,8 +219,8 @@ def check_security_alerts() -> Dict[str, Any]:
         Active Alerts: 0
         Firewall Status: NORMAL
         Intrusion Detection: ACTIVE (No threats detected)
-        Active Connections: {random.randint(500, 2000)}
-        Blocked Connections (last hour): {random.randint(0, 20)}
+        Active Connections: {rng.randint(500, 2000)}
+        Blocked Connections (last hour): {rng.randint(0, 20)}
         
         Overall Status: SECURE
         """
@@ -195,63 +233,35 @@ def check_security_alerts() -> Dict[str, Any]:
     }
 
 
-def check_network_status(server_addresses: str) -> Dict[str, Any]:
+async def check_network_status(server_addresses: str, threshold_ms: int = 100) -> Dict[str, Any]:
     """
     Comprehensive network status check for multiple servers.
     
     Args:
         server_addresses: Comma-separated list of server addresses to check
+        threshold_ms: Maximum acceptable latency in milliseconds (default: 100ms)
         
     Returns:
-        Dictionary with tool_call_status, output, and network_status fields
-    """
-    addresses = [addr.strip() for addr in server_addresses.split(",")]
-    issues_found = []
-    
-    output = f"""
-    Comprehensive Network Status Check:
-    ===================================
-    Check Time: 2025-01-15 14:50:00 UTC
-    Servers Checked: {len(addresses)}
-    
-    Server Status Summary:
-    """
-    
-    for addr in addresses:
-        is_healthy = random.choice([True, True, False])  # 66% healthy
-        if not is_healthy:
-            issues_found.append(addr)
-        
-        output += f"""
-    {addr}:
-        Connectivity: {'UP' if is_healthy else 'DOWN'}
-        Latency: {random.randint(10, 200)} ms
-        Response Time: {'Normal' if is_healthy else 'Timeout'}
-        """
-    
-    if issues_found:
-        output += f"""
-    
-    Issues Detected:
-    - {len(issues_found)} server(s) with connectivity problems: {', '.join(issues_found)}
-    - Network stability: DEGRADED
-    
-    Recommendation: Remediation required
+        Dictionary with tool_call_status, output, network_status and the lists
+        of unreachable, high-latency, refused (host up, port closed) and invalid
+        (malformed) targets. Without any valid target the check is an error.
     """
-        network_status = "degraded"
-    else:
-        output += f"""
-    
-    Overall Network Status: HEALTHY
-    All servers responding normally
-    No issues detected
-    """
-        network_status = "healthy"
+    results = await _probe(server_addresses)
+    error = _no_valid_targets(results)
+    if error:
+        return error
+    unreachable = results.unreachable()
+    high_latency = results.high_latency(threshold_ms)
+    refused = results.refused()
     
     return {
         "tool_call_status": "success",
-        "output": output.strip(),
-        "network_status": network_status
+        "output": render_report("Comprehensive Network Status Check", results, threshold_ms),
+        "network_status": "degraded" if unreachable or high_latency or refused else "healthy",
+        "unreachable": unreachable,
+        "high_latency": high_latency,
+        "refused": refused,
+        "invalid": results.invalid(),
     }
 
 
@@ -271,7 +281,9 @@ def restart_network_service(service_name: str, server_address: str) -> Dict[str,
         Dictionary with tool_call_status, output, and network_status fields
     """
     # Simulate service restart
-    restart_successful = random.choice([True, True, True, False])  # 75% success rate
+    simulator = get_simulator()
+    rng = simulator.rng("restart_network_service", server_address)
+    restart_successful = simulator.remediate("restart_network_service", server_address, rng, 0.75)
     
     if restart_successful:
         output = f"""
@@ -288,13 +300,13 @@ def restart_network_service(service_name: str, server_address: str) -> Dict[str,
         After: RUNNING
         
         Verification:
-        Service PID: {random.randint(1000, 9999)}
+        Service PID: {rng.randint(1000, 9999)}
         Uptime: 0 seconds (just restarted)
         Port Status: LISTENING
         
         Health Check:
         Service responding: YES
-        Response time: {random.randint(5, 20)} ms
+        Response time: {rng.randint(5, 20)} ms
         
         Result: Service successfully restarted and operational
         """
@@ -340,7 +352,9 @@ def adjust_firewall_rules(rule_action: str, source_ip: str, destination_ip: str,
         Dictionary with tool_call_status, output, and network_status fields
     """
     # Simulate firewall rule adjustment
-    rule_applied = random.choice([True, True, True, False])  # 75% success rate
+    simulator = get_simulator()
+    rng = simulator.rng("adjust_firewall_rules", destination_ip)
+    rule_applied = simulator.remediate("adjust_firewall_rules", destination_ip, rng, 0.75)
     
     if rule_applied:
         output = f"""
@@ -355,7 +369,7 @@ def adjust_firewall_rules(rule_action: str, source_ip: str, destination_ip: str,
         Status: SUCCESS
         
         Rule Applied:
-        Rule ID: FW-{random.randint(1000, 9999)}
+        Rule ID: FW-{rng.randint(1000, 9999)}
         Previous Status: {'BLOCKED' if rule_action == 'allow' else 'ALLOWED'}
         New Status: {'ALLOWED' if rule_action == 'allow' else 'BLOCKED'}
         
@@ -406,7 +420,9 @@ def fix_connectivity_issue(server_address: str, issue_type: str = "general") ->
         Dictionary with tool_call_status, output, and network_status fields
     """
     # Simulate connectivity fix attempt
-    fix_successful = random.choice([True, True, False])  # 66% success rate
+    simulator = get_simulator()
+    rng = simulator.rng("fix_connectivity_issue", server_address)
+    fix_successful = simulator.remediate("fix_connectivity_issue", server_address, rng, 2 / 3)
     
     remediation_steps = {
         "general": ["Flushing ARP cache", "Restarting network interface", "Checking routing table"],
@@ -439,7 +455,7 @@ def fix_connectivity_issue(server_address: str, issue_type: str = "general") ->
     Verification:
     Connectivity Test: PASSED
     Ping Test: SUCCESS (5/5 packets)
-    Response Time: {random.randint(8, 25)} ms
+    Response Time: {rng.randint(8, 25)} ms
     
     Result: Connectivity issue resolved
     Server {server_address} is now reachable
@@ -479,7 +495,9 @@ def optimize_network_latency(server_address: str, optimization_method: str = "ro
         Dictionary with tool_call_status, output, and network_status fields
     """
     # Simulate latency optimization
-    optimization_successful = random.choice([True, True, False])  # 66% success rate
+    simulator = get_simulator()
+    rng = simulator.rng("optimize_network_latency", server_address)
+    optimization_successful = simulator.remediate("optimize_network_latency", server_address, rng, 2 / 3)
     
     methods = {
         "routing": ["Analyzing routing paths", "Updating routing table", "Optimizing BGP paths"],
@@ -489,8 +507,8 @@ def optimize_network_latency(server_address: str, optimization_method: str = "ro
     
     steps = methods.get(optimization_method, methods["routing"])
     
-    initial_latency = random.randint(100, 200)
-    optimized_latency = initial_latency - random.randint(20, 60) if optimization_successful else initial_latency
+    initial_latency = rng.randint(100, 200)
+    optimized_latency = initial_latency - rng.randint(20, 60) if optimization_successful else initial_latency
     
     output = f"""
     Network Latency Optimization Results:
@@ -562,7 +580,9 @@ def block_security_threat(source_ip: str, threat_type: str = "suspicious_activit
         Dictionary with tool_call_status, output, and network_status fields
     """
     # Simulate threat blocking
-    block_successful = random.choice([True, True, True, False])  # 75% success rate
+    simulator = get_simulator()
+    rng = simulator.rng("block_security_threat", source_ip)
+    block_successful = simulator.remediate("block_security_threat", source_ip, rng, 0.75)
     
     if block_successful:
         output = f"""
@@ -575,7 +595,7 @@ def block_security_threat(source_ip: str, threat_type: str = "suspicious_activit
         Status: SUCCESS
         
         Firewall Rule Applied:
-        Rule ID: SEC-{random.randint(1000, 9999)}
+        Rule ID: SEC-{rng.randint(1000, 9999)}
         Action: BLOCK
         Source IP: {source_ip}
         Destination: ALL
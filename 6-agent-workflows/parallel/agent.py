@@ -8,7 +8,7 @@ from google.adk.agents import Agent
 from google.adk.apps.app import App
 from google.adk.models import Gemini
 from google.genai import types
-from google.adk.agents import ParallelAgent, SequentialAgent
+from google.adk.agents import SequentialAgent
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -28,7 +28,84 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(name)s - %(message)s'
 )
 
-from .app_utils.tools import check_cpu_utilization_r1_sea3, check_cpu_utilization_r2_sea3
+from .app_utils.tools import check_cpu_utilization
+from .app_utils.fleet import aggregate_results, load_inventory, run_fleet_checks, select_devices
+from .app_utils.anomaly import analyze_fleet, format_anomaly_table
+
+from typing import AsyncGenerator
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.tools import ToolContext
+
+# Inventory selector used when the user does not name devices (e.g. "site=sea3")
+DEFAULT_FLEET_SELECTOR = os.environ.get("FLEET_SELECTOR", "all")
+
+
+def set_fleet_selector(selector: str, tool_context: ToolContext) -> dict:
+    """Select the devices to check from the inventory.
+
+    Args:
+        selector: Comma-separated terms that must all match, e.g. "site=sea3",
+            "role=edge,site=sea*" or a hostname glob like "r*-pdx1". Use "all" for every device.
+
+    Returns:
+        The selector and the devices it matches.
+    """
+    devices = select_devices(load_inventory(), selector)
+    tool_context.state["fleet_selector"] = selector
+    return {"selector": selector, "devices": [d["hostname"] for d in devices]}
+
+
+class FleetHealthCheckAgent(BaseAgent):
+    """Checks every selected device with concurrent tool calls (no LLM calls)."""
+
+    max_concurrency: int = 16
+    output_key: str = "fleet_health_results"
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        selector = ctx.session.state.get("fleet_selector") or DEFAULT_FLEET_SELECTOR
+        devices = select_devices(load_inventory(), selector)
+        results = await run_fleet_checks(devices, check_cpu_utilization, self.max_concurrency)
+        summary = aggregate_results(selector, results)
+
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(
+                role="model",
+                parts=[types.Part(text=(
+                    f"Checked {summary['device_count']} devices ({selector}): "
+                    f"{summary['status_counts']}"
+                ))],
+            ),
+            actions=EventActions(state_delta={self.output_key: summary}),
+        )
+
+
+class FleetAnomalyAnalysisAgent(BaseAgent):
+    """Ranks anomalous devices from the fleet results with NumPy (no LLM calls)."""
+
+    input_key: str = "fleet_health_results"
+    output_key: str = "fleet_anomaly_table"
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        fleet = ctx.session.state.get(self.input_key) or {}
+        analysis = analyze_fleet(fleet.get("devices", []))
+        table = format_anomaly_table(analysis, fleet.get("selector"))
+        failed = fleet.get("failed_devices")
+        if failed:
+            table += "\nUnreachable devices: " + ", ".join(d["hostname"] for d in failed)
+
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=table)]),
+            actions=EventActions(state_delta={self.output_key: table}),
+        )
+
 
 # Define the subagents
 START_AGENT_SYSTEM_PROMPT = """## Role: Incident Context Initialization Agent
@@ -47,6 +124,7 @@ Your responsibility is to establish the **problem context** for downstream diagn
 
 - Act as the workflow entry point
 - Present the customer-reported complaint exactly as provided
+- If the complaint names devices, a site or a role, call `set_fleet_selector` with a matching selector (e.g. `site=sea3`, `role=edge,site=pdx1`, `r2-sea3`)
 - Do not perform analysis, diagnostics, or assumptions
 
 ---
@@ -63,94 +141,6 @@ This output serves as the **shared incident context** for all subsequent agents.
 
 
 
-SYSTEM_PROMPT_CHECK_CPU_UTILIZATION_R1_SEA3 = """
-## Role: CPU Health Validation Agent (r1-sea3)
-
-You are a **network performance monitoring assistant** responsible for validating CPU and memory utilization on router **r1-sea3**.
-
----
-
-## Primary Responsibility
-
-Your responsibility is to confirm whether **CPU or memory utilization** on r1-sea3 could be contributing to throughput or performance issues.
-
----
-
-## What You Must Do
-
-- Invoke the CPU utilization tool for r1-sea3
-- Review:
-  - CPU utilization percentage
-  - Memory utilization
-  - Reported operational status
-- Validate whether metrics fall within acceptable thresholds
-
----
-
-## Tool Usage
-
-You must use the following tool:
-
-- **`check_cpu_utilization_r1_sea3`**
-  - Returns CPU, memory, and system health metrics for r1-sea3
-
----
-
-## Output Expectations
-
-- Clearly state whether CPU utilization is:
-  - Normal
-  - Elevated
-- Confirm whether r1-sea3 is operating within healthy parameters
-- Do not infer root cause beyond CPU and memory indicators
-
-Your output provides a **baseline comparison** for parallel analysis.
-
-"""
-
-
-SYSTEM_PROMPT_CHECK_CPU_UTILIZATION_R2_SEA3 = """
-## Role: CPU Anomaly Detection Agent (r2-sea3)
-
-You are a **network performance analysis assistant** responsible for identifying high CPU utilization conditions on router **r2-sea3**.
-
----
-
-## Primary Responsibility
-
-Your responsibility is to determine whether **high CPU utilization** on r2-sea3 is likely contributing to observed throughput or performance degradation.
-
----
-
-## What You Must Do
-
-- Invoke the CPU utilization tool for r2-sea3
-- Analyze:
-  - CPU utilization relative to thresholds
-  - Memory usage
-  - Reported system status
-- Identify whether CPU utilization exceeds acceptable operational limits
-
----
-
-## Tool Usage
-
-You must use the following tool:
-
-- **`check_cpu_utilization_r2_sea3`**
-  - Returns CPU metrics, status indicators, and impact assessment for r2-sea3
-
----
-
-## Output Expectations
-
-- Clearly state that high CPU utilization is present (if detected)
-- Highlight potential performance impact as reported by the tool
-- Avoid speculative causes beyond CPU-related constraints
-
-Your output identifies a **likely performance bottleneck** in the parallel workflow.
-"""
-
 SYSTEM_PROMPT_SUMMARY_AGENT = """## Role: Parallel Diagnostics Correlation & Summary Agent
 
 You are a **network troubleshooting assistant** responsible for correlating parallel diagnostic results and presenting a clear operational summary.
@@ -159,16 +149,18 @@ You are a **network troubleshooting assistant** responsible for correlating para
 
 ## Inputs You Will Receive
 
-You will receive CPU utilization results from parallel agents:
-- r1-sea3 CPU results: `{cpu_utilization_r1_sea3_results}`
-- r2-sea3 CPU results: `{cpu_utilization_r2_sea3_results}`
+You will receive a ranked anomaly table computed over every checked device
+(fleet-wide z-scores, robust z-scores within each role, hard limits such as CPU >= 70%),
+followed by the fleet and per-role percentile bands:
+
+{fleet_anomaly_table}
 
 ---
 
 ## Primary Responsibility
 
 Your responsibility is to:
-- Compare CPU and memory utilization across both devices
+- Explain the ranked anomalies and compare them with the fleet and role bands
 - Identify discrepancies or anomalies
 - Determine which device is most likely contributing to performance issues
 
@@ -197,33 +189,8 @@ start_agent = Agent(
         temperature=0.0,
     ),
     description="This agent is the starting point of the workflow.",
-    instruction=START_AGENT_SYSTEM_PROMPT
-)
-
-
-check_cpu_utilization_r1_sea3_agent = Agent(
-    name="check_cpu_utilization_r1_sea3_agent",
-    model=Gemini(
-        model="gemini-3-flash-preview",
-        temperature=0.0,
-    ),
-    description="This agent checks the CPU utilization of r1-sea3 device.",
-    instruction=SYSTEM_PROMPT_CHECK_CPU_UTILIZATION_R1_SEA3,
-    tools=[check_cpu_utilization_r1_sea3],
-    output_key="cpu_utilization_r1_sea3_results",
-)   
-
-
-check_cpu_utilization_r2_sea3_agent = Agent(
-    name="check_cpu_utilization_r2_sea3_agent",
-    model=Gemini(
-        model="gemini-3-flash-preview",
-        temperature=0.0,
-    ),
-    description="This agent checks the CPU utilization of r2-sea3 device.",
-    instruction=SYSTEM_PROMPT_CHECK_CPU_UTILIZATION_R2_SEA3,
-    tools=[check_cpu_utilization_r2_sea3],
-    output_key="cpu_utilization_r2_sea3_results",
+    instruction=START_AGENT_SYSTEM_PROMPT,
+    tools=[set_fleet_selector],
 )
 
 
@@ -238,21 +205,24 @@ summary_agent = Agent(
     output_key="summary_results",   
 )
 
-# Create the parallel agent with minimal callback   
-parallel_network_tshoot_workflow_agent = ParallelAgent(
+# Checks all selected devices concurrently; one event, no per-device LLM agent
+parallel_network_tshoot_workflow_agent = FleetHealthCheckAgent(
                                             name="NetworkDeviceTroubleshootingAgent",
-                                            sub_agents=[check_cpu_utilization_r1_sea3_agent, 
-                                                        check_cpu_utilization_r2_sea3_agent],
                                             description="""This agent will troubleshoot 
                                             low throughput issues on a 
                                             network device by checking the CPU utilization 
-                                            on given network devices."""
-                                            
+                                            on the devices selected from the inventory."""
+)
+
+fleet_anomaly_analysis_agent = FleetAnomalyAnalysisAgent(
+    name="FleetAnomalyAnalysisAgent",
+    description="Ranks anomalous devices from the fleet CPU, memory and temperature metrics.",
 )
 
 high_cpu_utilization_sequential_agent = SequentialAgent(
     name="HighCPUUtilizationSequentialAgent",
-    sub_agents=[start_agent,parallel_network_tshoot_workflow_agent,summary_agent],
+    sub_agents=[start_agent,parallel_network_tshoot_workflow_agent,
+                fleet_anomaly_analysis_agent,summary_agent],
     description="""This agent will troubleshoot high CPU utilization issues on a 
     network device by checking the CPU utilization on given network devices."""
 )
@@ -0,0 +1,182 @@
+"""
+Vectorized fleet anomaly pre-analysis for the parallel workflow.
+
+The synthesis agent used to read every device report to spot the outlier.
+analyze_fleet() does that part with NumPy over the collected metrics:
+
+- fleet-wide z-scores per metric
+- robust (median/MAD) z-scores within each device's peer group (same role),
+  falling back to the whole fleet for groups too small to have a spread
+- p5/p50/p95 bands per role and per site
+
+and returns a ranked anomaly table, so the agent receives a few rows instead
+of N verbose reports.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+METRICS = ("cpu_utilization", "memory_utilization", "temperature_c")
+# Hard limits that make a device anomalous regardless of its peers
+METRIC_LIMITS = {"cpu_utilization": 70.0, "memory_utilization": 85.0, "temperature_c": 60.0}
+
+# 0.6745 scales MAD to the standard deviation of a normal distribution
+_MAD_SCALE = 0.6745
+
+
+def _zscores(values: np.ndarray) -> np.ndarray:
+    """Column-wise z-scores; NaN-aware, 0 where a column has no spread."""
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (values - mean) / std
+    return np.where(std > 0, z, 0.0)
+
+
+def _robust_zscores(values: np.ndarray) -> np.ndarray:
+    """Column-wise robust z-scores 0.6745 * (x - median) / MAD; 0 where MAD is 0."""
+    median = np.nanmedian(values, axis=0)
+    mad = np.nanmedian(np.abs(values - median), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = _MAD_SCALE * (values - median) / mad
+    return np.where(mad > 0, z, 0.0)
+
+
+def _bands(values: np.ndarray, keys: np.ndarray) -> Dict[str, Dict[str, List[float]]]:
+    """p5/p50/p95 of every metric per group key."""
+    bands = {}
+    for key in np.unique(keys):
+        group = values[keys == key]
+        percentiles = np.nanpercentile(group, [5, 50, 95], axis=0)
+        bands[str(key)] = {
+            metric: [round(float(p), 1) for p in percentiles[:, i]]
+            for i, metric in enumerate(METRICS)
+        }
+    return bands
+
+
+def analyze_fleet(
+    devices: Sequence[Dict[str, Any]],
+    z_threshold: float = 3.0,
+    robust_threshold: float = 3.5,
+    min_group_size: int = 5,
+    top_k: int = 20,
+) -> Dict[str, Any]:
+    """
+    Rank anomalous devices from per-device metric rows.
+
+    Args:
+        devices: Rows with "hostname", "site", "role" and the METRICS fields.
+        z_threshold: |z| above which a device is anomalous fleet-wide.
+        robust_threshold: |robust z| above which a device is anomalous within its role.
+        min_group_size: Smallest role group scored on its own; smaller groups use the fleet.
+        top_k: Maximum number of anomalies returned.
+
+    Returns:
+        {"device_count", "anomaly_count", "anomalies": [ranked rows],
+         "fleet": per-metric mean/std/bands, "bands_by_role", "bands_by_site"}
+    """
+    count = len(devices)
+    if count == 0:
+        return {"device_count": 0, "anomaly_count": 0, "anomalies": [], "fleet": {},
+                "bands_by_role": {}, "bands_by_site": {}}
+
+    values = np.array(
+        [[np.nan if d.get(m) is None else float(d[m]) for m in METRICS] for d in devices],
+        dtype=float,
+    )
+    roles = np.array([str(d.get("role", "unknown")) for d in devices])
+    sites = np.array([str(d.get("site", "unknown")) for d in devices])
+
+    z = _zscores(values)
+    robust = _robust_zscores(values)  # fleet-wide fallback
+    for role in np.unique(roles):
+        mask = roles == role
+        if mask.sum() >= min_group_size:
+            robust[mask] = _robust_zscores(values[mask])
+
+    limits = np.array([METRIC_LIMITS[m] for m in METRICS])
+    over_limit = np.nan_to_num(values, nan=-np.inf) >= limits
+    abs_z = np.nan_to_num(np.abs(z))
+    abs_robust = np.nan_to_num(np.abs(robust))
+
+    flagged = (
+        (abs_z >= z_threshold) | (abs_robust >= robust_threshold) | over_limit
+    )
+    # One score per device: the strongest signal across metrics, with hard-limit
+    # breaches always ranked above purely statistical outliers.
+    score = np.maximum(abs_z / z_threshold, abs_robust / robust_threshold) + over_limit * 10.0
+    device_score = np.where(flagged, score, 0.0).max(axis=1)
+    worst_metric = np.where(flagged, score, -1.0).argmax(axis=1)
+
+    anomalous = np.flatnonzero(device_score > 0)
+    ranked = anomalous[np.argsort(-device_score[anomalous], kind="stable")][:top_k]
+
+    anomalies = []
+    for rank, i in enumerate(ranked, 1):
+        metric_index = worst_metric[i]
+        row = {
+            "rank": rank,
+            "hostname": devices[i].get("hostname"),
+            "site": str(sites[i]),
+            "role": str(roles[i]),
+            "metric": METRICS[metric_index],
+            "value": round(float(values[i, metric_index]), 1),
+            "z": round(float(z[i, metric_index]), 2),
+            "robust_z": round(float(robust[i, metric_index]), 2),
+            "over_limit": bool(over_limit[i, metric_index]),
+            "score": round(float(device_score[i]), 2),
+        }
+        for m, metric in enumerate(METRICS):
+            row[metric] = None if np.isnan(values[i, m]) else round(float(values[i, m]), 1)
+        anomalies.append(row)
+
+    fleet_percentiles = np.nanpercentile(values, [5, 50, 95], axis=0)
+    fleet = {
+        metric: {
+            "mean": round(float(np.nanmean(values[:, m])), 1),
+            "std": round(float(np.nanstd(values[:, m])), 1),
+            "p5_p50_p95": [round(float(p), 1) for p in fleet_percentiles[:, m]],
+        }
+        for m, metric in enumerate(METRICS)
+    }
+    return {
+        "device_count": count,
+        "anomaly_count": int(len(anomalous)),
+        "anomalies": anomalies,
+        "fleet": fleet,
+        "bands_by_role": _bands(values, roles),
+        "bands_by_site": _bands(values, sites),
+    }
+
+
+def format_anomaly_table(analysis: Dict[str, Any], selector: Optional[str] = None) -> str:
+    """Compact markdown for the synthesis agent: ranked anomalies plus fleet bands."""
+    lines = [
+        f"Fleet: {analysis['device_count']} devices"
+        + (f" ({selector})" if selector else "")
+        + f", {analysis['anomaly_count']} anomalous"
+        + (f", top {len(analysis['anomalies'])} shown" if analysis["anomaly_count"] > len(analysis["anomalies"]) else ""),
+        "",
+    ]
+    if analysis["anomalies"]:
+        lines.append("| # | device | site | role | cpu % | mem % | temp C | signal | z | robust z |")
+        lines.append("|---|---|---|---|---|---|---|---|---|---|")
+        for row in analysis["anomalies"]:
+            signal = row["metric"] + (" over limit" if row["over_limit"] else "")
+            lines.append(
+                f"| {row['rank']} | {row['hostname']} | {row['site']} | {row['role']} | "
+                f"{row['cpu_utilization']} | {row['memory_utilization']} | {row['temperature_c']} | "
+                f"{signal} | {row['z']} | {row['robust_z']} |"
+            )
+    else:
+        lines.append("No anomalous devices.")
+    lines.append("")
+    lines.append("Fleet p5/p50/p95: " + "; ".join(
+        f"{metric} {'/'.join(str(v) for v in stats['p5_p50_p95'])}"
+        for metric, stats in analysis["fleet"].items()
+    ))
+    for role, bands in analysis["bands_by_role"].items():
+        lines.append(f"Role {role} cpu p5/p50/p95: {'/'.join(str(v) for v in bands['cpu_utilization'])}")
+    return "\n".join(lines)
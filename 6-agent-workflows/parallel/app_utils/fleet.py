@@ -0,0 +1,119 @@
+"""
+Inventory-driven fleet health checks for the parallel workflow.
+
+Instead of one LLM sub-agent per router, the devices picked by an inventory
+selector are checked with plain concurrent tool calls (bounded by a
+semaphore) and the results are folded into a single compact summary for one
+synthesis agent. Adding devices adds tool time, not LLM calls.
+"""
+
+import asyncio
+import fnmatch
+import inspect
+import json
+import logging
+import os
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INVENTORY_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "device_inventory.json",
+)
+
+
+def load_inventory(path: str = DEFAULT_INVENTORY_FILE) -> List[Dict[str, Any]]:
+    """Device records ({"hostname", "site", "role", ...}) from a JSON inventory file."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def select_devices(inventory: List[Dict[str, Any]], selector: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Devices matching a selector, in inventory order.
+
+    A selector is a comma-separated list of terms that must all match:
+    "key=value" compares an inventory field, a bare term matches the hostname.
+    Values may be globs. "all" (or an empty selector) selects every device.
+
+    Examples: "site=sea3", "role=edge,site=sea*", "r*-pdx1".
+    """
+    selector = (selector or "").strip()
+    if selector.lower() in ("", "all", "*"):
+        return list(inventory)
+
+    terms = []
+    for term in (t.strip() for t in selector.split(",")):
+        if not term:
+            continue
+        key, sep, value = term.partition("=")
+        if not sep:
+            key, value = "hostname", term
+        terms.append((key.strip(), value.strip().lower()))
+
+    return [
+        device for device in inventory
+        if all(fnmatch.fnmatchcase(str(device.get(key, "")).lower(), value) for key, value in terms)
+    ]
+
+
+async def run_fleet_checks(
+    devices: List[Dict[str, Any]],
+    check: Callable[[str], Any],
+    max_concurrency: int = 16,
+) -> List[Dict[str, Any]]:
+    """
+    Run a device check for every device, at most max_concurrency at a time.
+
+    Sync checks run in worker threads, async checks on the event loop. A
+    failing check is reported as a tool_call_status "error" result instead of
+    failing the whole fan-out. Results are returned in device order.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    is_async = inspect.iscoroutinefunction(check)
+
+    async def _check_one(device: Dict[str, Any]) -> Dict[str, Any]:
+        hostname = device["hostname"]
+        async with semaphore:
+            try:
+                if is_async:
+                    result = await check(hostname)
+                else:
+                    result = await asyncio.to_thread(check, hostname)
+            except Exception as e:
+                logger.warning("Device check failed for %s: %s", hostname, e)
+                result = {"tool_call_status": "error", "error": str(e), "reachability": "no"}
+        return {**device, **result}
+
+    return await asyncio.gather(*(_check_one(device) for device in devices))
+
+
+# Per-device fields kept in the aggregated result (the verbose report is dropped)
+SUMMARY_FIELDS = ("hostname", "site", "role", "cpu_utilization", "memory_utilization",
+                  "temperature_c", "status")
+
+
+def aggregate_results(selector: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fold per-device results into one compact summary for the synthesis agent:
+    status counts, failed devices and one row per device, highest CPU first.
+    """
+    succeeded = [r for r in results if r.get("tool_call_status") == "success"]
+    status_counts = Counter(r.get("status", "UNKNOWN") for r in succeeded)
+
+    rows = [
+        {field: result.get(field) for field in SUMMARY_FIELDS}
+        for result in sorted(succeeded, key=lambda r: r.get("cpu_utilization", 0), reverse=True)
+    ]
+    return {
+        "selector": selector,
+        "device_count": len(results),
+        "status_counts": dict(status_counts),
+        "failed_devices": [
+            {"hostname": r["hostname"], "error": r.get("error")} for r in results
+            if r.get("tool_call_status") != "success"
+        ],
+        "devices": rows,
+    }
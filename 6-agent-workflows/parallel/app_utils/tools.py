@@ -4,27 +4,35 @@ All functions accept router_name as argument and return JSON with tool_call_stat
 """
 
 import json
-from typing import Dict, Any
-
-
-def check_cpu_utilization_r1_sea3(device_name: str = "r1-sea3") -> Dict[str, Any]:
-    """
-    Check CPU utilization on r1-sea3 device.
-    
-    Args:
-        device_name: Name of the device (default: r1-sea3)
-        
-    Returns:
-        Dictionary with tool_call_status, output, and reachability fields
-    """
-    # Simulated CPU utilization values for r1-sea3: Normal CPU utilization
-    cpu_utilization = 38.5
-    memory_utilization = 52.0
-    
-    # Determine status
-    status = "NORMAL" if cpu_utilization < 70 else "HIGH"
-    
-    output = f"""
+import random
+from typing import Dict, Any, Tuple
+
+CPU_HIGH_THRESHOLD = 70
+
+# Simulated (cpu %, memory %, temperature C) per device. r2-sea3 is the
+# device with the high CPU problem; other devices get stable normal values.
+SIMULATED_METRICS: Dict[str, Tuple[float, float, int]] = {
+    "r1-sea3": (38.5, 52.0, 42),
+    "r2-sea3": (87.3, 68.0, 48),
+}
+
+
+def simulated_metrics(device_name: str) -> Tuple[float, float, int]:
+    """Stable simulated (cpu %, memory %, temperature C) for a device."""
+    if device_name in SIMULATED_METRICS:
+        return SIMULATED_METRICS[device_name]
+    rng = random.Random(device_name)
+    return (
+        round(rng.uniform(20, 55), 1),
+        round(rng.uniform(35, 65), 1),
+        rng.randint(36, 46),
+    )
+
+
+def _cpu_report(device_name: str, cpu_utilization: float, memory_utilization: float,
+                temperature_c: int, status: str) -> str:
+    if status == "NORMAL":
+        return f"""
 CPU Utilization Report for {device_name}:
 ==========================================
 
@@ -45,7 +53,7 @@ System Metrics:
 ===============
 - CPU Usage: {cpu_utilization}% (Normal)
 - Memory Usage: {memory_utilization}%
-- Temperature: 42°C (Normal)
+- Temperature: {temperature_c}°C (Normal)
 - Uptime: 45 days, 12 hours, 23 minutes
 
 Conclusion:
@@ -53,35 +61,7 @@ Conclusion:
 {device_name} is operating within normal parameters. CPU utilization 
 is healthy and should not impact throughput performance.
 """
-    
-    return {
-        "tool_call_status": "success",
-        "output": output.strip(),
-        "reachability": "yes",
-        "cpu_utilization": cpu_utilization,
-        "memory_utilization": memory_utilization,
-        "status": status
-    }
-
-
-def check_cpu_utilization_r2_sea3(device_name: str = "r2-sea3") -> Dict[str, Any]:
-    """
-    Check CPU utilization on r2-sea3 device and identify high CPU utilization issues.
-    
-    Args:
-        device_name: Name of the device (default: r2-sea3)
-        
-    Returns:
-        Dictionary with tool_call_status, output, and reachability fields
-    """
-    # Simulated CPU utilization values for r2-sea3: High CPU utilization (causing throughput issues)
-    cpu_utilization = 87.3
-    memory_utilization = 68.0
-    
-    # Determine status
-    status = "HIGH" if cpu_utilization >= 70 else "NORMAL"
-    
-    output = f"""
+    return f"""
 CPU Utilization Report for {device_name}:
 ==========================================
 
@@ -102,13 +82,13 @@ System Metrics:
 ===============
 - CPU Usage: {cpu_utilization}% (HIGH - Exceeds 70% threshold)
 - Memory Usage: {memory_utilization}%
-- Temperature: 48°C (Elevated)
+- Temperature: {temperature_c}°C (Elevated)
 - Uptime: 45 days, 12 hours, 23 minutes
 
 Root Cause Identification:
 ==========================
 The high CPU utilization on {device_name} ({cpu_utilization}%) is likely 
-the primary cause of reduced throughput compared to r1-sea3.
+the primary cause of reduced throughput compared to its peers.
 
 Impact Assessment:
 ==================
@@ -117,7 +97,7 @@ Performance degradation expected due to high CPU ({cpu_utilization}%):
   - Reduced forwarding capacity
   - Potential packet drops under load
   - Increased latency
-  - Lower throughput compared to r1-sea3
+  - Lower throughput compared to peer devices
 
 Recommendations:
 ================
@@ -129,14 +109,31 @@ Recommendations:
 6. Check for background processes or scheduled tasks
 7. Review routing table size and complexity
 """
-    
+
+
+def check_cpu_utilization(device_name: str) -> Dict[str, Any]:
+    """
+    Check CPU utilization on a device and identify high CPU utilization issues.
+
+    Args:
+        device_name: Name of the device (e.g. r1-sea3)
+
+    Returns:
+        Dictionary with tool_call_status, output, and reachability fields
+    """
+    cpu_utilization, memory_utilization, temperature_c = simulated_metrics(device_name)
+
+    # Determine status
+    status = "HIGH" if cpu_utilization >= CPU_HIGH_THRESHOLD else "NORMAL"
+    output = _cpu_report(device_name, cpu_utilization, memory_utilization, temperature_c, status)
+
     return {
         "tool_call_status": "success",
         "output": output.strip(),
         "reachability": "yes",
         "cpu_utilization": cpu_utilization,
         "memory_utilization": memory_utilization,
+        "temperature_c": temperature_c,
         "status": status,
-        "high_cpu_alert": True
+        "high_cpu_alert": status == "HIGH",
     }
-
@@ -8,7 +8,6 @@ Title: Sequential Network Troubleshooting Workflow
 from google.adk.agents import Agent
 from google.adk.apps.app import App
 from google.adk.models import Gemini
-from google.adk.agents import SequentialAgent
 import os
 import google.auth
 import logging
@@ -30,7 +29,131 @@ logging.basicConfig(
 )
 
 from .app_utils.tools import gather_device_information, check_device_status, ping_test, traceroute, check_firewall_rules
-
+from .app_utils.checkpoints import (
+    REPORT_KEY,
+    ROUTER_KEY,
+    checkpoint_callbacks,
+    discard_unfinished,
+    get_checkpoint_store,
+)
+from .app_utils.dag import StageSpec, execution_levels, run_dag
+
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+from pydantic import Field
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.tools.tool_context import ToolContext
+
+
+def set_troubleshooting_target(router_name: str, tool_context: ToolContext,
+                               refresh: bool = False) -> dict:
+    """Record the router being troubleshot, so completed diagnostic stages can be reused on a rerun.
+
+    Args:
+        router_name: Name of the Cisco router named in the request, e.g. "R1".
+        refresh: True when the user asks for fresh diagnostics; drops the
+            router's saved stage results so every stage runs again.
+
+    Returns:
+        The recorded router name and how many saved stage results were dropped.
+    """
+    tool_context.state[ROUTER_KEY] = router_name
+    dropped = get_checkpoint_store().invalidate(router_name) if refresh else 0
+    return {"router_name": router_name, "checkpoints_dropped": dropped}
+
+
+# State keys each stage reads, besides the router: the DAG's dependencies and
+# part of each diagnostic stage's checkpoint key.
+STAGE_READS: Dict[str, List[str]] = {
+    "gather_device_information_agent": ["troubleshooting_request"],
+    "check_device_status_agent": ["device_information"],
+    "ping_test_agent": ["device_information"],
+    "traceroute_agent": ["device_information"],
+    "check_firewall_rules_agent": ["device_information"],
+    "summarize_network_findings_agent": [
+        "device_information", "device_status",
+        "ping_test_results", "traceroute_results",
+        "firewall_rules_results",
+    ],
+}
+
+
+def stage_checkpoints(stage: str, output_key: str, instruction: str,
+                      tool: Callable[..., Any]) -> Dict[str, Callable[..., Any]]:
+    """Checkpoint callbacks for one diagnostic stage, keyed on the router, the
+    stage's upstream inputs and the stage definition."""
+    return checkpoint_callbacks(
+        stage, output_key, reads=(ROUTER_KEY, *STAGE_READS.get(stage, ())),
+        stage_fingerprint=f"{instruction}\n{tool.__name__}",
+    )
+
+
+def log_checkpoint_report(callback_context: CallbackContext) -> Optional[Any]:
+    """Log which stages were reused from checkpoints and the time saved."""
+    report = callback_context.state.get(REPORT_KEY)
+    if report and report.get("invocation_id") == callback_context.invocation_id:
+        logging.info("Stage checkpoints: reused %s, ran %s, %.2fs saved",
+                     report["reused"], report["ran"], report["seconds_saved"])
+    return None
+
+
+
+class DagWorkflowAgent(BaseAgent):
+    """Runs sub-agents as a dependency DAG instead of a fixed sequence.
+
+    Each sub-agent writes its output_key and reads the state keys listed for
+    it in `reads`. A sub-agent starts as soon as the agents writing its reads
+    have finished, so independent stages run concurrently.
+    """
+
+    reads: Dict[str, List[str]] = Field(default_factory=dict)
+    max_concurrency: Optional[int] = None
+
+    def stage_specs(self) -> List[StageSpec]:
+        return [
+            StageSpec(
+                agent.name,
+                tuple(self.reads.get(agent.name, ())),
+                (agent.output_key,) if getattr(agent, "output_key", None) else (),
+            )
+            for agent in self.sub_agents
+        ]
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        specs = self.stage_specs()
+        agents = {agent.name: agent for agent in self.sub_agents}
+        # Stages that can overlap get their own branch, like ParallelAgent, so
+        # they do not see each other's in-progress conversation.
+        concurrent = {name for level in execution_levels(specs) if len(level) > 1 for name in level}
+        durations: Dict[str, float] = {}
+
+        async def run_stage(name: str):
+            stage_ctx = ctx
+            if name in concurrent:
+                stage_ctx = ctx.model_copy()
+                suffix = f"{self.name}.{name}"
+                stage_ctx.branch = f"{ctx.branch}.{suffix}" if ctx.branch else suffix
+            start = time.perf_counter()
+            async for event in agents[name].run_async(stage_ctx):
+                yield event
+            durations[name] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        try:
+            async for event in run_dag(specs, run_stage, self.max_concurrency):
+                yield event
+        finally:
+            # Stages that raised or were cancelled never reached their
+            # after-agent callback; forget their start so no checkpoint is saved
+            discard_unfinished(ctx.invocation_id)
+        logging.info(
+            "DAG workflow %s: %.2fs wall clock vs %.2fs run one after another %s",
+            self.name, time.perf_counter() - start, sum(durations.values()),
+            {name: round(seconds, 2) for name, seconds in durations.items()},
+        )
 
 
 SYSTEM_PROMPT_GATHER_DEVICE_INFORMATION = """
@@ -91,6 +214,7 @@ gather_device_information_agent = Agent(
     instruction=SYSTEM_PROMPT_GATHER_DEVICE_INFORMATION,
     tools=[gather_device_information],
     output_key="device_information",
+    **stage_checkpoints("gather_device_information_agent", "device_information", SYSTEM_PROMPT_GATHER_DEVICE_INFORMATION, gather_device_information),
 )
 
 SYSTEM_PROMPT_CHECK_DEVICE_STATUS = """
@@ -151,6 +275,7 @@ check_device_status_agent = Agent(
     instruction=SYSTEM_PROMPT_CHECK_DEVICE_STATUS,
     tools=[check_device_status],
     output_key="device_status",
+    **stage_checkpoints("check_device_status_agent", "device_status", SYSTEM_PROMPT_CHECK_DEVICE_STATUS, check_device_status),
 )
 
 
@@ -207,6 +332,7 @@ ping_test_agent = Agent(
     instruction=SYSTEM_PROMPT_PING_TEST,
     tools=[ping_test],
     output_key="ping_test_results",
+    **stage_checkpoints("ping_test_agent", "ping_test_results", SYSTEM_PROMPT_PING_TEST, ping_test),
 )
 
 
@@ -264,6 +390,7 @@ traceroute_agent = Agent(
     instruction=SYSTEM_PROMPT_TRACEROUTE,
     tools=[traceroute],
     output_key="traceroute_results",
+    **stage_checkpoints("traceroute_agent", "traceroute_results", SYSTEM_PROMPT_TRACEROUTE, traceroute),
 )
 
 SYSTEM_PROMPT_CHECK_FIREWALL_RULES = """
@@ -318,6 +445,7 @@ check_firewall_rules_agent = Agent(
     instruction=SYSTEM_PROMPT_CHECK_FIREWALL_RULES,
     tools=[check_firewall_rules],
     output_key="firewall_rules_results",
+    **stage_checkpoints("check_firewall_rules_agent", "firewall_rules_results", SYSTEM_PROMPT_CHECK_FIREWALL_RULES, check_firewall_rules),
 )
 
 SYSTEM_PROMPT_SUMMARIZE_NETWORK_FINDINGS = """
@@ -366,6 +494,7 @@ summarize_network_findings_agent = Agent(
     ),
     description="This agent summarizes the network findings and provides a recommendation for the next steps.",
     instruction=SYSTEM_PROMPT_SUMMARIZE_NETWORK_FINDINGS,
+    before_agent_callback=log_checkpoint_report,
 )
 
 START_AGENT_SYSTEM_PROMPT = """
@@ -385,6 +514,7 @@ You are the entry point for network troubleshooting requests. Your job is to det
 
 2. **For actual network troubleshooting requests** (e.g., mentions of routers, interfaces, connectivity issues, network problems, device status):
    - Acknowledge the request
+   - Call `set_troubleshooting_target` with the router named in the request; pass `refresh=true` when the user asks to re-run or for fresh (not cached) diagnostics
    - Proceed to the next agent in the workflow to begin diagnostics
    - The workflow will gather device information and perform diagnostics
 
@@ -414,12 +544,15 @@ start_agent = Agent(
         temperature=0.0,
     ),
     description="This agent is the starting point of the workflow.",
-    instruction=START_AGENT_SYSTEM_PROMPT
+    instruction=START_AGENT_SYSTEM_PROMPT,
+    tools=[set_troubleshooting_target],
+    output_key="troubleshooting_request",
 )
 
 
-# Create the sequential agent with minimal callback
-sequential_network_tshoot_workflow_agent = SequentialAgent(
+# Ping, traceroute and firewall checks (and the NMS status query) only need the
+# device information, so they run concurrently once it is available.
+network_tshoot_workflow_agent = DagWorkflowAgent(
                                             name="NetworkDeviceTroubleshootingAgent",
                                             sub_agents=[start_agent,
                                                 gather_device_information_agent, 
@@ -429,12 +562,15 @@ sequential_network_tshoot_workflow_agent = SequentialAgent(
                                                 check_firewall_rules_agent,
                                                 summarize_network_findings_agent
                                             ],
+                                            reads=STAGE_READS,
                                             description="""This agent will troubleshoot a 
                                             network device by gathering information,
                                             by executing the subagents 
                                             and summarizing the findings."""
                                             
 )
+logging.info("Troubleshooting stages by level: %s",
+             execution_levels(network_tshoot_workflow_agent.stage_specs()))
 # We cannot use instruction here inside the workflow Agent
-root_agent=sequential_network_tshoot_workflow_agent
+root_agent=network_tshoot_workflow_agent
 app = App(root_agent=root_agent, name="sequential")
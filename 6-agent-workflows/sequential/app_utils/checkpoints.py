@@ -0,0 +1,229 @@
+"""
+Stage checkpoints for the sequential troubleshooting workflow.
+
+Each diagnostic stage's result (its output_key value) is saved once the stage
+completes, keyed by (router, stage, input hash). The input hash covers the
+state keys the stage reads (the router and the upstream outputs the workflow
+declares for it) and the stage definition (instruction and tools), so editing
+a prompt, troubleshooting another router or a changed upstream result never
+reuses a result.
+
+On a rerun or re-ask, a stage with a fresh checkpoint (younger than the TTL) is
+skipped: its before_agent_callback restores the recorded output_key value and
+returns it as the stage's response, so neither the LLM nor the tool runs. The
+workflow therefore resumes at the first stale or failed stage (failed stages
+never get a checkpoint). The time the skipped stages took when they were
+recorded is reported as time saved. CheckpointStore.invalidate() forces fresh
+diagnostics for a router before the TTL runs out.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+ROUTER_KEY = "router_name"
+REPORT_KEY = "checkpoint_report"
+
+DEFAULT_DB_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ".adk",
+    "stage_checkpoints.db",
+)
+DEFAULT_TTL_SECONDS = 900.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stage_checkpoints (
+    router_name TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    output_key TEXT NOT NULL,
+    output TEXT NOT NULL,
+    duration_s REAL NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (router_name, stage, input_hash)
+);
+"""
+
+
+def input_hash(stage_fingerprint: str, inputs: Dict[str, Any]) -> str:
+    """Hash of a stage definition and the state values it reads."""
+    encoded = json.dumps([stage_fingerprint, inputs], sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class CheckpointStore:
+    """SQLite-backed stage checkpoints with a TTL."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        # One connection shared across threads; sqlite3 calls are serialized by the lock.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def get(
+        self, router_name: str, stage: str, digest: str, now: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """The checkpoint for (router, stage, input hash) if it is younger than the TTL."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output_key, output, duration_s, created_at FROM stage_checkpoints "
+                "WHERE router_name = ? AND stage = ? AND input_hash = ?",
+                (router_name, stage, digest),
+            ).fetchone()
+        if row is None or now - row[3] > self.ttl_seconds:
+            return None
+        return {"output_key": row[0], "output": json.loads(row[1]),
+                "duration_s": row[2], "created_at": row[3]}
+
+    def put(
+        self,
+        router_name: str,
+        stage: str,
+        digest: str,
+        output_key: str,
+        output: Any,
+        duration_s: float,
+        now: Optional[float] = None,
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stage_checkpoints VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (router_name, stage, digest, output_key, json.dumps(output, default=str),
+                 duration_s, time.time() if now is None else now),
+            )
+
+    def invalidate(self, router_name: str, stage: Optional[str] = None) -> int:
+        """Drop a router's checkpoints (one stage or all). Returns the number removed."""
+        query, params = "DELETE FROM stage_checkpoints WHERE router_name = ?", [router_name]
+        if stage is not None:
+            query += " AND stage = ?"
+            params.append(stage)
+        with self._lock, self._conn:
+            return self._conn.execute(query, params).rowcount
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        cutoff = (time.time() if now is None else now) - self.ttl_seconds
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM stage_checkpoints WHERE created_at < ?", (cutoff,)
+            ).rowcount
+
+
+_store: Optional[CheckpointStore] = None
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Process-wide store from STAGE_CHECKPOINT_DB and STAGE_CHECKPOINT_TTL_SECONDS."""
+    global _store
+    if _store is None:
+        _store = CheckpointStore(
+            os.environ.get("STAGE_CHECKPOINT_DB", DEFAULT_DB_PATH),
+            float(os.environ.get("STAGE_CHECKPOINT_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+        )
+    return _store
+
+
+def _update_report(
+    callback_context: CallbackContext, stage: str, reused: bool, seconds_saved: float = 0.0
+) -> Dict[str, Any]:
+    """Record a stage in this run's checkpoint report (state "checkpoint_report")."""
+    state = callback_context.state
+    report = state.get(REPORT_KEY)
+    if not report or report.get("invocation_id") != callback_context.invocation_id:
+        report = {"invocation_id": callback_context.invocation_id,
+                  "reused": [], "ran": [], "seconds_saved": 0.0}
+    key = "reused" if reused else "ran"
+    report = {**report, key: report[key] + [stage],
+              "seconds_saved": round(report["seconds_saved"] + seconds_saved, 2)}
+    state[REPORT_KEY] = report
+    return report
+
+
+# (invocation id, stage) -> (start, router, hash) of the stages running now
+_started: Dict[Tuple[str, str], Tuple[float, str, str]] = {}
+
+
+def discard_unfinished(invocation_id: str) -> int:
+    """
+    Forget the stages of an invocation that never reached their after-agent
+    callback (they raised or were cancelled). Returns how many were dropped.
+    """
+    unfinished = [key for key in _started if key[0] == invocation_id]
+    for key in unfinished:
+        _started.pop(key, None)
+    return len(unfinished)
+
+
+def checkpoint_callbacks(
+    stage: str,
+    output_key: str,
+    reads: Sequence[str] = (ROUTER_KEY,),
+    stage_fingerprint: str = "",
+    store: Optional[Callable[[], CheckpointStore]] = None,
+) -> Dict[str, Callable[..., Any]]:
+    """
+    before/after agent callbacks that checkpoint one stage.
+
+    Args:
+        stage: Stage (agent) name.
+        output_key: State key the stage writes.
+        reads: State keys the stage result depends on; must include the router.
+        stage_fingerprint: Text identifying the stage definition (instruction, tools).
+        store: Returns the CheckpointStore to use (default: get_checkpoint_store).
+
+    Returns:
+        {"before_agent_callback": ..., "after_agent_callback": ...}, to be
+        passed to the stage's Agent(...).
+    """
+    get_store = store or get_checkpoint_store
+
+    def restore_checkpoint(callback_context: CallbackContext) -> Optional[types.Content]:
+        state = callback_context.state
+        router_name = state.get(ROUTER_KEY)
+        if not router_name:
+            return None  # no target recorded yet, nothing to key on
+        digest = input_hash(stage_fingerprint, {key: state.get(key) for key in reads})
+        checkpoint = get_store().get(router_name, stage, digest)
+        if checkpoint is None:
+            _started[(callback_context.invocation_id, stage)] = (
+                time.perf_counter(), router_name, digest
+            )
+            return None
+
+        state[output_key] = checkpoint["output"]
+        report = _update_report(callback_context, stage, reused=True, seconds_saved=checkpoint["duration_s"])
+        logger.info("Stage %s reused checkpoint for %s (%.2fs saved, %.2fs total)",
+                    stage, router_name, checkpoint["duration_s"], report["seconds_saved"])
+        return types.Content(role="model", parts=[types.Part(text=str(checkpoint["output"]))])
+
+    def save_checkpoint(callback_context: CallbackContext) -> Optional[types.Content]:
+        run = _started.pop((callback_context.invocation_id, stage), None)
+        if run is None:
+            return None
+        start, router_name, digest = run
+        output = callback_context.state.get(output_key)
+        if output in (None, ""):
+            return None  # the stage produced nothing: leave it to rerun
+        duration = time.perf_counter() - start
+        get_store().put(router_name, stage, digest, output_key, output, duration)
+        _update_report(callback_context, stage, reused=False)
+        return None
+
+    return {"before_agent_callback": restore_checkpoint, "after_agent_callback": save_checkpoint}
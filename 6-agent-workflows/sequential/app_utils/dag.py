@@ -0,0 +1,135 @@
+"""
+Dependency-DAG scheduling for workflow stages.
+
+A stage declares the state keys it reads and the keys it writes (an agent's
+output_key). A stage depends on the stages that write the keys it reads; keys
+no stage writes are treated as already present in state. run_dag() starts
+every stage as soon as all of its producers have finished, so independent
+stages run concurrently instead of one after another.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import (
+    Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Set, Tuple,
+)
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    name: str
+    reads: Tuple[str, ...] = ()
+    writes: Tuple[str, ...] = ()
+
+
+def build_dependencies(stages: Sequence[StageSpec]) -> Dict[str, Set[str]]:
+    """
+    Map each stage to the stages it waits for.
+
+    Raises:
+        ValueError: duplicate stage names, a key written by two stages, or a cycle.
+    """
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"duplicate stage names in {names}")
+
+    writer: Dict[str, str] = {}
+    for stage in stages:
+        for key in stage.writes:
+            if key in writer:
+                raise ValueError(f"state key {key!r} is written by both {writer[key]} and {stage.name}")
+            writer[key] = stage.name
+
+    dependencies = {
+        stage.name: {writer[key] for key in stage.reads if key in writer} - {stage.name}
+        for stage in stages
+    }
+    execution_levels(stages, dependencies)  # raises on cycles
+    return dependencies
+
+
+def execution_levels(
+    stages: Sequence[StageSpec], dependencies: Optional[Dict[str, Set[str]]] = None
+) -> List[List[str]]:
+    """Stages grouped into levels that can run concurrently, in declaration order."""
+    dependencies = dependencies if dependencies is not None else build_dependencies(stages)
+    done: Set[str] = set()
+    remaining = [stage.name for stage in stages]
+    levels = []
+    while remaining:
+        level = [name for name in remaining if dependencies[name] <= done]
+        if not level:
+            raise ValueError(f"dependency cycle between stages {remaining}")
+        levels.append(level)
+        done.update(level)
+        remaining = [name for name in remaining if name not in done]
+    return levels
+
+
+_DONE = object()
+
+
+async def run_dag(
+    stages: Sequence[StageSpec],
+    run_stage: Callable[[str], AsyncIterator[Any]],
+    max_concurrency: Optional[int] = None,
+) -> AsyncIterator[Any]:
+    """
+    Run stages in dependency order, concurrently where possible, and yield the
+    items (events) every stage produces as they arrive.
+
+    A stage's iterator is only resumed after the item it produced has been
+    consumed, so the consumer (e.g. the ADK runner committing state deltas)
+    has processed everything a stage wrote before any dependent stage starts.
+
+    Args:
+        stages: The stages; declaration order breaks ties.
+        run_stage: Returns the async iterator that runs one stage.
+        max_concurrency: Maximum stages running at once (default: unlimited).
+    """
+    dependencies = build_dependencies(stages)
+    order = [stage.name for stage in stages]
+    queue: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+    started: Set[str] = set()
+    finished: Set[str] = set()
+    tasks: List[asyncio.Task] = []
+
+    async def _pump(name: str) -> None:
+        try:
+            if semaphore is not None:
+                await semaphore.acquire()
+            try:
+                async for item in run_stage(name):
+                    consumed = asyncio.get_running_loop().create_future()
+                    await queue.put((name, item, consumed))
+                    await consumed
+            finally:
+                if semaphore is not None:
+                    semaphore.release()
+        except Exception as e:
+            await queue.put((name, e, None))
+            return
+        await queue.put((name, _DONE, None))
+
+    def _start_ready() -> None:
+        for name in order:
+            if name not in started and dependencies[name] <= finished:
+                started.add(name)
+                tasks.append(asyncio.ensure_future(_pump(name)))
+
+    try:
+        _start_ready()
+        while len(finished) < len(order):
+            name, item, consumed = await queue.get()
+            if item is _DONE:
+                finished.add(name)
+                _start_ready()
+            elif isinstance(item, Exception) and consumed is None:
+                raise item
+            else:
+                yield item
+                consumed.set_result(None)
+    finally:
+        for task in tasks:
+            task.cancel()
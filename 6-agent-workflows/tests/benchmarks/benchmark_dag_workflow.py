@@ -0,0 +1,87 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Wall-clock comparison of the troubleshooting stages run one after another
+(SequentialAgent) and as a dependency DAG (DagWorkflowAgent).
+
+Each stage is simulated by a delay that stands in for its LLM call plus tool
+call; set STAGE_SECONDS to measured per-stage times to compare a real run.
+
+Run with:
+    uv run python -m tests.benchmarks.benchmark_dag_workflow
+"""
+
+import asyncio
+import time
+
+from sequential.app_utils.dag import StageSpec, execution_levels, run_dag
+
+# Typical per-stage latency (seconds): one LLM turn with a tool call, the summary without
+STAGE_SECONDS = {
+    "start_agent": 1.0,
+    "gather_device_information_agent": 2.0,
+    "check_device_status_agent": 2.5,
+    "ping_test_agent": 2.0,
+    "traceroute_agent": 2.5,
+    "check_firewall_rules_agent": 3.0,
+    "summarize_network_findings_agent": 4.0,
+}
+
+STAGES = [
+    StageSpec("start_agent", writes=("troubleshooting_request",)),
+    StageSpec("gather_device_information_agent", ("troubleshooting_request",), ("device_information",)),
+    StageSpec("check_device_status_agent", ("device_information",), ("device_status",)),
+    StageSpec("ping_test_agent", ("device_information",), ("ping_test_results",)),
+    StageSpec("traceroute_agent", ("device_information",), ("traceroute_results",)),
+    StageSpec("check_firewall_rules_agent", ("device_information",), ("firewall_rules_results",)),
+    StageSpec("summarize_network_findings_agent", (
+        "device_information", "device_status", "ping_test_results",
+        "traceroute_results", "firewall_rules_results",
+    )),
+]
+
+# Simulated seconds per real second, so the benchmark finishes quickly
+SPEEDUP = 20
+
+
+async def run_stage(name: str):
+    await asyncio.sleep(STAGE_SECONDS[name] / SPEEDUP)
+    yield name
+
+
+async def sequential() -> float:
+    start = time.perf_counter()
+    for stage in STAGES:
+        async for _ in run_stage(stage.name):
+            pass
+    return (time.perf_counter() - start) * SPEEDUP
+
+
+async def dag() -> float:
+    start = time.perf_counter()
+    async for _ in run_dag(STAGES, run_stage):
+        pass
+    return (time.perf_counter() - start) * SPEEDUP
+
+
+def main() -> None:
+    print("Stage levels:", execution_levels(STAGES))
+    sequential_s = asyncio.run(sequential())
+    dag_s = asyncio.run(dag())
+    print(f"SequentialAgent : {sequential_s:6.2f} s")
+    print(f"DagWorkflowAgent: {dag_s:6.2f} s  ({sequential_s / dag_s:.2f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Measure the synthesis-agent input size for fleets of 10/100/1000 devices.
+
+Compares what the summary agent would read:
+- the verbose per-device reports (one tool output per device),
+- the aggregated per-device rows (fleet_health_results),
+- the ranked anomaly table (fleet_anomaly_table),
+and the time spent in the NumPy analysis. Tokens are estimated as chars / 4.
+
+Run with:
+    uv run python -m tests.benchmarks.benchmark_fleet_anomaly
+"""
+
+import asyncio
+import json
+import random
+import time
+
+from parallel.app_utils.anomaly import analyze_fleet, format_anomaly_table
+from parallel.app_utils.fleet import aggregate_results, run_fleet_checks
+from parallel.app_utils.tools import check_cpu_utilization
+
+SITES = ["sea3", "pdx1", "iad2", "ord1", "dfw4"]
+ROLES = ["core", "edge", "agg"]
+
+
+def build_fleet(count: int, rng: random.Random) -> list[dict]:
+    devices = [
+        {"hostname": f"r{i}-{rng.choice(SITES)}", "site": rng.choice(SITES), "role": rng.choice(ROLES)}
+        for i in range(count)
+    ]
+    # One known-bad device, as in the tutorial scenario
+    devices[rng.randrange(count)]["hostname"] = "r2-sea3"
+    return devices
+
+
+def tokens(text: str) -> int:
+    return len(text) // 4
+
+
+def main() -> None:
+    rng = random.Random(42)
+    print(
+        f"{'devices':>7} | {'verbose reports':>15} | {'aggregated rows':>15} | "
+        f"{'anomaly table':>13} | {'saving':>7} | {'analysis':>9}"
+    )
+    print("-" * 82)
+    for count in (10, 100, 1000):
+        devices = build_fleet(count, rng)
+        results = asyncio.run(run_fleet_checks(devices, check_cpu_utilization, max_concurrency=64))
+        verbose = "\n\n".join(r["output"] for r in results)
+        summary = aggregate_results("all", results)
+        rows = json.dumps(summary)
+
+        start = time.perf_counter()
+        table = format_anomaly_table(analyze_fleet(summary["devices"]), "all")
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"{count:>7} | {tokens(verbose):>8} tokens | {tokens(rows):>8} tokens | "
+            f"{tokens(table):>6} tokens | {tokens(verbose) / tokens(table):>6.0f}x | "
+            f"{elapsed * 1000:>6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
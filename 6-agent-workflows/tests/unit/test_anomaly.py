@@ -0,0 +1,64 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+
+from parallel.app_utils.anomaly import analyze_fleet, format_anomaly_table
+
+
+def _fleet(count: int, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "hostname": f"r{i}-{site}",
+            "site": site,
+            "role": role,
+            "cpu_utilization": round(rng.gauss(40, 5), 1),
+            "memory_utilization": round(rng.gauss(50, 4), 1),
+            "temperature_c": round(rng.gauss(42, 1.5), 1),
+        }
+        for i in range(count)
+        for site, role in [(rng.choice(["sea3", "pdx1"]), rng.choice(["core", "edge"]))]
+    ]
+
+
+def test_ranks_limit_breach_and_peer_outlier() -> None:
+    devices = _fleet(200)
+    devices[17]["cpu_utilization"] = 87.3       # over the hard CPU limit
+    devices[42]["temperature_c"] = 55.0         # statistical outlier only
+
+    analysis = analyze_fleet(devices)
+    ranked = [row["hostname"] for row in analysis["anomalies"]]
+
+    assert ranked[0] == devices[17]["hostname"]
+    assert analysis["anomalies"][0]["metric"] == "cpu_utilization"
+    assert analysis["anomalies"][0]["over_limit"]
+    assert devices[42]["hostname"] in ranked
+    assert analysis["anomaly_count"] < 10
+    assert set(analysis["bands_by_role"]) == {"core", "edge"}
+
+
+def test_small_fleet_and_missing_metrics() -> None:
+    devices = [
+        {"hostname": "r1-sea3", "site": "sea3", "role": "core",
+         "cpu_utilization": 38.5, "memory_utilization": 52.0, "temperature_c": 42},
+        {"hostname": "r2-sea3", "site": "sea3", "role": "core",
+         "cpu_utilization": 87.3, "memory_utilization": 68.0, "temperature_c": None},
+    ]
+    analysis = analyze_fleet(devices)
+    assert [row["hostname"] for row in analysis["anomalies"]] == ["r2-sea3"]
+
+    table = format_anomaly_table(analysis, "site=sea3")
+    assert "| 1 | r2-sea3 | sea3 | core | 87.3 | 68.0 | None | cpu_utilization over limit |" in table
+    assert analyze_fleet([])["anomalies"] == []
@@ -0,0 +1,88 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+from sequential.app_utils import checkpoints
+from sequential.app_utils.checkpoints import (
+    CheckpointStore,
+    checkpoint_callbacks,
+    discard_unfinished,
+)
+
+
+def test_store_ttl_and_invalidate() -> None:
+    store = CheckpointStore(":memory:", ttl_seconds=60)
+    store.put("R1", "ping_test_agent", "h1", "ping_test_results", "reachable", 2.5, now=1000)
+
+    assert store.get("R1", "ping_test_agent", "h1", now=1030)["output"] == "reachable"
+    assert store.get("R1", "ping_test_agent", "h2", now=1030) is None  # other inputs
+    assert store.get("R1", "ping_test_agent", "h1", now=1061) is None  # stale
+    assert store.invalidate("R1") == 1
+
+
+def test_rerun_resumes_at_first_missing_stage() -> None:
+    store = CheckpointStore(":memory:")
+    stages = [
+        checkpoint_callbacks(name, key, stage_fingerprint=name, store=lambda: store)
+        for name, key in [("device", "device_status"), ("ping", "ping_test_results")]
+    ]
+    state = {"router_name": "R1"}
+
+    # First run: both stages run and are checkpointed, except ping, which fails
+    first = SimpleNamespace(state=state, invocation_id="run-1")
+    assert stages[0]["before_agent_callback"](first) is None
+    state["device_status"] = "healthy"
+    stages[0]["after_agent_callback"](first)
+    assert stages[1]["before_agent_callback"](first) is None  # raises; no after callback
+
+    # Rerun: device is restored from its checkpoint, ping runs again
+    state.pop("device_status")
+    second = SimpleNamespace(state=state, invocation_id="run-2")
+    restored = stages[0]["before_agent_callback"](second)
+    assert restored.parts[0].text == "healthy"
+    assert state["device_status"] == "healthy"
+    assert stages[1]["before_agent_callback"](second) is None
+    assert state["checkpoint_report"]["reused"] == ["device"]
+    assert state["checkpoint_report"]["seconds_saved"] >= 0
+
+
+def test_changed_upstream_output_invalidates_downstream_stage() -> None:
+    store = CheckpointStore(":memory:")
+    ping = checkpoint_callbacks(
+        "ping", "ping_test_results", reads=("router_name", "device_information"),
+        stage_fingerprint="ping", store=lambda: store,
+    )
+    state = {"router_name": "R1", "device_information": "Gi0/1 down"}
+    run = SimpleNamespace(state=state, invocation_id="run-1")
+    assert ping["before_agent_callback"](run) is None
+    state["ping_test_results"] = "reachable"
+    ping["after_agent_callback"](run)
+
+    state["device_information"] = "Gi0/1 up, BGP neighbor idle"
+    rerun = SimpleNamespace(state=state, invocation_id="run-2")
+    assert ping["before_agent_callback"](rerun) is None  # upstream changed: runs again
+    state["device_information"] = "Gi0/1 down"
+    again = SimpleNamespace(state=state, invocation_id="run-3")
+    assert ping["before_agent_callback"](again).parts[0].text == "reachable"
+
+
+def test_failed_stage_is_forgotten() -> None:
+    store = CheckpointStore(":memory:")
+    ping = checkpoint_callbacks("ping", "ping_test_results", stage_fingerprint="ping",
+                                store=lambda: store)
+    run = SimpleNamespace(state={"router_name": "R1"}, invocation_id="run-fail")
+    assert ping["before_agent_callback"](run) is None  # the stage then raises
+    assert discard_unfinished("run-fail") == 1
+    assert ("run-fail", "ping") not in checkpoints._started
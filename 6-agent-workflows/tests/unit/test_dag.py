@@ -0,0 +1,72 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from sequential.app_utils.dag import StageSpec, build_dependencies, execution_levels, run_dag
+
+STAGES = [
+    StageSpec("start", writes=("request",)),
+    StageSpec("gather", reads=("request",), writes=("info",)),
+    StageSpec("ping", reads=("info",), writes=("ping",)),
+    StageSpec("trace", reads=("info",), writes=("trace",)),
+    StageSpec("summary", reads=("ping", "trace", "user:prefs")),
+]
+
+
+def test_levels_and_validation() -> None:
+    assert execution_levels(STAGES) == [["start"], ["gather"], ["ping", "trace"], ["summary"]]
+    with pytest.raises(ValueError, match="cycle"):
+        build_dependencies([StageSpec("a", ("y",), ("x",)), StageSpec("b", ("x",), ("y",))])
+    with pytest.raises(ValueError, match="written by both"):
+        build_dependencies([StageSpec("a", writes=("x",)), StageSpec("b", writes=("x",))])
+
+
+def test_independent_stages_overlap_and_dependents_wait() -> None:
+    log = []
+    running = set()
+    overlapped = []
+
+    async def run_stage(name):
+        running.add(name)
+        overlapped.append(set(running))
+        await asyncio.sleep(0.01)
+        yield f"{name}:event"
+        running.discard(name)
+
+    async def consume():
+        async for item in run_dag(STAGES, run_stage):
+            log.append(item)
+
+    asyncio.run(consume())
+
+    assert log[:2] == ["start:event", "gather:event"]
+    assert set(log[2:4]) == {"ping:event", "trace:event"}
+    assert log[4] == "summary:event"
+    assert {"ping", "trace"} in overlapped
+
+
+def test_stage_failure_propagates() -> None:
+    async def run_stage(name):
+        if name == "ping":
+            raise RuntimeError("ping failed")
+        yield name
+
+    async def consume():
+        return [item async for item in run_dag(STAGES, run_stage)]
+
+    with pytest.raises(RuntimeError, match="ping failed"):
+        asyncio.run(consume())
@@ -0,0 +1,68 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from parallel.app_utils.fleet import (
+    aggregate_results,
+    load_inventory,
+    run_fleet_checks,
+    select_devices,
+)
+from parallel.app_utils.tools import check_cpu_utilization
+
+
+def test_select_devices() -> None:
+    inventory = load_inventory()
+    hostnames = lambda devices: [d["hostname"] for d in devices]
+
+    assert len(select_devices(inventory, "all")) == len(inventory)
+    assert hostnames(select_devices(inventory, "site=sea3,role=core")) == ["r1-sea3", "r2-sea3"]
+    assert hostnames(select_devices(inventory, "R2-SEA3")) == ["r2-sea3"]
+    assert {d["site"] for d in select_devices(inventory, "r*-pdx1")} == {"pdx1"}
+    assert select_devices(inventory, "site=nowhere") == []
+
+
+def test_fan_out_respects_concurrency_limit() -> None:
+    running = 0
+    peak = 0
+
+    async def slow_check(hostname: str) -> dict:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if hostname == "r3":
+            raise TimeoutError("no response")
+        return {"tool_call_status": "success", "status": "NORMAL", "cpu_utilization": 10}
+
+    devices = [{"hostname": f"r{i}"} for i in range(20)]
+    results = asyncio.run(run_fleet_checks(devices, slow_check, max_concurrency=4))
+
+    assert peak == 4
+    assert [r["hostname"] for r in results] == [d["hostname"] for d in devices]
+    assert results[3]["tool_call_status"] == "error"
+
+
+def test_aggregate_sync_tool_results() -> None:
+    devices = select_devices(load_inventory(), "site=sea3")
+    results = asyncio.run(run_fleet_checks(devices, check_cpu_utilization))
+    summary = aggregate_results("site=sea3", results)
+
+    assert summary["device_count"] == 6
+    assert summary["status_counts"] == {"HIGH": 1, "NORMAL": 5}
+    assert summary["devices"][0]["hostname"] == "r2-sea3"
+    assert "output" not in summary["devices"][0]
+    assert summary["failed_devices"] == []
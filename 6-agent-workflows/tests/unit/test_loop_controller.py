@@ -0,0 +1,72 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from loop.app_utils.loop_controller import (
+    RUN,
+    SKIP_MONITORING,
+    STOP,
+    LoopBudget,
+    LoopRunStats,
+    fingerprint,
+    next_step,
+)
+
+DEGRADED = [
+    {"tool_call_status": "success", "network_status": "degraded", "output": "report at 10:00"},
+    {"tool_call_status": "success", "network_status": "healthy", "output": "no alerts"},
+]
+HEALTHY = [
+    {"tool_call_status": "success", "network_status": "healthy", "output": "ok"},
+    {"tool_call_status": "success", "network_status": "healthy", "output": "no alerts"},
+]
+
+
+def test_fingerprint_ignores_report_text() -> None:
+    reworded = [{**DEGRADED[0], "output": "report at 10:05"}, DEGRADED[1]]
+    assert fingerprint(DEGRADED) == fingerprint(reworded)
+    assert fingerprint(DEGRADED) != fingerprint(HEALTHY)
+
+
+def test_unchanged_signals_skip_then_converge() -> None:
+    stats = LoopRunStats(invocation_id="inv", started_at=0.0)
+    budget = LoopBudget(patience=1)
+
+    assert next_step(stats, DEGRADED, budget, now=1.0) == (RUN, None)
+    assert next_step(stats, DEGRADED, budget, now=2.0) == (SKIP_MONITORING, None)
+    assert next_step(stats, DEGRADED, budget, now=3.0) == (STOP, "converged")
+    assert stats.report() == {
+        "iterations": 3, "llm_calls": 0, "skipped_llm_calls": 1,
+        "tokens": 0, "wall_time_s": 3.0, "stop_reason": "converged",
+    }
+
+
+def test_healthy_and_budget_stops() -> None:
+    stats = LoopRunStats(invocation_id="inv", started_at=0.0)
+    assert next_step(stats, HEALTHY, LoopBudget(), now=1.0) == (STOP, "healthy")
+
+    stats = LoopRunStats(invocation_id="inv", started_at=0.0)
+    stats.add_tokens(60_000)
+    assert next_step(stats, DEGRADED, LoopBudget(max_tokens=50_000), now=1.0) == (STOP, "token_budget")
+
+    stats = LoopRunStats(invocation_id="inv", started_at=0.0)
+    assert next_step(stats, DEGRADED, LoopBudget(max_seconds=10), now=11.0) == (STOP, "time_budget")
+
+
+def test_stats_are_scoped_to_the_invocation() -> None:
+    stats = LoopRunStats(invocation_id="first", started_at=0.0)
+    stats.add_tokens(100)
+    raw = stats.to_dict()
+
+    assert LoopRunStats.for_invocation(raw, "first").tokens == 100
+    assert LoopRunStats.for_invocation(raw, "second").tokens == 0
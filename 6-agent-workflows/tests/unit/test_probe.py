@@ -0,0 +1,141 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import math
+import os
+import socket
+
+import pytest
+
+from loop.app_utils.probe import (
+    INVALID, INVALID_PORT, OPEN, REFUSED, icmp_echo, parse_targets, probe_targets, render_report,
+)
+from loop.app_utils.tools import (
+    check_network_connectivity, check_network_latency, check_network_status,
+)
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _with_listener(run):
+    server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0, backlog=1024)
+    try:
+        return await run(server.sockets[0].getsockname()[1])
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def test_parse_targets() -> None:
+    assert parse_targets(" 10.0.0.1, core1:22,[::1]:443 ,::1,") == [
+        ("10.0.0.1", None), ("core1", 22), ("::1", 443), ("::1", None),
+    ]
+
+
+def test_parse_targets_accepts_urls_and_flags_bad_ports() -> None:
+    assert parse_targets(
+        "http://example.com, https://user@shop.example.com:8443/status, ssh://[::1]"
+    ) == [("example.com", 80), ("shop.example.com", 8443), ("::1", 22)]
+    assert parse_targets("host:abc,core1:70000,bad host,ok:22") == [
+        ("host:abc", INVALID_PORT), ("core1:70000", INVALID_PORT),
+        ("bad host", INVALID_PORT), ("ok", 22),
+    ]
+
+
+def test_invalid_targets_are_reported_not_raised() -> None:
+    async def run(port):
+        return await check_network_connectivity(f"host:abc,127.0.0.1:{port}")
+
+    result = asyncio.run(_with_listener(run))
+    assert result["tool_call_status"] == "success"
+    assert result["network_status"] == "healthy"
+    assert result["invalid"] == ["host:abc"]
+    assert result["unreachable"] == []
+    assert "host:abc | INVALID" in result["output"]
+    assert "Invalid: 1" in result["output"]
+
+    results = asyncio.run(probe_targets(parse_targets("example.com:abc")))
+    assert results.states == [INVALID]
+
+
+def test_probe_open_and_closed_ports() -> None:
+    closed = _closed_port()
+
+    async def run(port):
+        return await probe_targets(
+            parse_targets(f"127.0.0.1:{port},127.0.0.1:{closed}"), samples=3, timeout=1
+        )
+
+    results = asyncio.run(_with_listener(run))
+    assert results.states == [OPEN, REFUSED]
+    # A refused connect means the host is up: reported apart from unreachable
+    assert results.unreachable() == []
+    assert results.refused() == [f"127.0.0.1:{closed}"]
+    assert results.loss[0] == 0.0 and results.rtt_min_ms[0] <= results.rtt_max_ms[0]
+    assert math.isnan(results.rtt_avg_ms[1])
+    assert results.high_latency(threshold_ms=0.0) == [results.targets[0]]
+
+    report = render_report("Status", results, threshold_ms=1000)
+    assert "Reachable: 1  Unreachable: 0  Refused (host up): 1" in report
+    # Problem targets are listed first
+    assert report.splitlines()[6].startswith(f"127.0.0.1:{closed} | REFUSED")
+
+
+def test_thousands_of_targets_concurrently() -> None:
+    closed = _closed_port()
+
+    async def run(port):
+        spec = ",".join([f"127.0.0.1:{port}"] * 1500 + [f"127.0.0.1:{closed}"])
+        return await check_network_status(spec)
+
+    result = asyncio.run(_with_listener(run))
+    assert result["network_status"] == "degraded"
+    assert result["unreachable"] == [] and result["refused"] == [f"127.0.0.1:{closed}"]
+    assert "Targets Checked: 1501" in result["output"]
+    assert "... 1451 more targets, all reachable within limits" in result["output"]
+
+
+def test_latency_tool_classifies_targets() -> None:
+    async def run(port):
+        return await check_network_latency(f"127.0.0.1:{port}", threshold_ms=1000)
+
+    result = asyncio.run(_with_listener(run))
+    assert result["network_status"] == "healthy"
+    assert result["unreachable"] == [] and result["high_latency"] == []
+
+
+def test_no_valid_target_is_an_error() -> None:
+    for spec in ("", "host:abc,bad host"):
+        for check in (check_network_connectivity, check_network_latency, check_network_status):
+            result = asyncio.run(check(spec))
+            assert result["tool_call_status"] == "error", (check, spec)
+            assert result["network_status"] == "unknown"
+    assert asyncio.run(check_network_status("host:abc"))["invalid"] == ["host:abc"]
+
+
+def test_icmp_echo_kills_ping_on_timeout(tmp_path, monkeypatch) -> None:
+    ping = tmp_path / "ping"
+    ping.write_text("#!/bin/sh\necho $$ > " + str(tmp_path / "pid") + "\nexec sleep 30\n")
+    ping.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    assert math.isnan(asyncio.run(icmp_echo("192.0.2.1", timeout=0.1)))
+    pid = int((tmp_path / "pid").read_text())
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
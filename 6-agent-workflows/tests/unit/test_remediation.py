@@ -0,0 +1,121 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from loop.app_utils.remediation import (
+    EXECUTED,
+    FAILED,
+    LEDGER_KEY,
+    RATE_LIMITED,
+    RUNNING,
+    SUPPRESSED,
+    RemediationExecutor,
+    RemediationPolicy,
+)
+
+
+def restart(service_name, server_address):
+    return {"tool_call_status": "success", "output": "restarted", "network_status": "remediated"}
+
+
+def test_duplicates_suppressed_within_cooldown() -> None:
+    executor = RemediationExecutor({"restart": restart}, RemediationPolicy(cooldown_seconds=60))
+    state = {}
+    args = {"service_name": "bgp", "server_address": "r1"}
+
+    first = executor.admit(state, "restart", args, now=0)
+    assert first["status"] == RUNNING
+    executor.complete(state, first["key"], restart(**args), now=1)
+
+    duplicate = executor.admit(state, "restart", dict(args), now=30)
+    assert duplicate["status"] == SUPPRESSED
+    assert "Previous outcome: remediated" in duplicate["response"]["output"]
+    assert executor.admit(state, "restart", args, now=61)["status"] == RUNNING
+    assert [e["status"] for e in state[LEDGER_KEY]] == [EXECUTED, SUPPRESSED, RUNNING]
+
+
+def test_per_target_and_global_rate_limits() -> None:
+    policy = RemediationPolicy(per_target_limit=2, global_limit=3, window_seconds=100)
+    executor = RemediationExecutor({"restart": restart}, policy)
+    state = {}
+    admit = lambda service, target, now: executor.admit(
+        state, "restart", {"service_name": service, "server_address": target}, now=now)["status"]
+
+    assert admit("a", "r1", 0) == RUNNING
+    assert admit("b", "r1", 1) == RUNNING
+    assert admit("c", "r1", 2) == RATE_LIMITED  # per target
+    assert admit("a", "r2", 3) == RUNNING
+    assert admit("a", "r3", 4) == RATE_LIMITED  # global
+    assert admit("c", "r1", 101) == RUNNING     # first actions left the window
+
+
+def test_batch_runs_targets_concurrently_and_suppresses_duplicates() -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_fix(server_address):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return {"tool_call_status": "success", "output": "fixed", "network_status": "remediated"}
+
+    executor = RemediationExecutor({"fix": slow_fix}, RemediationPolicy(global_limit=10))
+    state = {}
+    actions = [{"action": "fix", "args": {"server_address": f"r{i}"}} for i in range(4)]
+    actions.append({"action": "fix", "args": {"server_address": "r0"}})
+
+    results = asyncio.run(executor.execute_batch(state, actions))
+    assert [r["tool_call_status"] for r in results] == ["success"] * 4 + ["skipped"]
+    assert peak == 4
+    assert sum(e["status"] == EXECUTED for e in state[LEDGER_KEY]) == 4
+
+
+def test_tool_callbacks_record_and_block() -> None:
+    executor = RemediationExecutor({"restart": restart})
+    context = SimpleNamespace(state={})
+    tool = SimpleNamespace(name="restart")
+    args = {"service_name": "bgp", "server_address": "r1"}
+
+    assert executor.before_tool(tool, args, context) is None
+    executor.after_tool(tool, args, context, restart(**args))
+    assert executor.before_tool(tool, args, context)["tool_call_status"] == "skipped"
+    assert executor.before_tool(SimpleNamespace(name="exit_loop"), {}, context) is None
+
+
+def test_failed_actions_are_retried_but_rate_limited() -> None:
+    executor = RemediationExecutor({"restart": restart}, RemediationPolicy(per_target_limit=2))
+    context = SimpleNamespace(state={})
+    tool = SimpleNamespace(name="restart")
+    args = {"service_name": "bgp", "server_address": "r1"}
+
+    # A tool that raises: after_tool never runs, on_tool_error records the failure
+    assert executor.before_tool(tool, args, context) is None
+    executor.on_tool_error(tool, args, context, RuntimeError("device busy"))
+    # A tool that reports the remediation failed
+    assert executor.before_tool(tool, args, context) is None
+    executor.after_tool(tool, args, context, {"tool_call_status": "success",
+                                              "network_status": "remediation_failed"})
+
+    assert [e["status"] for e in context.state[LEDGER_KEY]] == [FAILED, FAILED]
+    # Failed attempts are not duplicates, but they count toward the rate limit
+    assert executor.before_tool(tool, args, context)["tool_call_status"] == "rate_limited"
@@ -0,0 +1,71 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from loop.app_utils import simulator as sim_module
+from loop.app_utils.simulator import ScenarioSimulator, configure_simulator, load_scenario
+from loop.app_utils.tools import (
+    check_network_status,
+    check_security_alerts,
+    fix_connectivity_issue,
+    restart_network_service,
+)
+
+
+def test_same_seed_same_outcomes() -> None:
+    def run(seed):
+        configure_simulator(seed=seed)
+        return [restart_network_service("bgp", f"r{i}")["output"] for i in range(20)]
+
+    try:
+        assert run(3) == run(3)
+        assert run(3) != run(4)
+    finally:
+        sim_module._simulator = None
+
+
+def test_remediation_clears_scenario_fault() -> None:
+    simulator = configure_simulator("link_down_then_fixed")
+    try:
+        status = asyncio.run(check_network_status("10.0.0.1,10.0.0.2,10.0.0.3"))
+        assert status["unreachable"] == ["10.0.0.2"]
+        assert status["high_latency"] == ["10.0.0.3"]
+        assert check_security_alerts()["network_status"] == "security_alert"
+
+        assert fix_connectivity_issue("10.0.0.2")["network_status"] == "remediated"
+        status = asyncio.run(check_network_status("10.0.0.1,10.0.0.2,10.0.0.3"))
+        assert status["unreachable"] == []
+
+        # A new invocation re-arms the fault timeline, once
+        assert simulator.begin_invocation("invocation-2")
+        status = asyncio.run(check_network_status("10.0.0.2"))
+        assert status["unreachable"] == ["10.0.0.2"]
+        fix_connectivity_issue("10.0.0.2")
+        assert not simulator.begin_invocation("invocation-2")
+        assert asyncio.run(check_network_status("10.0.0.2"))["unreachable"] == []
+    finally:
+        sim_module._simulator = None
+
+
+def test_fault_window_and_glob_targets() -> None:
+    simulator = ScenarioSimulator({"faults": [
+        {"kind": "unreachable", "target": "10.0.*", "start": 2, "end": 4},
+    ]}, seed=1)
+    seen = []
+    for _ in range(5):
+        rng = simulator.rng("probe")
+        seen.append(simulator.fault("unreachable", "10.0.0.9", rng, 0.0))
+    assert seen == [False, True, True, False, False]
+    assert load_scenario("stubborn_outage")["faults"][0]["fix_probability"] == 0.0
@@ -5,11 +5,16 @@ Title: Hierarchical Network Troubleshooting with Sub-Agents
 """
 
 import os
+import time
 import google.auth
 import logging
-from google.adk.agents import Agent
+from typing import Any, AsyncGenerator, Dict, Optional
+from google.adk.agents import Agent, BaseAgent, SequentialAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
 from google.adk.apps.app import App
-from google.adk.models import Gemini
+from google.adk.models import Gemini, LlmResponse
 from google.genai import types
 
 from dotenv import load_dotenv
@@ -42,7 +47,58 @@ from .app_utils.tools import (
     optimize_routing,
     # Reporting tools
     format_report,
+    report_section,
 )
+from .app_utils.results import stage_output_instruction
+from .app_utils.simulator import reset_simulator_for_invocation
+
+# How monitoring/analysis/remediation report their tool results (TOOL_OUTPUT_MODE)
+STAGE_OUTPUT_INSTRUCTION = stage_output_instruction()
+
+# "coordinator": an LLM parent agent delegates to the sub-agents (default).
+# "pipeline": the sub-agents run in their fixed order without coordinator turns,
+# and the report is built from session state without an LLM call.
+ORCHESTRATION_MODE = os.environ.get("ORCHESTRATION_MODE", "coordinator").strip().lower()
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# RUN STATISTICS
+# ============================================================================
+
+def _run_stats(callback_context: CallbackContext) -> Dict[str, Any]:
+    stats = callback_context.state.get("orchestration_stats")
+    if not stats or stats.get("invocation_id") != callback_context.invocation_id:
+        stats = {"invocation_id": callback_context.invocation_id, "mode": ORCHESTRATION_MODE,
+                 "llm_calls": 0, "started_at": time.time()}
+    return dict(stats)
+
+
+def start_run_stats(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Starts this run's LLM call count and clock (state "orchestration_stats")."""
+    callback_context.state["orchestration_stats"] = _run_stats(callback_context)
+    return None
+
+
+def count_llm_call(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+    """Counts every LLM response in this run (streamed chunks count once)."""
+    if llm_response.partial:
+        return None
+    stats = _run_stats(callback_context)
+    stats["llm_calls"] += 1
+    callback_context.state["orchestration_stats"] = stats
+    return None
+
+
+def log_run_stats(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Logs the LLM calls and wall-clock time of the finished run."""
+    stats = _run_stats(callback_context)
+    stats["elapsed_s"] = round(time.time() - stats["started_at"], 2)
+    callback_context.state["orchestration_stats"] = stats
+    logger.info("Troubleshooting run (%s mode): %d LLM calls in %.2fs",
+                stats["mode"], stats["llm_calls"], stats["elapsed_s"])
+    return None
 
 # ============================================================================
 # SUB-AGENTS
@@ -66,17 +122,17 @@ monitoring_agent = Agent(
     When you receive a task from the parent NetworkTroubleshootingAgent:
     - Extract the website URL from the task description
     - Perform comprehensive monitoring checks
-    - Report all findings in a clear, structured format
     - Include all relevant metrics and status information
 
     Be thorough and provide detailed monitoring results that will help the AnalysisAgent identify root causes.
-    """,
+    """ + STAGE_OUTPUT_INSTRUCTION,
     tools=[
         check_website_availability,
         check_response_time,
         check_packet_loss,
     ],
     output_key="monitoring_results",
+    after_model_callback=count_llm_call,
 )
 
 analysis_agent = Agent(
@@ -99,15 +155,20 @@ analysis_agent = Agent(
     - Perform deep analysis of network traffic and latency
     - Identify specific bottlenecks and root causes
     - Provide actionable insights for remediation
+    - If the user mentions a flow export (NetFlow, IPFIX or CSV file), pass its path as flow_export
+      to analyze_network_traffic and identify_bottlenecks
+    - If the user mentions a packet capture (pcap or pcapng file), pass its path as capture_file
+      to analyze_network_traffic
 
     Your analysis should help the RemediationAgent understand what needs to be fixed.
-    """,
+    """ + STAGE_OUTPUT_INSTRUCTION,
     tools=[
         analyze_network_traffic,
         analyze_latency,
         identify_bottlenecks,
     ],
     output_key="analysis_results",
+    after_model_callback=count_llm_call,
 )
 
 remediation_agent = Agent(
@@ -137,13 +198,14 @@ remediation_agent = Agent(
     - Routing/latency issues → optimize_routing tool
 
     Provide clear reports on what actions were taken and their outcomes.
-    """,
+    """ + STAGE_OUTPUT_INSTRUCTION,
     tools=[
         restart_web_server,
         clear_cache,
         optimize_routing,
     ],
     output_key="remediation_results",
+    after_model_callback=count_llm_call,
 )
 
 reporting_agent = Agent(
@@ -170,6 +232,7 @@ reporting_agent = Agent(
     - Pass analysis_results: Extract the complete output from AnalysisAgent from the conversation history  
     - Pass remediation_results: Extract the complete output from RemediationAgent (this is the input you received)
     - Pass user_report: Extract the original user issue/report from the beginning of the conversation
+    - Pass each agent's output verbatim, including any JSON tool results; format_report renders them as text
     
     The report should summarize the entire troubleshooting process and provide clear next steps.
     """,
@@ -177,21 +240,92 @@ reporting_agent = Agent(
         format_report,
     ],
     output_key="final_report",
+    after_model_callback=count_llm_call,
 )
 
+# ============================================================================
+# DETERMINISTIC REPORTING STEPS (pipeline mode)
+# ============================================================================
+
+class ReportSectionStep(BaseAgent):
+    """Streams one stage's section of the report as a partial event as soon as
+    the stage's results are in session state, so /run_sse clients see the
+    report grow while the later stages run."""
+
+    stage: str
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        results = ctx.session.state.get(self.stage)
+        if not results:
+            return
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            partial=True,
+            content=types.Content(role="model", parts=[types.Part(text=report_section(self.stage, results))]),
+        )
+
+
+class ReportingStep(BaseAgent):
+    """Builds the final report with format_report straight from session state,
+    in place of the ReportingAgent's LLM turns over the conversation history.
+    Its event completes the partial sections streamed by ReportSectionStep."""
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        user_report = ""
+        if ctx.user_content and ctx.user_content.parts:
+            user_report = "".join(part.text or "" for part in ctx.user_content.parts)
+        report = format_report(
+            monitoring_results=state.get("monitoring_results", ""),
+            analysis_results=state.get("analysis_results", ""),
+            remediation_results=state.get("remediation_results", ""),
+            user_report=user_report,
+        )
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=report)]),
+            actions=EventActions(state_delta={"final_report": report}),
+        )
+
+
 # ============================================================================
 # PARENT ORCHESTRATION AGENT
 # ============================================================================
 
-network_troubleshooting_agent = Agent(
-    name="NetworkTroubleshootingAgent",
-    sub_agents=[
-        monitoring_agent,
-        analysis_agent,
-        remediation_agent,
-        reporting_agent,
-    ],
-    description="""This is the parent orchestration agent that 
+# An agent can only have one parent, so only the selected orchestration is built.
+if ORCHESTRATION_MODE == "pipeline":
+    network_troubleshooting_agent = SequentialAgent(
+        name="NetworkTroubleshootingPipeline",
+        description="Runs monitoring, analysis, remediation and reporting in a fixed order.",
+        sub_agents=[
+            monitoring_agent,
+            ReportSectionStep(name="MonitoringSection", stage="monitoring_results"),
+            analysis_agent,
+            ReportSectionStep(name="AnalysisSection", stage="analysis_results"),
+            remediation_agent,
+            ReportSectionStep(name="RemediationSection", stage="remediation_results"),
+            ReportingStep(
+                name="ReportingStep",
+                description="Formats the stage results from session state into the final report.",
+            ),
+        ],
+        before_agent_callback=[start_run_stats, reset_simulator_for_invocation],
+        after_agent_callback=log_run_stats,
+    )
+else:
+    network_troubleshooting_agent = Agent(
+        name="NetworkTroubleshootingAgent",
+        sub_agents=[
+            monitoring_agent,
+            analysis_agent,
+            remediation_agent,
+            reporting_agent,
+        ],
+        description="""This is the parent orchestration agent that 
     coordinates the entire network troubleshooting workflow.
 
     It receives user reports about website issues and orchestrates a hierarchical 
@@ -206,12 +340,12 @@ network_troubleshooting_agent = Agent(
     from the previous one. This hierarchical structure allows for specialized expertise at each stage 
     of the troubleshooting process.
     """,
-    model=Gemini(
-        model="gemini-3-flash-preview",
-        temperature=0.0,
-        retry_options=types.HttpRetryOptions(attempts=3),
-    ),
-    instruction="""You are the Network Troubleshooting Agent, the parent orchestration agent for automated 
+        model=Gemini(
+            model="gemini-3-flash-preview",
+            temperature=0.0,
+            retry_options=types.HttpRetryOptions(attempts=3),
+        ),
+        instruction="""You are the Network Troubleshooting Agent, the parent orchestration agent for automated 
 network troubleshooting and remediation.
 
 When a user reports a network issue (e.g., "Website is slow" or "Website is not responding"):
@@ -226,10 +360,15 @@ original report and the results from previous agents.
 
 Always ensure the workflow completes successfully and that the final report is presented to the user.
 """,
-)
+        before_agent_callback=[start_run_stats, reset_simulator_for_invocation],
+        after_model_callback=count_llm_call,
+        after_agent_callback=log_run_stats,
+    )
+
+root_agent = network_troubleshooting_agent
 
 # ============================================================================
 # APP CONFIGURATION
 # ============================================================================
 
-app = App(root_agent=network_troubleshooting_agent, name="app")
+app = App(root_agent=root_agent, name="app")
@@ -0,0 +1,542 @@
+"""
+Heavy-hitter analytics over flow exports (CSV, NetFlow v5 and IPFIX).
+
+Flow exports run to many gigabytes, so nothing here keeps per-flow state:
+
+- the readers stream the file in chunks and decode records to NumPy arrays of
+  FLOW_DTYPE in bulk (CSV is parsed row by row, NetFlow v5 and IPFIX records
+  are decoded with one vectorised view per chunk or data set)
+- FlowAnalyzer aggregates each batch and folds it into bounded sketches:
+  Space-Saving summaries rank the top source addresses, destinations,
+  ports and interfaces by bytes, and a Count-Min sketch answers byte counts
+  for any address (e.g. the website under investigation)
+
+Only ranked summaries leave this module. Byte counts of ranked entries are
+upper-bound estimates; they are exact while fewer distinct keys than the
+summary capacity have been seen, and over-count by at most total bytes /
+capacity otherwise.
+
+IPv4 addresses are keyed by their value. IPv6 addresses are folded to 64 bits
+with the top bit set, and the readers pass the text of folded addresses so
+the ranked ones can be labelled. Interface hotspots use the egress interface,
+or the ingress interface when the exporter does not report one (0).
+
+CSV rows that cannot be parsed (too few columns, an address that is not an IP
+address such as a hostname or "N/A", a non-numeric count) are skipped and
+counted, so one bad row does not fail the whole export; the summary reports
+how many were skipped.
+"""
+
+import csv
+import gzip
+import ipaddress
+import logging
+import os
+import socket
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FLOW_DTYPE = np.dtype([
+    ("src", np.uint64), ("dst", np.uint64),
+    ("src_port", np.uint16), ("dst_port", np.uint16), ("proto", np.uint8),
+    ("in_if", np.uint32), ("out_if", np.uint32),
+    ("bytes", np.uint64), ("packets", np.uint64),
+])
+
+# A batch of flow records and the text of the IPv6 address keys in it
+FlowBatch = Tuple[np.ndarray, Dict[int, str]]
+
+BATCH_SIZE = 65_536
+CHUNK_BYTES = 4 * 1024 * 1024
+_IPV6 = 1 << 63
+_PROTOCOLS = {"icmp": 1, "tcp": 6, "udp": 17, "gre": 47, "esp": 50, "icmpv6": 58, "sctp": 132}
+_PROTOCOL_NAMES = {number: name for name, number in _PROTOCOLS.items()}
+
+
+# ============================================================================
+# SKETCHES
+# ============================================================================
+
+class SpaceSaving:
+    """
+    Weighted Space-Saving summary of the `capacity` heaviest keys.
+
+    Each tracked key has a count (an upper bound of its true weight) and an
+    error (how much of the count may be over-estimate). Updates and merges
+    combine two summaries: a key missing from a full summary is credited with
+    that summary's smallest count, then only the `capacity` largest stay.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.errors = np.empty(0, dtype=np.int64)
+
+    @property
+    def floor(self) -> int:
+        """Weight credited to untracked keys (0 until the summary is full)."""
+        return int(self.counts.min()) if self.keys.size >= self.capacity else 0
+
+    def update(self, keys: np.ndarray, weights: np.ndarray) -> None:
+        """Add a batch of (possibly repeated) keys with their weights."""
+        if keys.size == 0:
+            return
+        unique, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse.ravel(), weights=weights.astype(np.float64)).astype(np.int64)
+        self._combine(unique, totals, np.zeros_like(totals), 0)
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """Fold another summary into this one."""
+        self._combine(other.keys, other.counts, other.errors, other.floor)
+
+    def _combine(self, keys: np.ndarray, counts: np.ndarray, errors: np.ndarray, floor: int) -> None:
+        own_floor = self.floor
+        merged = np.union1d(self.keys, keys)
+        total = np.full(merged.size, own_floor + floor, dtype=np.int64)
+        error = total.copy()
+        mine = np.searchsorted(merged, self.keys)
+        total[mine] += self.counts - own_floor
+        error[mine] += self.errors - own_floor
+        theirs = np.searchsorted(merged, keys)
+        total[theirs] += counts - floor
+        error[theirs] += errors - floor
+        if merged.size > self.capacity:
+            keep = np.argpartition(-total, self.capacity - 1)[:self.capacity]
+            merged, total, error = merged[keep], total[keep], error[keep]
+        self.keys, self.counts, self.errors = merged, total, error
+
+    def top(self, n: int) -> List[Tuple[int, int, int]]:
+        """The n heaviest (key, count, error), heaviest first."""
+        order = np.argsort(-self.counts, kind="stable")[:n]
+        return [(int(self.keys[i]), int(self.counts[i]), int(self.errors[i])) for i in order]
+
+
+class CountMinSketch:
+    """Count-Min sketch over uint64 keys (multiply-shift hashing, one hash per row)."""
+
+    def __init__(self, width: int = 1 << 16, depth: int = 4, seed: int = 0x5EED):
+        if width & (width - 1):
+            raise ValueError("width must be a power of two")
+        generator = np.random.default_rng(seed)
+        self.width = width
+        self._multipliers = generator.integers(1, 2**63, depth, dtype=np.uint64) | np.uint64(1)
+        self._offsets = generator.integers(0, 2**63, depth, dtype=np.uint64)
+        self._shift = np.uint64(64 - width.bit_length() + 1)
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _index(self, keys: np.ndarray) -> np.ndarray:
+        keys = np.asarray(keys, dtype=np.uint64)
+        hashed = keys[None, :] * self._multipliers[:, None] + self._offsets[:, None]
+        return (hashed >> self._shift).astype(np.intp)
+
+    def add(self, keys: np.ndarray, weights: np.ndarray) -> None:
+        weights = weights.astype(np.float64)
+        for row, index in enumerate(self._index(keys)):
+            self.table[row] += np.bincount(index, weights=weights, minlength=self.width).astype(np.int64)
+
+    def estimate(self, keys: Sequence[int]) -> np.ndarray:
+        """Upper-bound weight of each key."""
+        index = self._index(np.asarray(keys, dtype=np.uint64))
+        return self.table[np.arange(self.table.shape[0])[:, None], index].min(axis=0)
+
+    def merge(self, other: "CountMinSketch") -> None:
+        self.table += other.table
+
+
+# ============================================================================
+# ANALYZER
+# ============================================================================
+
+def address_key(address: str) -> int:
+    """Sketch key of an IPv4 or IPv6 address; ValueError for anything else."""
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, address), "big")
+    except OSError:
+        pass
+    try:
+        value = int.from_bytes(socket.inet_pton(socket.AF_INET6, address), "big")
+    except OSError:
+        raise ValueError(f"not an IP address: {address!r}") from None
+    return _IPV6 | ((value ^ (value >> 64)) & (_IPV6 - 1))
+
+
+def _address_label(key: int, labels: Dict[int, str]) -> str:
+    if key & _IPV6:
+        return labels.get(key, f"ipv6#{key & (_IPV6 - 1):x}")
+    return socket.inet_ntoa(key.to_bytes(4, "big"))
+
+
+def _port_label(key: int) -> str:
+    proto, port = (key >> 16) & 0xFF, key & 0xFFFF
+    return f"{_PROTOCOL_NAMES.get(proto, proto)}/{port}"
+
+
+class FlowAnalyzer:
+    """Bounded-memory top-N flow analytics over any number of flow records."""
+
+    def __init__(self, capacity: int = 1024, sketch_width: int = 1 << 16):
+        self.records = 0
+        self.skipped_records = 0  # malformed records the reader dropped
+        self.bytes = 0
+        self.packets = 0
+        self.talkers = SpaceSaving(capacity)
+        self.destinations = SpaceSaving(capacity)
+        self.ports = SpaceSaving(capacity)
+        self.interfaces = SpaceSaving(capacity)
+        self.interface_ports = SpaceSaving(capacity)
+        self.address_bytes = CountMinSketch(sketch_width)  # by source and destination
+        self._labels: Dict[int, str] = {}
+
+    def add(self, batch: np.ndarray, labels: Optional[Dict[int, str]] = None) -> None:
+        """Fold a FLOW_DTYPE batch into the summaries."""
+        if batch.size > BATCH_SIZE:  # bounds the temporaries of one update
+            for start in range(0, batch.size, BATCH_SIZE):
+                self.add(batch[start:start + BATCH_SIZE], labels)
+            return
+        if batch.size == 0:
+            return
+        weights = batch["bytes"]
+        self.records += int(batch.size)
+        self.bytes += int(weights.sum())
+        self.packets += int(batch["packets"].sum())
+        ports = (batch["proto"].astype(np.uint64) << np.uint64(16)) | batch["dst_port"]
+        interface = np.where(batch["out_if"] != 0, batch["out_if"], batch["in_if"]).astype(np.uint64)
+        known = interface != 0
+        self.talkers.update(batch["src"], weights)
+        self.destinations.update(batch["dst"], weights)
+        self.ports.update(ports, weights)
+        self.interfaces.update(interface[known], weights[known])
+        self.interface_ports.update((interface[known] << np.uint64(24)) | ports[known], weights[known])
+        self.address_bytes.add(np.concatenate((batch["src"], batch["dst"])), np.concatenate((weights, weights)))
+        if labels or self._labels:
+            tracked = np.union1d(self.talkers.keys, self.destinations.keys)
+            tracked = tracked[tracked >= np.uint64(_IPV6)].tolist()
+            self._labels = {key: self._labels.get(key) or (labels or {}).get(key) for key in tracked}
+
+    def bytes_for(self, addresses: Iterable[str]) -> int:
+        """Estimated bytes sent or received by any of the addresses."""
+        keys = [address_key(address) for address in addresses]
+        return int(self.address_bytes.estimate(keys).sum()) if keys else 0
+
+    def _ranked(self, summary: SpaceSaving, top: int, label, name: str) -> List[Dict[str, Any]]:
+        ranked = []
+        for key, count, _ in summary.top(top):
+            ranked.append({name: label(key), "bytes": count,
+                           "share_pct": round(100 * count / self.bytes, 1) if self.bytes else 0.0})
+        return ranked
+
+    def _addresses(self, summary: SpaceSaving, top: int) -> List[Dict[str, Any]]:
+        ranked = self._ranked(summary, top, lambda key: key, "address")
+        for entry in ranked:
+            # Both bounds over-count; the sketch is tighter once the summary is full
+            key = entry["address"]
+            entry["bytes"] = min(entry["bytes"], int(self.address_bytes.estimate([key])[0]))
+            entry["share_pct"] = round(100 * entry["bytes"] / self.bytes, 1) if self.bytes else 0.0
+            entry["address"] = _address_label(key, self._labels)
+        return ranked
+
+    def summary(self, top: int = 5) -> Dict[str, Any]:
+        """Ranked top talkers, destinations, ports and interface hotspots."""
+        hot = self._ranked(self.interfaces, top, int, "interface")
+        pairs = self.interface_ports
+        for entry in hot:
+            mask = (pairs.keys >> np.uint64(24)) == np.uint64(entry["interface"])
+            order = np.argsort(-pairs.counts[mask], kind="stable")[:3]
+            entry["top_ports"] = [_port_label(int(key) & 0xFFFFFF) for key in pairs.keys[mask][order]]
+        return {
+            "flows": self.records,
+            "skipped_records": self.skipped_records,
+            "bytes": self.bytes,
+            "packets": self.packets,
+            "top_talkers": self._addresses(self.talkers, top),
+            "top_destinations": self._addresses(self.destinations, top),
+            "top_ports": self._ranked(self.ports, top, _port_label, "port"),
+            "hot_interfaces": hot,
+        }
+
+
+# ============================================================================
+# READERS
+# ============================================================================
+
+_CSV_COLUMNS = {
+    "src": ("src", "src_addr", "srcaddr", "src_ip", "sa", "source", "sourceipv4address", "sourceipv6address"),
+    "dst": ("dst", "dst_addr", "dstaddr", "dst_ip", "da", "destination", "destinationipv4address",
+            "destinationipv6address"),
+    "src_port": ("src_port", "srcport", "sport", "sp", "sourcetransportport"),
+    "dst_port": ("dst_port", "dstport", "dport", "dp", "destinationtransportport"),
+    "proto": ("proto", "protocol", "prot", "pr", "protocolidentifier"),
+    "in_if": ("in_if", "input", "input_snmp", "in", "inif", "ingressinterface"),
+    "out_if": ("out_if", "output", "output_snmp", "out", "outif", "egressinterface"),
+    "bytes": ("bytes", "octets", "doctets", "ibyt", "in_bytes", "octetdeltacount"),
+    "packets": ("packets", "pkts", "dpkts", "ipkt", "in_pkts", "packetdeltacount"),
+}
+
+
+def _number(value: str) -> int:
+    value = value.strip()
+    if not value:
+        return 0
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def _protocol(value: str) -> int:
+    value = value.strip().lower()
+    return _PROTOCOLS[value] if value in _PROTOCOLS else _number(value)
+
+
+def read_csv(path: str, batch_size: int = BATCH_SIZE // 4,
+             stats: Optional[Dict[str, int]] = None) -> Iterator[FlowBatch]:
+    """
+    Flow records from a CSV export with a header row (gzip when the name ends in .gz).
+    Malformed rows are skipped; their number is added to stats["skipped_rows"].
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", newline="") as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader, [])]
+        columns = {}
+        for field, aliases in _CSV_COLUMNS.items():
+            columns[field] = next((header.index(alias) for alias in aliases if alias in header), None)
+        if columns["src"] is None or columns["dst"] is None or columns["bytes"] is None:
+            raise ValueError(f"{path}: CSV header needs source, destination and bytes columns")
+        keys: Dict[str, int] = {}
+
+        def key(address: str) -> int:
+            if address not in keys:
+                if len(keys) >= batch_size:
+                    keys.clear()
+                keys[address] = address_key(address.strip())
+            return keys[address]
+
+        parse = {"src": key, "dst": key, "proto": _protocol}
+        present = [(field, index, parse.get(field, _number)) for field, index in columns.items()
+                   if index is not None]
+        values: Dict[str, list] = {field: [] for field, _, _ in present}
+        labels: Dict[int, str] = {}
+        n = skipped = 0
+        for row in reader:
+            try:
+                if len(row) < len(header):
+                    raise ValueError("too few columns")
+                parsed = [(field, convert(row[index])) for field, index, convert in present]
+            except (ValueError, OverflowError):
+                skipped += 1
+                continue
+            for field, value in parsed:
+                values[field].append(value)
+            n += 1
+            if n == batch_size:
+                yield _csv_batch(values, n, labels, keys)
+                values, labels, n = {field: [] for field in values}, {}, 0
+        if n:
+            yield _csv_batch(values, n, labels, keys)
+        if skipped:
+            logger.warning("%s: skipped %d malformed row(s)", path, skipped)
+            if stats is not None:
+                stats["skipped_rows"] = stats.get("skipped_rows", 0) + skipped
+
+
+def _csv_batch(values: Dict[str, list], n: int, labels: Dict[int, str], keys: Dict[str, int]) -> FlowBatch:
+    batch = np.zeros(n, dtype=FLOW_DTYPE)
+    for field, column in values.items():
+        batch[field] = column
+    labels.update((key, address.strip()) for address, key in keys.items() if key & _IPV6)
+    return batch, labels
+
+
+def _framed(path: str, frame_length, header_bytes: int) -> Iterator[Tuple[bytes, List[int]]]:
+    """Chunks of a file of concatenated export messages, with the message offsets in each."""
+    with open(path, "rb") as f:
+        pending = b""
+        while True:
+            data = f.read(CHUNK_BYTES)
+            buffer = pending + data
+            offsets, offset = [], 0
+            while len(buffer) - offset >= header_bytes:
+                length = frame_length(buffer, offset)
+                if offset + length > len(buffer):
+                    break
+                offsets.append(offset)
+                offset += length
+            if offsets:
+                yield buffer, offsets
+            pending = buffer[offset:]
+            if not data:
+                if pending:
+                    logger.warning("%s: ignoring %d trailing bytes", path, len(pending))
+                return
+
+
+_V5_HEADER = struct.Struct(">HHIIIIBBH")
+_V5_RECORD = np.dtype([
+    ("src", ">u4"), ("dst", ">u4"), ("nexthop", ">u4"), ("in_if", ">u2"), ("out_if", ">u2"),
+    ("packets", ">u4"), ("bytes", ">u4"), ("first", ">u4"), ("last", ">u4"),
+    ("src_port", ">u2"), ("dst_port", ">u2"), ("pad1", "u1"), ("tcp_flags", "u1"), ("proto", "u1"),
+    ("tos", "u1"), ("src_as", ">u2"), ("dst_as", ">u2"), ("src_mask", "u1"), ("dst_mask", "u1"),
+    ("pad2", ">u2"),
+])
+
+
+def _v5_length(buffer: bytes, offset: int) -> int:
+    version, count = struct.unpack_from(">HH", buffer, offset)
+    if version != 5 or not 1 <= count <= 30:
+        raise ValueError(f"not a NetFlow v5 message at byte {offset}")
+    return _V5_HEADER.size + count * _V5_RECORD.itemsize
+
+
+def read_netflow_v5(path: str) -> Iterator[FlowBatch]:
+    """Flow records from concatenated NetFlow v5 export packets (scaled by the sampling interval)."""
+    for buffer, offsets in _framed(path, _v5_length, _V5_HEADER.size):
+        headers = [_V5_HEADER.unpack_from(buffer, offset) for offset in offsets]
+        counts = np.array([header[1] for header in headers], dtype=np.intp)
+        sampling = np.array([max(1, header[8] & 0x3FFF) for header in headers], dtype=np.uint64)
+        view = memoryview(buffer)
+        records = np.frombuffer(b"".join(
+            view[offset + _V5_HEADER.size:offset + _V5_HEADER.size + count * _V5_RECORD.itemsize]
+            for offset, count in zip(offsets, counts.tolist())
+        ), dtype=_V5_RECORD)
+        batch = np.zeros(records.size, dtype=FLOW_DTYPE)
+        for field in ("src", "dst", "src_port", "dst_port", "proto", "in_if", "out_if"):
+            batch[field] = records[field]
+        scale = np.repeat(sampling, counts)
+        batch["bytes"] = records["bytes"].astype(np.uint64) * scale
+        batch["packets"] = records["packets"].astype(np.uint64) * scale
+        yield batch, {}
+
+
+_IPFIX_HEADER = struct.Struct(">HHIII")
+_IPFIX_FIELDS = {  # information element id -> FLOW_DTYPE field
+    1: "bytes", 2: "packets", 4: "proto", 7: "src_port", 8: "src", 10: "in_if",
+    11: "dst_port", 12: "dst", 14: "out_if", 27: "src", 28: "dst", 85: "bytes", 86: "packets",
+}
+
+
+def _ipfix_length(buffer: bytes, offset: int) -> int:
+    version, length = struct.unpack_from(">HH", buffer, offset)
+    if version != 10 or length < _IPFIX_HEADER.size:
+        raise ValueError(f"not an IPFIX message at byte {offset}")
+    return length
+
+
+def _ipfix_templates(buffer: bytes, offset: int, end: int) -> Iterator[Tuple[int, Optional[list]]]:
+    """(template id, [(field, offset, length)] or None if unsupported) for each template in a set."""
+    while offset + 4 <= end:
+        template_id, field_count = struct.unpack_from(">HH", buffer, offset)
+        offset += 4
+        fields, position, supported = [], 0, True
+        for _ in range(field_count):
+            element, length = struct.unpack_from(">HH", buffer, offset)
+            offset += 4
+            if element & 0x8000:  # enterprise-specific element
+                offset += 4
+                element = -1
+            if length == 0xFFFF:
+                supported = False  # variable-length fields have no fixed record layout
+            fields.append((_IPFIX_FIELDS.get(element), position, length))
+            position += length
+        yield template_id, (fields if supported else None)
+
+
+def _ipfix_records(buffer: bytes, start: int, end: int, fields: list) -> FlowBatch:
+    record_length = sum(length for _, _, length in fields)
+    count = (end - start) // record_length
+    raw = np.frombuffer(buffer, dtype=np.uint8, count=count * record_length, offset=start)
+    raw = raw.reshape(count, record_length)
+    batch = np.zeros(count, dtype=FLOW_DTYPE)
+    labels: Dict[int, str] = {}
+    for field, position, length in fields:
+        if field is None:
+            continue
+        column = raw[:, position:position + length]
+        if length == 16:  # IPv6 address: fold to a 64-bit key
+            halves = column.copy().view(">u8")
+            keys = ((halves[:, 0] ^ halves[:, 1]) & np.uint64(_IPV6 - 1)) | np.uint64(_IPV6)
+            batch[field] = keys
+            unique, first = np.unique(keys, return_index=True)
+            labels.update((int(key), str(ipaddress.IPv6Address(bytes(column[i]))))
+                          for key, i in zip(unique, first))
+        elif length <= 8:  # reduced-size unsigned integers are big-endian too
+            batch[field] = (column.astype(np.uint64) << (8 * np.arange(length - 1, -1, -1, dtype=np.uint64))).sum(
+                axis=1, dtype=np.uint64)
+    return batch, labels
+
+
+def read_ipfix(path: str) -> Iterator[FlowBatch]:
+    """Flow records from concatenated IPFIX messages (templates with fixed-length fields)."""
+    templates: Dict[Tuple[int, int], Optional[list]] = {}
+    for buffer, offsets in _framed(path, _ipfix_length, _IPFIX_HEADER.size):
+        for offset in offsets:
+            _, length, _, _, domain = _IPFIX_HEADER.unpack_from(buffer, offset)
+            position, end = offset + _IPFIX_HEADER.size, offset + length
+            while position + 4 <= end:
+                set_id, set_length = struct.unpack_from(">HH", buffer, position)
+                if set_length < 4:
+                    break
+                body, set_end = position + 4, min(end, position + set_length)
+                if set_id == 2:
+                    for template_id, fields in _ipfix_templates(buffer, body, set_end):
+                        if fields is None:
+                            logger.warning("%s: skipping variable-length template %d", path, template_id)
+                        templates[(domain, template_id)] = fields
+                elif set_id >= 256 and templates.get((domain, set_id)):
+                    yield _ipfix_records(buffer, body, set_end, templates[(domain, set_id)])
+                position += set_length
+
+
+def read_flows(path: str, stats: Optional[Dict[str, int]] = None) -> Iterator[FlowBatch]:
+    """Flow records from a CSV, NetFlow v5 or IPFIX export, detected from its content."""
+    if path.endswith((".csv", ".csv.gz", ".txt")):
+        return read_csv(path, stats=stats)
+    with open(path, "rb") as f:
+        head = f.read(2)
+    if len(head) == 2:
+        version = struct.unpack(">H", head)[0]
+        if version == 5:
+            return read_netflow_v5(path)
+        if version == 10:
+            return read_ipfix(path)
+    return read_csv(path, stats=stats)
+
+
+# ============================================================================
+# CACHED ANALYSIS
+# ============================================================================
+
+_analyses: "OrderedDict[Tuple[str, int, float], FlowAnalyzer]" = OrderedDict()
+_analyses_lock = threading.Lock()
+
+
+def analyze_export(path: str, capacity: int = 1024) -> FlowAnalyzer:
+    """
+    The FlowAnalyzer of a flow export, reused while the file is unchanged (the
+    last few exports are kept), so several tools can query one ingest.
+    """
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    cache_key = (path, stat.st_size, stat.st_mtime)
+    with _analyses_lock:
+        if cache_key in _analyses:
+            _analyses.move_to_end(cache_key)
+            return _analyses[cache_key]
+    analyzer = FlowAnalyzer(capacity)
+    stats: Dict[str, int] = {}
+    for batch, labels in read_flows(path, stats):
+        analyzer.add(batch, labels)
+    analyzer.skipped_records = stats.get("skipped_rows", 0)
+    logger.info("Ingested %d flow records (%d bytes) from %s", analyzer.records, analyzer.bytes, path)
+    with _analyses_lock:
+        _analyses[cache_key] = analyzer
+        while len(_analyses) > 4:
+            _analyses.popitem(last=False)
+    return analyzer
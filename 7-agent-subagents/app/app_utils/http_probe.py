@@ -0,0 +1,384 @@
+"""
+Asyncio HTTP probing engine behind the website monitoring tools.
+
+Requests go through one HttpProber per event loop, which keeps:
+
+- a DNS cache (answers are reused for dns_ttl seconds; concurrent lookups of
+  the same host share one query)
+- a keep-alive connection pool per (scheme, host, port): a connection whose
+  response was read completely goes back to the pool and the next request to
+  that origin skips DNS, TCP and TLS setup
+- a cap on connections per origin and on URLs checked at the same time
+
+Every request is timed phase by phase: DNS lookup, TCP connect, TLS handshake
+and time to first byte (request sent until the first response byte), plus the
+total. Phases a reused connection skips are reported as 0.
+
+Only plain HTTP/1.1 is spoken (GET or HEAD, no redirects followed), which is
+all an availability and response-time check needs.
+"""
+
+import asyncio
+import ipaddress
+import os
+import socket
+import ssl
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+USER_AGENT = "adk-network-troubleshooter/1.0"
+READ_CHUNK = 64 * 1024
+
+Origin = Tuple[str, str, int]  # (scheme, host, port)
+
+
+@dataclass
+class ProbeSettings:
+    timeout: float = 10.0
+    max_connections_per_host: int = 6
+    concurrency: int = 100
+    dns_ttl: float = 60.0
+    idle_timeout: float = 30.0
+    max_body_bytes: int = 1024 * 1024
+    verify_tls: bool = True
+
+    @classmethod
+    def from_env(cls) -> "ProbeSettings":
+        """HTTP_PROBE_TIMEOUT_SECONDS, HTTP_PROBE_MAX_CONNECTIONS_PER_HOST,
+        HTTP_PROBE_CONCURRENCY, HTTP_PROBE_DNS_TTL_SECONDS, HTTP_PROBE_VERIFY_TLS."""
+        return cls(
+            timeout=float(os.environ.get("HTTP_PROBE_TIMEOUT_SECONDS", "10")),
+            max_connections_per_host=int(os.environ.get("HTTP_PROBE_MAX_CONNECTIONS_PER_HOST", "6")),
+            concurrency=int(os.environ.get("HTTP_PROBE_CONCURRENCY", "100")),
+            dns_ttl=float(os.environ.get("HTTP_PROBE_DNS_TTL_SECONDS", "60")),
+            verify_tls=os.environ.get("HTTP_PROBE_VERIFY_TLS", "true").lower() not in ("0", "false", "no"),
+        )
+
+
+@dataclass
+class HttpCheck:
+    """One timed request. Times are milliseconds; 0 for phases a reused connection skips."""
+
+    url: str
+    ok: bool = False              # a complete HTTP response arrived
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    phase: Optional[str] = None   # phase that failed: dns, connect, tls, request
+    dns_ms: float = 0.0
+    connect_ms: float = 0.0
+    tls_ms: float = 0.0
+    ttfb_ms: float = 0.0
+    total_ms: float = 0.0
+    body_bytes: int = 0
+    reused: bool = False
+    tls: bool = False
+
+
+@dataclass
+class _Connection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    idle_since: float = 0.0
+
+    def usable(self, idle_timeout: float) -> bool:
+        return (
+            not self.writer.is_closing()
+            and not self.reader.at_eof()
+            and time.monotonic() - self.idle_since < idle_timeout
+        )
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def parse_urls(spec: str) -> List[str]:
+    """URLs from a comma-separated list; "http://" is assumed without a scheme."""
+    urls = []
+    for item in spec.split(","):
+        item = item.strip()
+        if item:
+            urls.append(item if "://" in item else f"http://{item}")
+    return urls
+
+
+def _origin(url: str) -> Tuple[Origin, str]:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"unsupported URL {url!r}")
+    port = parts.port or (443 if scheme == "https" else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    return (scheme, parts.hostname, port), path
+
+
+class DnsCache:
+    """getaddrinfo answers cached for `ttl` seconds, with concurrent lookups merged."""
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._answers: Dict[Tuple[str, int], Tuple[float, List[Tuple[int, tuple]]]] = {}
+        self._pending: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    async def resolve(self, host: str, port: int) -> List[Tuple[int, tuple]]:
+        """(family, sockaddr) candidates for host:port; IP literals skip the resolver."""
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            pass
+        else:
+            if address.version == 6:
+                return [(socket.AF_INET6, (host, port, 0, 0))]
+            return [(socket.AF_INET, (host, port))]
+
+        key = (host.lower(), port)
+        cached = self._answers.get(key)
+        if cached is not None and time.monotonic() < cached[0]:
+            self.hits += 1
+            return cached[1]
+        if key in self._pending:
+            self.hits += 1
+            return await asyncio.shield(self._pending[key])
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            answer = [(family, sockaddr) for family, _, _, _, sockaddr in infos]
+            self._answers[key] = (time.monotonic() + self.ttl, answer)
+            future.set_result(answer)
+            return answer
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved here, so waiters alone decide what to log
+            raise
+        finally:
+            del self._pending[key]
+
+
+class HttpProber:
+    """Pooled, phase-timed HTTP checks. Use one instance per event loop."""
+
+    def __init__(self, settings: Optional[ProbeSettings] = None):
+        self.settings = settings or ProbeSettings.from_env()
+        self.dns = DnsCache(self.settings.dns_ttl)
+        self.connections_opened = 0
+        self._idle: Dict[Origin, Deque[_Connection]] = {}
+        self._limits: Dict[Origin, asyncio.Semaphore] = {}
+        self._ssl = ssl.create_default_context()
+        if not self.settings.verify_tls:
+            self._ssl.check_hostname = False
+            self._ssl.verify_mode = ssl.CERT_NONE
+
+    # --- connections ------------------------------------------------------
+
+    def _take_idle(self, origin: Origin) -> Optional[_Connection]:
+        idle = self._idle.get(origin)
+        while idle:
+            conn = idle.pop()  # most recently used first
+            if conn.usable(self.settings.idle_timeout):
+                return conn
+            conn.close()
+        return None
+
+    def _release(self, origin: Origin, conn: _Connection) -> None:
+        conn.idle_since = time.monotonic()
+        self._idle.setdefault(origin, deque()).append(conn)
+
+    async def _open(self, origin: Origin, check: HttpCheck) -> _Connection:
+        scheme, host, port = origin
+        check.phase = "dns"
+        start = time.perf_counter()
+        candidates = await self.dns.resolve(host, port)
+        check.dns_ms = (time.perf_counter() - start) * 1000
+
+        check.phase = "connect"
+        loop = asyncio.get_running_loop()
+        last_error: Optional[OSError] = None
+        sock = None
+        start = time.perf_counter()
+        for family, sockaddr in candidates:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            try:
+                await loop.sock_connect(sock, sockaddr)
+                break
+            except OSError as e:
+                sock.close()
+                sock, last_error = None, e
+        if sock is None:
+            raise last_error or OSError(f"no addresses for {host}")
+        check.connect_ms = (time.perf_counter() - start) * 1000
+
+        if scheme == "https":
+            check.phase = "tls"
+            check.tls = True
+            start = time.perf_counter()
+            reader, writer = await asyncio.open_connection(sock=sock, ssl=self._ssl, server_hostname=host)
+            check.tls_ms = (time.perf_counter() - start) * 1000
+        else:
+            reader, writer = await asyncio.open_connection(sock=sock)
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    # --- requests ---------------------------------------------------------
+
+    async def _exchange(
+        self, conn: _Connection, origin: Origin, path: str, method: str, check: HttpCheck
+    ) -> bool:
+        """Send one request and read the response. Returns whether the connection can be reused."""
+        scheme, host, port = origin
+        default_port = 443 if scheme == "https" else 80
+        host_header = host if port == default_port else f"{host}:{port}"
+        if ":" in host and not host.startswith("["):
+            host_header = f"[{host}]" if port == default_port else f"[{host}]:{port}"
+        request = (
+            f"{method} {path} HTTP/1.1\r\nHost: {host_header}\r\nUser-Agent: {USER_AGENT}\r\n"
+            "Accept: */*\r\nConnection: keep-alive\r\n\r\n"
+        )
+        check.phase = "request"
+        start = time.perf_counter()
+        conn.writer.write(request.encode("latin-1"))
+        await conn.writer.drain()
+
+        first = await conn.reader.readexactly(1)
+        check.ttfb_ms = (time.perf_counter() - start) * 1000
+        status_line = first + await conn.reader.readline()
+        version, code = status_line.split(b" ", 2)[:2]
+        check.status_code = int(code)
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await conn.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get("connection", "").lower() != "close" and (
+            version == b"HTTP/1.1" or headers.get("connection", "").lower() == "keep-alive"
+        )
+        if method == "HEAD" or check.status_code in (204, 304) or 100 <= check.status_code < 200:
+            pass
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            while True:
+                size = int((await conn.reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await conn.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    break
+                if check.body_bytes + size > self.settings.max_body_bytes:
+                    return False
+                await conn.reader.readexactly(size + 2)
+                check.body_bytes += size
+        elif "content-length" in headers:
+            remaining = int(headers["content-length"])
+            if remaining > self.settings.max_body_bytes:
+                return False
+            while remaining:
+                chunk = await conn.reader.read(min(READ_CHUNK, remaining))
+                if not chunk:
+                    return False
+                remaining -= len(chunk)
+                check.body_bytes += len(chunk)
+        else:  # body runs until the server closes
+            while check.body_bytes <= self.settings.max_body_bytes:
+                chunk = await conn.reader.read(READ_CHUNK)
+                if not chunk:
+                    break
+                check.body_bytes += len(chunk)
+            return False
+        return keep_alive
+
+    def _limit(self, origin: Origin) -> asyncio.Semaphore:
+        if origin not in self._limits:
+            self._limits[origin] = asyncio.Semaphore(self.settings.max_connections_per_host)
+        return self._limits[origin]
+
+    async def check(self, url: str, method: str = "GET") -> HttpCheck:
+        """Time one request to `url`, reusing a pooled connection when there is one."""
+        check = HttpCheck(url=url)
+        try:
+            origin, path = _origin(url)
+        except ValueError as e:
+            check.error = str(e)
+            return check
+
+        async with self._limit(origin):
+            start = time.perf_counter()
+            conn = self._take_idle(origin)
+            check.reused = conn is not None
+            check.tls = origin[0] == "https"
+            reusable = False
+
+            async def _request() -> bool:
+                nonlocal conn
+                if conn is None:
+                    conn = await self._open(origin, check)
+                return await self._exchange(conn, origin, path, method, check)
+
+            try:
+                try:
+                    reusable = await asyncio.wait_for(_request(), self.settings.timeout)
+                except (OSError, asyncio.IncompleteReadError):
+                    if not check.reused or check.ttfb_ms:
+                        raise
+                    # The server closed the idle connection; retry once on a new one
+                    conn.close()
+                    conn, check.reused = None, False
+                    reusable = await asyncio.wait_for(_request(), self.settings.timeout)
+                check.ok = True
+                check.phase = None
+            except asyncio.TimeoutError:
+                check.error = f"timed out after {self.settings.timeout:g}s"
+            except ssl.SSLError as e:
+                check.error = f"TLS error: {e.reason or e}"
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                check.error = str(e) or type(e).__name__
+            finally:
+                check.total_ms = (time.perf_counter() - start) * 1000
+                if conn is not None:
+                    if check.ok and reusable:
+                        self._release(origin, conn)
+                    else:
+                        conn.close()
+        return check
+
+    async def check_many(self, urls: Sequence[str], method: str = "GET") -> List[HttpCheck]:
+        """Check many URLs concurrently (at most settings.concurrency at once), in input order."""
+        semaphore = asyncio.Semaphore(self.settings.concurrency)
+
+        async def _bounded(url: str) -> HttpCheck:
+            async with semaphore:
+                return await self.check(url, method)
+
+        return list(await asyncio.gather(*(_bounded(url) for url in urls)))
+
+    async def sample(self, url: str, samples: int = 10, method: str = "GET") -> List[HttpCheck]:
+        """`samples` requests to one URL in a row; after the first they ride the kept-alive connection."""
+        return [await self.check(url, method) for _ in range(samples)]
+
+    def close(self) -> None:
+        for idle in self._idle.values():
+            while idle:
+                idle.pop().close()
+
+
+_probers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HttpProber]" = weakref.WeakKeyDictionary()
+
+
+def get_prober() -> HttpProber:
+    """The HttpProber of the running event loop (pooled connections belong to one loop)."""
+    loop = asyncio.get_running_loop()
+    prober = _probers.get(loop)
+    if prober is None:
+        prober = _probers[loop] = HttpProber()
+    return prober
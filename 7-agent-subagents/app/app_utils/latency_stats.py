@@ -0,0 +1,303 @@
+"""
+Streaming latency statistics for probe sample streams.
+
+LatencyStats summarises any number of RTT samples in constant memory:
+
+- nearest-rank quantiles from a log-bucketed histogram (HDR / DDSketch
+  style): bucket i holds values in (gamma^(i-1), gamma^i], so every quantile
+  is within RELATIVE_ACCURACY (1%) of the exact sample quantile
+- exact count, min, max, mean and standard deviation
+- jitter as the mean absolute difference between consecutive samples (IPDV)
+- loss: lost samples and the lengths of loss bursts (runs of consecutive
+  losses), with burst lengths above MAX_BURST counted in the last slot
+
+A lost probe is recorded as None or NaN. add() takes one sample; add_many()
+takes a batch and runs on NumPy. Two LatencyStats merge by adding their
+buckets and counters, so targets and time windows combine without keeping
+samples (bursts and jitter are not joined across a merge boundary).
+
+LatencyTracker keeps rolling windows of LatencyStats per target, for the
+monitoring tools to record measurements and the analysis tools to read them.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(GAMMA)
+MIN_MS = 0.001      # 1 µs; smaller samples share the first bucket
+MAX_MS = 600_000.0  # 10 min; larger samples share the last bucket (max stays exact)
+_OFFSET = math.ceil(math.log(MIN_MS) / _LOG_GAMMA)
+NUM_BUCKETS = math.ceil(math.log(MAX_MS) / _LOG_GAMMA) - _OFFSET + 1
+MAX_BURST = 32
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _bucket(value: float) -> int:
+    if value <= MIN_MS:
+        return 0
+    return min(NUM_BUCKETS - 1, math.ceil(math.log(value) / _LOG_GAMMA) - _OFFSET)
+
+
+def _buckets(values: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore"):
+        index = np.ceil(np.log(np.maximum(values, MIN_MS)) / _LOG_GAMMA) - _OFFSET
+    return np.clip(index, 0, NUM_BUCKETS - 1).astype(np.intp)
+
+
+class LatencyStats:
+    """Constant-memory summary of one RTT sample stream (milliseconds)."""
+
+    __slots__ = ("counts", "count", "total", "total_sq", "min", "max",
+                 "lost", "burst_counts", "max_burst", "_open_burst",
+                 "jitter_total", "jitter_count", "_last")
+
+    def __init__(self) -> None:
+        self.counts = np.zeros(NUM_BUCKETS, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.lost = 0
+        self.burst_counts = np.zeros(MAX_BURST, dtype=np.int64)  # [i]: bursts of length i + 1
+        self.max_burst = 0
+        self._open_burst = 0
+        self.jitter_total = 0.0
+        self.jitter_count = 0
+        self._last: Optional[float] = None
+
+    # --- recording ----------------------------------------------------------
+
+    def _close_burst(self) -> None:
+        if self._open_burst:
+            self.burst_counts[min(self._open_burst, MAX_BURST) - 1] += 1
+            self.max_burst = max(self.max_burst, self._open_burst)
+            self._open_burst = 0
+
+    def add(self, rtt_ms: Optional[float]) -> None:
+        """Record one probe: its RTT, or None / NaN if it was lost."""
+        if rtt_ms is None or math.isnan(rtt_ms):
+            self.lost += 1
+            self._open_burst += 1
+            return
+        self._close_burst()
+        self.counts[_bucket(rtt_ms)] += 1
+        self.count += 1
+        self.total += rtt_ms
+        self.total_sq += rtt_ms * rtt_ms
+        self.min = min(self.min, rtt_ms)
+        self.max = max(self.max, rtt_ms)
+        if self._last is not None:
+            self.jitter_total += abs(rtt_ms - self._last)
+            self.jitter_count += 1
+        self._last = rtt_ms
+
+    def add_many(self, samples: Iterable[Optional[float]]) -> None:
+        """Record a batch of probes in order (NaN or None for lost ones)."""
+        values = np.asarray(
+            samples if isinstance(samples, np.ndarray) else
+            [math.nan if s is None else s for s in samples],
+            dtype=np.float64,
+        )
+        if values.size == 0:
+            return
+        lost = np.isnan(values)
+        self._add_losses(lost)
+
+        received = values[~lost]
+        if received.size:
+            self.counts += np.bincount(_buckets(received), minlength=NUM_BUCKETS)
+            self.count += int(received.size)
+            self.total += float(received.sum())
+            self.total_sq += float(np.dot(received, received))
+            self.min = min(self.min, float(received.min()))
+            self.max = max(self.max, float(received.max()))
+            chained = received if self._last is None else np.concatenate(([self._last], received))
+            if chained.size > 1:
+                self.jitter_total += float(np.abs(np.diff(chained)).sum())
+                self.jitter_count += int(chained.size - 1)
+            self._last = float(received[-1])
+
+    def _add_losses(self, lost: np.ndarray) -> None:
+        n_lost = int(lost.sum())
+        if n_lost == 0:
+            self._close_burst()
+            return
+        self.lost += n_lost
+        edges = np.diff(np.concatenate(([0], lost.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        lengths = ends - starts
+        if starts[0] == 0:
+            lengths[0] += self._open_burst  # continues the burst the last batch ended in
+        elif self._open_burst:
+            self._close_burst()
+        self._open_burst = 0
+        if ends[-1] == lost.size:  # still losing at the end of the batch
+            self._open_burst = int(lengths[-1])
+            lengths = lengths[:-1]
+        if lengths.size:
+            self.burst_counts += np.bincount(np.minimum(lengths, MAX_BURST) - 1, minlength=MAX_BURST)
+            self.max_burst = max(self.max_burst, int(lengths.max()))
+
+    def merge(self, other: "LatencyStats") -> "LatencyStats":
+        """A new LatencyStats covering both streams."""
+        merged = LatencyStats()
+        for stats in (self, other):
+            merged.counts += stats.counts
+            merged.count += stats.count
+            merged.total += stats.total
+            merged.total_sq += stats.total_sq
+            merged.min = min(merged.min, stats.min)
+            merged.max = max(merged.max, stats.max)
+            merged.lost += stats.lost
+            merged.burst_counts += stats.burst_counts
+            merged.max_burst = max(merged.max_burst, stats.max_burst)
+            merged.jitter_total += stats.jitter_total
+            merged.jitter_count += stats.jitter_count
+            if stats._open_burst:
+                merged.burst_counts[min(stats._open_burst, MAX_BURST) - 1] += 1
+                merged.max_burst = max(merged.max_burst, stats._open_burst)
+        return merged
+
+    # --- reading ------------------------------------------------------------
+
+    @property
+    def sent(self) -> int:
+        return self.count + self.lost
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    @property
+    def stddev(self) -> float:
+        if not self.count:
+            return math.nan
+        return math.sqrt(max(0.0, self.total_sq / self.count - self.mean ** 2))
+
+    @property
+    def jitter(self) -> float:
+        return self.jitter_total / self.jitter_count if self.jitter_count else math.nan
+
+    @property
+    def loss_ratio(self) -> float:
+        return self.lost / self.sent if self.sent else 0.0
+
+    def bursts(self) -> np.ndarray:
+        """Loss burst counts by length (index i: length i + 1), including an unfinished burst."""
+        counts = self.burst_counts.copy()
+        if self._open_burst:
+            counts[min(self._open_burst, MAX_BURST) - 1] += 1
+        return counts
+
+    def quantiles(self, qs: Sequence[float] = DEFAULT_QUANTILES) -> List[float]:
+        """
+        Nearest-rank quantiles of the received samples: the q-quantile is the
+        ceil(q * count)-th smallest sample, within RELATIVE_ACCURACY (exact for
+        the first and last rank, which are min and max). NaN when empty.
+        """
+        if not self.count:
+            return [math.nan] * len(qs)
+        # The epsilon keeps float error (0.95 * 20 = 19.000000000000004) from
+        # bumping an exact rank to the next one.
+        ranks = np.clip(np.ceil(np.asarray(qs, dtype=np.float64) * self.count - 1e-9), 1, self.count)
+        index = np.searchsorted(np.cumsum(self.counts), ranks, side="left")
+        values = np.clip(2 * np.power(GAMMA, index + _OFFSET) / (GAMMA + 1), self.min, self.max)
+        values[ranks == 1] = self.min
+        values[ranks == self.count] = self.max
+        return [float(v) for v in values]
+
+    def summary(self, qs: Sequence[float] = DEFAULT_QUANTILES, digits: int = 1) -> Dict[str, Any]:
+        """Plain-number summary for tool results (e.g. p50_ms, p95_ms, p99_ms)."""
+
+        def r(value: float) -> Optional[float]:
+            return None if math.isnan(value) or math.isinf(value) else round(value, digits)
+
+        bursts = self.bursts()
+        result: Dict[str, Any] = {
+            "samples": self.sent,
+            "received": self.count,
+            "loss_pct": round(100 * self.loss_ratio, 2),
+            "min_ms": r(self.min),
+            "avg_ms": r(self.mean),
+            "max_ms": r(self.max),
+            "stddev_ms": r(self.stddev),
+            "jitter_ms": r(self.jitter),
+        }
+        for q, value in zip(qs, self.quantiles(qs)):
+            result[f"p{q * 100:g}_ms"] = r(value)
+        result["loss_bursts"] = int(bursts.sum())
+        result["max_loss_burst"] = max(self.max_burst, self._open_burst)
+        return result
+
+
+class LatencyTracker:
+    """
+    Rolling windows of LatencyStats per target: the last `max_windows` windows
+    of `window_seconds` each, for at most `max_targets` targets (least
+    recently updated targets are dropped first).
+    """
+
+    def __init__(self, window_seconds: float = 60.0, max_windows: int = 15, max_targets: int = 1024):
+        self.window_seconds = window_seconds
+        self.max_windows = max_windows
+        self.max_targets = max_targets
+        self._targets: "OrderedDict[str, Deque[Tuple[int, LatencyStats]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _window(self, target: str, now: Optional[float]) -> LatencyStats:
+        window = int((time.time() if now is None else now) // self.window_seconds)
+        windows = self._targets.get(target)
+        if windows is None:
+            windows = self._targets[target] = deque(maxlen=self.max_windows)
+            while len(self._targets) > self.max_targets:
+                self._targets.popitem(last=False)
+        self._targets.move_to_end(target)
+        if not windows or windows[-1][0] != window:
+            windows.append((window, LatencyStats()))
+        return windows[-1][1]
+
+    def add(self, target: str, samples: Iterable[Optional[float]], now: Optional[float] = None) -> None:
+        """Record a batch of samples for a target in the current window."""
+        with self._lock:
+            self._window(target, now).add_many(samples)
+
+    def stats(
+        self, targets: Optional[Iterable[str]] = None, windows: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> LatencyStats:
+        """Merged stats of the given targets (default: all) over the last `windows` windows."""
+        current = int((time.time() if now is None else now) // self.window_seconds)
+        oldest = current - (windows or self.max_windows) + 1
+        merged = LatencyStats()
+        with self._lock:
+            names = list(self._targets) if targets is None else [t for t in targets if t in self._targets]
+            for name in names:
+                for window, stats in self._targets[name]:
+                    if window >= oldest:
+                        merged = merged.merge(stats)
+        return merged
+
+
+_tracker: Optional[LatencyTracker] = None
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Process-wide tracker from LATENCY_WINDOW_SECONDS and LATENCY_MAX_WINDOWS."""
+    global _tracker
+    if _tracker is None:
+        _tracker = LatencyTracker(
+            float(os.environ.get("LATENCY_WINDOW_SECONDS", "60")),
+            int(os.environ.get("LATENCY_MAX_WINDOWS", "15")),
+        )
+    return _tracker
@@ -0,0 +1,494 @@
+"""
+Packet capture analysis: memory-mapped pcap / pcapng reading and per-flow
+TCP summaries.
+
+read_packets() memory-maps the capture and walks it in chunks of packets.
+Walking the record chain is the only per-packet Python step and keeps just
+the record offsets (in a compact array). The record headers and the link, IP
+and TCP/UDP headers of the whole chunk are then decoded at once, by gathering
+bytes at fixed offsets from a NumPy view of the map, into a PACKET_DTYPE
+structured array. Captures of any size are read with memory bounded by the
+chunk size.
+
+Supported link types: Ethernet (with one VLAN tag), raw IP, Linux cooked
+capture v1 and v2. IPv6 extension headers and non-first IPv4 fragments are
+counted as IP packets without ports.
+
+CaptureAnalyzer folds chunks into a per-flow table (NumPy columns, one row
+per bidirectional 5-tuple, sorted by a 64-bit flow hash) with:
+
+- bytes, packets and duration, hence throughput
+- handshake RTT: SYN to SYN/ACK as seen at the capture point
+- retransmissions: data segments whose sequence range ends at or before the
+  highest sequence already sent in that direction (sequence numbers are taken
+  relative to the first seen, so one wrap per direction is handled)
+"""
+
+import ipaddress
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .latency_stats import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+PACKET_DTYPE = np.dtype([
+    ("ts", np.float64), ("length", np.uint32), ("family", np.uint8),
+    ("src_hi", np.uint64), ("src_lo", np.uint64), ("dst_hi", np.uint64), ("dst_lo", np.uint64),
+    ("src_port", np.uint16), ("dst_port", np.uint16), ("proto", np.uint8), ("flags", np.uint8),
+    ("seq", np.uint32), ("ack", np.uint32), ("payload", np.uint32),
+])
+
+FLOW_STATS_DTYPE = np.dtype([
+    ("key", np.uint64), ("family", np.uint8),
+    ("a_hi", np.uint64), ("a_lo", np.uint64), ("b_hi", np.uint64), ("b_lo", np.uint64),
+    ("a_port", np.uint16), ("b_port", np.uint16), ("proto", np.uint8),
+    ("packets", np.uint64), ("bytes", np.uint64), ("payload", np.uint64),
+    ("first", np.float64), ("last", np.float64), ("syn", np.float64), ("synack", np.float64),
+    ("client", np.int8),  # side that sent the SYN: 0 (a), 1 (b) or -1 (unknown)
+    ("data_segments", np.uint64), ("retransmits", np.uint64),
+    ("base", np.int64, (2,)),  # first sequence number per direction (-1 until seen)
+    ("end", np.uint64, (2,)),  # highest relative sequence end per direction
+])
+
+CHUNK_PACKETS = 65_536
+
+_ETHERNET, _RAW, _RAW_ALT, _IPV4, _IPV6_LINK, _SLL, _SLL2 = 1, 101, 12, 228, 229, 113, 276
+_PCAP_MAGIC = {
+    b"\xd4\xc3\xb2\xa1": ("<", 1e-6), b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+    b"\x4d\x3c\xb2\xa1": ("<", 1e-9), b"\xa1\xb2\x3c\x4d": (">", 1e-9),
+}
+_PCAPNG_SHB = 0x0A0D0D0A
+_SYN, _ACK = 0x02, 0x10
+_SEQ_BITS = np.uint64(34)  # relative sequence ends fit in 33 bits
+
+
+# ============================================================================
+# INDEXING (record headers)
+# ============================================================================
+
+class _Gather:
+    """Fields at arbitrary byte positions of a uint8 view (big-endian unless noted)."""
+
+    def __init__(self, buffer: np.ndarray):
+        self.buffer = buffer
+        self.last = buffer.size - 1
+
+    def u8(self, at: np.ndarray) -> np.ndarray:
+        return self.buffer[np.clip(at, 0, self.last)].astype(np.uint64)
+
+    def u16(self, at: np.ndarray) -> np.ndarray:
+        return (self.u8(at) << np.uint64(8)) | self.u8(at + 1)
+
+    def u32(self, at: np.ndarray) -> np.ndarray:
+        return (self.u16(at) << np.uint64(16)) | self.u16(at + 2)
+
+    def u64(self, at: np.ndarray) -> np.ndarray:
+        return (self.u32(at) << np.uint64(32)) | self.u32(at + 4)
+
+    def u32_as(self, at: np.ndarray, endian: str) -> np.ndarray:
+        if endian == ">":
+            return self.u32(at)
+        return self.u8(at) | (self.u8(at + 1) << np.uint64(8)) | (self.u8(at + 2) << np.uint64(16)) | (
+            self.u8(at + 3) << np.uint64(24))
+
+
+class _Chunk:
+    """
+    Record offsets of one chunk of packets (walking the file is the only
+    sequential step), with what is needed to decode their headers in bulk.
+    """
+
+    def __init__(self, endian: str, interfaces: List[Tuple[int, float]]):
+        self.offsets = array("q")
+        self.endian = endian
+        self.interfaces = interfaces  # (link type, seconds per timestamp unit); pcap: one entry
+
+    def records(self, get: _Gather, pcapng: bool) -> Tuple[np.ndarray, ...]:
+        """(packet data offset, captured length, wire length, timestamp, link type) arrays."""
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        linktypes = np.array([linktype for linktype, _ in self.interfaces] or [0], dtype=np.uint16)
+        units = np.array([unit for _, unit in self.interfaces] or [1e-6])
+        u32 = lambda at: get.u32_as(at, self.endian)  # noqa: E731
+        if pcapng:  # enhanced packet block
+            interface = np.minimum(u32(offsets + 8), linktypes.size - 1).astype(np.intp)
+            ticks = (u32(offsets + 12) << np.uint64(32)) | u32(offsets + 16)
+            return (offsets + 28, u32(offsets + 20).astype(np.int64), u32(offsets + 24),
+                    ticks * units[interface], linktypes[interface])
+        unit = units[0]
+        return (offsets + 16, u32(offsets + 8).astype(np.int64), u32(offsets + 12),
+                u32(offsets) + u32(offsets + 4) * unit, np.full(offsets.size, linktypes[0]))
+
+
+def _pcap_chunks(mm: mmap.mmap, chunk: int) -> Iterator[_Chunk]:
+    endian, unit = _PCAP_MAGIC[bytes(mm[:4])]
+    linktype = struct.unpack_from(endian + "I", mm, 20)[0] & 0x0FFFFFFF
+    caplen = struct.Struct(endian + "I").unpack_from
+    offset, size = 24, len(mm)
+    current, count = _Chunk(endian, [(linktype, unit)]), 0
+    while offset + 16 <= size:
+        following = offset + 16 + caplen(mm, offset + 8)[0]
+        if following > size:
+            logger.warning("capture truncated at byte %d", offset)
+            break
+        current.offsets.append(offset)
+        offset, count = following, count + 1
+        if count == chunk:
+            yield current
+            current, count = _Chunk(endian, current.interfaces), 0
+    if count:
+        yield current
+
+
+def _pcapng_chunks(mm: mmap.mmap, chunk: int) -> Iterator[_Chunk]:
+    """Chunks of enhanced packet blocks; a new section (byte order, interfaces) starts a new chunk."""
+    offset, size = 0, len(mm)
+    current, count = _Chunk("<", []), 0
+    header = struct.Struct("<II").unpack_from
+    while offset + 12 <= size:
+        block_type, block_length = header(mm, offset)
+        if block_type == _PCAPNG_SHB:
+            if count:
+                yield current
+            endian = "<" if bytes(mm[offset + 8:offset + 12]) == b"\x4d\x3c\x2b\x1a" else ">"
+            header = struct.Struct(endian + "II").unpack_from
+            block_type, block_length = header(mm, offset)
+            current, count = _Chunk(endian, []), 0
+        if block_length < 12 or offset + block_length > size:
+            logger.warning("capture truncated at byte %d", offset)
+            break
+        if block_type == 6:  # enhanced packet
+            current.offsets.append(offset)
+            count += 1
+            if count == chunk:
+                yield current
+                current, count = _Chunk(current.endian, current.interfaces), 0
+        elif block_type == 1:  # interface description (listed before the packets that use it)
+            linktype = struct.unpack_from(current.endian + "H", mm, offset + 8)[0]
+            resolution = _pcapng_resolution(mm, offset + 16, offset + block_length - 4, current.endian)
+            current.interfaces = current.interfaces + [(linktype, resolution)]
+        offset += block_length
+    if count:
+        yield current
+
+
+def _pcapng_resolution(mm: mmap.mmap, offset: int, end: int, endian: str) -> float:
+    """if_tsresol of an interface description block (microseconds by default)."""
+    while offset + 4 <= end:
+        code, length = struct.unpack_from(endian + "HH", mm, offset)
+        if code == 0:
+            break
+        if code == 9 and length >= 1:
+            value = mm[offset + 4]
+            return 2.0 ** -(value & 0x7F) if value & 0x80 else 10.0 ** -value
+        offset += 4 + (length + 3) // 4 * 4
+    return 1e-6
+
+
+# ============================================================================
+# DECODING (headers at fixed offsets, whole chunk at once)
+# ============================================================================
+
+def _decode(get: _Gather, records: Tuple[np.ndarray, ...]) -> np.ndarray:
+    data, caplen, length, ts, linktype = records
+    end = data + caplen
+    packets = np.zeros(data.size, dtype=PACKET_DTYPE)
+    packets["ts"] = ts
+    packets["length"] = length
+
+    # Link layer: where the IP header starts and its ethertype
+    l3 = np.full(data.size, -1, dtype=np.int64)
+    ethertype = np.zeros(data.size, dtype=np.uint64)
+    ethernet = linktype == _ETHERNET
+    if ethernet.any():
+        outer = get.u16(data + 12)
+        tagged = (outer == 0x8100) | (outer == 0x88A8)
+        ethertype = np.where(ethernet, np.where(tagged, get.u16(data + 16), outer), ethertype)
+        l3 = np.where(ethernet, data + 14 + 4 * tagged, l3)
+    for cooked, type_at, header in ((_SLL, 14, 16), (_SLL2, 0, 20)):
+        mask = linktype == cooked
+        if mask.any():
+            ethertype = np.where(mask, get.u16(data + type_at), ethertype)
+            l3 = np.where(mask, data + header, l3)
+    raw = np.isin(linktype, (_RAW, _RAW_ALT, _IPV4, _IPV6_LINK))
+    if raw.any():
+        version = get.u8(data) >> np.uint64(4)
+        ethertype = np.where(raw, np.where(version == 4, 0x0800, np.where(version == 6, 0x86DD, 0)), ethertype)
+        l3 = np.where(raw, data, l3)
+
+    # Network layer
+    v4 = (ethertype == 0x0800) & (l3 >= 0) & (l3 + 20 <= end)
+    v6 = (ethertype == 0x86DD) & (l3 >= 0) & (l3 + 40 <= end)
+    ihl = ((get.u8(l3) & np.uint64(0x0F)) * np.uint64(4)).astype(np.int64)
+    packets["family"] = np.where(v4, 4, np.where(v6, 6, 0))
+    proto = np.where(v4, get.u8(l3 + 9), np.where(v6, get.u8(l3 + 6), 0))
+    packets["proto"] = proto
+    ip_payload = np.where(v4, get.u16(l3 + 2).astype(np.int64) - ihl,
+                          np.where(v6, get.u16(l3 + 4).astype(np.int64), 0))
+    packets["src_hi"] = np.where(v6, get.u64(l3 + 8), 0)
+    packets["src_lo"] = np.where(v4, get.u32(l3 + 12), np.where(v6, get.u64(l3 + 16), 0))
+    packets["dst_hi"] = np.where(v6, get.u64(l3 + 24), 0)
+    packets["dst_lo"] = np.where(v4, get.u32(l3 + 16), np.where(v6, get.u64(l3 + 32), 0))
+    first_fragment = ~v4 | ((get.u16(l3 + 6) & np.uint64(0x1FFF)) == 0)
+
+    # Transport layer
+    l4 = np.where(v4, l3 + ihl, l3 + 40)
+    tcp = (v4 | v6) & first_fragment & (proto == 6) & (l4 + 20 <= end)
+    udp = (v4 | v6) & first_fragment & (proto == 17) & (l4 + 8 <= end)
+    ports = tcp | udp
+    packets["src_port"] = np.where(ports, get.u16(l4), 0)
+    packets["dst_port"] = np.where(ports, get.u16(l4 + 2), 0)
+    packets["seq"] = np.where(tcp, get.u32(l4 + 4), 0)
+    packets["ack"] = np.where(tcp, get.u32(l4 + 8), 0)
+    packets["flags"] = np.where(tcp, get.u8(l4 + 13), 0)
+    tcp_header = ((get.u8(l4 + 12) >> np.uint64(4)) * np.uint64(4)).astype(np.int64)
+    packets["payload"] = np.maximum(0, np.where(tcp, ip_payload - tcp_header, np.where(udp, ip_payload - 8, 0)))
+    return packets
+
+
+def read_packets(path: str, chunk: int = CHUNK_PACKETS) -> Iterator[np.ndarray]:
+    """PACKET_DTYPE arrays of up to `chunk` packets from a pcap or pcapng file."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < 24:
+            raise ValueError(f"{path}: not a pcap or pcapng capture")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic = bytes(mm[:4])
+            pcapng = struct.unpack("<I", magic)[0] == _PCAPNG_SHB
+            if magic not in _PCAP_MAGIC and not pcapng:
+                raise ValueError(f"{path}: not a pcap or pcapng capture")
+            chunks = (_pcapng_chunks if pcapng else _pcap_chunks)(mm, chunk)
+            get = _Gather(np.frombuffer(mm, dtype=np.uint8))
+            try:
+                for current in chunks:
+                    yield _decode(get, current.records(get, pcapng))
+            finally:
+                del get  # the map cannot close while a view of it exists
+
+
+# ============================================================================
+# FLOW ANALYSIS
+# ============================================================================
+
+def _mix(value: np.ndarray) -> np.ndarray:
+    """splitmix64 finaliser."""
+    value = (value ^ (value >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    value = (value ^ (value >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return value ^ (value >> np.uint64(31))
+
+
+def _flow_key(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    key = np.zeros(columns["a_lo"].size, dtype=np.uint64)
+    for name in ("a_hi", "a_lo", "b_hi", "b_lo"):
+        key = _mix(key ^ columns[name])
+    ports = (columns["a_port"].astype(np.uint64) << np.uint64(24)) | (columns["b_port"].astype(np.uint64) << np.uint64(8))
+    return _mix(key ^ ports ^ columns["proto"])
+
+
+def _address(family: int, hi: int, lo: int) -> str:
+    if family == 6:
+        return f"[{ipaddress.IPv6Address((hi << 64) | lo)}]"
+    return str(ipaddress.IPv4Address(lo))
+
+
+def _ms(value: float) -> Any:
+    return None if math.isnan(value) else round(value, 1)
+
+
+class CaptureAnalyzer:
+    """Per-flow throughput, handshake RTT and retransmission summaries of a capture."""
+
+    def __init__(self) -> None:
+        self.packets = 0
+        self.ip_packets = 0
+        self.bytes = 0
+        self.first = math.inf
+        self.last = -math.inf
+        self.flows = np.zeros(0, dtype=FLOW_STATS_DTYPE)
+
+    def add(self, packets: np.ndarray) -> None:
+        """Fold a PACKET_DTYPE chunk (in capture order) into the flow table."""
+        if packets.size == 0:
+            return
+        self.packets += int(packets.size)
+        self.bytes += int(packets["length"].sum(dtype=np.uint64))
+        self.first = min(self.first, float(packets["ts"].min()))
+        self.last = max(self.last, float(packets["ts"].max()))
+        ip = packets[packets["family"] != 0]
+        self.ip_packets += int(ip.size)
+        if ip.size == 0:
+            return
+
+        # One row per bidirectional flow: side a is the lower (address, port)
+        forward = (ip["src_hi"] < ip["dst_hi"]) | ((ip["src_hi"] == ip["dst_hi"]) & (
+            (ip["src_lo"] < ip["dst_lo"]) | ((ip["src_lo"] == ip["dst_lo"]) & (ip["src_port"] <= ip["dst_port"]))))
+        columns = {"proto": ip["proto"].astype(np.uint64)}
+        for side, mine, theirs in (("a", "src", "dst"), ("b", "dst", "src")):
+            for part in ("hi", "lo"):
+                columns[f"{side}_{part}"] = np.where(forward, ip[f"{mine}_{part}"], ip[f"{theirs}_{part}"])
+            columns[f"{side}_port"] = np.where(forward, ip[f"{mine}_port"], ip[f"{theirs}_port"])
+        direction = (~forward).astype(np.intp)  # 0: sent by side a
+        keys, first_index, inverse = np.unique(_flow_key(columns), return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        chunk = np.zeros(keys.size, dtype=FLOW_STATS_DTYPE)
+        chunk["key"] = keys
+        chunk["family"] = ip["family"][first_index]
+        for name, column in columns.items():
+            chunk[name] = column[first_index]
+        ts, flags = ip["ts"], ip["flags"]
+        chunk["packets"] = np.bincount(inverse, minlength=keys.size)
+        chunk["bytes"] = np.bincount(inverse, weights=ip["length"], minlength=keys.size)
+        chunk["payload"] = np.bincount(inverse, weights=ip["payload"], minlength=keys.size)
+        for field, reduce, start in (("first", np.minimum, math.inf), ("last", np.maximum, -math.inf)):
+            chunk[field] = start
+            reduce.at(chunk[field], inverse, ts)
+
+        tcp = ip["proto"] == 6
+        chunk["client"] = -1
+        for field, wanted in (("syn", _SYN), ("synack", _SYN | _ACK)):
+            mask = tcp & ((flags & (_SYN | _ACK)) == wanted)
+            chunk[field] = math.nan
+            np.fmin.at(chunk[field], inverse[mask], ts[mask])
+            if field == "syn":
+                chunk["client"][inverse[mask]] = direction[mask]
+
+        position = np.searchsorted(self.flows["key"], keys)
+        exists = position < self.flows.size
+        exists[exists] = self.flows["key"][position[exists]] == keys[exists]
+        chunk["base"] = -1
+        chunk["base"][exists] = self.flows["base"][position[exists]]
+        chunk["end"][exists] = self.flows["end"][position[exists]]
+        self._retransmits(chunk, inverse * 2 + direction, ip, tcp & (ip["payload"] > 0))
+        self._merge(chunk, position, exists)
+
+    @staticmethod
+    def _retransmits(chunk: np.ndarray, group: np.ndarray, ip: np.ndarray, data: np.ndarray) -> None:
+        """Count retransmitted data segments per flow and carry the per-direction state forward."""
+        group, seq, payload = group[data], ip["seq"][data].astype(np.int64), ip["payload"][data].astype(np.int64)
+        if group.size == 0:
+            return
+        flows = group // 2
+        chunk["data_segments"] += np.bincount(flows, minlength=chunk.size).astype(np.uint64)
+        order = np.argsort(group, kind="stable")  # per direction, in capture order
+        group, seq, payload = group[order], seq[order], payload[order]
+        base = chunk["base"].reshape(-1)  # indexed by flow * 2 + direction
+        starts = np.flatnonzero(np.concatenate(([True], group[1:] != group[:-1])))
+        unset = base[group[starts]] < 0
+        base[group[starts[unset]]] = seq[starts[unset]]
+        relative = ((seq - base[group]) % (1 << 32) + payload).astype(np.uint64)
+        encoded = (group.astype(np.uint64) << _SEQ_BITS) | relative
+        running = np.maximum.accumulate(encoded)
+        previous = np.concatenate(([np.uint64(0)], running[:-1]))
+        same = np.concatenate(([False], group[1:] == group[:-1]))
+        end = chunk["end"].reshape(-1)
+        mask = (np.uint64(1) << _SEQ_BITS) - np.uint64(1)
+        highest = np.maximum(end[group], np.where(same, previous & mask, 0))
+        retransmitted = relative <= highest
+        chunk["retransmits"] += np.bincount(group // 2, weights=retransmitted, minlength=chunk.size).astype(np.uint64)
+        np.maximum.at(end, group, relative)
+        chunk["base"] = base.reshape(-1, 2)
+        chunk["end"] = end.reshape(-1, 2)
+
+    def _merge(self, chunk: np.ndarray, position: np.ndarray, exists: np.ndarray) -> None:
+        if exists.any():
+            rows, update = position[exists], chunk[exists]
+            table = self.flows
+            for field in ("packets", "bytes", "payload", "data_segments", "retransmits"):
+                table[field][rows] += update[field]
+            table["first"][rows] = np.minimum(table["first"][rows], update["first"])
+            table["last"][rows] = np.maximum(table["last"][rows], update["last"])
+            for field in ("syn", "synack"):
+                table[field][rows] = np.fmin(table[field][rows], update[field])
+            table["client"][rows] = np.where(table["client"][rows] < 0, update["client"], table["client"][rows])
+            table["base"][rows] = update["base"]
+            table["end"][rows] = update["end"]
+        self.flows = np.insert(self.flows, position[~exists], chunk[~exists])
+
+    def _label(self, row: np.void) -> str:
+        sides = [(_address(int(row["family"]), int(row["a_hi"]), int(row["a_lo"])), int(row["a_port"])),
+                 (_address(int(row["family"]), int(row["b_hi"]), int(row["b_lo"])), int(row["b_port"]))]
+        if row["client"] == 1:
+            sides.reverse()
+        proto = {6: "tcp", 17: "udp"}.get(int(row["proto"]), str(int(row["proto"])))
+        if row["proto"] not in (6, 17):
+            return f"{sides[0][0]} > {sides[1][0]} {proto}"
+        return f"{sides[0][0]}:{sides[0][1]} > {sides[1][0]}:{sides[1][1]} {proto}"
+
+    def summary(self, top: int = 5) -> Dict[str, Any]:
+        """Capture totals, handshake RTT percentiles, and the heaviest and lossiest flows."""
+        flows = self.flows
+        duration = max(0.0, self.last - self.first) if self.packets else 0.0
+        rtt_ms = (flows["synack"] - flows["syn"]) * 1000
+        valid = np.isfinite(rtt_ms) & (rtt_ms >= 0)
+        rtt = LatencyStats()
+        rtt.add_many(rtt_ms[valid])
+        p50, p95, p99 = rtt.quantiles()
+        segments, retransmits = int(flows["data_segments"].sum()), int(flows["retransmits"].sum())
+        seconds = flows["last"] - flows["first"]
+
+        def flow(i: int) -> Dict[str, Any]:
+            return {
+                "flow": self._label(flows[i]),
+                "bytes": int(flows["bytes"][i]),
+                "packets": int(flows["packets"][i]),
+                "mbps": round(float(flows["bytes"][i]) * 8 / seconds[i] / 1e6, 2) if seconds[i] > 0 else None,
+                "rtt_ms": _ms(float(rtt_ms[i])) if valid[i] else None,
+                "retransmits": int(flows["retransmits"][i]),
+            }
+
+        heaviest = np.argsort(-flows["bytes"].astype(np.float64), kind="stable")[:top]
+        lossy = np.flatnonzero(flows["retransmits"] > 0)
+        lossy = lossy[np.argsort(-flows["retransmits"][lossy].astype(np.float64), kind="stable")[:top]]
+        return {
+            "packets": self.packets,
+            "ip_packets": self.ip_packets,
+            "bytes": self.bytes,
+            "duration_s": round(duration, 3),
+            "throughput_mbps": round(self.bytes * 8 / duration / 1e6, 2) if duration else None,
+            "flows": int(flows.size),
+            "tcp_flows": int((flows["proto"] == 6).sum()),
+            "retransmits": retransmits,
+            "retransmit_pct": round(100 * retransmits / segments, 2) if segments else 0.0,
+            "rtt_flows": rtt.count,
+            "rtt_p50_ms": _ms(p50),
+            "rtt_p95_ms": _ms(p95),
+            "rtt_p99_ms": _ms(p99),
+            "top_flows": [flow(int(i)) for i in heaviest],
+            "lossy_flows": [flow(int(i)) for i in lossy],
+        }
+
+
+# ============================================================================
+# CACHED ANALYSIS
+# ============================================================================
+
+_analyses: "OrderedDict[Tuple[str, int, float], CaptureAnalyzer]" = OrderedDict()
+_analyses_lock = threading.Lock()
+
+
+def analyze_capture(path: str) -> CaptureAnalyzer:
+    """The CaptureAnalyzer of a capture file, reused while the file is unchanged."""
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    cache_key = (path, stat.st_size, stat.st_mtime)
+    with _analyses_lock:
+        if cache_key in _analyses:
+            _analyses.move_to_end(cache_key)
+            return _analyses[cache_key]
+    analyzer = CaptureAnalyzer()
+    for packets in read_packets(path):
+        analyzer.add(packets)
+    logger.info("Analyzed %d packets (%d flows) from %s", analyzer.packets, analyzer.flows.size, path)
+    with _analyses_lock:
+        _analyses[cache_key] = analyzer
+        while len(_analyses) > 4:
+            _analyses.popitem(last=False)
+    return analyzer
@@ -0,0 +1,577 @@
+"""
+Structured tool results and their text rendering.
+
+Every tool builds one result dict with stable keys ("tool" names the tool that
+produced it; measurements are plain numbers, flags are booleans). What the
+tool returns depends on TOOL_OUTPUT_MODE:
+
+- "compact" (default): the dict itself. ADK hands it to the model as JSON, and
+  the sub-agents pass it on unchanged, so each result costs a few dozen tokens
+  every time it is re-read by a later agent.
+- "text": the multi-line text block the tools used to return.
+
+Rendering to text is deferred to format_report(), which renders structured
+results (or passes text through) once, for the final report.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, List, Union
+
+logger = logging.getLogger(__name__)
+
+COMPACT = "compact"
+TEXT = "text"
+
+ToolResult = Union[str, Dict[str, Any], List[Dict[str, Any]]]
+
+
+def output_mode() -> str:
+    """The tool output mode from TOOL_OUTPUT_MODE ("compact" or "text")."""
+    mode = os.environ.get("TOOL_OUTPUT_MODE", COMPACT).strip().lower()
+    return mode if mode in (COMPACT, TEXT) else COMPACT
+
+
+def emit(result: Union[Dict[str, Any], List[Dict[str, Any]]]) -> ToolResult:
+    """What a tool returns for `result` in the current output mode."""
+    return result if output_mode() == COMPACT else render(result)
+
+
+def stage_output_instruction() -> str:
+    """How a sub-agent should report its tool results, for its instruction."""
+    if output_mode() == COMPACT:
+        return (
+            "Report your findings as a JSON list of the tool results you received, "
+            "unchanged and without code fences, followed by one line with your assessment. "
+            "Do not restate the results as prose; they are rendered in the final report."
+        )
+    return "Report all findings in a clear, structured format."
+
+
+# ============================================================================
+# TEXT RENDERERS (one per tool)
+# ============================================================================
+
+def _lines(*lines: str) -> str:
+    return "\n".join(lines)
+
+
+def _timings(r: Dict[str, Any]) -> List[str]:
+    """Phase timings of a measured check (simulated results have none)."""
+    if "ttfb_ms" not in r or "dns_ms" not in r:
+        return []
+    reused = " (reused connection)" if r.get("reused_connection") else ""
+    return [
+        f"Timings: DNS {r['dns_ms']} ms, Connect {r['connect_ms']} ms, "
+        f"TLS {r['tls_ms']} ms, TTFB {r['ttfb_ms']} ms{reused}",
+        "",
+    ]
+
+
+def _percentiles(r: Dict[str, Any]) -> List[str]:
+    """RTT percentiles of a summarised probe stream (older results have none)."""
+    if "p50_ms" not in r:
+        return []
+    return [f"Percentiles: p50 {r['p50_ms']} ms, p95 {r['p95_ms']} ms, p99 {r['p99_ms']} ms"]
+
+
+def _availability(r: Dict[str, Any]) -> str:
+    if r["available"]:
+        return _lines(
+            "Website Availability Check Results:",
+            "==================================",
+            f"Target URL: {r['url']}",
+            "Status: AVAILABLE",
+            "",
+            "HTTP Response:",
+            f"Status Code: {r['status_code']}",
+            f"Response Time: {r['response_ms']} ms",
+            f"Content-Length: {r['content_bytes']} bytes",
+            "",
+            f"DNS Resolution: {r['dns']}",
+            f"SSL Certificate: {r['ssl']}",
+            "Connection: ESTABLISHED",
+            "",
+            *_timings(r),
+            "Overall Status: OPERATIONAL",
+        )
+    answered = r.get("status_code") is not None
+    return _lines(
+        "Website Availability Check Results:",
+        "==================================",
+        f"Target URL: {r['url']}",
+        "Status: UNAVAILABLE",
+        "",
+        "HTTP Response:",
+        f"Status Code: {r['status_code'] if answered else 'TIMEOUT / CONNECTION ERROR'}",
+        f"Response Time: {r['response_ms']} ms" if answered else "Response Time: N/A",
+        f"Connection: {'ESTABLISHED' if answered else 'FAILED'}",
+        "",
+        f"DNS Resolution: {r['dns']}",
+        f"SSL Certificate: {r.get('ssl', 'N/A')}",
+        f"Connection: {'ESTABLISHED' if answered else 'FAILED'}",
+        "",
+        *(_timings(r) if answered else []),
+        "Overall Status: DOWN",
+        f"Issue: {r['error']}" if r.get("error") else (
+            f"Issue: Server error (HTTP {r['status_code']})" if answered
+            else "Issue: Website is not responding to requests"
+        ),
+    )
+
+
+def _response_time(r: Dict[str, Any]) -> str:
+    samples = r.get("samples", 10)
+    if r.get("avg_ms") is None:
+        return _lines(
+            "Response Time Check Results:",
+            "===========================",
+            f"Target URL: {r['url']}",
+            f"Threshold: {r['threshold_ms']} ms",
+            "",
+            f"Response Time Measurements ({samples} samples):",
+            "Status: NO RESPONSE",
+            f"Error: {r.get('error', 'no response')}",
+            "",
+            "Recommendation: Check website availability first",
+        )
+    avg = r["avg_ms"]
+    setup = r.get("setup_ms")
+    return _lines(
+        "Response Time Check Results:",
+        "===========================",
+        f"Target URL: {r['url']}",
+        f"Threshold: {r['threshold_ms']} ms",
+        "",
+        f"Response Time Measurements ({samples} samples):",
+        f"Minimum: {r.get('min_ms', avg - 20)} ms",
+        f"Average: {avg} ms",
+        f"Maximum: {r.get('max_ms', avg + 50)} ms",
+        f"Median: {r.get('median_ms', avg + 5)} ms",
+        f"95th Percentile: {r.get('p95_ms', avg + 80)} ms",
+        *([f"Failed Requests: {r['failed']} ({r['error']})"] if r.get("failed") else []),
+        "",
+        "Threshold Comparison:",
+        f"Average Response Time: {avg} ms",
+        f"Threshold: {r['threshold_ms']} ms",
+        f"Status: {'EXCEEDED - SLOW' if r['slow'] else 'WITHIN LIMITS'}",
+        "",
+        "Performance Analysis:",
+        f"Time to First Byte (TTFB): {r['ttfb_ms']} ms",
+        f"Content Load Time: {r['content_load_ms']} ms",
+        f"Total Load Time: {avg} ms",
+        *([f"Connection Setup (first request only): DNS {setup['dns']} ms, "
+           f"Connect {setup['connect']} ms, TLS {setup['tls']} ms"] if setup else []),
+        "",
+        f"Recommendation: {'Performance optimization recommended' if r['slow'] else 'Performance is acceptable'}",
+    )
+
+
+def _packet_loss(r: Dict[str, Any]) -> str:
+    loss = r["loss_pct"]
+    return _lines(
+        "Packet Loss Check Results:",
+        "=========================",
+        f"Target URL: {r['url']}",
+        f"Packets Sent: {r['sent']}",
+        f"Packets Received: {r['received']}",
+        f"Packets Lost: {r['sent'] - r['received']}",
+        "",
+        f"Packet Loss: {loss:.1f}%",
+        f"Status: {'HIGH PACKET LOSS DETECTED' if loss > 5 else 'NORMAL' if loss == 0 else 'MINOR PACKET LOSS'}",
+        "",
+        "Network Path Analysis:",
+        f"Hop Count: {r['hops']}",
+        f"Average RTT: {r['rtt_ms']} ms",
+        *_percentiles(r),
+        f"Jitter: {r['jitter_ms']} ms",
+        *([f"Loss Bursts: {r['loss_bursts']} (longest {r['max_loss_burst']} packets)"] if "loss_bursts" in r else []),
+        "",
+        f"Recommendation: {'Investigate network path issues' if loss > 5 else 'Network path is stable'}",
+    )
+
+
+def _size(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+def _flows(r: Dict[str, Any]) -> List[str]:
+    """Ranked flow summaries of a flow-export-backed result."""
+    if "error" in r:
+        return [f"Flow Export: {r['flow_export']}", f"Error: {r['error']}"]
+    lines = [f"Flow Export: {r['flow_export']} ({r['flows']} flows, {_size(r['bytes'])}, {r['packets']} packets)"]
+    if "site_bytes" in r:
+        lines.append(f"Website Traffic: {_size(r['site_bytes'])} ({r['site_share_pct']}% of bytes)")
+    for title, key, name in (("Top Talkers", "top_talkers", "address"),
+                             ("Top Destinations", "top_destinations", "address"),
+                             ("Top Ports", "top_ports", "port")):
+        lines += ["", f"{title}:"] + [f"{i}. {e[name]}: {_size(e['bytes'])} ({e['share_pct']}%)"
+                                      for i, e in enumerate(r[key], 1)]
+    if r["hot_interfaces"]:
+        lines += ["", "Interface Hotspots:"] + [
+            f"{i}. Interface {e['interface']}: {_size(e['bytes'])} ({e['share_pct']}%), "
+            f"top ports {', '.join(e['top_ports'])}"
+            for i, e in enumerate(r["hot_interfaces"], 1)
+        ]
+    return lines
+
+
+def _capture(c: Dict[str, Any]) -> List[str]:
+    """Per-flow summaries of a packet capture."""
+    if "error" in c:
+        return [f"Packet Capture: {c['file']}", f"Error: {c['error']}"]
+
+    def flow(i: int, f: Dict[str, Any]) -> str:
+        rate = f", {f['mbps']} Mbps" if f["mbps"] is not None else ""
+        rtt = f", RTT {f['rtt_ms']} ms" if f["rtt_ms"] is not None else ""
+        return f"{i}. {f['flow']}: {_size(f['bytes'])}{rate}{rtt}, {f['retransmits']} retransmits"
+
+    lines = [
+        f"Packet Capture: {c['file']} ({c['packets']} packets, {_size(c['bytes'])}, {c['duration_s']} s)",
+        f"Flows: {c['flows']} ({c['tcp_flows']} TCP), Throughput: {c['throughput_mbps']} Mbps",
+        f"Retransmissions: {c['retransmits']} ({c['retransmit_pct']}% of data segments)",
+    ]
+    if c["rtt_flows"]:
+        lines.append(f"Handshake RTT ({c['rtt_flows']} flows): p50 {c['rtt_p50_ms']} ms, "
+                     f"p95 {c['rtt_p95_ms']} ms, p99 {c['rtt_p99_ms']} ms")
+    lines += ["", "Top Flows:"] + [flow(i, f) for i, f in enumerate(c["top_flows"], 1)]
+    if c["lossy_flows"]:
+        lines += ["", "Flows With Retransmissions:"] + [flow(i, f) for i, f in enumerate(c["lossy_flows"], 1)]
+    return lines
+
+
+def _traffic_issues(r: Dict[str, Any]) -> List[str]:
+    issues = []
+    if "flow_export" in r:
+        talkers = r.get("top_talkers") or [{"share_pct": 0}]
+        if "error" in r:
+            issues.append("Flow export could not be analyzed")
+        elif talkers[0]["share_pct"] >= 30:
+            issues.append(f"Traffic concentrated on a few talkers (top talker {talkers[0]['share_pct']}% of bytes)")
+    capture = r.get("capture")
+    if capture is not None:
+        if "error" in capture:
+            issues.append("Packet capture could not be analyzed")
+        elif capture["retransmit_pct"] > 1:
+            issues.append(f"TCP retransmissions at {capture['retransmit_pct']}% - packet loss on the path")
+    return issues or ["Traffic patterns appear normal"]
+
+
+def _traffic(r: Dict[str, Any]) -> str:
+    if "flow_export" in r or "capture" in r:
+        return _lines(
+            "Network Traffic Analysis Results:",
+            "=================================",
+            f"Target URL: {r['url']}",
+            "",
+            *([*_flows(r), ""] if "flow_export" in r else []),
+            *([*_capture(r["capture"]), ""] if "capture" in r else []),
+            "Issues Identified:",
+            *_traffic_issues(r),
+        )
+    total, errors = r["requests"], r["errors"]
+    return _lines(
+        "Network Traffic Analysis Results:",
+        "=================================",
+        f"Target URL: {r['url']}",
+        f"Analysis Duration: {r['duration_min']} minutes",
+        "",
+        "Traffic Statistics:",
+        f"Total Requests: {total}",
+        f"Successful Requests: {total - errors}",
+        f"Failed Requests: {errors}",
+        f"Error Rate: {r['error_rate'] * 100:.2f}%",
+        "",
+        "Request Distribution:",
+        f"GET Requests: {int(total * 0.85)}",
+        f"POST Requests: {int(total * 0.10)}",
+        f"Other: {int(total * 0.05)}",
+        "",
+        "Error Analysis:",
+        f"4xx Errors: {int(errors * 0.6)}",
+        f"5xx Errors: {int(errors * 0.4)}",
+        f"Common Error Codes: {r['top_error_code']}",
+        "",
+        "Traffic Patterns:",
+        f"Peak Requests/Minute: {r['peak_rpm']}",
+        f"Average Requests/Minute: {total // r['duration_min']}",
+        f"Bandwidth Usage: {r['bandwidth_mbps']} Mbps",
+        "",
+        "Issues Identified:",
+        'High error rate detected - server may be overloaded' if r['error_rate'] > 0.1
+        else 'Traffic patterns appear normal',
+    )
+
+
+def _latency(r: Dict[str, Any]) -> str:
+    avg, high = r["avg_ms"], r["bottleneck"]
+    return _lines(
+        "Latency Analysis Results:",
+        "========================",
+        f"Target URL: {r['url']}",
+        "",
+        "Latency Metrics:",
+        f"Average Latency: {avg} ms",
+        f"Minimum Latency: {r.get('min_ms', avg - 30)} ms",
+        f"Maximum Latency: {r.get('max_ms', avg + 100)} ms",
+        f"Standard Deviation: {r['stddev_ms']} ms",
+        *_percentiles(r),
+        *([f"Jitter: {r['jitter_ms']} ms", f"Samples: {r['samples']}"] if "jitter_ms" in r else []),
+        "",
+        "Path Analysis:",
+        f"Number of Hops: {r['hops']}",
+        f"Bottleneck Detected: {'YES' if high else 'NO'}",
+        f"Bottleneck Location: {'Hop {random.randint(5, 12)} - High latency detected' if high else 'No significant bottlenecks'}",
+        "",
+        "Geographic Analysis:",
+        "Source Location: US-West",
+        "Destination Location: US-East",
+        f"Expected Latency: {r['expected_ms']} ms",
+        f"Actual Latency: {avg} ms",
+        f"Variance: {'HIGH - Path optimization needed' if high else 'ACCEPTABLE'}",
+        "",
+        f"Recommendation: {'Investigate network path and consider routing optimization' if high else 'Latency is within acceptable range'}",
+    )
+
+
+def _bottlenecks(r: Dict[str, Any]) -> str:
+    kind = r["bottleneck"]
+    if kind is None:
+        return _lines(
+            "Bottleneck Identification Results:",
+            "==================================",
+            f"Target URL: {r['url']}",
+            "",
+            "Bottlenecks Detected: NO",
+            "",
+            "System Health Check:",
+            "Network Path: Normal",
+            *([f"Server Resources: Normal (CPU: {r['cpu_pct']}%, Memory: {r['memory_pct']}%)",
+               "Database Performance: Normal",
+               "CDN/Cache: Normal"] if "cpu_pct" in r else []),
+            "",
+            *([*_flows(r), ""] if "flow_export" in r else []),
+            "All components operating within normal parameters.",
+            "No significant bottlenecks identified.",
+        )
+    network = 'latency' in kind.lower() or 'Bandwidth' in kind or 'network' in kind.lower()
+    server = 'CPU' in kind or 'Server' in kind
+    return _lines(
+        "Bottleneck Identification Results:",
+        "==================================",
+        f"Target URL: {r['url']}",
+        "",
+        "Bottlenecks Detected: YES",
+        "",
+        "Primary Bottleneck:",
+        f"Type: {kind}",
+        f"Severity: {r['severity']}",
+        f"Impact: {'Significant performance degradation' if 'High' in kind else 'Moderate performance impact'}",
+        "",
+        "Affected Components:",
+        f"- Network Path: {'Affected' if network else 'Normal'}",
+        f"- Server Resources: {'Affected' if server else 'Normal'}",
+        f"- Database: {'Affected' if 'Database' in kind else 'Normal'}",
+        f"- CDN/Cache: {'Affected' if 'CDN' in kind or 'cache' in kind.lower() else 'Normal'}",
+        "",
+        "Root Cause Analysis:",
+        f"Likely Cause: {kind}",
+        "Contributing Factors:",
+        f"- Network congestion: {'Yes' if network else 'No'}",
+        f"- Resource constraints: {'Yes' if server else 'No'}",
+        f"- Configuration issues: {r['config_issue']}",
+        "",
+        *([*_flows(r), ""] if "flow_export" in r else []),
+        "Recommendation: Immediate remediation required to restore performance",
+    )
+
+
+def _restart(r: Dict[str, Any]) -> str:
+    if r["success"]:
+        return _lines(
+            "Web Server Restart Results:",
+            "==========================",
+            f"Server: {r['server']}",
+            "",
+            "Action: Restarting web server...",
+            "Status: SUCCESS",
+            "",
+            "Service Status:",
+            "Before: RUNNING (with issues)",
+            "After: RUNNING (healthy)",
+            "",
+            "Restart Details:",
+            "Service: nginx/apache",
+            f"Restart Time: {r['restart_s']} seconds",
+            f"Downtime: {r['downtime_s']} seconds",
+            "",
+            "Verification:",
+            "Server responding: YES",
+            "Health check passed: YES",
+            f"Response time: {r['response_ms']} ms",
+            "",
+            "Result: Web server successfully restarted and operational",
+        )
+    return _lines(
+        "Web Server Restart Results:",
+        "==========================",
+        f"Server: {r['server']}",
+        "",
+        "Action: Restarting web server...",
+        "Status: FAILED",
+        "",
+        "Error Details:",
+        "Service: nginx/apache",
+        "Error: Unable to restart service",
+        "Reason: Service dependency issue / Configuration error",
+        "",
+        "Current Status:",
+        "Server: PARTIALLY OPERATIONAL",
+        "Response time: Degraded",
+        "",
+        "Recommendation: Manual intervention required",
+    )
+
+
+def _cache(r: Dict[str, Any]) -> str:
+    cache_type = r["cache_type"]
+    head = [
+        "Cache Clear Results:",
+        "===================",
+        f"Target URL: {r['url']}",
+        f"Cache Type: {cache_type}",
+        "",
+        f"Action: Clearing {cache_type} cache...",
+        f"Status: {'SUCCESS' if r['success'] else 'PARTIAL SUCCESS'}",
+        "",
+        "Cache Statistics:",
+        f"Cache Entries Cleared: {r['entries_cleared']}",
+        f"Cache Size Cleared: {r['size_mb']} MB",
+        f"Clear Duration: {r['duration_s']} seconds",
+        "",
+    ]
+    if r["success"]:
+        return _lines(
+            *head,
+            "Verification:",
+            "Cache Status: EMPTY",
+            "New Requests: Serving fresh content",
+            "Cache Rebuild: In progress",
+            "",
+            f"Result: {cache_type} cache successfully cleared",
+        )
+    return _lines(
+        *head,
+        "Issues:",
+        "Some cache entries could not be cleared",
+        "Cache may require manual intervention",
+        "",
+        "Result: Partial cache clear completed",
+    )
+
+
+def _routing(r: Dict[str, Any]) -> str:
+    if r["success"]:
+        return _lines(
+            "Routing Optimization Results:",
+            "============================",
+            f"Target URL: {r['url']}",
+            "",
+            "Action: Optimizing network routing...",
+            "Status: SUCCESS",
+            "",
+            "Routing Changes:",
+            f"Previous Path: {r['hops_before']} hops",
+            f"Optimized Path: {r['hops_after']} hops",
+            f"Hops Reduced: {r['hops_reduced']}",
+            "",
+            "Performance Improvement:",
+            f"Previous Latency: {r['latency_before_ms']} ms",
+            f"New Latency: {r['latency_after_ms']} ms",
+            f"Latency Reduction: {r['latency_reduction_ms']} ms ({r['latency_reduction_pct']:.1f}%)",
+            "",
+            "Route Details:",
+            "Primary Route: Optimized",
+            "Backup Route: Available",
+            "Load Balancing: Enabled",
+            "",
+            "Result: Routing successfully optimized, performance improved",
+        )
+    return _lines(
+        "Routing Optimization Results:",
+        "============================",
+        f"Target URL: {r['url']}",
+        "",
+        "Action: Optimizing network routing...",
+        "Status: NO CHANGES APPLIED",
+        "",
+        "Analysis:",
+        "Current routing is already optimal",
+        "No better paths available",
+        "Network conditions: Stable",
+        "",
+        "Recommendation: Current routing configuration is appropriate",
+    )
+
+
+_RENDERERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "check_website_availability": _availability,
+    "check_response_time": _response_time,
+    "check_packet_loss": _packet_loss,
+    "analyze_network_traffic": _traffic,
+    "analyze_latency": _latency,
+    "identify_bottlenecks": _bottlenecks,
+    "restart_web_server": _restart,
+    "clear_cache": _cache,
+    "optimize_routing": _routing,
+}
+
+
+def render(result: Any) -> str:
+    """Text for one tool result, a list of them, or any other JSON value."""
+    if isinstance(result, list):
+        return "\n\n".join(render(item) for item in result)
+    if isinstance(result, dict):
+        if result.get("tool") in _RENDERERS:
+            try:
+                return _RENDERERS[result["tool"]](result)
+            except (KeyError, TypeError, ValueError):
+                # Stage outputs are relayed by an LLM, which may drop or alter fields
+                logger.warning("Incomplete %s result, rendering it as is", result["tool"])
+        # e.g. {"check_website_availability": {...}, ...} or ADK's {"result": ...}
+        return "\n\n".join(
+            render(value) if isinstance(value, (dict, list)) else f"{key}: {value}"
+            for key, value in result.items()
+        )
+    return str(result)
+
+
+def render_stage(output: Any) -> str:
+    """
+    Text for one stage's output (a sub-agent's output_key value): structured
+    results are rendered, anything after them (the agent's assessment) is kept,
+    and plain text passes through unchanged.
+    """
+    if not isinstance(output, str):
+        return render(output)
+    text = output.strip()
+    if text.startswith("```"):
+        text = text.strip("`").strip()
+        if text.startswith("json"):
+            text = text[4:].lstrip()
+    if not text.startswith(("{", "[")):
+        return output.strip()
+    try:
+        value, end = json.JSONDecoder().raw_decode(text)
+    except json.JSONDecodeError:
+        return output.strip()
+    rest = text[end:].strip().strip("`").strip()
+    rendered: List[str] = [render(value)]
+    if rest:
+        rendered.append(rest)
+    return "\n\n".join(rendered)
@@ -1,117 +1,215 @@
 """
 Network troubleshooting and remediation tools for hierarchical agent system.
-All functions return string results for agent consumption.
+Every tool builds a structured result; see results.py for the output modes
+(compact dicts by default, text blocks with TOOL_OUTPUT_MODE=text).
+
+The availability and response-time checks make real HTTP requests through the
+pooled probing engine in http_probe.py; with a simulation scenario loaded they
+are simulated like the other tools.
+
+Every real check is also recorded in the latency tracker (latency_stats.py).
+analyze_latency and check_packet_loss report percentiles, jitter and loss
+bursts from those recorded samples; when a target has none (or a scenario is
+loaded) they summarise a simulated probe stream instead.
+
+Given a flow export (the flow_export argument or FLOW_EXPORT_PATH),
+analyze_network_traffic and identify_bottlenecks report ranked top talkers,
+ports and interface hotspots from it (flows.py) instead of simulated numbers.
+Given a packet capture (capture_file or CAPTURE_PATH), analyze_network_traffic
+also reports per-flow throughput, handshake RTT and retransmissions (pcap.py).
 """
 
+import asyncio
+import ipaddress
+import math
+import os
 import random
+import socket
+import statistics
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from .flows import FlowAnalyzer, analyze_export
+from .http_probe import HttpCheck, get_prober, parse_urls
+from .pcap import CaptureAnalyzer, analyze_capture
+from .latency_stats import LatencyStats, get_latency_tracker
+from .results import ToolResult, emit, render_stage
+from .simulator import ScenarioSimulator, get_simulator
+
+
+SIMULATED_LATENCY_SAMPLES = 20_000
+FLOW_TOP_N = 5
 
 
 # ============================================================================
 # MONITORING TOOLS
 # ============================================================================
 
-def check_website_availability(website_url: str) -> str:
+def _target(url: str) -> str:
+    """Latency tracker key: the host name of a URL or bare host."""
+    return urlsplit(url if "://" in url else f"//{url}").hostname or url.strip().lower()
+
+
+def _record(url: str, checks: List[HttpCheck]) -> None:
+    """Record real checks as RTT samples (time to first byte; failures as lost)."""
+    get_latency_tracker().add(_target(url), [check.ttfb_ms if check.ok else math.nan for check in checks])
+
+
+def _recorded(url: str, simulator: ScenarioSimulator) -> Optional[LatencyStats]:
+    """Recorded samples for the URL's host, unless a scenario is loaded."""
+    if simulator.scenario is not None:
+        return None
+    stats = get_latency_tracker().stats([_target(url)])
+    return stats if stats.sent else None
+
+
+def _simulated_rtts(rng: random.Random, median_ms: float, count: int) -> np.ndarray:
+    """A lognormal RTT stream around median_ms with occasional 2-4x spikes."""
+    generator = np.random.default_rng(rng.getrandbits(64))
+    rtts = median_ms * np.exp(generator.normal(0.0, rng.uniform(0.1, 0.3), count))
+    spikes = generator.random(count) < 0.01
+    rtts[spikes] *= generator.uniform(2.0, 4.0, int(spikes.sum()))
+    return rtts
+
+def _simulated_availability(website_url: str, simulator: ScenarioSimulator) -> Dict[str, Any]:
+    rng = simulator.rng("check_website_availability", website_url)
+    is_available = not simulator.fault("site_down", website_url, rng, 0.25)
+    
+    result = {"tool": "check_website_availability", "url": website_url, "available": is_available}
+    if is_available:
+        result["response_ms"] = rng.randint(50, 200)
+        result["status_code"] = rng.choice([200, 200, 200, 200, 301, 302])
+        result["content_bytes"] = rng.randint(1000, 50000)
+        result["dns"] = "SUCCESS"
+        result["ssl"] = "VALID"
+    else:
+        result["dns"] = "SUCCESS" if rng.choice([True, False]) else "FAILED"
+    return result
+
+
+def _availability(check: HttpCheck) -> Dict[str, Any]:
+    result = {
+        "tool": "check_website_availability",
+        "url": check.url,
+        "available": check.ok and check.status_code < 500,
+        "status_code": check.status_code,
+        "response_ms": round(check.total_ms, 1),
+        "content_bytes": check.body_bytes,
+        "dns": "FAILED" if check.phase == "dns" else "SUCCESS",
+        "ssl": ("INVALID" if check.phase == "tls" else "VALID") if check.tls else "N/A",
+        "dns_ms": round(check.dns_ms, 1),
+        "connect_ms": round(check.connect_ms, 1),
+        "tls_ms": round(check.tls_ms, 1),
+        "ttfb_ms": round(check.ttfb_ms, 1),
+        "reused_connection": check.reused,
+    }
+    if check.error:
+        result["error"] = check.error
+    return result
+
+
+def _simulated_response_time(website_url: str, threshold_ms: int, simulator: ScenarioSimulator) -> Dict[str, Any]:
+    rng = simulator.rng("check_response_time", website_url)
+    avg_response_time = simulator.metric(
+        "slow_response", website_url, rng,
+        unscripted=(100, 800), healthy=(100, max(100, threshold_ms - 50)),
+        degraded=(threshold_ms + 100, threshold_ms + 400),
+    )
+    
+    return {
+        "tool": "check_response_time",
+        "url": website_url,
+        "threshold_ms": threshold_ms,
+        "avg_ms": avg_response_time,
+        "slow": avg_response_time > threshold_ms,
+        "ttfb_ms": rng.randint(50, avg_response_time - 20),
+        "content_load_ms": rng.randint(100, 300),
+    }
+
+
+def _response_time(url: str, threshold_ms: int, checks: List[HttpCheck]) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"tool": "check_response_time", "url": url, "threshold_ms": threshold_ms,
+                              "samples": len(checks)}
+    answered = [check for check in checks if check.ok]
+    if len(answered) < len(checks):
+        result["failed"] = len(checks) - len(answered)
+        result["error"] = next(check.error for check in checks if not check.ok)
+    if not answered:
+        result["slow"] = True
+        return result
+    totals = sorted(check.total_ms for check in answered)
+    avg = statistics.fmean(totals)
+    first = checks[0]
+    result.update({
+        "avg_ms": round(avg, 1),
+        "slow": avg > threshold_ms,
+        "min_ms": round(totals[0], 1),
+        "max_ms": round(totals[-1], 1),
+        "median_ms": round(statistics.median(totals), 1),
+        "p95_ms": round(totals[min(len(totals) - 1, math.ceil(0.95 * len(totals)) - 1)], 1),
+        "ttfb_ms": round(statistics.fmean(check.ttfb_ms for check in answered), 1),
+        "content_load_ms": round(statistics.fmean(check.total_ms - check.ttfb_ms for check in answered), 1),
+        # Paid once: later samples reuse the kept-alive connection
+        "setup_ms": {"dns": round(first.dns_ms, 1), "connect": round(first.connect_ms, 1),
+                     "tls": round(first.tls_ms, 1)},
+    })
+    return result
+
+
+def _single_or_list(results: List[Dict[str, Any]]) -> ToolResult:
+    return emit(results[0] if len(results) == 1 else results)
+
+
+async def check_website_availability(website_url: str) -> ToolResult:
     """
     Check if a website is available and responding.
     
     Args:
-        website_url: The URL of the website to check (e.g., "https://example.com")
+        website_url: The URL of the website to check (e.g., "https://example.com"),
+            or a comma-separated list of URLs to check concurrently
         
     Returns:
-        A string containing the availability status and response details.
+        The availability status, response details and DNS / connect / TLS /
+        time-to-first-byte timings (a list of them for several URLs).
     """
-    # Simulate website availability check
-    is_available = random.choice([True, True, True, False])  # 75% success rate
-    
-    if is_available:
-        response_time = random.randint(50, 200)
-        status_code = random.choice([200, 200, 200, 200, 301, 302])
-        
-        output = f"""
-        Website Availability Check Results:
-        ==================================
-        Target URL: {website_url}
-        Status: AVAILABLE
-
-        HTTP Response:
-        Status Code: {status_code}
-        Response Time: {response_time} ms
-        Content-Length: {random.randint(1000, 50000)} bytes
-
-        DNS Resolution: SUCCESS
-        SSL Certificate: VALID
-        Connection: ESTABLISHED
-
-        Overall Status: OPERATIONAL
-        """
-    else:
-        output = f"""
-        Website Availability Check Results:
-        ==================================
-        Target URL: {website_url}
-        Status: UNAVAILABLE
-
-        HTTP Response:
-        Status Code: TIMEOUT / CONNECTION ERROR
-        Response Time: N/A
-        Connection: FAILED
-
-        DNS Resolution: {'SUCCESS' if random.choice([True, False]) else 'FAILED'}
-        SSL Certificate: N/A
-        Connection: FAILED
-
-        Overall Status: DOWN
-        Issue: Website is not responding to requests
-        """
-    
-    return output.strip()
+    simulator = get_simulator()
+    if simulator.scenario is not None:
+        return _single_or_list([_simulated_availability(url.strip(), simulator)
+                                for url in website_url.split(",") if url.strip()])
+    checks = await get_prober().check_many(parse_urls(website_url))
+    for check in checks:
+        _record(check.url, [check])
+    return _single_or_list([_availability(check) for check in checks])
 
 
-def check_response_time(website_url: str, threshold_ms: int = 500) -> str:
+async def check_response_time(website_url: str, threshold_ms: int = 500, samples: int = 10) -> ToolResult:
     """
     Check the response time of a website and compare against threshold.
     
     Args:
-        website_url: The URL of the website to check
+        website_url: The URL of the website to check, or a comma-separated
+            list of URLs to check concurrently
         threshold_ms: Maximum acceptable response time in milliseconds (default: 500ms)
+        samples: Requests timed per URL (default: 10)
         
     Returns:
-        A string containing response time metrics and analysis.
+        Response time metrics and analysis.
     """
-    # Simulate response time measurement
-    avg_response_time = random.randint(100, 800)
-    is_slow = avg_response_time > threshold_ms
-    
-    output = f"""
-    Response Time Check Results:
-    ===========================
-    Target URL: {website_url}
-    Threshold: {threshold_ms} ms
-
-    Response Time Measurements (10 samples):
-    Minimum: {avg_response_time - 20} ms
-    Average: {avg_response_time} ms
-    Maximum: {avg_response_time + 50} ms
-    Median: {avg_response_time + 5} ms
-    95th Percentile: {avg_response_time + 80} ms
-
-    Threshold Comparison:
-    Average Response Time: {avg_response_time} ms
-    Threshold: {threshold_ms} ms
-    Status: {'EXCEEDED - SLOW' if is_slow else 'WITHIN LIMITS'}
-
-    Performance Analysis:
-    Time to First Byte (TTFB): {random.randint(50, avg_response_time - 20)} ms
-    Content Load Time: {random.randint(100, 300)} ms
-    Total Load Time: {avg_response_time} ms
-
-    Recommendation: {'Performance optimization recommended' if is_slow else 'Performance is acceptable'}
-    """
-    
-    return output.strip()
-
-
-def check_packet_loss(website_url: str, packets: int = 10) -> str:
+    simulator = get_simulator()
+    if simulator.scenario is not None:
+        return _single_or_list([_simulated_response_time(url.strip(), threshold_ms, simulator)
+                                for url in website_url.split(",") if url.strip()])
+    prober = get_prober()
+    urls = parse_urls(website_url)
+    sampled = await asyncio.gather(*(prober.sample(url, max(1, samples)) for url in urls))
+    for url, checks in zip(urls, sampled):
+        _record(url, checks)
+    return _single_or_list([_response_time(url, threshold_ms, checks) for url, checks in zip(urls, sampled)])
+
+
+def check_packet_loss(website_url: str, packets: int = 10) -> ToolResult:
     """
     Check packet loss to a website.
     
@@ -120,90 +218,144 @@ def check_packet_loss(website_url: str, packets: int = 10) -> str:
         packets: Number of packets to send (default: 10)
         
     Returns:
-        A string containing packet loss statistics.
-    """
-    # Simulate packet loss measurement
-    packets_sent = packets
-    packets_received = random.randint(packets - 3, packets)
-    packet_loss_percent = ((packets_sent - packets_received) / packets_sent) * 100
-    
-    output = f"""
-    Packet Loss Check Results:
-    =========================
-    Target URL: {website_url}
-    Packets Sent: {packets_sent}
-    Packets Received: {packets_received}
-    Packets Lost: {packets_sent - packets_received}
-
-    Packet Loss: {packet_loss_percent:.1f}%
-    Status: {'HIGH PACKET LOSS DETECTED' if packet_loss_percent > 5 else 'NORMAL' if packet_loss_percent == 0 else 'MINOR PACKET LOSS'}
-
-    Network Path Analysis:
-    Hop Count: {random.randint(8, 15)}
-    Average RTT: {random.randint(20, 100)} ms
-    Jitter: {random.randint(1, 10)} ms
-
-    Recommendation: {'Investigate network path issues' if packet_loss_percent > 5 else 'Network path is stable'}
+        Packet loss statistics, loss bursts and RTT percentiles (from the
+        checks recorded for the website when there are any).
     """
+    simulator = get_simulator()
+    rng = simulator.rng("check_packet_loss", website_url)
+    hops = rng.randint(8, 15)
+    stats = _recorded(website_url, simulator)
+    if stats is None:
+        # Simulate packet loss measurement: one probe stream, lost probes as NaN
+        packets = max(1, packets)
+        lost = min(packets, int(simulator.metric(
+            "packet_loss", website_url, rng, unscripted=(0, 3), healthy=(0, 0), degraded=(2, 3),
+        )))
+        rtts = _simulated_rtts(rng, rng.randint(20, 100), packets)
+        if lost > 1 and rng.random() < 0.5:
+            start = rng.randrange(packets - lost + 1)
+            rtts[start:start + lost] = math.nan
+        else:
+            rtts[rng.sample(range(packets), lost)] = math.nan
+        stats = LatencyStats()
+        stats.add_many(rtts)
+    summary = stats.summary()
     
-    return output.strip()
+    return emit({
+        "tool": "check_packet_loss",
+        "url": website_url,
+        "sent": summary["samples"],
+        "received": summary["received"],
+        "loss_pct": round(summary["loss_pct"], 1),
+        "loss_bursts": summary["loss_bursts"],
+        "max_loss_burst": summary["max_loss_burst"],
+        "hops": hops,
+        "rtt_ms": summary["avg_ms"],
+        "p50_ms": summary["p50_ms"],
+        "p95_ms": summary["p95_ms"],
+        "p99_ms": summary["p99_ms"],
+        "jitter_ms": summary["jitter_ms"],
+    })
 
 
 # ============================================================================
 # ANALYSIS TOOLS
 # ============================================================================
 
-def analyze_network_traffic(website_url: str, duration_minutes: int = 5) -> str:
+async def _flow_analysis(website_url: str, flow_export: str) -> Optional[Dict[str, Any]]:
+    """Ranked flow summary of the export, or None when there is no export to analyze."""
+    path = flow_export or os.environ.get("FLOW_EXPORT_PATH", "")
+    if not path:
+        return None
+    try:
+        analyzer: FlowAnalyzer = await asyncio.to_thread(analyze_export, path)
+    except (OSError, ValueError) as exc:
+        return {"flow_export": path, "error": str(exc)}
+    result = {"flow_export": path, **analyzer.summary(FLOW_TOP_N)}
+    addresses = await asyncio.to_thread(_site_addresses, website_url)
+    if addresses and analyzer.bytes:
+        site_bytes = min(analyzer.bytes, analyzer.bytes_for(addresses))
+        result["site_bytes"] = site_bytes
+        result["site_share_pct"] = round(100 * site_bytes / analyzer.bytes, 1)
+    return result
+
+
+async def _capture_analysis(capture_file: str) -> Optional[Dict[str, Any]]:
+    """Flow summary of the packet capture, or None when there is no capture to analyze."""
+    path = capture_file or os.environ.get("CAPTURE_PATH", "")
+    if not path:
+        return None
+    try:
+        analyzer: CaptureAnalyzer = await asyncio.to_thread(analyze_capture, path)
+    except (OSError, ValueError) as exc:
+        return {"file": path, "error": str(exc)}
+    return {"file": path, **analyzer.summary(FLOW_TOP_N)}
+
+
+def _site_addresses(website_url: str) -> List[str]:
+    """The website's IP addresses (none when it does not resolve)."""
+    host = _target(website_url)
+    try:
+        return [str(ipaddress.ip_address(host))]
+    except ValueError:
+        pass
+    try:
+        return sorted({info[4][0] for info in socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)})
+    except OSError:
+        return []
+
+
+async def analyze_network_traffic(
+    website_url: str, duration_minutes: int = 5, flow_export: str = "", capture_file: str = "",
+) -> ToolResult:
     """
     Analyze network traffic patterns to identify issues.
     
     Args:
         website_url: The URL of the website to analyze
         duration_minutes: Duration of traffic analysis in minutes (default: 5)
+        flow_export: Path of a NetFlow v5, IPFIX or CSV flow export to analyze
+            (default: FLOW_EXPORT_PATH, if set)
+        capture_file: Path of a pcap or pcapng packet capture to analyze
+            (default: CAPTURE_PATH, if set)
         
     Returns:
-        A string containing traffic analysis results.
+        Traffic analysis results; with a flow export, the ranked top talkers,
+        destinations, ports and interfaces by bytes and the website's share;
+        with a capture, per-flow throughput, handshake RTT and retransmissions.
     """
+    flows, capture = await asyncio.gather(
+        _flow_analysis(website_url, flow_export), _capture_analysis(capture_file),
+    )
+    if flows is not None or capture is not None:
+        result = {"tool": "analyze_network_traffic", "url": website_url, **(flows or {})}
+        if capture is not None:
+            result["capture"] = capture
+        return emit(result)
+    
     # Simulate traffic analysis
-    total_requests = random.randint(1000, 10000)
-    error_rate = random.uniform(0, 0.15)
-    error_count = int(total_requests * error_rate)
+    simulator = get_simulator()
+    rng = simulator.rng("analyze_network_traffic", website_url)
+    total_requests = rng.randint(1000, 10000)
+    error_rate = simulator.metric(
+        "error_spike", website_url, rng,
+        unscripted=(0.0, 0.15), healthy=(0.0, 0.05), degraded=(0.11, 0.15),
+    )
     
-    output = f"""
-    Network Traffic Analysis Results:
-    =================================
-    Target URL: {website_url}
-    Analysis Duration: {duration_minutes} minutes
-
-    Traffic Statistics:
-    Total Requests: {total_requests}
-    Successful Requests: {total_requests - error_count}
-    Failed Requests: {error_count}
-    Error Rate: {error_rate * 100:.2f}%
-
-    Request Distribution:
-    GET Requests: {int(total_requests * 0.85)}
-    POST Requests: {int(total_requests * 0.10)}
-    Other: {int(total_requests * 0.05)}
-
-    Error Analysis:
-    4xx Errors: {int(error_count * 0.6)}
-    5xx Errors: {int(error_count * 0.4)}
-    Common Error Codes: {random.choice(['500', '503', '504', '404', '429'])}
-
-    Traffic Patterns:
-    Peak Requests/Minute: {random.randint(200, 500)}
-    Average Requests/Minute: {total_requests // duration_minutes}
-    Bandwidth Usage: {random.randint(50, 500)} Mbps
-
-    Issues Identified:
-    {'High error rate detected - server may be overloaded' if error_rate > 0.1 else 'Traffic patterns appear normal'}
-    """
-    
-    return output.strip()
-
-
-def analyze_latency(website_url: str) -> str:
+    return emit({
+        "tool": "analyze_network_traffic",
+        "url": website_url,
+        "duration_min": duration_minutes,
+        "requests": total_requests,
+        "errors": int(total_requests * error_rate),
+        "error_rate": round(error_rate, 4),
+        "top_error_code": rng.choice(['500', '503', '504', '404', '429']),
+        "peak_rpm": rng.randint(200, 500),
+        "bandwidth_mbps": rng.randint(50, 500),
+    })
+
+
+def analyze_latency(website_url: str) -> ToolResult:
     """
     Analyze latency patterns to identify bottlenecks.
     
@@ -211,116 +363,108 @@ def analyze_latency(website_url: str) -> str:
         website_url: The URL of the website to analyze
         
     Returns:
-        A string containing latency analysis results.
+        Latency analysis results: percentiles, jitter and spread over the
+        checks recorded for the website, or over a simulated probe stream.
     """
-    # Simulate latency analysis
-    avg_latency = random.randint(50, 400)
-    high_latency_detected = avg_latency > 200
+    simulator = get_simulator()
+    rng = simulator.rng("analyze_latency", website_url)
+    hops = rng.randint(8, 15)
+    expected_ms = rng.randint(40, 80)
+    stats = _recorded(website_url, simulator)
+    if stats is None:
+        # Simulate latency analysis over a large probe stream
+        median_ms = simulator.metric(
+            "high_latency", website_url, rng, unscripted=(50, 400), healthy=(50, 180), degraded=(220, 400),
+        )
+        stats = LatencyStats()
+        stats.add_many(_simulated_rtts(rng, median_ms, SIMULATED_LATENCY_SAMPLES))
+    summary = stats.summary()
     
-    output = f"""
-    Latency Analysis Results:
-    ========================
-    Target URL: {website_url}
-
-    Latency Metrics:
-    Average Latency: {avg_latency} ms
-    Minimum Latency: {avg_latency - 30} ms
-    Maximum Latency: {avg_latency + 100} ms
-    Standard Deviation: {random.randint(10, 50)} ms
-
-    Path Analysis:
-    Number of Hops: {random.randint(8, 15)}
-    Bottleneck Detected: {'YES' if high_latency_detected else 'NO'}
-    Bottleneck Location: {'Hop {random.randint(5, 12)} - High latency detected' if high_latency_detected else 'No significant bottlenecks'}
-
-    Geographic Analysis:
-    Source Location: US-West
-    Destination Location: US-East
-    Expected Latency: {random.randint(40, 80)} ms
-    Actual Latency: {avg_latency} ms
-    Variance: {'HIGH - Path optimization needed' if high_latency_detected else 'ACCEPTABLE'}
-
-    Recommendation: {'Investigate network path and consider routing optimization' if high_latency_detected else 'Latency is within acceptable range'}
-    """
-        
-    return output.strip()
-
-
-def identify_bottlenecks(website_url: str) -> str:
+    return emit({
+        "tool": "analyze_latency",
+        "url": website_url,
+        "avg_ms": summary["avg_ms"],
+        "p50_ms": summary["p50_ms"],
+        "p95_ms": summary["p95_ms"],
+        "p99_ms": summary["p99_ms"],
+        "min_ms": summary["min_ms"],
+        "max_ms": summary["max_ms"],
+        "stddev_ms": summary["stddev_ms"],
+        "jitter_ms": summary["jitter_ms"],
+        "samples": summary["received"],
+        "bottleneck": summary["p50_ms"] is not None and summary["p50_ms"] > 200,
+        "hops": hops,
+        "expected_ms": expected_ms,
+    })
+
+
+def _flow_bottleneck(website_url: str, flows: Dict[str, Any]) -> Dict[str, Any]:
+    """A bottleneck from the flow summary: a saturated interface or a heavy hitter."""
+    result = {"tool": "identify_bottlenecks", "url": website_url, "bottleneck": None, **flows}
+    hot, talkers = flows.get("hot_interfaces", []), flows.get("top_talkers", [])
+    hotspot_pct = float(os.environ.get("FLOW_HOTSPOT_PCT", "60"))
+    heavy_hitter_pct = float(os.environ.get("FLOW_HEAVY_HITTER_PCT", "30"))
+    if len(hot) > 1 and hot[0]["share_pct"] >= hotspot_pct:
+        share = hot[0]["share_pct"]
+        result["bottleneck"] = "Bandwidth saturation on network link"
+        result["interface"] = hot[0]["interface"]
+    elif talkers and talkers[0]["share_pct"] >= heavy_hitter_pct:
+        share = talkers[0]["share_pct"]
+        result["bottleneck"] = "Heavy hitter flows on network path"
+        result["address"] = talkers[0]["address"]
+    if result["bottleneck"]:
+        result["severity"] = "HIGH" if share >= 80 else "MEDIUM"
+        result["config_issue"] = "Unlikely"
+    return result
+
+
+async def identify_bottlenecks(website_url: str, flow_export: str = "") -> ToolResult:
     """
     Identify network bottlenecks affecting website performance.
     
     Args:
         website_url: The URL of the website to analyze
+        flow_export: Path of a NetFlow v5, IPFIX or CSV flow export to analyze
+            (default: FLOW_EXPORT_PATH, if set)
         
     Returns:
-        A string containing bottleneck identification results.
+        Bottleneck identification results ("bottleneck" is null when none was
+        found); with a flow export, the interface hotspots and top talkers.
     """
+    flows = await _flow_analysis(website_url, flow_export)
+    if flows is not None:
+        return emit(_flow_bottleneck(website_url, flows))
+    
     # Simulate bottleneck identification
-    bottlenecks_found = random.choice([True, False, False])
+    simulator = get_simulator()
+    rng = simulator.rng("identify_bottlenecks", website_url)
+    bottlenecks_found = simulator.fault("bottleneck", website_url, rng, 1 / 3)
     
+    result = {"tool": "identify_bottlenecks", "url": website_url}
     if bottlenecks_found:
-        bottleneck_type = random.choice([
+        bottleneck_type = simulator.pick("bottleneck", website_url, rng, [
             "High latency on network path",
             "Server CPU utilization above 80%",
             "Database query performance degradation",
             "CDN cache miss rate high",
             "Bandwidth saturation on network link"
         ])
-        
-        output = f"""
-        Bottleneck Identification Results:
-        ==================================
-        Target URL: {website_url}
-
-        Bottlenecks Detected: YES
-
-        Primary Bottleneck:
-        Type: {bottleneck_type}
-        Severity: {'HIGH' if 'High' in bottleneck_type or 'CPU' in bottleneck_type else 'MEDIUM'}
-        Impact: {'Significant performance degradation' if 'High' in bottleneck_type else 'Moderate performance impact'}
-
-        Affected Components:
-        - Network Path: {'Affected' if 'latency' in bottleneck_type.lower() or 'Bandwidth' in bottleneck_type else 'Normal'}
-        - Server Resources: {'Affected' if 'CPU' in bottleneck_type or 'Server' in bottleneck_type else 'Normal'}
-        - Database: {'Affected' if 'Database' in bottleneck_type else 'Normal'}
-        - CDN/Cache: {'Affected' if 'CDN' in bottleneck_type or 'cache' in bottleneck_type.lower() else 'Normal'}
-
-        Root Cause Analysis:
-        Likely Cause: {bottleneck_type}
-        Contributing Factors:
-        - Network congestion: {'Yes' if 'latency' in bottleneck_type.lower() or 'Bandwidth' in bottleneck_type else 'No'}
-        - Resource constraints: {'Yes' if 'CPU' in bottleneck_type or 'Server' in bottleneck_type else 'No'}
-        - Configuration issues: {'Possible' if random.choice([True, False]) else 'Unlikely'}
-
-        Recommendation: Immediate remediation required to restore performance
-        """
+        result["bottleneck"] = bottleneck_type
+        result["severity"] = 'HIGH' if 'High' in bottleneck_type or 'CPU' in bottleneck_type else 'MEDIUM'
+        result["config_issue"] = 'Possible' if rng.choice([True, False]) else 'Unlikely'
     else:
-        output = f"""
-        Bottleneck Identification Results:
-        ==================================
-        Target URL: {website_url}
-
-        Bottlenecks Detected: NO
-
-        System Health Check:
-        Network Path: Normal
-        Server Resources: Normal (CPU: {random.randint(20, 60)}%, Memory: {random.randint(40, 70)}%)
-        Database Performance: Normal
-        CDN/Cache: Normal
-
-        All components operating within normal parameters.
-        No significant bottlenecks identified.
-        """
+        result["bottleneck"] = None
+        result["cpu_pct"] = rng.randint(20, 60)
+        result["memory_pct"] = rng.randint(40, 70)
     
-    return output.strip()
+    return emit(result)
 
 
 # ============================================================================
 # REMEDIATION TOOLS
 # ============================================================================
 
-def restart_web_server(server_address: str) -> str:
+def restart_web_server(server_address: str) -> ToolResult:
     """
     Restart the web server on a specified server.
     
@@ -328,61 +472,23 @@ def restart_web_server(server_address: str) -> str:
         server_address: IP address or hostname of the server
         
     Returns:
-        A string containing the restart operation results.
+        The restart operation results.
     """
     # Simulate server restart
-    restart_successful = random.choice([True, True, True, False])  # 75% success rate
+    simulator = get_simulator()
+    rng = simulator.rng("restart_web_server", server_address)
+    restart_successful = simulator.remediate("restart_web_server", server_address, rng, 0.75)
     
+    result = {"tool": "restart_web_server", "server": server_address, "success": restart_successful}
     if restart_successful:
-        output = f"""
-        Web Server Restart Results:
-        ==========================
-        Server: {server_address}
-
-        Action: Restarting web server...
-        Status: SUCCESS
-
-        Service Status:
-        Before: RUNNING (with issues)
-        After: RUNNING (healthy)
-
-        Restart Details:
-        Service: nginx/apache
-        Restart Time: {random.randint(2, 8)} seconds
-        Downtime: {random.randint(1, 5)} seconds
-
-        Verification:
-        Server responding: YES
-        Health check passed: YES
-        Response time: {random.randint(50, 150)} ms
-
-        Result: Web server successfully restarted and operational
-        """
-    else:
-        output = f"""
-        Web Server Restart Results:
-        ==========================
-        Server: {server_address}
-
-        Action: Restarting web server...
-        Status: FAILED
-
-        Error Details:
-        Service: nginx/apache
-        Error: Unable to restart service
-        Reason: Service dependency issue / Configuration error
-
-        Current Status:
-        Server: PARTIALLY OPERATIONAL
-        Response time: Degraded
-
-        Recommendation: Manual intervention required
-        """
+        result["restart_s"] = rng.randint(2, 8)
+        result["downtime_s"] = rng.randint(1, 5)
+        result["response_ms"] = rng.randint(50, 150)
     
-    return output.strip()
+    return emit(result)
 
 
-def clear_cache(website_url: str, cache_type: str = "CDN") -> str:
+def clear_cache(website_url: str, cache_type: str = "CDN") -> ToolResult:
     """
     Clear cache for a website (CDN, application cache, etc.).
     
@@ -391,59 +497,28 @@ def clear_cache(website_url: str, cache_type: str = "CDN") -> str:
         cache_type: Type of cache to clear (default: "CDN")
         
     Returns:
-        A string containing cache clearing operation results.
+        Cache clearing operation results ("success" false means a partial clear).
     """
     # Simulate cache clearing
-    clear_successful = random.choice([True, True, False])  # 66% success rate
+    simulator = get_simulator()
+    rng = simulator.rng("clear_cache", website_url)
+    clear_successful = simulator.remediate("clear_cache", website_url, rng, 2 / 3)
     
+    result = {"tool": "clear_cache", "url": website_url, "cache_type": cache_type,
+              "success": clear_successful}
     if clear_successful:
-        output = f"""
-        Cache Clear Results:
-        ===================
-        Target URL: {website_url}
-        Cache Type: {cache_type}
-
-        Action: Clearing {cache_type} cache...
-        Status: SUCCESS
-
-        Cache Statistics:
-        Cache Entries Cleared: {random.randint(100, 1000)}
-        Cache Size Cleared: {random.randint(50, 500)} MB
-        Clear Duration: {random.randint(1, 5)} seconds
-
-        Verification:
-        Cache Status: EMPTY
-        New Requests: Serving fresh content
-        Cache Rebuild: In progress
-
-        Result: {cache_type} cache successfully cleared
-        """
+        result["entries_cleared"] = rng.randint(100, 1000)
+        result["size_mb"] = rng.randint(50, 500)
+        result["duration_s"] = rng.randint(1, 5)
     else:
-        output = f"""
-        Cache Clear Results:
-        ===================
-        Target URL: {website_url}
-        Cache Type: {cache_type}
-
-        Action: Clearing {cache_type} cache...
-        Status: PARTIAL SUCCESS
-
-        Cache Statistics:
-        Cache Entries Cleared: {random.randint(50, 200)}
-        Cache Size Cleared: {random.randint(10, 100)} MB
-        Clear Duration: {random.randint(1, 3)} seconds
-
-        Issues:
-        Some cache entries could not be cleared
-        Cache may require manual intervention
-
-        Result: Partial cache clear completed
-        """
+        result["entries_cleared"] = rng.randint(50, 200)
+        result["size_mb"] = rng.randint(10, 100)
+        result["duration_s"] = rng.randint(1, 3)
     
-    return output.strip()
+    return emit(result)
 
 
-def optimize_routing(website_url: str) -> str:
+def optimize_routing(website_url: str) -> ToolResult:
     """
     Optimize network routing to improve performance.
     
@@ -451,104 +526,60 @@ def optimize_routing(website_url: str) -> str:
         website_url: The URL of the website to optimize routing for
         
     Returns:
-        A string containing routing optimization results.
+        Routing optimization results ("success" false means no changes were applied).
     """
     # Simulate routing optimization
-    optimization_successful = random.choice([True, True, False])  # 66% success rate
+    simulator = get_simulator()
+    rng = simulator.rng("optimize_routing", website_url)
+    optimization_successful = simulator.remediate("optimize_routing", website_url, rng, 2 / 3)
     
+    result = {"tool": "optimize_routing", "url": website_url, "success": optimization_successful}
     if optimization_successful:
-        latency_improvement = random.randint(10, 50)
-        
-        output = f"""
-        Routing Optimization Results:
-        ============================
-        Target URL: {website_url}
-
-        Action: Optimizing network routing...
-        Status: SUCCESS
-
-        Routing Changes:
-        Previous Path: {random.randint(12, 18)} hops
-        Optimized Path: {random.randint(8, 12)} hops
-        Hops Reduced: {random.randint(2, 6)}
-
-        Performance Improvement:
-        Previous Latency: {random.randint(150, 300)} ms
-        New Latency: {random.randint(100, 200)} ms
-        Latency Reduction: {latency_improvement} ms ({latency_improvement * 100 / (latency_improvement + random.randint(100, 200)):.1f}%)
-
-        Route Details:
-        Primary Route: Optimized
-        Backup Route: Available
-        Load Balancing: Enabled
-
-        Result: Routing successfully optimized, performance improved
-        """
-    else:
-        output = f"""
-        Routing Optimization Results:
-        ============================
-        Target URL: {website_url}
-
-        Action: Optimizing network routing...
-        Status: NO CHANGES APPLIED
-
-        Analysis:
-        Current routing is already optimal
-        No better paths available
-        Network conditions: Stable
-
-        Recommendation: Current routing configuration is appropriate
-        """
+        latency_improvement = rng.randint(10, 50)
+        result["hops_before"] = rng.randint(12, 18)
+        result["hops_after"] = rng.randint(8, 12)
+        result["hops_reduced"] = rng.randint(2, 6)
+        result["latency_before_ms"] = rng.randint(150, 300)
+        result["latency_after_ms"] = rng.randint(100, 200)
+        result["latency_reduction_ms"] = latency_improvement
+        result["latency_reduction_pct"] = round(
+            latency_improvement * 100 / (latency_improvement + rng.randint(100, 200)), 1
+        )
     
-    return output.strip()
+    return emit(result)
 
 
 # ============================================================================
 # REPORTING TOOLS
 # ============================================================================
 
-def format_report(
-    monitoring_results: str,
-    analysis_results: str,
-    remediation_results: str,
-    user_report: str
-) -> str:
-    """
-    Format all troubleshooting results into a comprehensive report.
-    
-    Args:
-        monitoring_results: Results from monitoring agent
-        analysis_results: Results from analysis agent
-        remediation_results: Results from remediation agent
-        user_report: Original user report/issue
-        
-    Returns:
-        A formatted report string ready for presentation.
-    """
-    report = f"""
+_REPORT_TITLE = """\
 ╔══════════════════════════════════════════════════════════════════════════╗
 ║                    NETWORK TROUBLESHOOTING REPORT                        ║
 ╚══════════════════════════════════════════════════════════════════════════╝
 
+"""
+
+# Session state key of each stage's results, in report order, with its heading
+REPORT_SECTIONS = {
+    "monitoring_results": """\
 ╔══════════════════════════════════════════════════════════════════════════╗
 ║ 1. MONITORING RESULTS                                                   ║
 ╚══════════════════════════════════════════════════════════════════════════╝
-
-{monitoring_results}
-
+""",
+    "analysis_results": """\
 ╔══════════════════════════════════════════════════════════════════════════╗
 ║ 2. ANALYSIS RESULTS                                                     ║
 ╚══════════════════════════════════════════════════════════════════════════╝
-
-{analysis_results}
-
+""",
+    "remediation_results": """\
 ╔══════════════════════════════════════════════════════════════════════════╗
 ║ 3. REMEDIATION RESULTS                                                  ║
 ╚══════════════════════════════════════════════════════════════════════════╝
+""",
+}
 
-{remediation_results}
-
+_REPORT_SUMMARY = """\
 ╔══════════════════════════════════════════════════════════════════════════╗
 ║ SUMMARY                                                                  ║
 ╚══════════════════════════════════════════════════════════════════════════╝
@@ -566,8 +597,55 @@ address the reported network performance issues.
 
 ═══════════════════════════════════════════════════════════════════════════
 Report Generated: Automated Network Troubleshooting System
-═══════════════════════════════════════════════════════════════════════════
-"""
+═══════════════════════════════════════════════════════════════════════════"""
+
+
+def report_section(stage: str, results: str) -> str:
+    """
+    One stage's section of the report, as format_report lays it out.
+
+    Sections can be emitted as soon as each stage's results exist; the
+    sections of all stages in REPORT_SECTIONS order followed by
+    report_summary() make up the report.
+
+    Args:
+        stage: Session state key of the stage (a REPORT_SECTIONS key)
+        results: The stage's output
+
+    Returns:
+        The section text; the first stage's section starts with the report title.
+    """
+    title = _REPORT_TITLE if stage == next(iter(REPORT_SECTIONS)) else ""
+    return f"{title}{REPORT_SECTIONS[stage]}\n{render_stage(results)}\n\n"
+
+
+def report_summary() -> str:
+    """The closing section of the report."""
+    return _REPORT_SUMMARY
+
+
+def format_report(
+    monitoring_results: str,
+    analysis_results: str,
+    remediation_results: str,
+    user_report: str
+) -> str:
+    """
+    Format all troubleshooting results into a comprehensive report.
     
-    return report.strip()
+    Args:
+        monitoring_results: Results from monitoring agent
+        analysis_results: Results from analysis agent
+        remediation_results: Results from remediation agent
+        user_report: Original user report/issue
+        
+    Structured (compact) tool results in the stage outputs are rendered to
+    text here; plain text results are included as they are.
+        
+    Returns:
+        A formatted report string ready for presentation.
+    """
+    stages = zip(REPORT_SECTIONS, (monitoring_results, analysis_results, remediation_results))
+    report = "".join(report_section(stage, results) for stage, results in stages)
+    return (report + report_summary()).strip()
 
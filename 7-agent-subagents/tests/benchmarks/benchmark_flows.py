@@ -0,0 +1,123 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Flow export ingest with bounded sketches against exact per-key aggregation.
+
+Writes a NetFlow v5 export of RECORDS flows (source addresses drawn from a
+Zipf distribution over ADDRESSES hosts, so a few heavy hitters carry most
+bytes) and a CSV export of CSV_RECORDS flows. Each is ingested by
+FlowAnalyzer and by an exact dict of bytes per source address (the
+baseline). Reports records per second, the memory still held by the
+aggregate after ingesting and the peak while ingesting (tracemalloc; the
+peak includes the reader's fixed-size chunk buffers), and how many of the exact top 10 talkers the
+sketches rank in their top 10, with the worst byte-count error among them.
+
+Run with:
+    uv run python -m tests.benchmarks.benchmark_flows
+"""
+
+import os
+import socket
+import struct
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+import numpy as np
+
+from app.app_utils.flows import FlowAnalyzer, read_flows
+
+RECORDS = 2_000_000
+CSV_RECORDS = 200_000
+ADDRESSES = 1_000_000
+
+
+def flows(count: int, seed: int) -> dict:
+    generator = np.random.default_rng(seed)
+    src = (generator.zipf(1.2, count) % ADDRESSES).astype(np.uint32) + np.uint32(0x0A000000)
+    return {
+        "src": src,
+        "dst": generator.integers(0xCB007100, 0xCB0071FF, count, dtype=np.uint32),
+        "dst_port": generator.choice(np.array([443, 80, 53, 22, 8443], dtype=np.uint16), count),
+        "out_if": generator.integers(1, 9, count, dtype=np.uint16),
+        "bytes": generator.integers(64, 1_500_000, count, dtype=np.uint32),
+    }
+
+
+def write_netflow_v5(path: str, data: dict) -> None:
+    count = data["src"].size
+    record = np.zeros(count, dtype=[("src", ">u4"), ("dst", ">u4"), ("nexthop", ">u4"), ("in_if", ">u2"),
+                                    ("out_if", ">u2"), ("packets", ">u4"), ("bytes", ">u4"), ("times", ">u8"),
+                                    ("src_port", ">u2"), ("dst_port", ">u2"), ("flags", ">u4"),
+                                    ("as", ">u4"), ("tail", ">u4")])
+    for field in ("src", "dst", "out_if", "bytes", "dst_port"):
+        record[field] = data[field]
+    record["packets"] = data["bytes"] // 1000 + 1
+    record["flags"] = 6 << 8  # protocol byte
+    with open(path, "wb") as f:
+        for start in range(0, count, 30):
+            chunk = record[start:start + 30]
+            f.write(struct.pack(">HHIIIIBBH", 5, chunk.size, 0, 0, 0, start, 0, 0, 0) + chunk.tobytes())
+
+
+def write_csv(path: str, data: dict) -> None:
+    with open(path, "w") as f:
+        f.write("srcaddr,dstaddr,dstport,proto,output,bytes,packets\n")
+        for src, dst, port, out_if, nbytes in zip(*(data[k].tolist() for k in
+                                                    ("src", "dst", "dst_port", "out_if", "bytes"))):
+            f.write(f"{socket.inet_ntoa(src.to_bytes(4, 'big'))},{socket.inet_ntoa(dst.to_bytes(4, 'big'))},"
+                    f"{port},TCP,{out_if},{nbytes},{nbytes // 1000 + 1}\n")
+
+
+def measure(path: str, exact: bool) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    if exact:
+        talkers = Counter()
+        for batch, _ in read_flows(path):
+            for src, nbytes in zip(batch["src"].tolist(), batch["bytes"].tolist()):
+                talkers[src] += nbytes
+        top = [(socket.inet_ntoa(k.to_bytes(4, "big")), v) for k, v in talkers.most_common(10)]
+    else:
+        analyzer = FlowAnalyzer()
+        for batch, labels in read_flows(path):
+            analyzer.add(batch, labels)
+        top = [(e["address"], e["bytes"]) for e in analyzer.summary(10)["top_talkers"]]
+    elapsed = time.perf_counter() - start
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "held_mb": held / 2**20, "peak_mb": peak / 2**20, "top": top}
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for name, count, write in (("flows.nf5", RECORDS, write_netflow_v5), ("flows.csv", CSV_RECORDS, write_csv)):
+            path = os.path.join(directory, name)
+            write(path, flows(count, 0))
+            print(f"{name}: {count} records, {os.path.getsize(path) / 2**20:.0f} MB")
+            print(f"  {'mode':<10} {'records/s':>11} {'held MB':>8} {'peak MB':>8} {'top-10 found':>13} "
+                  f"{'max error %':>12}")
+            baseline = measure(path, exact=True)
+            exact_top = dict(baseline["top"])
+            for mode, result in (("exact", baseline), ("sketches", measure(path, exact=False))):
+                found = [(a, b) for a, b in result["top"] if a in exact_top]
+                error = max((abs(b - exact_top[a]) / exact_top[a] for a, b in found), default=0.0)
+                print(f"  {mode:<10} {count / result['seconds']:>11,.0f} {result['held_mb']:>8.1f} "
+                      f"{result['peak_mb']:>8.1f} "
+                      f"{len(found):>13} {100 * error:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Pooled keep-alive HTTP checks against a new connection per request.
+
+A local server charges SETUP_SECONDS on the first request of every connection
+(standing in for the TCP and TLS handshakes of a remote site) and
+REQUEST_SECONDS per request. Each mode runs the same checks: sequential
+response-time samples of one URL, and one concurrent availability check of
+many URLs on the same site. The unpooled mode uses an idle timeout of 0, so
+every request opens a new connection, as a plain per-call `requests.get`
+would.
+
+Run with:
+    uv run python -m tests.benchmarks.benchmark_http_probe
+"""
+
+import asyncio
+import time
+
+from app.app_utils.http_probe import HttpProber, ProbeSettings
+
+SETUP_SECONDS = 0.03
+REQUEST_SECONDS = 0.005
+SAMPLES = 50
+URLS = 200
+
+
+async def handle(reader, writer) -> None:
+    await asyncio.sleep(SETUP_SECONDS)
+    try:
+        while True:
+            await reader.readuntil(b"\r\n\r\n")
+            await asyncio.sleep(REQUEST_SECONDS)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def measure(base: str, pooled: bool) -> dict:
+    prober = HttpProber(ProbeSettings(timeout=10, max_connections_per_host=8,
+                                      idle_timeout=30 if pooled else 0))
+    start = time.perf_counter()
+    samples = await prober.sample(f"{base}/", SAMPLES)
+    sampled_s = time.perf_counter() - start
+    start = time.perf_counter()
+    checks = await prober.check_many([f"{base}/page{i}" for i in range(URLS)])
+    many_s = time.perf_counter() - start
+    prober.close()
+    await asyncio.sleep(0.1)  # let the server see the pooled connections close
+    assert all(c.ok for c in samples + checks)
+    return {"sampled_s": sampled_s, "many_s": many_s, "connections": prober.connections_opened,
+            "dns_lookups": prober.dns.misses}
+
+
+async def main() -> None:
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    base = f"http://localhost:{server.sockets[0].getsockname()[1]}"
+    print(f"{SAMPLES} sequential samples, then {URLS} URLs concurrently (8 connections max)")
+    print(f"{'mode':<10} {'samples s':>10} {'concurrent s':>13} {'connections':>12} {'DNS lookups':>12}")
+    for pooled in (False, True):
+        m = await measure(base, pooled)
+        print(f"{'pooled' if pooled else 'unpooled':<10} {m['sampled_s']:>10.2f} {m['many_s']:>13.2f} "
+              f"{m['connections']:>12} {m['dns_lookups']:>12}")
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
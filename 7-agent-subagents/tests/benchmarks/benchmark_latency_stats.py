@@ -0,0 +1,92 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Streaming latency statistics against keeping every sample.
+
+Feeds TARGETS probe streams of SAMPLES RTTs each (lognormal, 2% lost) to
+three summaries of the same data: a list of every sample with exact
+quantiles (the baseline), LatencyStats one sample at a time, and
+LatencyStats in NumPy batches. Then it merges the per-target summaries into
+one. Reports the time, the memory held and the worst relative p50/p95/p99
+error against the exact quantiles.
+
+Run with:
+    uv run python -m tests.benchmarks.benchmark_latency_stats
+"""
+
+import math
+import sys
+import time
+
+import numpy as np
+
+from app.app_utils.latency_stats import LatencyStats
+
+TARGETS = 20
+SAMPLES = 50_000
+BATCH = 1_000
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def streams() -> list:
+    generator = np.random.default_rng(0)
+    result = []
+    for _ in range(TARGETS):
+        rtts = 60 * np.exp(generator.normal(0, 0.5, SAMPLES))
+        rtts[generator.random(SAMPLES) < 0.02] = math.nan
+        result.append(rtts)
+    return result
+
+
+def stats_bytes(stats: LatencyStats) -> int:
+    return stats.counts.nbytes + stats.burst_counts.nbytes + 16 * 8
+
+
+def main() -> None:
+    data = streams()
+    print(f"{TARGETS} targets x {SAMPLES} samples, merged into one summary")
+    print(f"{'mode':<16} {'time s':>8} {'memory KB':>10} {'max error %':>12}")
+
+    start = time.perf_counter()
+    kept = [[float(v) for v in rtts if not math.isnan(v)] for rtts in data]
+    merged_list = [v for samples in kept for v in samples]
+    exact = np.quantile(merged_list, QUANTILES, method="lower")
+    elapsed = time.perf_counter() - start
+    memory = sum(sys.getsizeof(samples) + 24 * len(samples) for samples in kept) + sys.getsizeof(merged_list)
+    print(f"{'keep samples':<16} {elapsed:>8.2f} {memory / 1024:>10.0f} {0.0:>12.2f}")
+
+    for mode in ("per sample", "numpy batches"):
+        start = time.perf_counter()
+        per_target = []
+        for rtts in data:
+            stats = LatencyStats()
+            if mode == "per sample":
+                for value in rtts.tolist():
+                    stats.add(value)
+            else:
+                for offset in range(0, SAMPLES, BATCH):
+                    stats.add_many(rtts[offset:offset + BATCH])
+            per_target.append(stats)
+        merged = per_target[0]
+        for stats in per_target[1:]:
+            merged = merged.merge(stats)
+        estimate = merged.quantiles(QUANTILES)
+        elapsed = time.perf_counter() - start
+        error = max(abs(e - x) / x for e, x in zip(estimate, exact))
+        memory = sum(stats_bytes(stats) for stats in per_target) + stats_bytes(merged)
+        print(f"{mode:<16} {elapsed:>8.2f} {memory / 1024:>10.0f} {100 * error:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+LLM calls, tokens and latency per troubleshooting run for the coordinator and
+pipeline orchestration modes (ORCHESTRATION_MODE).
+
+coordinator: the parent LLM takes a turn to hand over to each of the four
+sub-agents, and the ReportingAgent makes one call to pass the stage outputs
+to format_report and one to present the report.
+pipeline: the sub-agents run in order without coordinator turns, and the
+ReportingStep calls format_report from session state without an LLM call.
+Each stage's report section is streamed as soon as the stage finishes, so
+the first report text arrives after the monitoring stage instead of at the
+end of the run.
+
+The monitoring/analysis/remediation sub-agents make the same two calls in both
+modes (tool calls, then their stage output). Every call re-reads the session
+so far. Latency per call is modelled as time to first token plus output
+tokens at a fixed rate (see the constants); tokens are estimated as chars / 4.
+"first report s" is the modelled time until the first report text is sent.
+
+Run with:
+    uv run python -m tests.benchmarks.benchmark_orchestration
+"""
+
+import json
+
+from app.app_utils import simulator as sim_module
+from app.app_utils.simulator import configure_simulator
+from app.app_utils.tools import format_report
+
+from tests.benchmarks.benchmark_tool_output import STAGES, URL, as_response, run_tool, tokens
+
+FIRST_TOKEN_SECONDS = 0.6
+INPUT_TOKENS_PER_SECOND = 20000
+OUTPUT_TOKENS_PER_SECOND = 150
+# A transfer_to_agent call with a task description, and a turn issuing three tool calls
+HANDOVER_TOKENS = 80
+TOOL_CALLS_TOKENS = 60
+
+
+def call_seconds(input_tokens: int, output_tokens: int) -> float:
+    return (FIRST_TOKEN_SECONDS + input_tokens / INPUT_TOKENS_PER_SECOND
+            + output_tokens / OUTPUT_TOKENS_PER_SECOND)
+
+
+def run(mode: str, scenario: str = None, seed: int = None) -> dict:
+    """LLM calls, input tokens, modelled LLM seconds and time to the first report text of one run."""
+    configure_simulator(scenario, seed)
+    history = [tokens("Website https://shop.example.com is slow")]
+    calls = []
+
+    def call(output_tokens: int) -> None:
+        calls.append((sum(history), output_tokens))
+        history.append(output_tokens)
+
+    stage_outputs = []
+    first_report = None
+    for tools in STAGES:
+        if mode == "coordinator":
+            call(HANDOVER_TOKENS)
+        call(TOOL_CALLS_TOKENS)
+        results = [run_tool(tool, URL) for tool in tools]
+        history.extend(tokens(as_response(result)) for result in results)
+        output = json.dumps(results)
+        stage_outputs.append(output)
+        call(tokens(output))
+        if mode == "pipeline" and first_report is None:
+            first_report = sum(call_seconds(i, o) for i, o in calls)  # section streamed
+
+    report = format_report(*stage_outputs, "Website is slow")
+    if mode == "coordinator":
+        call(HANDOVER_TOKENS)
+        call(sum(tokens(output) for output in stage_outputs))  # format_report arguments
+        history.append(tokens(report))
+        first_report = sum(call_seconds(i, o) for i, o in calls) + call_seconds(sum(history), 0)
+        call(tokens(report))  # presents the report
+
+    return {
+        "calls": len(calls),
+        "input": sum(i for i, _ in calls),
+        "seconds": sum(call_seconds(i, o) for i, o in calls),
+        "first_report": first_report,
+    }
+
+
+def main() -> None:
+    runs = [("shop_slowdown", seed) for seed in range(21)]
+    print(f"{'mode':<12} {'LLM calls':>9} {'input tok':>10} {'LLM s/run':>10} {'first report s':>15}")
+    measured = {}
+    for mode in ("coordinator", "pipeline"):
+        results = [run(mode, scenario, seed) for scenario, seed in runs]
+        measured[mode] = {key: sum(r[key] for r in results) / len(results)
+                          for key in ("calls", "input", "seconds", "first_report")}
+        m = measured[mode]
+        print(f"{mode:<12} {m['calls']:>9.0f} {m['input']:>10.0f} {m['seconds']:>10.1f} "
+              f"{m['first_report']:>15.1f}")
+    before, after = measured["coordinator"], measured["pipeline"]
+    print(f"pipeline: {before['calls'] - after['calls']:.0f} fewer LLM calls per run "
+          f"({1 - after['calls'] / before['calls']:.0%}), "
+          f"{1 - after['seconds'] / before['seconds']:.0%} less modelled LLM time, "
+          f"first report text after {after['first_report']:.1f}s instead of {after['seconds']:.1f}s")
+    sim_module._simulator = None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Vectorised memory-mapped capture analysis against a per-packet parser.
+
+Writes a pcap of PACKETS Ethernet/IPv4/TCP packets spread over FLOWS
+connections (each opened with a SYN, SYN/ACK handshake, with RETRANSMIT_RATE
+of the data segments sent twice) and analyzes it twice:
+
+- per packet: struct-unpacking each record into Python values and updating
+  a dict of flow state, as a dpkt/scapy-style loop would
+- vectorised: read_packets() + CaptureAnalyzer
+
+Reports packets per second, peak memory allocated (tracemalloc) and the
+retransmissions each found.
+
+Run with:
+    uv run python -m tests.benchmarks.benchmark_pcap
+"""
+
+import os
+import struct
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.app_utils.pcap import CaptureAnalyzer, read_packets
+
+PACKETS = 1_000_000
+FLOWS = 20_000
+PAYLOAD = 200
+RETRANSMIT_RATE = 0.01
+
+FRAME = np.dtype([
+    ("ts_sec", "<u4"), ("ts_usec", "<u4"), ("caplen", "<u4"), ("length", "<u4"),
+    ("mac", "V12"), ("ethertype", ">u2"),
+    ("version_ihl", "u1"), ("tos", "u1"), ("total_length", ">u2"), ("ip_id", ">u2"), ("fragment", ">u2"),
+    ("ttl", "u1"), ("proto", "u1"), ("checksum", ">u2"), ("src", ">u4"), ("dst", ">u4"),
+    ("src_port", ">u2"), ("dst_port", ">u2"), ("seq", ">u4"), ("ack", ">u4"), ("offset", "u1"),
+    ("flags", "u1"), ("window", ">u2"), ("tcp_checksum", ">u2"), ("urgent", ">u2"),
+    ("payload", f"V{PAYLOAD}"),
+])
+
+
+def write_capture(path: str) -> int:
+    generator = np.random.default_rng(0)
+    flow = np.sort(generator.integers(0, FLOWS, PACKETS))
+    start = np.searchsorted(flow, flow)  # first packet of each packet's flow
+    position = np.arange(PACKETS) - start
+    frames = np.zeros(PACKETS, dtype=FRAME)
+    ts = 1_700_000_000 + np.arange(PACKETS) * 1e-5
+    frames["ts_sec"], frames["ts_usec"] = ts.astype(np.uint32), (ts % 1 * 1e6).astype(np.uint32)
+    frames["caplen"] = frames["length"] = FRAME.itemsize - 16
+    frames["ethertype"], frames["version_ihl"], frames["proto"], frames["offset"] = 0x0800, 0x45, 6, 5 << 4
+    frames["total_length"] = FRAME.itemsize - 16 - 14
+    reply = position == 1  # the SYN/ACK; every other packet is client to server
+    client, server = 0x0A000000 + flow, 0xCB007100 + flow % 200
+    frames["src"], frames["dst"] = np.where(reply, server, client), np.where(reply, client, server)
+    frames["src_port"] = np.where(reply, 443, 30000 + flow % 30000)
+    frames["dst_port"] = np.where(reply, 30000 + flow % 30000, 443)
+    frames["flags"] = np.where(position == 0, 0x02, np.where(reply, 0x12, 0x18))
+    # Data segments advance the sequence, except retransmissions, which resend the previous one
+    data = position >= 2
+    retransmit = data & (position >= 3) & (generator.random(PACKETS) < RETRANSMIT_RATE)
+    advance = np.where(data & ~retransmit, PAYLOAD, 0)
+    sent = np.cumsum(advance) - np.repeat(np.cumsum(advance)[start], 1)
+    frames["seq"] = 1000 + np.where(retransmit, sent - PAYLOAD * 2 + PAYLOAD, sent - advance)
+    frames["seq"][reply] = 5000
+    frames["total_length"][~data] = 40
+    with open(path, "wb") as f:
+        f.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1))
+        f.write(frames.tobytes())
+    return int(retransmit.sum())
+
+
+def per_packet(path: str) -> int:
+    flows, retransmits = {}, 0
+    with open(path, "rb") as f:
+        f.read(24)
+        record = struct.Struct("<IIII")
+        while True:
+            header = f.read(16)
+            if len(header) < 16:
+                break
+            sec, usec, caplen, _ = record.unpack(header)
+            frame = f.read(caplen)
+            if struct.unpack_from(">H", frame, 12)[0] != 0x0800 or frame[23] != 6:
+                continue
+            ihl = (frame[14] & 0x0F) * 4
+            total = struct.unpack_from(">H", frame, 16)[0]
+            src, dst = frame[26:30], frame[30:34]
+            sport, dport, seq = struct.unpack_from(">HHI", frame, 14 + ihl)
+            payload = total - ihl - (frame[14 + ihl + 12] >> 4) * 4
+            key = (src, sport, dst, dport)
+            state = flows.setdefault(key, {"packets": 0, "bytes": 0, "end": -1, "first": sec + usec / 1e6})
+            state["packets"] += 1
+            state["bytes"] += caplen
+            if payload > 0:
+                if seq + payload <= state["end"]:
+                    retransmits += 1
+                state["end"] = max(state["end"], seq + payload)
+    return retransmits
+
+
+def vectorised(path: str) -> int:
+    analyzer = CaptureAnalyzer()
+    for packets in read_packets(path):
+        analyzer.add(packets)
+    return analyzer.summary()["retransmits"]
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "capture.pcap")
+        expected = write_capture(path)
+        print(f"{PACKETS} packets, {FLOWS} flows, {os.path.getsize(path) / 2**20:.0f} MB, "
+              f"{expected} retransmissions")
+        print(f"{'mode':<12} {'packets/s':>11} {'peak MB':>8} {'retransmits':>12}")
+        for mode, analyze in (("per packet", per_packet), ("vectorised", vectorised)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            found = analyze(path)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{mode:<12} {PACKETS / elapsed:>11,.0f} {peak / 2**20:>8.1f} {found:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Tokens per full troubleshooting run with text and compact tool output.
+
+A run of the hierarchical agent is modelled as the LLM calls it makes:
+the coordinator hands over to each sub-agent in turn; a sub-agent makes one
+call that issues its three tool calls and one that writes its stage output
+(its tool results restated) after reading them; the ReportingAgent passes all
+stage outputs to format_report and presents the report. Every call re-reads
+everything before it in the session, so a tool result is paid for once per
+later call. Instructions are the same in both modes and are left out. Tokens
+are estimated as chars / 4. Runs replay the shop_slowdown scenario with 21
+seeds, so the HTTP checks are simulated too.
+
+Run with:
+    uv run python -m tests.benchmarks.benchmark_tool_output
+"""
+
+import asyncio
+import inspect
+import json
+import os
+
+from app.app_utils import simulator as sim_module
+from app.app_utils.simulator import configure_simulator
+from app.app_utils.tools import (
+    analyze_latency,
+    analyze_network_traffic,
+    check_packet_loss,
+    check_response_time,
+    check_website_availability,
+    clear_cache,
+    format_report,
+    identify_bottlenecks,
+    optimize_routing,
+    restart_web_server,
+)
+
+URL = "https://shop.example.com"
+STAGES = [
+    [check_website_availability, check_response_time, check_packet_loss],
+    [analyze_network_traffic, analyze_latency, identify_bottlenecks],
+    [lambda url: restart_web_server(url.split("//")[-1]), clear_cache, optimize_routing],
+]
+
+
+def run_tool(tool, *args):
+    """Run a tool, sync or async (the HTTP checks are simulated with a scenario loaded)."""
+    result = tool(*args)
+    return asyncio.run(result) if inspect.iscoroutine(result) else result
+
+
+def tokens(text: str) -> int:
+    return len(text) // 4
+
+
+def as_response(result) -> str:
+    """What the model reads for one tool response (ADK wraps text in {"result": ...})."""
+    return json.dumps(result if isinstance(result, dict) else {"result": result})
+
+
+def run_tokens(mode: str, scenario: str = None, seed: int = None) -> dict:
+    """Input and output tokens of one modelled run."""
+    os.environ["TOOL_OUTPUT_MODE"] = mode
+    configure_simulator(scenario, seed)
+    history, calls = [], []
+
+    def call() -> None:
+        calls.append(sum(history))
+
+    stage_outputs = []
+    for tools in STAGES:
+        call()  # coordinator transfers to the sub-agent
+        call()  # sub-agent issues its tool calls
+        results = [run_tool(tool, URL) for tool in tools]
+        history.extend(tokens(as_response(result)) for result in results)
+        call()  # sub-agent writes its stage output
+        output = json.dumps(results) if mode == "compact" else "\n\n".join(results)
+        stage_outputs.append(output)
+        history.append(tokens(output))
+
+    call()  # coordinator transfers to the ReportingAgent
+    call()  # ReportingAgent calls format_report with the stage outputs
+    history.append(sum(tokens(output) for output in stage_outputs))
+    report = format_report(*stage_outputs, "Website is slow")
+    history.append(tokens(report))
+    call()  # ReportingAgent presents the report
+    output_tokens = sum(tokens(o) for o in stage_outputs) * 2 + tokens(report)
+    return {"input": sum(calls), "output": output_tokens}
+
+
+def main() -> None:
+    runs = [("shop_slowdown", seed) for seed in range(21)]
+    print(f"{'mode':<8} {'input tok/run':>14} {'output tok/run':>15} {'total':>8}")
+    totals = {}
+    for mode in ("text", "compact"):
+        measured = [run_tokens(mode, scenario, seed) for scenario, seed in runs]
+        input_tokens = sum(m["input"] for m in measured) / len(measured)
+        output_tokens = sum(m["output"] for m in measured) / len(measured)
+        totals[mode] = input_tokens + output_tokens
+        print(f"{mode:<8} {input_tokens:>14.0f} {output_tokens:>15.0f} {totals[mode]:>8.0f}")
+    print(f"compact uses {1 - totals['compact'] / totals['text']:.0%} fewer tokens per run")
+    sim_module._simulator = None
+    os.environ.pop("TOOL_OUTPUT_MODE")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import socket
+import struct
+
+import numpy as np
+
+from app.app_utils.flows import CountMinSketch, FlowAnalyzer, SpaceSaving, analyze_export, read_flows
+from app.app_utils.tools import analyze_network_traffic, identify_bottlenecks
+
+# (src, dst, src_port, dst_port, proto, in_if, out_if, bytes, packets)
+FLOWS = [
+    ("10.0.0.5", "203.0.113.10", 50000, 443, 6, 1, 3, 6_000_000, 4000),
+    ("10.0.0.5", "203.0.113.10", 50001, 443, 6, 1, 3, 3_000_000, 2000),
+    ("10.0.0.7", "198.51.100.2", 40000, 53, 17, 2, 4, 20_000, 200),
+    ("10.0.0.9", "203.0.113.10", 41000, 80, 6, 2, 3, 900_000, 700),
+    ("2001:db8::1", "2001:db8::2", 42000, 443, 6, 2, 4, 80_000, 60),
+]
+
+
+def write_csv(path) -> None:
+    lines = ["srcaddr,dstaddr,srcport,dstport,proto,input,output,bytes,packets"]
+    lines += [",".join(str(v) if i != 4 else {6: "TCP", 17: "UDP"}[v] for i, v in enumerate(flow))
+              for flow in FLOWS]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def write_netflow_v5(path, flows, sampling=1) -> None:
+    with open(path, "wb") as f:
+        for start in range(0, len(flows), 30):
+            packet = flows[start:start + 30]
+            f.write(struct.pack(">HHIIIIBBH", 5, len(packet), 0, 0, 0, start, 0, 0, sampling))
+            for src, dst, sport, dport, proto, in_if, out_if, nbytes, packets in packet:
+                f.write(socket.inet_aton(src) + socket.inet_aton(dst) + bytes(4))
+                f.write(struct.pack(">HHIIIIHHBBBBHHBBH", in_if, out_if, packets, nbytes, 0, 0,
+                                    sport, dport, 0, 0, proto, 0, 0, 0, 0, 0, 0))
+
+
+def write_ipfix(path) -> None:
+    v4 = [(8, 4), (12, 4), (7, 2), (11, 2), (4, 1), (10, 4), (14, 4), (1, 8), (2, 4)]
+    v6 = [(27, 16), (28, 16), (7, 2), (11, 2), (4, 1), (10, 2), (14, 2), (1, 4), (2, 4)]
+    templates = b"".join(struct.pack(">HH", tid, len(fields)) + b"".join(struct.pack(">HH", *f) for f in fields)
+                         for tid, fields in ((256, v4), (257, v6)))
+    records = {256: b"", 257: b""}
+    for src, dst, sport, dport, proto, in_if, out_if, nbytes, packets in FLOWS:
+        if ":" in src:
+            records[257] += (socket.inet_pton(socket.AF_INET6, src) + socket.inet_pton(socket.AF_INET6, dst)
+                             + struct.pack(">HHBHHII", sport, dport, proto, in_if, out_if, nbytes, packets))
+        else:
+            records[256] += (socket.inet_aton(src) + socket.inet_aton(dst)
+                             + struct.pack(">HHBIIQI", sport, dport, proto, in_if, out_if, nbytes, packets))
+    sets = struct.pack(">HH", 2, 4 + len(templates)) + templates
+    sets += b"".join(struct.pack(">HH", tid, 4 + len(data)) + data for tid, data in records.items())
+    path.write_bytes(struct.pack(">HHIII", 10, 16 + len(sets), 0, 0, 1) + sets)
+
+
+def test_readers_agree_across_formats(tmp_path) -> None:
+    write_csv(tmp_path / "flows.csv")
+    write_ipfix(tmp_path / "flows.ipfix")
+    summaries = []
+    for name in ("flows.csv", "flows.ipfix"):
+        analyzer = FlowAnalyzer()
+        for batch, labels in read_flows(str(tmp_path / name)):
+            analyzer.add(batch, labels)
+        summaries.append(analyzer.summary())
+    assert summaries[0] == summaries[1]
+    summary = summaries[0]
+    assert summary["flows"] == 5 and summary["bytes"] == 10_000_000
+    assert summary["top_talkers"][0] == {"address": "10.0.0.5", "bytes": 9_000_000, "share_pct": 90.0}
+    assert "2001:db8::1" in [e["address"] for e in summary["top_talkers"]]
+    assert summary["top_ports"][0]["port"] == "tcp/443"
+    assert summary["hot_interfaces"][0] == {"interface": 3, "bytes": 9_900_000, "share_pct": 99.0,
+                                            "top_ports": ["tcp/443", "tcp/80"]}
+
+
+def test_netflow_v5_scales_by_sampling_interval(tmp_path) -> None:
+    flows = [flow for flow in FLOWS if ":" not in flow[0]] * 20  # spans several export packets
+    write_netflow_v5(tmp_path / "flows.nf5", flows, sampling=10)
+    batches = list(read_flows(str(tmp_path / "flows.nf5")))
+    total = sum(int(batch["bytes"].sum()) for batch, _ in batches)
+    assert sum(batch.size for batch, _ in batches) == 80
+    assert total == 10 * 20 * 9_920_000
+
+
+def test_sketches_find_heavy_hitters_in_bounded_memory() -> None:
+    generator = np.random.default_rng(0)
+    keys = generator.integers(1000, 1_000_000, 500_000, dtype=np.uint64)
+    keys[:100_000] = np.repeat(np.arange(10, dtype=np.uint64), 10_000)  # 10 heavy hitters
+    weights = np.ones(keys.size, dtype=np.uint64)
+    summary, sketch = SpaceSaving(64), CountMinSketch(1 << 12)
+    for start in range(0, keys.size, 50_000):
+        summary.update(keys[start:start + 50_000], weights[start:start + 50_000])
+        sketch.add(keys[start:start + 50_000], weights[start:start + 50_000])
+    assert summary.keys.size == 64
+    assert sorted(key for key, _, _ in summary.top(10)) == list(range(10))
+    for key, count, error in summary.top(10):
+        assert count - error <= 10_000 <= count
+    assert all(10_000 <= estimate <= 10_000 + keys.size * 2 / 4096 for estimate in sketch.estimate(range(10)))
+
+
+def test_tools_report_ranked_flow_summaries(tmp_path, monkeypatch) -> None:
+    write_csv(tmp_path / "flows.csv")
+    monkeypatch.setenv("FLOW_EXPORT_PATH", str(tmp_path / "flows.csv"))
+    traffic = asyncio.run(analyze_network_traffic("https://203.0.113.10/shop"))
+    assert traffic["site_bytes"] == 9_900_000 and len(traffic["top_talkers"]) == 4
+    bottleneck = asyncio.run(identify_bottlenecks("https://203.0.113.10/shop"))
+    assert bottleneck["bottleneck"] == "Bandwidth saturation on network link"
+    assert bottleneck["interface"] == 3 and bottleneck["severity"] == "HIGH"
+    assert analyze_export(str(tmp_path / "flows.csv")) is analyze_export(str(tmp_path / "flows.csv"))
+    missing = asyncio.run(identify_bottlenecks("https://203.0.113.10", str(tmp_path / "missing.csv")))
+    assert missing["bottleneck"] is None and "error" in missing
+
+
+def test_malformed_csv_rows_are_skipped_and_counted(tmp_path) -> None:
+    write_csv(tmp_path / "flows.csv")
+    with open(tmp_path / "flows.csv", "a") as f:
+        f.write("web01.example.com,203.0.113.10,1,443,TCP,1,3,100,1\n")
+        f.write("10.0.0.5,N/A,1,443,TCP,1,3,100,1\n")
+        f.write("10.0.0.5,203.0.113.10,1,443,TCP,1,3,lots,1\n")
+        f.write("10.0.0.5,203.0.113.10\n")
+    summary = analyze_export(str(tmp_path / "flows.csv")).summary()
+    assert summary["flows"] == len(FLOWS) and summary["skipped_records"] == 4
+    assert summary["bytes"] == 10_000_000
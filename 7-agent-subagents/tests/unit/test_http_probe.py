@@ -0,0 +1,157 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import socket
+import time
+
+from app.app_utils import simulator as sim_module
+from app.app_utils.http_probe import HttpProber, ProbeSettings, parse_urls
+from app.app_utils.results import render
+from app.app_utils.simulator import configure_simulator
+from app.app_utils.tools import check_response_time, check_website_availability
+
+BODY = b"x" * 2048
+
+
+class _Server:
+    """Local HTTP/1.1 keep-alive server that waits `delay` seconds before each response."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                path = head.split(b" ")[1]
+                await asyncio.sleep(self.delay)
+                if path == b"/chunked":
+                    writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                                 b"400\r\n" + BODY[:1024] + b"\r\n0\r\n\r\n")
+                elif path == b"/close":
+                    writer.write(b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 2\r\n\r\nok")
+                    await writer.drain()
+                    break
+                else:
+                    status = b"503 Service Unavailable" if path == b"/down" else b"200 OK"
+                    writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: %d\r\n\r\n" % len(BODY) + BODY)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def run(self, test):
+        server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        try:
+            return await test(f"http://localhost:{server.sockets[0].getsockname()[1]}")
+        finally:
+            server.close()
+            await server.wait_closed()
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_parse_urls() -> None:
+    assert parse_urls(" https://a.example.com, b.example.com:8080/x ,") == [
+        "https://a.example.com", "http://b.example.com:8080/x",
+    ]
+
+
+def test_keep_alive_skips_setup_and_times_injected_latency() -> None:
+    server = _Server(delay=0.05)
+
+    async def test(base):
+        prober = HttpProber(ProbeSettings(timeout=2))
+        checks = await prober.sample(f"{base}/", samples=4)
+        prober.close()
+        return prober, checks
+
+    prober, checks = asyncio.run(server.run(test))
+    assert all(c.ok and c.status_code == 200 and c.body_bytes == len(BODY) for c in checks)
+    assert all(c.ttfb_ms >= 50 for c in checks)
+    first, rest = checks[0], checks[1:]
+    assert not first.reused and first.connect_ms > 0
+    assert all(c.reused and c.dns_ms == c.connect_ms == 0 for c in rest)
+    assert server.connections == prober.connections_opened == 1
+    assert prober.dns.misses == 1
+
+
+def test_concurrent_checks_share_pool_and_dns() -> None:
+    server = _Server(delay=0.1)
+
+    async def test(base):
+        prober = HttpProber(ProbeSettings(timeout=5, max_connections_per_host=10))
+        start = time.perf_counter()
+        checks = await prober.check_many([f"{base}/page{i}" for i in range(50)])
+        prober.close()
+        return prober, checks, time.perf_counter() - start
+
+    prober, checks, elapsed = asyncio.run(server.run(test))
+    assert all(c.ok for c in checks)
+    # 50 requests of 100 ms over at most 10 connections: about 0.5 s, not 5 s
+    assert elapsed < 2.0
+    assert prober.connections_opened <= 10
+    assert prober.dns.misses == 1 and prober.dns.hits >= 9
+
+
+def test_chunked_close_and_failures() -> None:
+    server = _Server(delay=0.0)
+    closed = _closed_port()
+
+    async def test(base):
+        prober = HttpProber(ProbeSettings(timeout=0.5))
+        chunked = await prober.sample(f"{base}/chunked", samples=2)
+        close = await prober.sample(f"{base}/close", samples=2)
+        refused = await prober.check(f"http://127.0.0.1:{closed}/")
+        server.delay = 1.0
+        slow = await prober.check(f"{base}/")
+        prober.close()
+        return chunked, close, refused, slow
+
+    chunked, close, refused, slow = asyncio.run(server.run(test))
+    assert [c.body_bytes for c in chunked] == [1024, 1024] and chunked[1].reused
+    assert all(c.ok for c in close) and not close[1].reused
+    assert not refused.ok and refused.phase == "connect"
+    assert not slow.ok and "timed out" in slow.error
+
+
+def test_tools_report_measured_checks(monkeypatch) -> None:
+    monkeypatch.delenv("SIMULATION_SCENARIO", raising=False)
+    configure_simulator()
+    server = _Server(delay=0.02)
+
+    async def test(base):
+        availability = await check_website_availability(f"{base}/, {base}/down")
+        response = await check_response_time(f"{base}/", threshold_ms=5, samples=5)
+        return availability, response
+
+    try:
+        (up, down), response = asyncio.run(server.run(test))
+    finally:
+        sim_module._simulator = None
+    assert up["available"] and up["status_code"] == 200 and up["ttfb_ms"] >= 20
+    assert not down["available"] and down["status_code"] == 503
+    assert response["slow"] and response["samples"] == 5
+    assert response["min_ms"] <= response["median_ms"] <= response["p95_ms"] <= response["max_ms"]
+    assert "Timings: DNS" in render(up)
+    assert "Issue: Server error (HTTP 503)" in render(down)
+    assert "Connection Setup (first request only)" in render(response)
@@ -0,0 +1,107 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+
+import numpy as np
+
+from app.app_utils import latency_stats
+from app.app_utils import simulator as sim_module
+from app.app_utils.latency_stats import LatencyStats, LatencyTracker
+from app.app_utils.simulator import configure_simulator
+from app.app_utils.tools import analyze_latency, check_packet_loss
+
+
+def _stream(seed: int, count: int) -> np.ndarray:
+    generator = np.random.default_rng(seed)
+    rtts = 80 * np.exp(generator.normal(0, 0.4, count))
+    rtts[generator.random(count) < 0.02] = math.nan
+    return rtts
+
+
+def test_quantiles_within_relative_accuracy() -> None:
+    rtts = _stream(1, 50_000)
+    stats = LatencyStats()
+    stats.add_many(rtts)
+    received = rtts[~np.isnan(rtts)]
+    for q, value in zip((0.5, 0.95, 0.99), stats.quantiles((0.5, 0.95, 0.99))):
+        exact = np.quantile(received, q, method="inverted_cdf")  # nearest rank
+        assert abs(value - exact) <= 0.011 * exact
+    assert stats.count == received.size and stats.lost == rtts.size - received.size
+    assert math.isclose(stats.mean, received.mean()) and math.isclose(stats.stddev, received.std())
+
+
+def test_quantiles_use_nearest_rank() -> None:
+    stats = LatencyStats()
+    stats.add_many([1.0, 2.0])
+    assert stats.quantiles((0.5, 0.95, 0.99)) == [1.0, 2.0, 2.0]
+
+    stats = LatencyStats()
+    stats.add_many([float(v) for v in range(10, 110, 10)])
+    p50, p95, p99 = stats.quantiles((0.5, 0.95, 0.99))
+    assert abs(p50 - 50) <= 0.5 and p95 == p99 == 100.0
+
+
+def test_batches_match_single_samples() -> None:
+    rtts = [10.0, None, None, 12.0, 11.0, None, None, None, None, 15.0, None]
+    one_by_one = LatencyStats()
+    for rtt in rtts:
+        one_by_one.add(rtt)
+    batched = LatencyStats()
+    for batch in (rtts[:2], rtts[2:7], rtts[7:8], rtts[8:]):  # bursts span batch boundaries
+        batched.add_many(batch)
+    for stats in (one_by_one, batched):
+        assert stats.summary()["loss_bursts"] == 3
+        assert stats.summary()["max_loss_burst"] == 4
+        assert list(stats.bursts()[:4]) == [1, 1, 0, 1]
+        assert stats.jitter == (2 + 1 + 4) / 3
+    assert one_by_one.summary() == batched.summary()
+
+
+def test_merge_matches_one_stream() -> None:
+    first, second = _stream(2, 20_000), _stream(3, 20_000)
+    whole, left, right = LatencyStats(), LatencyStats(), LatencyStats()
+    whole.add_many(np.concatenate((first, second)))
+    left.add_many(first)
+    right.add_many(second)
+    merged = left.merge(right)
+    assert np.array_equal(merged.counts, whole.counts)
+    assert merged.quantiles() == whole.quantiles()
+    assert (merged.count, merged.lost, merged.min, merged.max) == (whole.count, whole.lost, whole.min, whole.max)
+
+
+def test_tracker_merges_targets_and_expires_windows() -> None:
+    tracker = LatencyTracker(window_seconds=60, max_windows=3)
+    tracker.add("a.example.com", [10.0, 20.0], now=0)
+    tracker.add("a.example.com", [30.0], now=130)
+    tracker.add("b.example.com", [40.0, None], now=130)
+    assert tracker.stats(["a.example.com"], now=130).count == 3
+    assert tracker.stats(["a.example.com"], now=200).count == 1  # the first window has expired
+    assert tracker.stats(now=130).sent == 5
+    assert tracker.stats(["a.example.com"], windows=1, now=130).max == 30.0
+
+
+def test_tools_report_recorded_samples() -> None:
+    configure_simulator(seed=5)
+    latency_stats._tracker = LatencyTracker()
+    try:
+        latency_stats.get_latency_tracker().add("shop.example.com", [100.0] * 99 + [None, 900.0])
+        latency = analyze_latency("https://shop.example.com/cart")
+        assert latency["samples"] == 100 and abs(latency["p50_ms"] - 100) <= 1 and latency["max_ms"] == 900.0
+        loss = check_packet_loss("shop.example.com")
+        assert (loss["sent"], loss["received"], loss["loss_bursts"]) == (101, 100, 1)
+        assert analyze_latency("https://other.example.com")["samples"] == 20_000  # simulated
+    finally:
+        sim_module._simulator = None
+        latency_stats._tracker = None
@@ -0,0 +1,109 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import socket
+import struct
+
+from app.app_utils.pcap import CaptureAnalyzer, read_packets
+from app.app_utils.tools import analyze_network_traffic
+
+CLIENT, SERVER = ("10.0.0.5", 50000), ("203.0.113.10", 443)
+SYN, ACK, PSH = 0x02, 0x10, 0x08
+
+
+def tcp_packet(src, dst, seq, ack, flags, payload=b"", vlan=False) -> bytes:
+    tcp = struct.pack(">HHIIBBHHH", src[1], dst[1], seq, ack, 5 << 4, flags, 65535, 0, 0) + payload
+    ip = struct.pack(">BBHHHBBH4s4s", 0x45, 0, 20 + len(tcp), 0, 0, 64, 6, 0,
+                     socket.inet_aton(src[0]), socket.inet_aton(dst[0])) + tcp
+    ethernet = b"\x00" * 12 + (b"\x81\x00\x00\x01" if vlan else b"") + b"\x08\x00"
+    return ethernet + ip
+
+
+def udp6_packet(src, dst, payload) -> bytes:
+    udp = struct.pack(">HHHH", src[1], dst[1], 8 + len(payload), 0) + payload
+    ip = (struct.pack(">IHBB", 6 << 28, len(udp), 17, 64) + socket.inet_pton(socket.AF_INET6, src[0])
+          + socket.inet_pton(socket.AF_INET6, dst[0]) + udp)
+    return b"\x00" * 12 + b"\x86\xdd" + ip
+
+
+def conversation() -> list:
+    """(timestamp, frame): handshake with a 40 ms RTT, 3 data segments, one retransmitted."""
+    data = b"x" * 1000
+    return [
+        (1.000, tcp_packet(CLIENT, SERVER, 100, 0, SYN)),
+        (1.040, tcp_packet(SERVER, CLIENT, 900, 101, SYN | ACK)),
+        (1.041, tcp_packet(CLIENT, SERVER, 101, 901, ACK, vlan=True)),
+        (1.050, tcp_packet(CLIENT, SERVER, 101, 901, PSH | ACK, data)),
+        (1.051, tcp_packet(CLIENT, SERVER, 1101, 901, PSH | ACK, data)),
+        (1.300, tcp_packet(CLIENT, SERVER, 101, 901, PSH | ACK, data)),  # retransmission
+        (1.310, tcp_packet(SERVER, CLIENT, 901, 2101, ACK)),
+        (1.400, udp6_packet(("2001:db8::1", 5353), ("2001:db8::2", 53), b"q" * 30)),
+        (1.500, b"\x00" * 12 + b"\x08\x06" + b"\x00" * 28),  # ARP
+    ]
+
+
+def write_pcap(path, packets) -> None:
+    with open(path, "wb") as f:
+        f.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1))
+        for ts, frame in packets:
+            f.write(struct.pack("<IIII", int(ts), round(ts % 1 * 1e6), len(frame), len(frame)) + frame)
+
+
+def write_pcapng(path, packets) -> None:
+    def block(kind, body):
+        body += b"\x00" * (-len(body) % 4)
+        return struct.pack("<II", kind, 12 + len(body)) + body + struct.pack("<I", 12 + len(body))
+
+    with open(path, "wb") as f:
+        f.write(block(0x0A0D0D0A, struct.pack("<IHHq", 0x1A2B3C4D, 1, 0, -1)))
+        f.write(block(1, struct.pack("<HHI", 1, 0, 65535) + struct.pack("<HHB3x", 9, 1, 9) + b"\x00" * 4))
+        for ts, frame in packets:
+            units = round(ts * 1e9)
+            f.write(block(6, struct.pack("<IIIII", 0, units >> 32, units & 0xFFFFFFFF, len(frame), len(frame))
+                          + frame))
+
+
+def analyze(path, chunk=4) -> dict:
+    analyzer = CaptureAnalyzer()
+    for packets in read_packets(str(path), chunk=chunk):  # several chunks: state carries across them
+        analyzer.add(packets)
+    return analyzer.summary()
+
+
+def test_pcap_flow_summary(tmp_path) -> None:
+    write_pcap(tmp_path / "capture.pcap", conversation())
+    summary = analyze(tmp_path / "capture.pcap")
+    assert (summary["packets"], summary["ip_packets"], summary["flows"], summary["tcp_flows"]) == (9, 8, 2, 1)
+    assert summary["retransmits"] == 1 and summary["retransmit_pct"] == 33.33
+    assert summary["rtt_flows"] == 1 and abs(summary["rtt_p50_ms"] - 40) < 0.5
+    top = summary["top_flows"][0]
+    assert top["flow"] == "10.0.0.5:50000 > 203.0.113.10:443 tcp"
+    assert top["packets"] == 7 and top["retransmits"] == 1 and abs(top["rtt_ms"] - 40) < 0.5
+    assert summary["top_flows"][1]["flow"] == "[2001:db8::1]:5353 > [2001:db8::2]:53 udp"
+    assert summary["lossy_flows"] == [top]
+
+
+def test_pcapng_matches_pcap(tmp_path) -> None:
+    write_pcap(tmp_path / "capture.pcap", conversation())
+    write_pcapng(tmp_path / "capture.pcapng", conversation())
+    assert analyze(tmp_path / "capture.pcapng", chunk=100) == analyze(tmp_path / "capture.pcap")
+
+
+def test_traffic_tool_reports_capture(tmp_path) -> None:
+    write_pcap(tmp_path / "capture.pcap", conversation())
+    result = asyncio.run(analyze_network_traffic("https://203.0.113.10", capture_file=str(tmp_path / "capture.pcap")))
+    assert result["capture"]["retransmits"] == 1 and "requests" not in result
+    missing = asyncio.run(analyze_network_traffic("https://203.0.113.10", capture_file=str(tmp_path / "none.pcap")))
+    assert "error" in missing["capture"]
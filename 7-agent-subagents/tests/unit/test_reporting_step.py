@@ -0,0 +1,73 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from app.agent import ReportingStep
+from app.app_utils.tools import REPORT_SECTIONS, format_report
+
+
+def run_step(state: Dict[str, Any], text: str) -> Tuple[List[Event], Dict[str, Any]]:
+    """Runs the ReportingStep on a session seeded with `state`; returns its events and the final state."""
+
+    async def scenario() -> Tuple[List[Event], Dict[str, Any]]:
+        runner = InMemoryRunner(agent=ReportingStep(name="ReportingStep"), app_name="test")
+        session = await runner.session_service.create_session(
+            app_name="test", user_id="test_user", state=state
+        )
+        message = types.Content(role="user", parts=[types.Part.from_text(text=text)])
+        events = [
+            event
+            async for event in runner.run_async(
+                user_id="test_user", session_id=session.id, new_message=message
+            )
+        ]
+        session = await runner.session_service.get_session(
+            app_name="test", user_id="test_user", session_id=session.id
+        )
+        return events, session.state
+
+    return asyncio.run(scenario())
+
+
+def test_report_is_built_from_session_state() -> None:
+    state = {
+        "monitoring_results": "shop.example.com: 12% packet loss",
+        "analysis_results": "Bottleneck on the uplink of edge-router2",
+        "remediation_results": "Rerouted traffic through core-router1",
+    }
+    events, final_state = run_step(state, "The shop is slow")
+
+    expected = format_report(user_report="The shop is slow", **state)
+    final = events[-1]
+    assert final.author == "ReportingStep"
+    assert final.actions.state_delta == {"final_report": expected}
+    assert final.content.parts[0].text == expected
+    assert final_state["final_report"] == expected
+    assert "Rerouted traffic through core-router1" in expected
+
+
+def test_report_with_empty_state() -> None:
+    events, final_state = run_step({}, "The shop is slow")
+
+    expected = format_report("", "", "", "The shop is slow")
+    final = events[-1]
+    assert final.actions.state_delta == {"final_report": expected}
+    assert final_state["final_report"] == expected
+    assert all(section.strip() in expected for section in REPORT_SECTIONS.values())
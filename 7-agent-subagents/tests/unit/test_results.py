@@ -0,0 +1,101 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import inspect
+import json
+
+import pytest
+
+from app.app_utils import simulator as sim_module
+from app.app_utils.results import render, render_stage
+from app.app_utils.simulator import configure_simulator
+from app.app_utils.tools import (
+    analyze_latency,
+    check_response_time,
+    check_website_availability,
+    REPORT_SECTIONS,
+    format_report,
+    identify_bottlenecks,
+    report_section,
+    report_summary,
+)
+
+URL = "https://shop.example.com"
+
+
+@pytest.fixture(autouse=True)
+def seeded_simulator():
+    # With a scenario loaded the HTTP checks are simulated too
+    configure_simulator("shop_slowdown", seed=7)
+    yield
+    sim_module._simulator = None
+
+
+def call(tool, *args):
+    result = tool(*args)
+    return asyncio.run(result) if inspect.iscoroutine(result) else result
+
+
+def test_compact_results_render_to_the_text_output(monkeypatch) -> None:
+    tools = [check_website_availability, check_response_time, analyze_latency, identify_bottlenecks]
+    compact = [call(tool, URL) for tool in tools]
+    assert all(isinstance(result, dict) and result["tool"] == tool.__name__
+               for tool, result in zip(tools, compact))
+
+    monkeypatch.setenv("TOOL_OUTPUT_MODE", "text")
+    configure_simulator("shop_slowdown", seed=7)
+    text = [call(tool, URL) for tool in tools]
+    assert [render(result) for result in compact] == text
+    assert sum(len(json.dumps(r)) for r in compact) < sum(len(t) for t in text) / 2
+
+
+def test_render_stage_handles_json_fences_and_plain_text() -> None:
+    results = [call(check_response_time, URL), analyze_latency(URL)]
+    stage = "```json\n" + json.dumps(results) + "\n```\nLatency is the likely cause."
+    rendered = render_stage(stage)
+    assert rendered.startswith("Response Time Check Results:")
+    assert "Latency Analysis Results:" in rendered
+    assert rendered.endswith("Latency is the likely cause.")
+    assert render_stage("  Website is up.  ") == "Website is up."
+    assert render_stage("[not json") == "[not json"
+
+
+def test_incomplete_result_falls_back_to_key_values() -> None:
+    rendered = render_stage('[{"tool": "check_packet_loss", "url": "x", "loss_pct": 0}]')
+    assert "tool: check_packet_loss" in rendered and "loss_pct: 0" in rendered
+    report = format_report('{"tool": "analyze_latency", "avg_ms": "n/a"}', "", "", "")
+    assert "avg_ms: n/a" in report
+
+
+def test_format_report_renders_structured_stages() -> None:
+    report = format_report(
+        json.dumps([call(check_website_availability, URL)]),
+        json.dumps(call(identify_bottlenecks, URL)),
+        "No remediation needed.",
+        "Website is slow",
+    )
+    assert "Website Availability Check Results:" in report
+    assert "Bottleneck Identification Results:" in report
+    assert "No remediation needed." in report
+    assert '"tool"' not in report
+
+
+def test_streamed_sections_make_up_the_report() -> None:
+    outputs = [json.dumps([call(check_website_availability, URL)]), "Latency is high.", ""]
+    streamed = [report_section(stage, output) for stage, output in zip(REPORT_SECTIONS, outputs)]
+    assert streamed[0].startswith("╔") and "NETWORK TROUBLESHOOTING REPORT" in streamed[0]
+    assert "Website Availability Check Results:" in streamed[0]
+    assert "2. ANALYSIS RESULTS" in streamed[1] and "Latency is high." in streamed[1]
+    assert "".join(streamed) + report_summary() == format_report(*outputs, "Website is slow")
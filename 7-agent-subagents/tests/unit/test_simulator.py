@@ -0,0 +1,60 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+from app.app_utils import simulator as sim_module
+from app.app_utils.simulator import configure_simulator, reset_simulator_for_invocation
+from app.app_utils.tools import analyze_latency, check_packet_loss, optimize_routing
+
+
+def test_seeded_tools_are_reproducible() -> None:
+    def run(seed):
+        configure_simulator(seed=seed)
+        return [check_packet_loss(f"https://site{i}.example.com") for i in range(10)]
+
+    try:
+        assert run(42) == run(42)
+    finally:
+        sim_module._simulator = None
+
+
+def test_scenario_fault_cleared_by_remediation() -> None:
+    configure_simulator("shop_slowdown")
+    try:
+        assert analyze_latency("https://shop.example.com")["bottleneck"] is True
+        assert optimize_routing("https://shop.example.com")["success"] is True
+        assert analyze_latency("https://shop.example.com")["bottleneck"] is False
+    finally:
+        sim_module._simulator = None
+
+
+def test_each_invocation_replays_the_scenario() -> None:
+    configure_simulator("shop_slowdown")
+
+    def run(invocation_id):
+        reset_simulator_for_invocation(SimpleNamespace(invocation_id=invocation_id))
+        before = analyze_latency("https://shop.example.com")
+        fixed = optimize_routing("https://shop.example.com")
+        # A callback running again in the same invocation does not rewind it
+        reset_simulator_for_invocation(SimpleNamespace(invocation_id=invocation_id))
+        after = analyze_latency("https://shop.example.com")
+        return before, fixed, after
+
+    try:
+        first, second = run("invocation-1"), run("invocation-2")
+        assert first == second
+        assert first[0]["bottleneck"] is True and first[2]["bottleneck"] is False
+    finally:
+        sim_module._simulator = None
@@ -32,6 +32,7 @@ from langchain_google_vertexai import VertexAIEmbeddings
 
 from app.retrievers import get_compressor, get_retriever
 from app.templates import format_docs
+from app.vector_index import DEFAULT_NPROBE
 
 EMBEDDING_MODEL = "text-embedding-005"
 LLM_LOCATION = "global"
@@ -60,6 +61,8 @@ TOP_K = 5
 
 data_store_region = os.getenv("DATA_STORE_REGION", "us")
 data_store_id = os.getenv("DATA_STORE_ID", "8-agent-rag-datastore")
+# Directory of a local index built with `python -m app.vector_index` (replaces Vertex AI Search)
+local_index_path = os.getenv("LOCAL_INDEX_PATH")
 
 retriever = get_retriever(
     project_id=project_id,
@@ -67,10 +70,13 @@ retriever = get_retriever(
     data_store_region=data_store_region,
     embedding=embedding,
     embedding_column=EMBEDDING_COLUMN,
-    max_documents=10,
+    max_documents=TOP_K if local_index_path else 10,
+    local_index_path=local_index_path,
+    local_index_nprobe=int(os.getenv("LOCAL_INDEX_NPROBE", DEFAULT_NPROBE)),
 )
 
-compressor = get_compressor(
+# Local results are already ranked by similarity, so they skip the Vertex AI re-rank
+compressor = None if local_index_path else get_compressor(
     project_id=project_id,
 )
 
@@ -90,8 +96,10 @@ def retrieve_docs(query: str) -> str:
         # Use the retriever to fetch relevant documents based on the query
         retrieved_docs = retriever.invoke(query)
         # Re-rank docs with Vertex AI Rank for better relevance
-        ranked_docs = compressor.compress_documents(
-            documents=retrieved_docs, query=query
+        ranked_docs = (
+            compressor.compress_documents(documents=retrieved_docs, query=query)
+            if compressor
+            else retrieved_docs
         )
         # Format ranked documents into a consistent structure for LLM consumption
         formatted_docs = format_docs.format(docs=ranked_docs)
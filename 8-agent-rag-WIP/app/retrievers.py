@@ -17,9 +17,46 @@
 import os
 
 from unittest.mock import MagicMock
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
 from langchain_google_community.vertex_rank import VertexAIRank
 from langchain_google_vertexai import VertexAIEmbeddings
 from langchain_google_community import VertexAISearchRetriever
+from pydantic import ConfigDict
+
+from app.vector_index import DEFAULT_NPROBE, IVFIndex
+
+
+class LocalVectorRetriever(BaseRetriever):
+    """
+    Retriever over a local memory-mapped IVF index (see app/vector_index.py).
+
+    Only the query is embedded remotely; the search runs in process, with
+    documents returned most similar first.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: IVFIndex
+    embedding: Embeddings
+    k: int = 10
+    nprobe: int = DEFAULT_NPROBE
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        rows, scores = self.index.search(
+            self.embedding.embed_query(query), k=self.k, nprobe=self.nprobe
+        )
+        documents = []
+        for document, score in zip(self.index.documents(rows), scores):
+            content = document.pop("content", "")
+            documents.append(
+                Document(page_content=content, metadata={**document, "score": float(score)})
+            )
+        return documents
 
 
 def get_retriever(
@@ -30,13 +67,23 @@ def get_retriever(
     embedding_column: str = "embedding",
     max_documents: int = 10,
     custom_embedding_ratio: float = 0.5,
-) -> VertexAISearchRetriever:
+    local_index_path: str | None = None,
+    local_index_nprobe: int = DEFAULT_NPROBE,
+) -> BaseRetriever:
     """
     Creates and returns an instance of the retriever service.
 
-    Uses mock service if the INTEGRATION_TEST environment variable is set to "TRUE",
-    otherwise initializes real Vertex AI retriever.
+    Uses a LocalVectorRetriever over the index at local_index_path if given,
+    otherwise initializes real Vertex AI retriever (or a mock service that
+    raises if it is not available).
     """
+    if local_index_path:
+        return LocalVectorRetriever(
+            index=IVFIndex(local_index_path),
+            embedding=embedding,
+            k=max_documents,
+            nprobe=local_index_nprobe,
+        )
     try:
         return VertexAISearchRetriever(
             project_id=project_id,
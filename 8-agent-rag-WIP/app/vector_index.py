@@ -0,0 +1,281 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Local IVF (inverted file) vector index over memory-mapped NumPy files.
+
+The index is a directory:
+
+- index.json: dimension, number of vectors and lists
+- centroids.npy: one unit-length centroid per list (k-means on a sample)
+- offsets.npy: where each list starts in vectors.npy
+- vectors.npy: the unit-length embeddings, grouped by list
+- rows.npy: the original row of each vector in vectors.npy
+- documents.jsonl / document_offsets.npy: one JSON document per original row
+
+A search scores the query against the centroids, then only against the
+vectors of the `nprobe` nearest lists, read straight from the memory-mapped
+vectors.npy. Only the centroids and list offsets are held in memory, so
+indexes larger than RAM are served from the page cache. Similarity is cosine
+(inner product of unit vectors).
+
+Build an index from the data ingestion pipeline's JSONL export with:
+    uv run python -m app.vector_index <index_dir> <export.jsonl>...
+"""
+
+import json
+import math
+import os
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+import numpy as np
+
+DEFAULT_NPROBE = 32
+TRAIN_POINTS_PER_LIST = 64
+KMEANS_ITERATIONS = 10
+BATCH_ROWS = 65_536
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid of each vector, in batches."""
+    nearest = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), BATCH_ROWS):
+        batch = _normalize(vectors[start : start + BATCH_ROWS])
+        nearest[start : start + len(batch)] = np.argmax(batch @ centroids.T, axis=1)
+    return nearest
+
+
+def train_centroids(
+    vectors: np.ndarray,
+    nlist: int,
+    iterations: int = KMEANS_ITERATIONS,
+    seed: int = 0,
+) -> np.ndarray:
+    """Spherical k-means centroids from a sample of up to TRAIN_POINTS_PER_LIST per list."""
+    rng = np.random.default_rng(seed)
+    count = len(vectors)
+    sample_size = min(count, nlist * TRAIN_POINTS_PER_LIST)
+    sample = _normalize(vectors[np.sort(rng.choice(count, sample_size, replace=False))])
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)]
+    for _ in range(iterations):
+        assignment = _nearest(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        empty = np.flatnonzero(np.bincount(assignment, minlength=nlist) == 0)
+        sums[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+        centroids = _normalize(sums)
+    return centroids
+
+
+def build_index(
+    path: str,
+    embeddings: np.ndarray,
+    documents: Iterable[dict[str, Any]] | None = None,
+    nlist: int | None = None,
+    seed: int = 0,
+) -> "IVFIndex":
+    """
+    Builds an index directory from an embedding matrix (a memory-mapped array
+    works) and, optionally, one JSON document per row.
+
+    Args:
+        path: Index directory, created if missing
+        embeddings: (rows, dimension) embedding matrix
+        documents: Documents in row order, e.g. {"id": ..., "content": ...}
+        nlist: Number of lists (default: about sqrt(rows))
+        seed: Seed of the k-means sampling
+
+    Returns:
+        The opened index.
+    """
+    os.makedirs(path, exist_ok=True)
+    count, dim = embeddings.shape
+    nlist = min(count, nlist or max(1, round(math.sqrt(count))))
+    centroids = train_centroids(embeddings, nlist, seed=seed)
+    assignment = _nearest(embeddings, centroids)
+    rows = np.argsort(assignment, kind="stable")
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(assignment, minlength=nlist))))
+
+    vectors = np.lib.format.open_memmap(
+        os.path.join(path, "vectors.npy"), mode="w+", dtype=np.float32, shape=(count, dim)
+    )
+    for start in range(0, count, BATCH_ROWS):
+        batch = rows[start : start + BATCH_ROWS]
+        order = np.argsort(batch)  # read the source in row order
+        vectors[start + order] = _normalize(embeddings[batch[order]])
+    vectors.flush()
+    del vectors
+    np.save(os.path.join(path, "rows.npy"), rows)
+    np.save(os.path.join(path, "offsets.npy"), offsets)
+    np.save(os.path.join(path, "centroids.npy"), centroids)
+    if documents is not None:
+        _write_documents(path, documents)
+    with open(os.path.join(path, "index.json"), "w") as f:
+        json.dump({"dim": dim, "count": count, "nlist": nlist, "metric": "cosine"}, f)
+    return IVFIndex(path)
+
+
+def _write_documents(path: str, documents: Iterable[dict[str, Any]]) -> None:
+    offsets = [0]
+    with open(os.path.join(path, "documents.jsonl"), "wb") as f:
+        for document in documents:
+            offsets.append(offsets[-1] + f.write(json.dumps(document).encode() + b"\n"))
+    np.save(os.path.join(path, "document_offsets.npy"), np.array(offsets, dtype=np.int64))
+
+
+def read_export(
+    paths: Sequence[str], embedding_column: str = "embedding"
+) -> Iterator[tuple[list[float], dict[str, Any]]]:
+    """(embedding, document) pairs from the data ingestion pipeline's JSONL export."""
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "json_data" in record:
+                    record = json.loads(record["json_data"])
+                embedding = record.pop(embedding_column)
+                yield embedding, record
+
+
+def build_index_from_export(
+    path: str, paths: Sequence[str], embedding_column: str = "embedding", **kwargs: Any
+) -> "IVFIndex":
+    """Builds an index from JSONL export files without holding the embeddings in memory."""
+    os.makedirs(path, exist_ok=True)
+    staging = os.path.join(path, "staging.f32")
+    count, dim = 0, None
+    with open(staging, "wb") as f:
+
+        def documents() -> Iterator[dict[str, Any]]:
+            nonlocal count, dim
+            for embedding, document in read_export(paths, embedding_column):
+                vector = np.asarray(embedding, dtype=np.float32)
+                if dim is None:
+                    dim = vector.size
+                elif vector.size != dim:
+                    raise ValueError(f"{document.get('id')}: embedding has {vector.size} values, expected {dim}")
+                f.write(vector.tobytes())
+                count += 1
+                yield document
+
+        _write_documents(path, documents())
+    try:
+        if not count:
+            raise ValueError("no embeddings in the export")
+        embeddings = np.memmap(staging, dtype=np.float32, mode="r", shape=(count, dim))
+        index = build_index(path, embeddings, **kwargs)
+        del embeddings
+    finally:
+        os.remove(staging)
+    return index
+
+
+class IVFIndex:
+    """A memory-mapped index directory written by build_index()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "index.json")) as f:
+            info = json.load(f)
+        self.dim = info["dim"]
+        self.nlist = info["nlist"]
+        self.centroids = np.load(os.path.join(path, "centroids.npy"))
+        self.offsets = np.load(os.path.join(path, "offsets.npy"))
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self.rows = np.load(os.path.join(path, "rows.npy"), mmap_mode="r")
+        documents = os.path.join(path, "document_offsets.npy")
+        self.document_offsets = np.load(documents) if os.path.exists(documents) else None
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def search(
+        self, query: Sequence[float], k: int = 10, nprobe: int = DEFAULT_NPROBE
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate k nearest rows to a query embedding.
+
+        Args:
+            query: Query embedding
+            k: Number of results
+            nprobe: Lists searched; more is slower and closer to exact (nlist: exact)
+
+        Returns:
+            (rows, cosine similarities), most similar first.
+        """
+        query = _normalize(query)
+        lists = np.argsort(-(self.centroids @ query))[: max(1, nprobe)]
+        positions, scores = [], []
+        for start, end in zip(self.offsets[lists], self.offsets[lists + 1]):
+            if end > start:
+                positions.append(np.arange(start, end))
+                scores.append(self.vectors[start:end] @ query)
+        if not scores:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        position, score = np.concatenate(positions), np.concatenate(scores)
+        if k < len(score):
+            top = np.argpartition(-score, k - 1)[:k]
+            position, score = position[top], score[top]
+        order = np.argsort(-score, kind="stable")
+        return np.asarray(self.rows[position[order]]), score[order]
+
+    def documents(self, rows: Iterable[int]) -> list[dict[str, Any]]:
+        """The stored documents of the given rows."""
+        if self.document_offsets is None:
+            raise ValueError(f"{self.path} has no documents")
+        found = []
+        with open(os.path.join(self.path, "documents.jsonl"), "rb") as f:
+            for row in rows:
+                f.seek(self.document_offsets[row])
+                found.append(json.loads(f.read(self.document_offsets[row + 1] - self.document_offsets[row])))
+        return found
+
+
+def brute_force_search(
+    vectors: np.ndarray, query: Sequence[float], k: int = 10
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Exact k nearest rows by cosine similarity, scanning every vector.
+
+    Args:
+        vectors: Unit-length rows, e.g. IVFIndex.vectors
+        query: Query embedding
+        k: Number of results
+
+    Returns:
+        (positions in vectors, cosine similarities), most similar first.
+    """
+    query = _normalize(query)
+    scores = np.empty(len(vectors), dtype=np.float32)
+    for start in range(0, len(vectors), BATCH_ROWS):
+        scores[start : start + BATCH_ROWS] = vectors[start : start + BATCH_ROWS] @ query
+    top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+    order = np.argsort(-scores[top], kind="stable")
+    return top[order], scores[top][order]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit("usage: python -m app.vector_index <index_dir> <export.jsonl>...")
+    built = build_index_from_export(sys.argv[1], sys.argv[2:])
+    print(f"{sys.argv[1]}: {len(built)} vectors in {built.nlist} lists")
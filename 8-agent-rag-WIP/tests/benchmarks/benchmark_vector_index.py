@@ -0,0 +1,104 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Local IVF index search against brute-force search on CHUNKS embeddings.
+
+Generates CHUNKS synthetic DIM-dimensional embeddings clustered around TOPICS
+topic vectors, since real chunk embeddings are clustered. They are written to a
+memory-mapped file and indexed with build_index. Each of QUERIES queries is a
+perturbed chunk embedding. The exact top K of brute_force_search over the
+index's vectors is the ground truth. Reports recall@K and p50/p99 query
+latency for brute force and for the index at several nprobe values.
+
+DIM defaults to 768, the dimension of text-embedding-005. CHUNKS, DIM and NOISE
+(how far chunks spread around their topic; higher is harder) can be overridden
+with BENCHMARK_CHUNKS, BENCHMARK_DIM and BENCHMARK_NOISE. At the defaults the
+embeddings and the index vectors take about 3 GB of disk each.
+
+Run with:
+    uv run python -m tests.benchmarks.benchmark_vector_index
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from app.vector_index import brute_force_search, build_index
+
+CHUNKS = int(os.environ.get("BENCHMARK_CHUNKS", "1000000"))
+DIM = int(os.environ.get("BENCHMARK_DIM", "768"))  # text-embedding-005
+TOPICS = 2_000
+NOISE = float(os.environ.get("BENCHMARK_NOISE", "1.0"))  # relative to the unit topic vectors
+QUERIES = 200
+K = 10
+NPROBES = (8, 16, 32, 64, 128)
+
+
+def write_embeddings(path: str, rng: np.random.Generator) -> np.ndarray:
+    topics = rng.normal(size=(TOPICS, DIM)).astype(np.float32)
+    topics /= np.linalg.norm(topics, axis=1, keepdims=True)
+    embeddings = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(CHUNKS, DIM))
+    for start in range(0, CHUNKS, 100_000):
+        size = min(100_000, CHUNKS - start)
+        noise = rng.normal(scale=NOISE / np.sqrt(DIM), size=(size, DIM)).astype(np.float32)
+        embeddings[start : start + size] = topics[rng.integers(0, TOPICS, size)] + noise
+    embeddings.flush()
+    return embeddings
+
+
+def timed(search, queries: np.ndarray) -> tuple[list[set], np.ndarray]:
+    results, seconds = [], []
+    for query in queries:
+        started = time.perf_counter()
+        rows = search(query)
+        seconds.append(time.perf_counter() - started)
+        results.append(set(rows.tolist()))
+    return results, np.array(seconds) * 1000
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        embeddings = write_embeddings(os.path.join(tmp, "embeddings.npy"), rng)
+        started = time.perf_counter()
+        index = build_index(os.path.join(tmp, "index"), embeddings)
+        build_seconds = time.perf_counter() - started
+        print(f"{CHUNKS} chunks x {DIM} dims, {index.nlist} lists, built in {build_seconds:.1f}s")
+
+        picks = rng.choice(CHUNKS, QUERIES, replace=False)
+        queries = embeddings[np.sort(picks)] + rng.normal(
+            scale=NOISE / np.sqrt(DIM), size=(QUERIES, DIM)
+        ).astype(np.float32)
+        del embeddings
+
+        truth, latency = timed(
+            lambda q: index.rows[brute_force_search(index.vectors, q, K)[0]], queries
+        )
+        print(f"{'search':<14} {'recall@' + str(K):>9} {'p50 ms':>8} {'p99 ms':>8}")
+        print(f"{'brute force':<14} {1.0:>9.3f} {np.percentile(latency, 50):>8.2f} "
+              f"{np.percentile(latency, 99):>8.2f}")
+        brute_p99 = np.percentile(latency, 99)
+        for nprobe in NPROBES:
+            found, latency = timed(lambda q: index.search(q, K, nprobe)[0], queries)
+            recall = np.mean([len(f & t) / K for f, t in zip(found, truth)])
+            print(f"{'ivf nprobe=' + str(nprobe):<14} {recall:>9.3f} "
+                  f"{np.percentile(latency, 50):>8.2f} {np.percentile(latency, 99):>8.2f} "
+                  f"({brute_p99 / np.percentile(latency, 99):.0f}x faster p99)")
+        del index
+
+
+if __name__ == "__main__":
+    main()
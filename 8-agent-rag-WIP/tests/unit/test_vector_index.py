@@ -0,0 +1,68 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import numpy as np
+
+from app.vector_index import (
+    IVFIndex,
+    brute_force_search,
+    build_index,
+    build_index_from_export,
+)
+
+
+def clustered(rows: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(20, dim))
+    return (topics[rng.integers(0, 20, rows)] + 0.3 * rng.normal(size=(rows, dim))).astype(np.float32)
+
+
+def test_search_matches_brute_force(tmp_path) -> None:
+    embeddings = clustered(2000)
+    documents = ({"id": f"chunk-{i}", "content": f"text {i}"} for i in range(2000))
+    index = build_index(str(tmp_path), embeddings, documents, nlist=20)
+    assert len(index) == 2000 and index.nlist == 20
+
+    # Searching every list is exact
+    query = embeddings[42]
+    rows, scores = index.search(query, k=5, nprobe=index.nlist)
+    exact, exact_scores = brute_force_search(index.vectors, query, k=5)
+    assert rows[0] == 42 and scores[0] > 0.999
+    assert rows.tolist() == index.rows[exact].tolist()
+    np.testing.assert_allclose(scores, exact_scores, rtol=1e-5)
+    assert index.documents(rows[:2])[0] == {"id": "chunk-42", "content": "text 42"}
+
+    # A few lists still find most neighbours
+    found = sum(
+        len(set(index.search(q, k=10, nprobe=4)[0]) & set(index.rows[brute_force_search(index.vectors, q, 10)[0]]))
+        for q in embeddings[:50]
+    )
+    assert found / 500 > 0.9
+
+
+def test_build_from_ingestion_export(tmp_path) -> None:
+    embeddings = clustered(50)
+    export = tmp_path / "export.jsonl"
+    with open(export, "w") as f:
+        for i, embedding in enumerate(embeddings):
+            data = {"id": f"q{i}", "embedding": embedding.tolist(), "content": f"answer {i}"}
+            f.write(json.dumps({"id": f"q{i}", "json_data": json.dumps(data)}) + "\n")
+
+    build_index_from_export(str(tmp_path / "index"), [str(export)], nlist=4)
+    index = IVFIndex(str(tmp_path / "index"))
+    rows, _ = index.search(embeddings[7], k=1, nprobe=4)
+    assert index.documents(rows) == [{"id": "q7", "content": "answer 7"}]
+    assert not (tmp_path / "index" / "staging.f32").exists()
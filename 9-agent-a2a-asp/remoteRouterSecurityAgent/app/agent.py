@@ -15,6 +15,7 @@ from google.adk.apps.app import App
 from google.adk.models import Gemini
 from google.genai import types
 
+from .app_utils.simulator import reset_simulator_for_invocation
 from .app_utils.tools import (
     check_router_firewall_status,
     scan_router_open_ports,
@@ -99,6 +100,8 @@ root_agent = Agent(
         check_router_firmware_security,
     ],
     sub_agents=[connectivity_agent],
+    # Each request replays the simulation scenario from its start
+    before_agent_callback=reset_simulator_for_invocation,
 )
 
 # ============================================================================
@@ -0,0 +1,232 @@
+"""
+Seedable, scenario-driven network state for the simulated tools.
+
+The tools used to draw every outcome from the unseeded global `random`, so no
+two runs were alike. They now ask the simulator instead:
+
+- rng(tool, target) gives a random.Random seeded from (run seed, tool, target,
+  call number), so the same run seed reproduces every drawn value regardless
+  of how calls to different tools and targets interleave. The fault timeline
+  is a global step count, though, so which faults are active still depends
+  on the order of the tool calls
+- fault(kind, target) and metric(kind, target, ...) say whether a fault is
+  present and what a measurement reads. With a scenario loaded the
+  scenario's fault timeline decides; without one, the tool's historical
+  distribution is drawn from the seeded rng
+- remediate(action, target) clears the active faults that action fixes (with
+  the fault's fix probability), so remediation calls change what later checks see
+
+A scenario is a JSON file:
+
+    {
+      "name": "link-down",
+      "seed": 7,
+      "background": {"security_alert": 0.0},
+      "faults": [
+        {"kind": "unreachable", "target": "10.0.0.2", "start": 0, "end": null,
+         "fixed_by": ["fix_connectivity_issue"], "fix_probability": 1.0}
+      ]
+    }
+
+`start`/`end` are simulator steps: one step per tool call. `target` may be a
+glob. `background` gives the probability of fault kinds that are not on the
+timeline (0 when omitted). Select a scenario with SIMULATION_SCENARIO (a file
+name in the scenarios directory, or a path) and the run seed with
+SIMULATION_SEED; without a seed every run draws a fresh one. A run is one
+agent invocation: reset_simulator_for_invocation, as the root agent's
+before_agent_callback, restarts the scenario for each one.
+"""
+
+import fnmatch
+import json
+import logging
+import os
+import random
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_SCENARIO_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "scenarios",
+)
+
+
+def load_scenario(name_or_path: str, scenario_dir: str = DEFAULT_SCENARIO_DIR) -> Dict[str, Any]:
+    """A scenario from a path, or by name from the scenarios directory."""
+    path = name_or_path
+    if not os.path.exists(path):
+        path = os.path.join(scenario_dir, name_or_path)
+        if not path.endswith(".json"):
+            path += ".json"
+    with open(path) as f:
+        return json.load(f)
+
+
+class ScenarioSimulator:
+    """Network state for one run: seeded randomness plus a fault timeline."""
+
+    def __init__(self, scenario: Optional[Dict[str, Any]] = None, seed: Optional[int] = None):
+        self.scenario = scenario
+        self._configured_seed = seed
+        self._lock = threading.Lock()
+        self._invocation_id: Optional[str] = None
+        self.reset()
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """
+        Start a new run: rewind the clock and re-arm faults. The run seed is
+        `seed`, else the configured seed, else the scenario's, else a fresh one.
+        """
+        if seed is None:
+            seed = self._configured_seed
+        if seed is None and self.scenario is not None:
+            seed = self.scenario.get("seed")
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2**32)
+        self.step = 0
+        self._calls: Dict[tuple, int] = {}
+        self._cleared: Dict[int, int] = {}  # fault index -> step it was fixed
+        self.history: List[Dict[str, Any]] = []
+
+    def begin_invocation(self, invocation_id: str) -> bool:
+        """reset() for a new invocation, once (agent callbacks can run several times in one)."""
+        with self._lock:
+            if invocation_id == self._invocation_id:
+                return False
+            self._invocation_id = invocation_id
+        self.reset()
+        return True
+
+    @property
+    def faults(self) -> List[Dict[str, Any]]:
+        return (self.scenario or {}).get("faults", [])
+
+    def rng(self, tool: str, target: str = "", advance: bool = True) -> random.Random:
+        """Deterministic randomness for one tool call; advances the clock one step."""
+        with self._lock:
+            if advance:
+                self.step += 1
+            n = self._calls.get((tool, target), 0)
+            self._calls[(tool, target)] = n + 1
+        return random.Random(f"{self.seed}:{tool}:{target}:{n}")
+
+    def _active(self, kind: str, target: str) -> List[int]:
+        active = []
+        for index, fault in enumerate(self.faults):
+            if fault["kind"] != kind or index in self._cleared:
+                continue
+            if not fnmatch.fnmatchcase(target.lower(), str(fault.get("target", "*")).lower()):
+                continue
+            end = fault.get("end")
+            if fault.get("start", 0) <= self.step and (end is None or self.step < end):
+                active.append(index)
+        return active
+
+    def fault(self, kind: str, target: str, rng: random.Random, default_probability: float) -> bool:
+        """Whether a fault of this kind affects the target now."""
+        if self._active(kind, target):
+            return True
+        if self.scenario is None:
+            return rng.random() < default_probability
+        return rng.random() < self.scenario.get("background", {}).get(kind, 0.0)
+
+    def fault_params(self, kind: str, target: str) -> Dict[str, Any]:
+        """Parameters of the first active fault of this kind (e.g. latency_ms)."""
+        active = self._active(kind, target)
+        return dict(self.faults[active[0]].get("params", {})) if active else {}
+
+    def metric(
+        self,
+        kind: str,
+        target: str,
+        rng: random.Random,
+        unscripted: Tuple[float, float],
+        healthy: Tuple[float, float],
+        degraded: Tuple[float, float],
+    ) -> float:
+        """
+        A measurement drawn from the `unscripted` range without a scenario, and
+        with one from `degraded` while a `kind` fault is active (or its
+        params["value"]), else from `healthy`. Integer bounds give integers.
+        """
+        if self.scenario is None:
+            low, high = unscripted
+        elif self._active(kind, target):
+            params = self.fault_params(kind, target)
+            if "value" in params:
+                return params["value"]
+            low, high = degraded
+        else:
+            low, high = healthy
+        if isinstance(low, int) and isinstance(high, int):
+            return rng.randint(low, high)
+        return rng.uniform(low, high)
+
+    def pick(self, kind: str, target: str, rng: random.Random, options: Sequence[T]) -> T:
+        """An option chosen by the active fault's params["option"] index, else at random."""
+        params = self.fault_params(kind, target)
+        if "option" in params:
+            return options[params["option"]]
+        return rng.choice(options)
+
+    def remediate(self, action: str, target: str, rng: random.Random, default_probability: float) -> bool:
+        """
+        Apply a remediation. Active faults on the target fixed by this action
+        are cleared with their fix_probability. Without a matching fault the
+        action succeeds with default_probability (no scenario) or
+        the scenario's "remediation_success" (default 1.0).
+        """
+        matching = [
+            index for index, fault in enumerate(self.faults)
+            if action in fault.get("fixed_by", ()) and index in self._active(fault["kind"], target)
+        ]
+        if matching:
+            success = True
+            for index in matching:
+                if rng.random() < self.faults[index].get("fix_probability", 1.0):
+                    self._cleared[index] = self.step
+                else:
+                    success = False
+        elif self.scenario is None:
+            success = rng.random() < default_probability
+        else:
+            success = rng.random() < self.scenario.get("remediation_success", 1.0)
+        self.history.append({"step": self.step, "action": action, "target": target,
+                             "success": success, "cleared": [self.faults[i]["kind"] for i in matching
+                                                             if i in self._cleared]})
+        return success
+
+
+_simulator: Optional[ScenarioSimulator] = None
+
+
+def configure_simulator(scenario: Optional[str] = None, seed: Optional[int] = None) -> ScenarioSimulator:
+    """Replace the process-wide simulator (scenario name/path and run seed)."""
+    global _simulator
+    _simulator = ScenarioSimulator(load_scenario(scenario) if scenario else None, seed)
+    logger.info("Simulator: scenario=%s seed=%s", scenario or "none", _simulator.seed)
+    return _simulator
+
+
+def get_simulator() -> ScenarioSimulator:
+    """The process-wide simulator, configured from SIMULATION_SCENARIO and SIMULATION_SEED."""
+    if _simulator is None:
+        seed = os.environ.get("SIMULATION_SEED")
+        return configure_simulator(
+            os.environ.get("SIMULATION_SCENARIO") or None,
+            int(seed) if seed else None,
+        )
+    return _simulator
+
+
+def reset_simulator_for_invocation(callback_context: Any) -> None:
+    """
+    before_agent_callback for a root agent: every invocation replays the
+    scenario from its start with the same seed, instead of continuing the
+    previous run's timeline and cleared faults.
+    """
+    get_simulator().begin_invocation(callback_context.invocation_id)
+    return None
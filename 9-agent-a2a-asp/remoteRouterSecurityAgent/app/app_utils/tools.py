@@ -4,6 +4,8 @@ import subprocess
 import json
 from typing import Dict, Any
 
+from .simulator import get_simulator
+
 
 def check_router_firewall_status(router_name: str) -> Dict[str, Any]:
     """
@@ -18,8 +20,9 @@ def check_router_firewall_status(router_name: str) -> Dict[str, Any]:
     try:
         # Simulate firewall status check (in real implementation, this would connect to router)
         # For demo purposes, we'll use a simulated check
-        import random
-        firewall_enabled = random.choice([True, True, False])  # 66% success rate
+        simulator = get_simulator()
+        rng = simulator.rng("check_router_firewall_status", router_name)
+        firewall_enabled = not simulator.fault("firewall_disabled", router_name, rng, 1 / 3)
         
         if firewall_enabled:
             return {
@@ -121,7 +124,8 @@ def check_router_firmware_security(router_name: str) -> Dict[str, Any]:
     try:
         # In a real implementation, this would connect to the router's management interface
         # For demo purposes, we'll simulate firmware checking
-        import random
+        simulator = get_simulator()
+        rng = simulator.rng("check_router_firmware_security", router_name)
         
         # Simulate different firmware states
         firmware_states = [
@@ -131,7 +135,12 @@ def check_router_firmware_security(router_name: str) -> Dict[str, Any]:
             {"status": False, "reason": "Firmware version is end-of-life and no longer receives security updates."}
         ]
         
-        selected_state = random.choice(firmware_states)
+        if simulator.scenario is None:
+            selected_state = rng.choice(firmware_states)
+        elif simulator.fault("firmware_vulnerable", router_name, rng, 0.0):
+            selected_state = simulator.pick("firmware_vulnerable", router_name, rng, firmware_states[2:])
+        else:
+            selected_state = rng.choice(firmware_states[:2])
         
         return {
             "security_status": selected_state["status"],